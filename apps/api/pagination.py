@@ -0,0 +1,98 @@
+"""
+Keyset pagination for list endpoints.
+
+Lists are ordered newest first by ``(created_at, id)``, with rows missing a
+``created_at`` last. The opaque cursor encodes the last row's pair, so the next
+page is an indexed range read whatever the offset. Lists with a natural order
+of their own (a run's pages) page forward through it with ``ordered_page``.
+Every paginated route returns the same envelope:
+``{"items": [...], "next_cursor": "..." | null, "limit": n}``.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None
+    limit: int
+
+
+def _encode(values: list[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str, size: int) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError(cursor)
+        return values
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def encode_cursor(created_at: datetime | None, row_id: str) -> str:
+    return _encode([created_at.isoformat() if created_at else None, row_id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, str]:
+    created_at, row_id = _decode(cursor, 2)
+    try:
+        return (datetime.fromisoformat(created_at) if created_at is not None else None), str(row_id)
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def keyset_page(query: Query, created_col: Any, id_col: Any, *, limit: int, cursor: str | None) -> tuple[list[Any], str | None]:
+    """One page of *query* newest first, plus the cursor for the next page (None on the last page)."""
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if created_at is None:
+            query = query.filter(created_col.is_(None), id_col < row_id)
+        else:
+            query = query.filter(or_(
+                created_col < created_at,
+                and_(created_col == created_at, id_col < row_id),
+                created_col.is_(None),
+            ))
+    rows = query.order_by(created_col.desc().nulls_last(), id_col.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+
+
+def ordered_page(query: Query, *cols: Any, limit: int, cursor: str | None) -> tuple[list[Any], str | None]:
+    """One page of *query* in ascending *cols* order (which must be a unique key), plus the next cursor."""
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    if cursor:
+        values = _decode(cursor, len(cols))
+        # Row-value comparison (cols) > (values), spelled out for dialects without tuple support.
+        query = query.filter(or_(*(
+            and_(*(c == v for c, v in zip(cols[:i], values[:i], strict=True)), cols[i] > values[i])
+            for i in range(len(cols))
+        )))
+    rows = query.order_by(*cols).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, _encode([getattr(rows[-1], c.key) for c in cols])
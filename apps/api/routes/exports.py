@@ -51,20 +51,17 @@ def get_latest_exports(
         raise HTTPException(status_code=404, detail="Matter not found")
     assert_firm_access(identity, matter.firm_id)
 
-    runs = (
+    mode = str(export_mode or "").strip().upper()
+    run = (
         db.query(Run)
-        .filter(Run.matter_id == matter_id, Run.status.in_(["success", "partial", "needs_review", "completed"]))
+        .filter(
+            Run.matter_id == matter_id,
+            Run.export_mode == mode,
+            Run.status.in_(["success", "partial", "needs_review", "completed"]),
+        )
         .order_by(Run.finished_at.desc())
-        .all()
+        .first()
     )
-    mode = str(export_mode or "").strip().upper()
-    run = None
-    for cand in runs:
-        cfg = cand.config_json if isinstance(cand.config_json, dict) else {}
-        cand_mode = str(cfg.get("export_mode") or "").strip().upper()
-        if cand_mode == mode:
-            run = cand
-            break
     if not run:
         raise HTTPException(status_code=404, detail=f"No exportable runs found for mode={mode} on this matter")
 
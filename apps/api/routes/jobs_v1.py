@@ -9,16 +9,19 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from apps.api.authz import RequestIdentity, assert_firm_access, get_request_identity
+from apps.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, CursorPage, keyset_page
+from apps.api.routes.runs import run_status_filter
 from apps.api.routes.webhooks_v1 import emit_job_webhook_events
 from packages.db.database import get_db
 from packages.db.models import Artifact, Matter, Run, SourceDocument
+from packages.db.run_dispatch import notify_run_enqueued
 from packages.shared.models import RunConfig
 from packages.shared.storage import get_artifact_path
 
@@ -227,6 +230,7 @@ def create_job(
         _assert_job_access(existing, db, identity)
         return _to_job_accepted(existing)
 
+    notify_run_enqueued(db, run.id)
     emit_job_webhook_events(
         db,
         firm_id=matter.firm_id,
@@ -242,6 +246,33 @@ def create_job(
     return _to_job_accepted(run)
 
 
+@router.get("/jobs", response_model=CursorPage[JobStatusResponse])
+def list_jobs(
+    matter_id: str,
+    status: list[str] | None = Query(None),
+    export_mode: Literal["INTERNAL", "MEDIATION"] | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+    identity: RequestIdentity | None = Depends(get_request_identity),
+):
+    _assert_v1_jobs_enabled()
+
+    matter = db.query(Matter).filter_by(id=matter_id).first()
+    if not matter:
+        raise HTTPException(status_code=404, detail="Matter not found")
+    assert_firm_access(identity, matter.firm_id)
+
+    query = db.query(Run).filter(Run.matter_id == matter_id)
+    statuses = run_status_filter(status)
+    if statuses:
+        query = query.filter(Run.status.in_(sorted(statuses)))
+    if export_mode:
+        query = query.filter(Run.export_mode == export_mode)
+    runs, next_cursor = keyset_page(query, Run.created_at, Run.id, limit=limit, cursor=cursor)
+    return CursorPage[JobStatusResponse](items=[_to_job_status(r) for r in runs], next_cursor=next_cursor, limit=limit)
+
+
 @router.get("/jobs/{job_id}", response_model=JobStatusResponse)
 def get_job(
     job_id: str,
@@ -11,8 +11,9 @@ from pydantic import BaseModel
 from sqlalchemy import func, desc
 from sqlalchemy.orm import Session
 
-from packages.db.database import get_db
+from packages.db.database import ENGINE_PROFILE_NAMES, engine_profile, get_db, pool_metrics
 from packages.db.models import OpsEvent, Incident, SalesEvent, Run, Firm, SystemConfig
+from packages.db.run_dispatch import dispatch_metrics
 from packages.shared.utils.ops_utils import generate_fingerprint, calculate_impact_score
 
 router = APIRouter(tags=["ops"])
@@ -146,6 +147,23 @@ async def update_system_config(key: str, value: Any, db: Session = Depends(get_d
     db.commit()
     return {"status": "ok", "key": key, "value": value}
 
+@router.get("/admin/ops/db-pool")
+def get_db_pool_metrics():
+    """Connection pool state per engine profile (checked out, overflow, checkout wait time)."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "pools": pool_metrics(),
+        "profiles": {name: vars(engine_profile(name)) for name in ENGINE_PROFILE_NAMES},
+    }
+
+@router.get("/admin/ops/run-dispatch")
+def get_run_dispatch_metrics():
+    """Run wakeups sent and enqueue-to-claim latency for runs claimed by this process."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "dispatch": dispatch_metrics(),
+    }
+
 @router.get("/admin/cockpit/snapshot")
 async def get_cockpit_snapshot(db: Session = Depends(get_db)):
     summary = await get_cockpit_summary(db)
@@ -4,16 +4,18 @@ API route: Runs
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Literal
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer, selectinload
 
 from apps.api.authz import RequestIdentity, assert_firm_access, get_request_identity
+from apps.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, CursorPage, keyset_page, ordered_page
 from packages.db.database import get_db
-from packages.db.models import Artifact, Matter, Run, SourceDocument
+from packages.db.models import Artifact, Matter, Page, Run, SourceDocument
+from packages.db.run_dispatch import notify_run_enqueued
 from packages.shared.artifacts import artifact_extension, is_valid_artifact_type
 from packages.shared.models import RunConfig
 
@@ -68,6 +70,23 @@ class RunResponse(BaseModel):
     quality_gate_score: int | None = None
 
 
+class PageResponse(BaseModel):
+    id: str
+    source_document_id: str
+    page_number: int
+    text_source: str | None
+    page_type: str | None
+    text: str | None = None
+    layout: dict | None = None
+
+
+class ValuationResponse(BaseModel):
+    run_id: str
+    extensions: dict[str, Any]
+    computed: list[str]  # requested keys that were not stored and had to be computed
+    computed_dependencies: list[str]  # unrequested valuation extensions computed as their inputs
+
+
 @router.post("/matters/{matter_id}/runs", response_model=RunResponse, status_code=202)
 def start_run(
     matter_id: str,
@@ -131,6 +150,7 @@ def start_run(
     )
     db.add(run)
     db.flush()
+    notify_run_enqueued(db, run.id)
 
     return RunResponse(
         id=run.id,
@@ -146,20 +166,37 @@ def start_run(
     )
 
 
-@router.get("/matters/{matter_id}/runs", response_model=list[RunResponse])
+def run_status_filter(statuses: list[str] | None) -> set[str]:
+    wanted = {str(s).strip().lower() for s in statuses or [] if str(s).strip()}
+    if "success" in wanted:
+        wanted.add("completed")  # legacy spelling, reported as success
+    return wanted
+
+
+@router.get("/matters/{matter_id}/runs", response_model=CursorPage[RunResponse])
 def list_runs(
     matter_id: str,
+    status: list[str] | None = Query(None),
+    export_mode: Literal["INTERNAL", "MEDIATION"] | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     identity: RequestIdentity | None = Depends(get_request_identity),
 ):
-    """List all processing runs for a matter."""
+    """List processing runs for a matter, newest first, one keyset page at a time."""
     matter = db.query(Matter).filter_by(id=matter_id).first()
     if not matter:
         raise HTTPException(status_code=404, detail="Matter not found")
 
     assert_firm_access(identity, matter.firm_id)
 
-    runs = db.query(Run).filter_by(matter_id=matter_id).order_by(Run.created_at.desc()).all()
+    query = db.query(Run).filter(Run.matter_id == matter_id)
+    statuses = run_status_filter(status)
+    if statuses:
+        query = query.filter(Run.status.in_(sorted(statuses)))
+    if export_mode:
+        query = query.filter(Run.export_mode == export_mode)
+    runs, next_cursor = keyset_page(query, Run.created_at, Run.id, limit=limit, cursor=cursor)
 
     response = []
     for r in runs:
@@ -180,7 +217,7 @@ def list_runs(
                 processing_seconds=r.processing_seconds,
             )
         )
-    return response
+    return CursorPage[RunResponse](items=response, next_cursor=next_cursor, limit=limit)
 
 
 @router.get("/runs/{run_id}", response_model=RunResponse)
@@ -390,3 +427,89 @@ def download_artifact_by_name(
         filename=safe_name,
         media_type="application/octet-stream",
     )
+
+
+@router.get("/runs/{run_id}/pages", response_model=CursorPage[PageResponse])
+def list_run_pages(
+    run_id: str,
+    include_text: bool = False,
+    include_layout: bool = False,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+    identity: RequestIdentity | None = Depends(get_request_identity),
+):
+    """
+    Pages of a run in document / page order, one keyset page at a time. Text and layout
+    blobs are only loaded when requested, in one batch each for the returned page.
+    """
+    run = db.query(Run).filter_by(id=run_id).first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    matter = db.query(Matter).filter_by(id=run.matter_id).first()
+    if not matter:
+        raise HTTPException(status_code=404, detail="Matter not found")
+    assert_firm_access(identity, matter.firm_id)
+
+    query = db.query(Page).filter_by(run_id=run_id)
+    query = query.options(selectinload(Page.text_blob)) if include_text else query.options(defer(Page.text))
+    query = query.options(selectinload(Page.layout_blob)) if include_layout else query.options(defer(Page.layout_json))
+    order = (Page.source_document_id, Page.page_number, Page.id)
+    pages, next_cursor = ordered_page(query, *order, limit=limit, cursor=cursor)
+    items = [
+        PageResponse(
+            id=p.id,
+            source_document_id=p.source_document_id,
+            page_number=p.page_number,
+            text_source=p.text_source,
+            page_type=p.page_type,
+            text=p.page_text if include_text else None,
+            layout=p.layout if include_layout else None,
+        )
+        for p in pages
+    ]
+    return CursorPage[PageResponse](items=items, next_cursor=next_cursor, limit=limit)
+
+
+@router.get("/runs/{run_id}/valuation", response_model=ValuationResponse)
+def get_run_valuation(
+    run_id: str,
+    keys: list[str] | None = Query(None),
+    recompute: bool = False,
+    db: Session = Depends(get_db),
+    identity: RequestIdentity | None = Depends(get_request_identity),
+):
+    """Valuation extensions for an INTERNAL run, computed on demand when not stored."""
+    run = db.query(Run).filter_by(id=run_id).first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    matter = db.query(Matter).filter_by(id=run.matter_id).first()
+    if not matter:
+        raise HTTPException(status_code=404, detail="Matter not found")
+    assert_firm_access(identity, matter.firm_id)
+
+    # Fail closed: a run whose export mode was never recorded is not treated as INTERNAL.
+    if not run.export_mode:
+        raise HTTPException(status_code=409, detail="Run export mode is unknown; valuation is only available for INTERNAL runs")
+    if run.export_mode != "INTERNAL":
+        raise HTTPException(status_code=403, detail=f"Valuation is only available for INTERNAL runs; run export mode is {run.export_mode}")
+
+    import json
+    from pathlib import Path
+
+    from apps.worker.pipeline_stages import compute_valuation_extensions
+    from packages.shared.storage import get_artifact_path
+
+    file_path = get_artifact_path(run_id, "evidence_graph.json")
+    if not file_path or not Path(file_path).exists():
+        raise HTTPException(status_code=404, detail="evidence_graph.json not found for this run")
+    graph = json.loads(Path(file_path).read_text(encoding="utf-8"))
+    payload = graph.get("evidence_graph", graph) if isinstance(graph, dict) else {}
+
+    try:
+        extensions, computed, dependencies = compute_valuation_extensions(payload, keys=keys, recompute=recompute)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return ValuationResponse(run_id=run_id, extensions=extensions, computed=computed, computed_dependencies=dependencies)
@@ -5,7 +5,7 @@ import os
 import threading
 import time
 
-from packages.db.database import get_session
+from packages.db.database import get_session, use_engine_profile
 
 logger = logging.getLogger("linecite.upload_orphan_sweeper")
 
@@ -22,7 +22,8 @@ def sweep_interval_seconds() -> int:
 def run_upload_orphan_sweep_once() -> dict[str, int]:
     from apps.api.routes.documents import sweep_orphaned_direct_uploads
 
-    with get_session() as db:
+    # NullPool profile: the sweep runs every half hour and should not hold API pool slots in between.
+    with use_engine_profile("cron"), get_session() as db:
         return sweep_orphaned_direct_uploads(db)
 
 
@@ -42,6 +42,12 @@ export interface Run {
   processing_seconds?: number;
 }
 
+export interface CursorPage<T> {
+  items: T[];
+  next_cursor: string | null;
+  limit: number;
+}
+
 export interface ArtifactMeta {
   artifact_type: string;
   storage_uri: string;
@@ -97,8 +103,16 @@ export const uploadDocument = async (matterId: string, file: File) => {
 };
 
 export const getMatterRuns = async (matterId: string) => {
-  const response = await api.get<Run[]>(`/matters/${matterId}/runs`);
-  return response.data;
+  const runs: Run[] = [];
+  let cursor: string | null = null;
+  do {
+    const response: { data: CursorPage<Run> } = await api.get<CursorPage<Run>>(`/matters/${matterId}/runs`, {
+      params: { limit: 200, ...(cursor ? { cursor } : {}) },
+    });
+    runs.push(...response.data.items);
+    cursor = response.data.next_cursor;
+  } while (cursor);
+  return runs;
 };
 
 export const createRun = async (matterId: string, config: { max_pages?: number } = {}) => {
@@ -0,0 +1,171 @@
+"""
+Indexed, read-only access to a JSON evidence graph for the valuation analyzers.
+
+Settlement leverage, the settlement feature pack and the case severity index all
+ask the same questions of ``evidence_graph_payload``: "is there a procedure event
+mentioning surgery", "which events mention radiculopathy", "what page does this
+citation point at". Each used to answer by rescanning every event and rebuilding
+its lowercased text blob. ``AnalysisContext`` makes one pass over the events and
+citations, then answers from indexes:
+
+  - events by normalized type, provider and parsed date
+  - citations by id
+  - keyword queries over the precomputed per-event text: existence checks run
+    against one joined blob per type filter, hit lists are memoized per query
+
+Build it once per run and pass it as ``analysis_context=`` to the builders;
+each builder falls back to building its own from the payload when none is given.
+Only events and citations are indexed: they are fixed once the analyzers run.
+Extensions and gaps keep growing as stages publish, so builders read those from
+the payload they are called with.
+Event text and type normalization match the analyzers' ``_event_all_text`` /
+``_event_type_str`` helpers exactly.
+"""
+from __future__ import annotations
+
+from datetime import date as _date
+from typing import Any, Iterable
+
+_TEXT_SCALAR_FIELDS = ("reason_for_visit", "chief_complaint", "author_name", "author_role")
+_TEXT_LIST_FIELDS = ("facts", "diagnoses", "procedures", "exam_findings", "treatment_plan")
+
+
+def event_type_str(event: dict) -> str:
+    raw = event.get("event_type")
+    if isinstance(raw, dict):
+        return str(raw.get("value") or "").lower()
+    return str(raw or "").lower()
+
+
+def event_all_text(event: dict) -> str:
+    parts: list[str] = []
+    for k in _TEXT_SCALAR_FIELDS:
+        v = event.get(k)
+        if v:
+            parts.append(str(v))
+    for k in _TEXT_LIST_FIELDS:
+        for f in (event.get(k) or []):
+            if isinstance(f, dict):
+                parts.append(str(f.get("text") or ""))
+            else:
+                parts.append(str(f))
+    return " ".join(parts).lower()
+
+
+def parse_iso_date(s: Any) -> _date | None:
+    if not s:
+        return None
+    try:
+        parts = str(s).split("-")
+        if len(parts) == 3:
+            return _date(int(parts[0]), int(parts[1]), int(parts[2]))
+    except Exception:
+        pass
+    return None
+
+
+def _event_date(event: dict) -> _date | None:
+    raw = event.get("date") or event.get("event_date")
+    if isinstance(raw, dict):
+        raw = raw.get("value")
+    return parse_iso_date(str(raw) if raw else None)
+
+
+class EventRecord:
+    """One evidence-graph event with its derived lookup keys precomputed."""
+
+    __slots__ = ("event", "event_type", "text", "date", "provider_id")
+
+    def __init__(self, event: dict) -> None:
+        self.event = event
+        self.event_type = event_type_str(event)
+        self.text = event_all_text(event)
+        self.date = _event_date(event)
+        self.provider_id = str(event.get("provider_id") or "")
+
+
+class AnalysisContext:
+    """Per-run indexes over ``evidence_graph_payload`` events and citations."""
+
+    def __init__(self, evidence_graph_payload: dict | None) -> None:
+        eg = evidence_graph_payload if isinstance(evidence_graph_payload, dict) else {}
+        self.events: list[EventRecord] = [EventRecord(e) for e in (eg.get("events") or []) if isinstance(e, dict)]
+
+        self._by_type: dict[str, list[EventRecord]] = {}
+        self._by_provider: dict[str, list[EventRecord]] = {}
+        self._by_date: dict[_date, list[EventRecord]] = {}
+        for rec in self.events:
+            self._by_type.setdefault(rec.event_type, []).append(rec)
+            if rec.provider_id:
+                self._by_provider.setdefault(rec.provider_id, []).append(rec)
+            if rec.date is not None:
+                self._by_date.setdefault(rec.date, []).append(rec)
+
+        self._citations: dict[str, dict] = {}
+        for c in (eg.get("citations") or []):
+            if not isinstance(c, dict):
+                continue
+            cid = str(c.get("citation_id") or "").strip()
+            if cid:
+                self._citations[cid] = c
+
+        self._keyword_hits: dict[tuple, list[EventRecord]] = {}
+        self._blobs: dict[str | None, str] = {}
+
+    @classmethod
+    def ensure(cls, context: "AnalysisContext | None", evidence_graph_payload: dict | None) -> "AnalysisContext":
+        """Reuse ``context`` when given, else index ``evidence_graph_payload``."""
+        return context if context is not None else cls(evidence_graph_payload)
+
+    # ── Event lookups ─────────────────────────────────────────────────────────
+
+    def event_types(self) -> list[str]:
+        return list(self._by_type)
+
+    def of_type(self, event_type: str) -> list[EventRecord]:
+        return self._by_type.get(event_type, [])
+
+    def of_type_containing(self, fragment: str) -> list[EventRecord]:
+        """Events whose normalized type contains ``fragment`` (e.g. ``"work"``)."""
+        out: list[EventRecord] = []
+        for et, recs in self._by_type.items():
+            if fragment in et:
+                out.extend(recs)
+        return out
+
+    def by_provider(self, provider_id: str) -> list[EventRecord]:
+        return self._by_provider.get(provider_id, [])
+
+    def on_date(self, day: _date) -> list[EventRecord]:
+        return self._by_date.get(day, [])
+
+    def event_dates(self) -> list[_date]:
+        return sorted(self._by_date)
+
+    def first_event_date(self) -> _date | None:
+        return min(self._by_date) if self._by_date else None
+
+    def with_keywords(self, keywords: Iterable[str], *, event_type: str | None = None) -> list[EventRecord]:
+        """Events whose text contains any of ``keywords`` (memoized per query)."""
+        kws = tuple(sorted(set(keywords)))
+        key = (kws, event_type)
+        hits = self._keyword_hits.get(key)
+        if hits is None:
+            pool = self.events if event_type is None else self.of_type(event_type)
+            hits = [rec for rec in pool if any(kw in rec.text for kw in kws)]
+            self._keyword_hits[key] = hits
+        return hits
+
+    def any_keyword(self, keywords: Iterable[str], *, event_type: str | None = None) -> bool:
+        """Existence check: one substring search per keyword over a joined text blob."""
+        blob = self._blobs.get(event_type)
+        if blob is None:
+            pool = self.events if event_type is None else self.of_type(event_type)
+            # NUL never occurs in a keyword, so matches cannot straddle two events.
+            blob = self._blobs[event_type] = "\x00".join(rec.text for rec in pool)
+        return any(kw in blob for kw in keywords)
+
+    # ── Citation lookups ──────────────────────────────────────────────────────
+
+    def citation(self, citation_id: str) -> dict | None:
+        return self._citations.get(str(citation_id or "").strip())
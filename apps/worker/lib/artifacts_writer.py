@@ -2,12 +2,17 @@ from __future__ import annotations
 
 import copy
 import hashlib
-import json
 import os
 import shutil
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable
 
+from packages.shared.storage import ArtifactWrite, iter_json_bytes, save_artifact_json
+
+# Evidence graphs can run to hundreds of MB: optionally drop the indentation, and/or
+# also store a gzip-compressed copy (evidence_graph.json.gz) of the final artifact.
+_EVIDENCE_GRAPH_COMPACT = os.getenv("EVIDENCE_GRAPH_JSON_COMPACT", "false").strip().lower() in {"1", "true", "yes", "on"}
+_EVIDENCE_GRAPH_GZIP = os.getenv("EVIDENCE_GRAPH_JSON_GZIP", "false").strip().lower() in {"1", "true", "yes", "on"}
 
 
 _VALUATION_EXTENSION_KEYS = {
@@ -60,10 +65,21 @@ _MEDIATION_EXTENSION_ALLOWLIST = {
 }
 
 
+def exported_extension_keys(export_mode: str) -> frozenset[str] | None:
+    """Extension keys that survive ``build_export_evidence_graph`` for ``export_mode``; None means all."""
+    if str(export_mode or "").strip().upper() != "MEDIATION":
+        return None
+    return frozenset(k for k in _MEDIATION_EXTENSION_ALLOWLIST if k not in _VALUATION_EXTENSION_KEYS)
+
+
 def write_artifact_json(name: str, obj: dict[str, Any], out_dir: Path) -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
     path = out_dir / name
-    path.write_text(json.dumps(obj, indent=2), encoding="utf-8")
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        for chunk in iter_json_bytes(obj):
+            f.write(chunk)
+    os.replace(tmp, path)  # never rewrite in place: the name may be hardlinked to a shared blob
     return path
 
 
@@ -136,7 +152,15 @@ def build_export_evidence_graph(payload: dict[str, Any], export_mode: str) -> di
     Build a mode-safe evidence graph payload for artifact serialization.
     Never mutates caller payload.
     """
-    out = copy.deepcopy(payload or {})
+    return copy.deepcopy(export_evidence_graph_view(payload, export_mode))
+
+
+def export_evidence_graph_view(payload: dict[str, Any], export_mode: str) -> dict[str, Any]:
+    """
+    Mode-safe evidence graph that shares the caller's sub-objects instead of
+    deep-copying them; for serializers that only read the result.
+    """
+    out = dict(payload or {})
     mode = str(export_mode or "").strip().upper()
     if mode != "MEDIATION":
         return out
@@ -185,7 +209,28 @@ def write_evidence_graph_artifact(
     """
     Single writer for evidence graph artifacts. Ensures mode-safe filtering.
     """
-    return write_artifact_json(name, build_export_evidence_graph(payload, export_mode), out_dir)
+    return write_artifact_json(name, export_evidence_graph_view(payload, export_mode), out_dir)
+
+
+def save_evidence_graph_artifact(
+    run_id: str,
+    payload: dict[str, Any],
+    export_mode: str,
+    *,
+    copies: Iterable[str] = (),
+    default: Callable[[Any], Any] | None = None,
+    allow_gzip: bool = False,
+) -> ArtifactWrite:
+    """
+    Stream the mode-safe evidence graph into the run's ``evidence_graph.json`` (and *copies*)
+    without materializing the JSON text. With ``allow_gzip`` and ``EVIDENCE_GRAPH_JSON_GZIP``
+    set, a compressed ``evidence_graph.json.gz`` is stored alongside.
+    """
+    view = export_evidence_graph_view(payload, export_mode)
+    written = save_artifact_json(run_id, "evidence_graph.json", view, copies=copies, compact=_EVIDENCE_GRAPH_COMPACT, default=default)
+    if allow_gzip and _EVIDENCE_GRAPH_GZIP:
+        save_artifact_json(run_id, "evidence_graph.json", view, compact=True, gzip=True, default=default)
+    return written
 
 
 def safe_copy(src_path: Path, dst_dir: Path, dst_name: str | None = None) -> Path | None:
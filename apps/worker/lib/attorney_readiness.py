@@ -6,6 +6,7 @@ from typing import Any
 
 from apps.worker.lib.compact_packet_policy import is_compact_packet
 from apps.worker.lib.noise_filter import is_noise_span
+from apps.worker.lib.rule_engine import Rule, RuleSet
 from packages.shared.utils.noise_utils import has_narrative_sentence, is_flowsheet_noise
 
 
@@ -42,6 +43,25 @@ BUCKET_SIGNALS = {
     "ORTHO": re.compile(r"\b(ortho|orthopedic|orthopaedic)\b.*\b(assessment|plan|impression)\b", re.IGNORECASE),
     "PROCEDURE": re.compile(r"\b(depo-?medrol|lidocaine|fluoroscopy|interlaminar|transforaminal|epidural)\b", re.IGNORECASE),
 }
+_FACT_TOKEN_RULES = RuleSet(
+    "attorney.fact_tokens",
+    [Rule.of(f"fact_token_{i}", rex) for i, rex in enumerate(FACT_TOKEN_PATTERNS)],
+)
+_SOURCE_BUCKET_RULES = RuleSet("attorney.source_buckets", [Rule.of(b, rex) for b, rex in BUCKET_SIGNALS.items()])
+# Matched against lowercased "event type + facts" blobs.
+_BLOB_RULES = RuleSet(
+    "attorney.blob_buckets",
+    [
+        Rule("ED", r"\b(ed|emergency|chief complaint|triage)\b"),
+        Rule("MRI", r"\b(mri|impression|imaging)\b"),
+        Rule("ORTHO", r"\b(ortho|orthopedic|orthopaedic)\b"),
+        Rule("PROCEDURE", r"\b(procedure|injection|fluoroscopy|depo-medrol|lidocaine)\b"),
+        # Projection rows also count epidurals as procedures.
+        Rule("PROCEDURE_EPIDURAL", r"\bepidural\b"),
+        Rule("MILESTONE", r"\b(ed|emergency|mri|imaging|orthopedic|ortho|procedure|injection|fluoroscopy|admission|discharge)\b"),
+    ],
+)
+_TIMELINE_BUCKETS = frozenset({"ED", "MRI", "ORTHO", "PROCEDURE"})
 
 
 @dataclass
@@ -178,7 +198,7 @@ def _merge_rows(parsed_rows: list[_TimelineRow], projection_rows: list[_Timeline
 
 
 def _fact_category_count(text: str) -> int:
-    return sum(1 for rex in FACT_TOKEN_PATTERNS if rex.search(text or ""))
+    return len(_FACT_TOKEN_RULES.matched(text or ""))
 
 
 def _source_buckets(page_text_by_number: dict[int, str] | None) -> set[str]:
@@ -186,9 +206,9 @@ def _source_buckets(page_text_by_number: dict[int, str] | None) -> set[str]:
     for txt in (page_text_by_number or {}).values():
         if not txt:
             continue
-        for b, rex in BUCKET_SIGNALS.items():
-            if rex.search(txt):
-                present.add(b)
+        present |= _SOURCE_BUCKET_RULES.matched(txt)
+        if len(present) == len(BUCKET_SIGNALS):
+            break
     return present
 
 
@@ -196,14 +216,7 @@ def _timeline_buckets(rows: list[_TimelineRow]) -> set[str]:
     present: set[str] = set()
     for row in rows:
         blob = f"{row.event_type} {' '.join(row.facts)}".lower()
-        if re.search(r"\b(ed|emergency|chief complaint|triage)\b", blob):
-            present.add("ED")
-        if re.search(r"\b(mri|impression|imaging)\b", blob):
-            present.add("MRI")
-        if re.search(r"\b(ortho|orthopedic|orthopaedic)\b", blob):
-            present.add("ORTHO")
-        if re.search(r"\b(procedure|injection|fluoroscopy|depo-medrol|lidocaine)\b", blob):
-            present.add("PROCEDURE")
+        present |= _BLOB_RULES.matched(blob) & _TIMELINE_BUCKETS
     return present
 
 
@@ -214,14 +227,10 @@ def _projection_buckets(entries: list[Any]) -> set[str]:
             f"{str(getattr(e, 'event_type_display', '') or '')} "
             f"{' '.join(str(f or '') for f in (getattr(e, 'facts', []) or []))}"
         ).lower()
-        if re.search(r"\b(ed|emergency|chief complaint|triage)\b", blob):
-            present.add("ED")
-        if re.search(r"\b(mri|impression|imaging)\b", blob):
-            present.add("MRI")
-        if re.search(r"\b(ortho|orthopedic|orthopaedic)\b", blob):
-            present.add("ORTHO")
-        if re.search(r"\b(procedure|injection|fluoroscopy|depo-medrol|lidocaine|epidural)\b", blob):
-            present.add("PROCEDURE")
+        hits = _BLOB_RULES.matched(blob)
+        if "PROCEDURE_EPIDURAL" in hits:
+            hits = hits | {"PROCEDURE"}
+        present |= hits & _TIMELINE_BUCKETS
     return present
 
 
@@ -246,12 +255,7 @@ def _row_is_noise_only(row: _TimelineRow, noise_pages: set[int]) -> bool:
 
 def _is_milestone_row(row: _TimelineRow) -> bool:
     blob = f"{row.event_type} {' '.join(row.facts)}".lower()
-    return bool(
-        re.search(
-            r"\b(ed|emergency|mri|imaging|orthopedic|ortho|procedure|injection|fluoroscopy|admission|discharge)\b",
-            blob,
-        )
-    )
+    return "MILESTONE" in _BLOB_RULES.matched(blob)
 
 
 def build_attorney_readiness_report(report_text: str, ctx: dict[str, Any]) -> dict[str, Any]:
@@ -11,6 +11,8 @@ import logging
 import re
 from typing import Any
 
+from apps.worker.lib.analysis_context import AnalysisContext
+
 logger = logging.getLogger(__name__)
 
 _WEIGHTS = {"objective": 0.45, "intensity": 0.35, "duration": 0.20}
@@ -224,17 +226,10 @@ def _band_for_csi(csi: float) -> str:
     return "Surgical-tier profile"
 
 
-def _resolve_page_refs(citation_ids: set[str], eg: dict[str, Any]) -> list[dict[str, Any]]:
-    by_id: dict[str, dict[str, Any]] = {}
-    for c in _safe_list(eg.get("citations")):
-        if not isinstance(c, dict):
-            continue
-        cid = str(c.get("citation_id") or "").strip()
-        if cid:
-            by_id[cid] = c
+def _resolve_page_refs(citation_ids: set[str], ctx: AnalysisContext) -> list[dict[str, Any]]:
     refs: list[dict[str, Any]] = []
     for cid in sorted(citation_ids):
-        c = by_id.get(cid)
+        c = ctx.citation(cid)
         if not c:
             continue
         try:
@@ -264,9 +259,12 @@ def build_case_severity_index(
     evidence_graph_payload: dict | None,
     renderer_manifest: dict | None,
     feature_pack: dict | None = None,
+    analysis_context: AnalysisContext | None = None,
 ) -> dict[str, Any]:
     """Build deterministic CSI v2 contract.
 
+    ``analysis_context`` is the optional shared index over the same payload.
+
     Backward compatibility fields are retained:
     - case_severity_index
     - duration_score, treatment_intensity_score, objective_finding_score
@@ -304,7 +302,7 @@ def build_case_severity_index(
         risk_adjusted = max(0.0, round(base_csi - penalty, 1))
 
         support_cids = set(sorted(d_cids | i_cids | o_cids))
-        support_page_refs = _resolve_page_refs(support_cids, eg)
+        support_page_refs = _resolve_page_refs(support_cids, AnalysisContext.ensure(analysis_context, eg))
 
         band = _band_for_csi(base_csi)
         profile = f"Profile: {o_label}; {i_label}; {d_label}."
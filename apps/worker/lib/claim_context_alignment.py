@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import hashlib
 import re
-from difflib import SequenceMatcher
+from functools import lru_cache
 from typing import Any
 
+from apps.worker.lib.fuzzy_match import get_similarity_engine
+
 
 _ALLOWED_PAGE_TYPES: dict[str, set[str]] = {
     "mechanism": {"clinical_note"},
@@ -386,12 +388,14 @@ def _result(
     }
 
 
-def _tokens(text: str) -> set[str]:
+@lru_cache(maxsize=4096)
+def _tokens(text: str) -> frozenset[str]:
+    # Cached: the same cited page text is tokenized once per claim citing it.
     toks = {t for t in re.findall(r"[a-z0-9]+", (text or "").lower()) if len(t) >= 2}
     out = {t for t in toks if t not in _STOPWORDS}
     if "mva" in out or "mvc" in out:
         out.update({"motor", "vehicle", "collision"})
-    return out
+    return frozenset(out)
 
 
 def _semantic_score(a: str, b: str) -> float:
@@ -402,7 +406,7 @@ def _semantic_score(a: str, b: str) -> float:
     ta = _tokens(aa)
     tb = _tokens(bb)
     jaccard = (len(ta & tb) / len(ta | tb)) if ta and tb else 0.0
-    seq = SequenceMatcher(None, aa[:400], bb[:800]).ratio()
+    seq = get_similarity_engine().ratio(aa[:400], bb[:800])
     containment_bonus = 0.2 if aa in bb or any(tok in bb for tok in ta if len(tok) >= 4) else 0.0
     return max(0.0, min(1.0, (0.55 * jaccard) + (0.45 * seq) + containment_bonus))
 
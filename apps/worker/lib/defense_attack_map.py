@@ -8,7 +8,7 @@ and a plaintiff_counter enriched with case-specific facts where available.
 No claim-row fragility scores required — fires on any packet.
 
 Public API:
-    build_defense_attack_map(evidence_graph_payload, renderer_manifest, feature_pack=None) -> dict
+    build_defense_attack_map(evidence_graph_payload, renderer_manifest, feature_pack=None, analysis_context=None) -> dict
 
 Returns DefenseAttackMap.v2 dict. Never raises.
 """
@@ -17,6 +17,8 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from apps.worker.lib.analysis_context import AnalysisContext
+
 logger = logging.getLogger(__name__)
 
 # ── Flag registry ─────────────────────────────────────────────────────────────
@@ -298,10 +300,11 @@ def _build_dam(
     eg: dict | None,
     rm: dict | None,
     feature_pack: dict | None,
+    analysis_context: AnalysisContext | None = None,
 ) -> dict[str, Any]:
     from apps.worker.lib.settlement_features import build_settlement_feature_pack
 
-    fp = feature_pack if isinstance(feature_pack, dict) else build_settlement_feature_pack(eg, rm)
+    fp = feature_pack if isinstance(feature_pack, dict) else build_settlement_feature_pack(eg, rm, analysis_context)
 
     flags: list[dict[str, Any]] = []
     flags_triggered = 0
@@ -341,6 +344,7 @@ def build_defense_attack_map(
     evidence_graph_payload: dict | None,
     renderer_manifest: dict | None,
     feature_pack: dict | None = None,
+    analysis_context: AnalysisContext | None = None,
 ) -> dict[str, Any]:
     """
     Build the Defense Attack Map v2.
@@ -354,6 +358,9 @@ def build_defense_attack_map(
     feature_pack
         Optional pre-extracted SettlementFeaturePack.v1 dict. If None, extracted
         from evidence_graph_payload and renderer_manifest.
+    analysis_context
+        Optional shared ``AnalysisContext``; only used when the feature pack has
+        to be extracted here.
 
     Returns
     -------
@@ -363,7 +370,7 @@ def build_defense_attack_map(
     try:
         eg = evidence_graph_payload if isinstance(evidence_graph_payload, dict) else None
         rm = renderer_manifest if isinstance(renderer_manifest, dict) else None
-        return _build_dam(eg, rm, feature_pack)
+        return _build_dam(eg, rm, feature_pack, analysis_context)
     except Exception as exc:
         logger.exception(f"DefenseAttackMap build failed: {exc}")
         return {
@@ -0,0 +1,75 @@
+"""
+Copy-on-write event views for pipeline branches.
+
+After dedup/scoring the pipeline forks the event list twice (chronology and
+export) and runs ``improve_legal_usability`` over each branch. Branches only
+ever *replace* an event's facts / citation ids / author fields or append to its
+flags and extensions — they never edit a base ``Fact``, ``EventDate``,
+``ImagingDetails`` or ``BillingDetails`` in place (derived facts are built via
+``_derive_fact``). So instead of ``model_copy(deep=True)`` a branch gets a view:
+
+  - a shallow ``Event`` copy that shares every nested model with the base
+  - fresh top-level containers (fact lists, flags, citation ids, page numbers,
+    extensions, coding) so list/dict edits stay branch-local
+
+``overlay_fields`` reports which top-level fields a view has changed relative to
+its base (the branch's overlay). Code that needs to edit a shared nested object
+in place calls ``materialize_event`` first, which deep-copies only that view.
+"""
+from __future__ import annotations
+
+import copy
+from typing import Any, Iterable
+
+from packages.shared.models import Event
+
+# Top-level list fields that branches append to or replace.
+_FACT_LIST_FIELDS = ("facts", "diagnoses", "medications", "procedures", "exam_findings", "treatment_plan")
+_LIST_FIELDS = _FACT_LIST_FIELDS + ("flags", "citation_ids", "source_page_numbers")
+# Nested models shared between base and view until materialized.
+_SHARED_FIELDS = ("date", "imaging", "billing")
+
+
+def fork_event(base: Event) -> Event:
+    """Return a copy-on-write view of ``base``; nested models are shared."""
+    update: dict[str, Any] = {name: list(getattr(base, name)) for name in _LIST_FIELDS}
+    update["extensions"] = dict(base.extensions)
+    update["coding"] = {k: list(v) for k, v in base.coding.items()}
+    return base.model_copy(update=update)
+
+
+def fork_events(events: Iterable[Event]) -> list[Event]:
+    """Fork a branch over ``events`` (replaces ``[e.model_copy(deep=True) ...]``)."""
+    return [fork_event(e) for e in events]
+
+
+def overlay_fields(base: Event, view: Event) -> dict[str, Any]:
+    """Top-level fields whose value in ``view`` differs from ``base``."""
+    changed: dict[str, Any] = {}
+    for name in type(base).model_fields:
+        ours, theirs = getattr(view, name), getattr(base, name)
+        if ours is theirs:
+            continue
+        if name in _SHARED_FIELDS or ours != theirs:
+            changed[name] = ours
+    return changed
+
+
+def shares_state(base: Event, view: Event) -> bool:
+    """True while ``view`` still references nested models owned by ``base``."""
+    if any(getattr(view, n) is not None and getattr(view, n) is getattr(base, n) for n in _SHARED_FIELDS):
+        return True
+    base_facts = {id(f) for name in _FACT_LIST_FIELDS for f in getattr(base, name)}
+    return any(id(f) in base_facts for name in _FACT_LIST_FIELDS for f in getattr(view, name))
+
+
+def materialize_event(view: Event) -> Event:
+    """Detach ``view`` from its base so nested models can be edited in place."""
+    for name in _SHARED_FIELDS:
+        value = getattr(view, name)
+        if value is not None:
+            setattr(view, name, value.model_copy(deep=True))
+    for name in _FACT_LIST_FIELDS:
+        setattr(view, name, [f.model_copy(deep=True) for f in getattr(view, name)])
+    view.extensions = copy.deepcopy(view.extensions)
+    return view
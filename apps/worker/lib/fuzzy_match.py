@@ -0,0 +1,174 @@
+"""
+Pluggable string-similarity engines for claim alignment and finding consolidation.
+
+Claim context alignment scores every promoted claim against the text of each
+cited page, and renderer-manifest consolidation compares promoted-finding labels
+pairwise within a semantic family. Both used a fresh ``difflib.SequenceMatcher``
+per comparison, which rebuilds the index of the (long) page text every time.
+
+Engines expose two calls:
+
+  - ``ratio(a, b)``: similarity in [0, 1]
+  - ``ratio_at_least(a, b, threshold)``: the threshold test, allowed to reject
+    early without computing the full score
+
+``SequenceRatioEngine`` (default, ``"sequence"``) returns exactly
+``SequenceMatcher(None, a, b).ratio()``. It keeps one matcher per ``b`` so the
+``b`` index is built once per distinct page text, memoizes pairs, and rejects
+threshold tests through the ``real_quick_ratio`` / ``quick_ratio`` upper bounds.
+
+``QGramEngine`` (``"qgram"``) is opt-in because its scores differ: both calls use
+the trigram Dice coefficient. ``ratio_at_least`` first rejects on the profile
+sizes alone, whose ratio bounds the coefficient, before counting shared q-grams.
+
+Select with ``CITELINE_SIMILARITY_ENGINE`` or pass a name to
+``get_similarity_engine``; ``register_similarity_engine`` adds new engines.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import Counter, OrderedDict
+from difflib import SequenceMatcher
+from typing import Callable, Protocol
+
+_DEFAULT_ENGINE = os.getenv("CITELINE_SIMILARITY_ENGINE", "sequence")
+_PAIR_CACHE_SIZE = 8192
+_MATCHER_CACHE_SIZE = 256
+
+
+class SimilarityEngine(Protocol):
+    name: str
+
+    def ratio(self, a: str, b: str) -> float: ...
+
+    def ratio_at_least(self, a: str, b: str, threshold: float) -> bool: ...
+
+
+class _LRU:
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.data: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is not None:
+            self.data.move_to_end(key)
+        return value
+
+    def put(self, key, value) -> None:
+        self.data[key] = value
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+
+class SequenceRatioEngine:
+    """Exact ``SequenceMatcher`` ratios with the ``b``-side index reused across calls."""
+
+    name = "sequence"
+
+    def __init__(self, *, pair_cache_size: int = _PAIR_CACHE_SIZE, matcher_cache_size: int = _MATCHER_CACHE_SIZE) -> None:
+        self._pairs = _LRU(pair_cache_size)
+        self._matchers = _LRU(matcher_cache_size)
+        self._lock = threading.Lock()
+
+    def _matcher(self, a: str, b: str) -> SequenceMatcher:
+        sm = self._matchers.get(b)
+        if sm is None:
+            sm = SequenceMatcher(None, "", b)
+            self._matchers.put(b, sm)
+        sm.set_seq1(a)
+        return sm
+
+    def ratio(self, a: str, b: str) -> float:
+        key = (a, b)
+        with self._lock:
+            cached = self._pairs.get(key)
+            if cached is None:
+                cached = self._matcher(a, b).ratio()
+                self._pairs.put(key, cached)
+        return cached
+
+    def ratio_at_least(self, a: str, b: str, threshold: float) -> bool:
+        with self._lock:
+            cached = self._pairs.get((a, b))
+            if cached is not None:
+                return cached >= threshold
+            sm = self._matcher(a, b)
+            if sm.real_quick_ratio() < threshold or sm.quick_ratio() < threshold:
+                return False
+            value = sm.ratio()
+            self._pairs.put((a, b), value)
+        return value >= threshold
+
+
+def _qgrams(s: str, q: int) -> Counter:
+    padded = f"{'#' * (q - 1)}{s}{'$' * (q - 1)}"
+    return Counter(padded[i : i + q] for i in range(len(padded) - q + 1))
+
+
+class QGramEngine:
+    """Trigram Dice similarity; the threshold test is the same score with a size-bound early exit."""
+
+    name = "qgram"
+
+    def __init__(self, q: int = 3, *, cache_size: int = _PAIR_CACHE_SIZE) -> None:
+        self.q = q
+        self._grams = _LRU(cache_size)
+        self._lock = threading.Lock()
+
+    def _profile(self, s: str) -> Counter:
+        with self._lock:
+            grams = self._grams.get(s)
+            if grams is None:
+                grams = _qgrams(s, self.q)
+                self._grams.put(s, grams)
+        return grams
+
+    def _shared(self, a: str, b: str) -> tuple[int, int, int]:
+        ga, gb = self._profile(a), self._profile(b)
+        if len(ga) > len(gb):
+            ga, gb = gb, ga
+        shared = sum(min(n, gb[g]) for g, n in ga.items() if g in gb)
+        return shared, sum(ga.values()), sum(gb.values())
+
+    def ratio(self, a: str, b: str) -> float:
+        if not a and not b:
+            return 1.0
+        if not a or not b:
+            return 0.0
+        shared, na, nb = self._shared(a, b)
+        return 2.0 * shared / (na + nb)
+
+    def ratio_at_least(self, a: str, b: str, threshold: float) -> bool:
+        """``ratio(a, b) >= threshold``, rejecting on profile sizes before counting shared q-grams."""
+        if not a or not b:
+            return self.ratio(a, b) >= threshold
+        # A string of n characters has n + q - 1 padded q-grams; shared <= the smaller count.
+        na, nb = len(a) + self.q - 1, len(b) + self.q - 1
+        if 2.0 * min(na, nb) / (na + nb) < threshold:
+            return False
+        return self.ratio(a, b) >= threshold
+
+
+_ENGINE_FACTORIES: dict[str, Callable[[], SimilarityEngine]] = {
+    "sequence": SequenceRatioEngine,
+    "qgram": QGramEngine,
+}
+_ENGINES: dict[str, SimilarityEngine] = {}
+
+
+def register_similarity_engine(name: str, factory: Callable[[], SimilarityEngine]) -> None:
+    _ENGINE_FACTORIES[name] = factory
+    _ENGINES.pop(name, None)
+
+
+def get_similarity_engine(name: str | None = None) -> SimilarityEngine:
+    """Process-wide engine instance; unknown names fall back to ``"sequence"``."""
+    key = (name or _DEFAULT_ENGINE or "sequence").strip().lower()
+    if key not in _ENGINE_FACTORIES:
+        key = "sequence"
+    engine = _ENGINES.get(key)
+    if engine is None:
+        engine = _ENGINES[key] = _ENGINE_FACTORIES[key]()
+    return engine
@@ -0,0 +1,151 @@
+"""
+Serialize-once snapshots of pipeline models for read-only consumers.
+
+The post-extraction analyzers (claim context alignment, settlement leverage,
+feature pack, defense attack map, severity index, demand package, export
+rendering) each take ``evidence_graph.model_dump(mode="json")`` and
+``renderer_manifest.model_dump(mode="json")``. Every dump re-serializes every
+page's text and every citation. ``ModelSnapshot`` serializes each top-level field
+once and reuses the result until that field changes:
+
+  - non-extension fields are re-dumped when the attribute is reassigned
+    (identity check) or after an explicit ``invalidate(field)``
+  - ``extensions`` is tracked per key: reassigning ``extensions[key]`` re-dumps
+    only that key; in-place edits of an existing value need ``invalidate("extensions", key)``
+
+``view()`` returns a deep read-only payload (``FrozenDict`` / ``FrozenList``,
+still ``dict`` / ``list`` subclasses so ``isinstance`` checks and ``json.dumps``
+behave as before). ``copy.deepcopy`` of a view yields plain mutable containers;
+``mutable_copy()`` thaws only the top levels for consumers that add keys.
+"""
+from __future__ import annotations
+
+import copy
+import threading
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is a read-only snapshot view")
+
+
+class FrozenDict(dict):
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return thaw(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return thaw(self)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return value
+
+
+class ModelSnapshot:
+    """Cached JSON-mode dump of a pydantic model, handed out as a read-only view."""
+
+    def __init__(self, model: BaseModel, *, tracked: str | None = "extensions") -> None:
+        self.model = model
+        self._tracked = tracked if tracked in type(model).model_fields else None
+        # field / tracked key -> (source object, frozen dump); compared by identity
+        self._fields: dict[str, tuple[Any, Any]] = {}
+        self._tracked_keys: dict[Any, tuple[Any, Any]] = {}
+        self.dumps = 0
+        self._lock = threading.RLock()  # analyzer stages may take views concurrently
+
+    def invalidate(self, field: str | None = None, key: Any = None) -> None:
+        """Drop cached serialization for ``field`` (or one tracked key), or everything."""
+        with self._lock:
+            self._invalidate(field, key)
+
+    def _invalidate(self, field: str | None, key: Any) -> None:
+        if field is None:
+            self._fields.clear()
+            self._tracked_keys.clear()
+        elif field == self._tracked:
+            if key is None:
+                self._tracked_keys.clear()
+            else:
+                self._tracked_keys.pop(key, None)
+        else:
+            self._fields.pop(field, None)
+
+    def _field(self, name: str) -> Any:
+        value = getattr(self.model, name)
+        cached = self._fields.get(name)
+        if cached is None or cached[0] is not value:
+            self.dumps += 1
+            cached = (value, freeze(self.model.model_dump(mode="json", include={name}).get(name)))
+            self._fields[name] = cached
+        return cached[1]
+
+    def _tracked_field(self) -> FrozenDict:
+        current = getattr(self.model, self._tracked) or {}
+        for key in [k for k in self._tracked_keys if k not in current]:
+            del self._tracked_keys[key]
+        out = {}
+        for key, value in current.items():
+            cached = self._tracked_keys.get(key)
+            if cached is None or cached[0] is not value:
+                self.dumps += 1
+                cached = (value, freeze(to_jsonable_python(value)))
+                self._tracked_keys[key] = cached
+            out[key] = cached[1]
+        return FrozenDict(out)
+
+    def view(self) -> FrozenDict:
+        """Read-only ``model_dump(mode="json")`` equivalent, re-serializing only what changed."""
+        with self._lock:
+            return FrozenDict(
+                (name, self._tracked_field() if name == self._tracked else self._field(name))
+                for name in type(self.model).model_fields
+            )
+
+    def mutable_copy(self, *keys: str) -> dict[str, Any]:
+        """Shallow plain-dict copy of the view; ``keys`` are also thawed one level down."""
+        out = dict(self.view())
+        for key in keys:
+            if isinstance(out.get(key), dict):
+                out[key] = dict(out[key])
+        return out
+
+    def thaw(self) -> dict[str, Any]:
+        """Fully mutable copy (no re-serialization, just container copies)."""
+        return copy.deepcopy(self.view())
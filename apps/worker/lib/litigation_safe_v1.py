@@ -4,6 +4,7 @@ import re
 from datetime import date
 from typing import Any, cast
 
+from apps.worker.lib.temporal_index import TemporalIndex
 from packages.shared.models import Event, Gap
 
 _REASON_MESSAGES = {
@@ -39,14 +40,24 @@ def validateLitigationSafeV1(snapshot: dict | None, events: list[Event] | list[d
     return validate_litigation_safe_v1(snapshot, events, extractionContext)
 
 
-def validate_litigation_safe_v1(snapshot: dict | None, events: list[Event] | list[dict] | None, extractionContext: dict | None) -> dict[str, Any]:
+def validate_litigation_safe_v1(
+    snapshot: dict | None,
+    events: list[Event] | list[dict] | None,
+    extractionContext: dict | None,
+    *,
+    temporal_index: TemporalIndex | None = None,
+) -> dict[str, Any]:
+    """``temporal_index``, when given, must index ``events``; the treatment-gap check then reads its day buckets."""
     snapshot = snapshot if isinstance(snapshot, dict) else {}
     ctx = extractionContext if isinstance(extractionContext, dict) else {}
     evs = list(events or [])
     failures: list[dict[str, Any]] = []
     failure_codes: set[str] = set()
 
-    computed_gap = _compute_max_gap_days(evs)
+    if temporal_index is not None:
+        computed_gap = temporal_index.max_gap_days(include=_is_gap_treatment_event)
+    else:
+        computed_gap = _compute_max_gap_days(evs)
     reported_gap = _max_reported_gap_days(ctx)
     gap_inconsistent = reported_gap is not None and reported_gap != computed_gap
 
@@ -302,18 +313,23 @@ def _has_missing_required_procedure_date(events: list[Event] | list[dict]) -> bo
     return False
 
 
+_NON_TREATMENT_TYPES = {"billing_event", "administrative", "referenced_prior_event", "other_event"}
+
+
+def _is_gap_treatment_event(event: Event | dict) -> bool:
+    if _event_type_value(event).lower() in _NON_TREATMENT_TYPES:
+        return False
+    s, _e = _event_dates(event)
+    return s is not None and s.year > 1900
+
+
 def _treatment_events_for_gap(events: list[Event] | list[dict]) -> list[tuple[date, str]]:
     rows: list[tuple[date, str]] = []
     for ev in events:
-        et = _event_type_value(ev).lower()
-        if et in {"billing_event", "administrative", "referenced_prior_event", "other_event"}:
+        if not _is_gap_treatment_event(ev):
             continue
         s, _e = _event_dates(ev)
-        if s is None:
-            continue
-        if s.year <= 1900:
-            continue
-        rows.append((s, et))
+        rows.append((s, _event_type_value(ev).lower()))
     rows.sort(key=lambda x: x[0])
     return rows
 
@@ -9,6 +9,7 @@ from typing import Any
 
 from apps.worker.lib.compact_packet_policy import is_compact_packet
 from apps.worker.lib.noise_filter import is_noise_span
+from apps.worker.lib.rule_engine import Rule, RuleSet
 from packages.shared.utils.noise_utils import has_narrative_sentence, is_flowsheet_noise
 from packages.shared.utils.scoring_utils import bucket_for_required_coverage as _bucket_for_required_coverage
 from packages.shared.utils.scoring_utils import is_ed_event
@@ -64,6 +65,72 @@ BUCKET_SIGNALS = {
     "ORTHO": re.compile(r"\b(ortho|orthopedic|orthopaedic)\b.*\b(assessment|plan|impression)\b", re.IGNORECASE),
     "PROCEDURE": re.compile(r"\b(depo-?medrol|lidocaine|fluoroscopy|interlaminar|transforaminal|epidural)\b", re.IGNORECASE),
 }
+# Each rule set below is scanned once per text; the per-rule regexes above stay the source of truth.
+_ROW_FACT_RULES = RuleSet(
+    "luqa.row_facts",
+    [
+        Rule.of("pain", PAIN_RE),
+        Rule.of("rom", ROM_RE),
+        Rule.of("strength", STRENGTH_RE),
+        Rule.of("vitals", VITALS_RE),
+        Rule.of("med", MED_RE),
+        Rule.of("dosage", DOSAGE_RE),
+        Rule.of("level", LEVEL_RE),
+        Rule.of("dx", DX_RE),
+        Rule.of("encounter", ENCOUNTER_RE),
+        Rule.of("functional", _FUNCTIONAL_RE),
+        Rule.of("imaging", _IMAGING_SIGNAL_RE),
+        Rule.of("tier1", TIER1_RE),
+        Rule.of("mechanism", MECHANISM_RE),
+        Rule.of("placeholder", PLACEHOLDER_RE),
+    ],
+)
+_FACT_CATEGORIES: tuple[tuple[str, ...], ...] = (
+    ("pain",),
+    ("rom",),
+    ("strength",),
+    ("vitals",),
+    ("med", "dosage"),
+    ("level",),
+    ("dx",),
+    ("encounter",),
+    ("functional",),
+    ("imaging",),
+)
+_SOURCE_BUCKET_RULES = RuleSet("luqa.source_buckets", [Rule.of(b, rex) for b, rex in BUCKET_SIGNALS.items()])
+# Matched against lowercased "event type + facts" blobs.
+_BLOB_BUCKET_RULES = RuleSet(
+    "luqa.blob_buckets",
+    [
+        Rule("MRI", r"\b(mri|impression|imaging)\b"),
+        Rule("PT_EVAL", r"\b(therapy visit|pt eval|physical therapy)\b"),
+        Rule("ORTHO", r"\b(ortho|orthopedic|orthopaedic)\b"),
+        Rule("PROCEDURE", r"\b(procedure|injection|fluoroscopy|depo-medrol|lidocaine)\b"),
+        # Projection rows also count epidurals as procedures.
+        Rule("PROCEDURE_EPIDURAL", r"\bepidural\b"),
+    ],
+)
+_TIMELINE_TEXT_RULES = RuleSet(
+    "luqa.timeline_text",
+    [
+        Rule.of("meta_language", META_RE),
+        Rule.of("control_character_artifact", CONTROL_CHAR_RE),
+        Rule("double_period_after_quoted_snippet", r'"\s*[^"]*?\."\.'),
+        Rule("truncated_fragment_suffix", r"\b(?:includ|assessm|therap|diagnos|manageme)\b[\".]?\s*$", re.IGNORECASE | re.MULTILINE),
+    ],
+)
+_TOP10_TEXT_RULES = RuleSet(
+    "luqa.top10_text",
+    [
+        Rule.of("control_character_artifact", CONTROL_CHAR_RE),
+        Rule("orphan_conjunction_ending", r"\b(?:and|or|with|to)\.\s*$", re.IGNORECASE | re.MULTILINE),
+        Rule("undated_top10_item", r"(?im)^\s*[•\u2022\x7f]\s*date not documented\b"),
+    ],
+)
+_APPENDIX_B_TEXT_RULES = RuleSet(
+    "luqa.appendix_b_text",
+    [Rule("dx_appendix_contains_discharge_summary_text", r"\bdischarge summary\b", re.IGNORECASE)],
+)
 STOPWORDS = {
     "the",
     "and",
@@ -237,29 +304,10 @@ def _non_stopword_token_count(text: str) -> int:
     return sum(1 for t in tokens if t not in STOPWORDS)
 
 
-def _fact_category_count(text: str) -> int:
-    categories = 0
-    if PAIN_RE.search(text):
-        categories += 1
-    if ROM_RE.search(text):
-        categories += 1
-    if STRENGTH_RE.search(text):
-        categories += 1
-    if VITALS_RE.search(text):
-        categories += 1
-    if MED_RE.search(text) and DOSAGE_RE.search(text):
-        categories += 1
-    if LEVEL_RE.search(text):
-        categories += 1
-    if DX_RE.search(text):
-        categories += 1
-    if ENCOUNTER_RE.search(text):
-        categories += 1
-    if _FUNCTIONAL_RE.search(text):
-        categories += 1
-    if _IMAGING_SIGNAL_RE.search(text):
-        categories += 1
-    return categories
+def _fact_category_count(text: str, hits: set[str] | None = None) -> int:
+    if hits is None:
+        hits = _ROW_FACT_RULES.matched(text)
+    return sum(1 for names in _FACT_CATEGORIES if all(n in hits for n in names))
 
 
 def _parse_header_timeframe(report_text: str) -> tuple[date | None, date | None]:
@@ -312,9 +360,9 @@ def _source_bucket_presence(page_text_by_number: dict[int, str]) -> set[str]:
     for txt in (page_text_by_number or {}).values():
         if not txt:
             continue
-        for bucket, rex in BUCKET_SIGNALS.items():
-            if rex.search(txt):
-                present.add(bucket)
+        present |= _SOURCE_BUCKET_RULES.matched(txt)
+        if len(present) == len(BUCKET_SIGNALS):
+            break
     return present
 
 
@@ -328,14 +376,7 @@ def _timeline_bucket_presence(rows: list[TimelineRow]) -> set[str]:
             provider_blob=row.provider,
         ):
             present.add("ED")
-        if re.search(r"\b(mri|impression|imaging)\b", blob):
-            present.add("MRI")
-        if re.search(r"\b(therapy visit|pt eval|physical therapy)\b", blob):
-            present.add("PT_EVAL")
-        if re.search(r"\b(ortho|orthopedic|orthopaedic)\b", blob):
-            present.add("ORTHO")
-        if re.search(r"\b(procedure|injection|fluoroscopy|depo-medrol|lidocaine)\b", blob):
-            present.add("PROCEDURE")
+        present |= _BLOB_BUCKET_RULES.matched(blob) - {"PROCEDURE_EPIDURAL"}
     return present
 
 
@@ -366,14 +407,10 @@ def _projection_bucket_presence(entries: list[Any]) -> set[str]:
             provider_blob=str(getattr(e, "provider_display", "") or ""),
         ):
             present.add("ED")
-        if re.search(r"\b(mri|impression|imaging)\b", blob):
-            present.add("MRI")
-        if re.search(r"\b(therapy visit|pt eval|physical therapy)\b", blob):
-            present.add("PT_EVAL")
-        if re.search(r"\b(ortho|orthopedic|orthopaedic)\b", blob):
-            present.add("ORTHO")
-        if re.search(r"\b(procedure|injection|fluoroscopy|depo-medrol|lidocaine|epidural)\b", blob):
-            present.add("PROCEDURE")
+        hits = _BLOB_BUCKET_RULES.matched(blob)
+        if "PROCEDURE_EPIDURAL" in hits:
+            hits = (hits - {"PROCEDURE_EPIDURAL"}) | {"PROCEDURE"}
+        present |= hits
     return present
 
 
@@ -433,7 +470,9 @@ def build_luqa_report(report_text: str, ctx: dict[str, Any]) -> dict[str, Any]:
     penalties = 0.0
     hard_fail = False
 
-    meta_matches = list(META_RE.finditer(timeline_text))
+    timeline_hits = _TIMELINE_TEXT_RULES.collect(timeline_text)
+    top10_hits = _TOP10_TEXT_RULES.matched(top10_text)
+    meta_matches = timeline_hits["meta_language"]
     meta_hits = len(meta_matches)
     if meta_hits > 0:
         hard_fail = True
@@ -448,18 +487,15 @@ def build_luqa_report(report_text: str, ctx: dict[str, Any]) -> dict[str, Any]:
         penalties += 20
 
     render_quality_defects: list[str] = []
-    if CONTROL_CHAR_RE.search(timeline_text) or CONTROL_CHAR_RE.search(top10_text):
+    if timeline_hits["control_character_artifact"] or "control_character_artifact" in top10_hits:
         render_quality_defects.append("control_character_artifact")
-    if re.search(r'"\s*[^"]*?\."\.', timeline_text):
-        render_quality_defects.append("double_period_after_quoted_snippet")
-    if re.search(r"\b(?:includ|assessm|therap|diagnos|manageme)\b[\".]?\s*$", timeline_text, re.IGNORECASE | re.MULTILINE):
-        render_quality_defects.append("truncated_fragment_suffix")
-    if re.search(r"\b(?:and|or|with|to)\.\s*$", top10_text, re.IGNORECASE | re.MULTILINE):
-        render_quality_defects.append("orphan_conjunction_ending")
-    if re.search(r"(?im)^\s*[•\u2022\x7f]\s*date not documented\b", top10_text):
-        render_quality_defects.append("undated_top10_item")
-    if re.search(r"\bdischarge summary\b", appendix_b_text, re.IGNORECASE):
-        render_quality_defects.append("dx_appendix_contains_discharge_summary_text")
+    for defect in ("double_period_after_quoted_snippet", "truncated_fragment_suffix"):
+        if timeline_hits[defect]:
+            render_quality_defects.append(defect)
+    for defect in ("orphan_conjunction_ending", "undated_top10_item"):
+        if defect in top10_hits:
+            render_quality_defects.append(defect)
+    render_quality_defects.extend(_APPENDIX_B_TEXT_RULES.matched(appendix_b_text))
     if not used_projection_fallback:
         for row in rows:
             if "orthopedic" in (row.event_type or "").lower():
@@ -491,10 +527,11 @@ def build_luqa_report(report_text: str, ctx: dict[str, Any]) -> dict[str, Any]:
     for row in score_rows:
         facts_text = " ".join(row.fact_lines)
         tokens = _non_stopword_token_count(facts_text)
-        categories = _fact_category_count(facts_text)
-        tier1_hit = bool(TIER1_RE.search(facts_text) or MECHANISM_RE.search(facts_text))
+        fact_hits = _ROW_FACT_RULES.matched(facts_text)
+        categories = _fact_category_count(facts_text, fact_hits)
+        tier1_hit = "tier1" in fact_hits or "mechanism" in fact_hits
         
-        is_placeholder_text = bool(PLACEHOLDER_RE.search(facts_text))
+        is_placeholder_text = "placeholder" in fact_hits
         is_low_signal = tokens < 8 and categories == 0 and not tier1_hit
         if is_placeholder_text or is_low_signal:
             placeholders += 1
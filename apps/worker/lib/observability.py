@@ -13,6 +13,7 @@ from __future__ import annotations
 import contextlib
 import json
 import logging
+import threading
 import time
 from enum import Enum
 from typing import Any
@@ -64,6 +65,7 @@ class _StageTimings:
     """Accumulates per-stage elapsed times across a pipeline run."""
     def __init__(self) -> None:
         self._times: dict[str, float] = {}
+        self._lock = threading.Lock()  # concurrent analyzer stages record from pool threads
 
     @contextlib.contextmanager
     def timer(self, stage: str, run_id: str = "", **meta: Any):
@@ -73,7 +75,8 @@ class _StageTimings:
             yield
         finally:
             elapsed_ms = int((time.monotonic() - t0) * 1000)
-            self._times[stage] = elapsed_ms
+            with self._lock:
+                self._times[stage] = elapsed_ms
             logger.info(
                 json.dumps({
                     "run_id": run_id,
@@ -85,7 +88,8 @@ class _StageTimings:
             )
 
     def as_dict(self) -> dict[str, float]:
-        return dict(self._times)
+        with self._lock:
+            return dict(self._times)
 
 
 def make_stage_timings() -> _StageTimings:
@@ -13,6 +13,7 @@ import re
 from datetime import date
 from typing import Optional
 
+from apps.worker.lib.temporal_index import TemporalIndex
 from packages.shared.models import (
     EvidenceGraph,
     EventDate,
@@ -164,24 +165,41 @@ def normalize_provider_entities(
 
 def compute_coverage_spans(
     providers_normalized: list[dict],
+    temporal_index: Optional[TemporalIndex] = None,
 ) -> list[dict]:
     """
     Compute coverage spans per normalized provider entity.
     
     A coverage span is the observed date range for a provider:
-    [first_seen_date, last_seen_date].
+    [first_seen_date, last_seen_date]. With ``temporal_index`` (the run's
+    shared index) the range is read from the indexed events of the entity's
+    source providers instead, so placeholder dates are skipped and date
+    ranges count through their end.
     
     Returns list of dicts for extensions.coverage_spans.
     """
     spans = []
     for entity in providers_normalized:
-        if entity.get("first_seen_date") and entity.get("last_seen_date"):
-            spans.append({
-                "provider_name": entity["display_name"],
-                "normalized_name": entity["normalized_name"],
-                "provider_type": entity["provider_type"],
-                "start_date": entity["first_seen_date"],
-                "end_date": entity["last_seen_date"],
-                "event_count": entity["event_count"],
-            })
+        if temporal_index is not None:
+            covered = [
+                span for span in (
+                    temporal_index.coverage(provider_id=pid) for pid in entity.get("source_provider_ids") or []
+                ) if span
+            ]
+            if not covered:
+                continue
+            start_date = min(s for s, _ in covered).isoformat()
+            end_date = max(e for _, e in covered).isoformat()
+        elif entity.get("first_seen_date") and entity.get("last_seen_date"):
+            start_date, end_date = entity["first_seen_date"], entity["last_seen_date"]
+        else:
+            continue
+        spans.append({
+            "provider_name": entity["display_name"],
+            "normalized_name": entity["normalized_name"],
+            "provider_type": entity["provider_type"],
+            "start_date": start_date,
+            "end_date": end_date,
+            "event_count": entity["event_count"],
+        })
     return spans
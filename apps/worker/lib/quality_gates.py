@@ -15,6 +15,7 @@ from pathlib import Path
 from typing import Any
 
 from apps.worker.lib.compact_packet_policy import is_compact_packet
+from apps.worker.lib.rule_engine import Rule, RuleSet, rule_timings
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,19 @@ _ATTORNEY_PLACEHOLDER_PATTERNS: list[tuple[str, str]] = [
     ("DATE_NOT_DOCUMENTED", r"\bDate not documented\b"),
     ("UNDATED", r"\bUndated\b"),
 ]
+_PT_VERIFIED_RULE = "PT_VERIFIED_COUNT"
+_PT_REPORTED_RULE = "PT_REPORTED_COUNT"
+_TOP10_CITATION_RULE = "TOP10_CITATION"
+# Every text rule of the attorney-facing gates, scanned in one pass per report.
+_REPORT_RULES = RuleSet(
+    "quality_gates.report",
+    [
+        *(Rule(code, pattern, re.IGNORECASE) for code, pattern in _ATTORNEY_PLACEHOLDER_PATTERNS),
+        Rule(_PT_VERIFIED_RULE, r"PT visits\s*\(Verified\)\s*:\s*(\d+)\s+encounters", re.IGNORECASE),
+        Rule(_PT_REPORTED_RULE, r"PT visits\s*\(Reported(?: in records)?\)\s*:\s*(\d+)\s*(?:encounters?)?", re.IGNORECASE),
+        Rule(_TOP10_CITATION_RULE, r"(\[p\.\s*\d+\]|Citation\(s\):)", re.IGNORECASE),
+    ],
+)
 
 # Canonical hard/soft policy for litigation-safe v1 expression.
 _HARD_FAILURE_CODES: set[str] = {
@@ -102,11 +116,18 @@ def _attorney_facing_text(report_text: str) -> str:
     return text
 
 
-def _placeholder_leak_findings(report_text: str) -> list[dict[str, Any]]:
-    text = _attorney_facing_text(report_text)
+def _report_rule_hits(report_text: str) -> dict[str, list[re.Match[str]]]:
+    return _REPORT_RULES.collect(_attorney_facing_text(report_text))
+
+
+def _placeholder_leak_findings(
+    report_text: str,
+    hits: dict[str, list[re.Match[str]]] | None = None,
+) -> list[dict[str, Any]]:
+    hits = hits if hits is not None else _report_rule_hits(report_text)
     findings: list[dict[str, Any]] = []
-    for code, pattern in _ATTORNEY_PLACEHOLDER_PATTERNS:
-        if not re.search(pattern, text, re.IGNORECASE):
+    for code, _pattern in _ATTORNEY_PLACEHOLDER_PATTERNS:
+        if not hits[code]:
             continue
         findings.append({
             "source": "placeholder_scan",
@@ -116,17 +137,13 @@ def _placeholder_leak_findings(report_text: str) -> list[dict[str, Any]]:
     return findings
 
 
-def _pt_count_consistency_findings(report_text: str) -> tuple[list[dict[str, Any]], dict[str, Any]]:
-    text = _attorney_facing_text(report_text)
-    verified = [int(x) for x in re.findall(r"PT visits\s*\(Verified\)\s*:\s*(\d+)\s+encounters", text, re.I)]
-    reported = [
-        int(x)
-        for x in re.findall(
-            r"PT visits\s*\(Reported(?: in records)?\)\s*:\s*(\d+)\s*(?:encounters?)?",
-            text,
-            re.I,
-        )
-    ]
+def _pt_count_consistency_findings(
+    report_text: str,
+    hits: dict[str, list[re.Match[str]]] | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    hits = hits if hits is not None else _report_rule_hits(report_text)
+    verified = [int(m.group(1)) for m in hits[_PT_VERIFIED_RULE]]
+    reported = [int(m.group(1)) for m in hits[_PT_REPORTED_RULE]]
     findings: list[dict[str, Any]] = []
     max_verified = max(verified) if verified else 0
     max_reported = max(reported) if reported else 0
@@ -198,8 +215,12 @@ def _projection_citation_integrity_findings(projection_entries: list[Any] | None
     return findings, telemetry
 
 
-def _top10_citation_integrity_findings(report_text: str) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+def _top10_citation_integrity_findings(
+    report_text: str,
+    hits: dict[str, list[re.Match[str]]] | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
     text = _attorney_facing_text(report_text)
+    hits = hits if hits is not None else _REPORT_RULES.collect(text)
     low = text.lower()
     start = low.find("top 10 case-driving events")
     if start < 0:
@@ -212,9 +233,19 @@ def _top10_citation_integrity_findings(report_text: str) -> tuple[list[dict[str,
     ]
     end_candidates = [i for i in end_candidates if i > start]
     end = min(end_candidates) if end_candidates else len(text)
-    block = text[start:end]
-    bullets = [ln.strip() for ln in block.splitlines() if ln.strip().startswith("-")]
-    uncited = [b for b in bullets if not re.search(r"(\[p\.\s*\d+\]|Citation\(s\):)", b, re.I)]
+    # A bullet is cited when a citation match from the report scan lies wholly on its line.
+    citations = [(m.start(), m.end()) for m in hits[_TOP10_CITATION_RULE] if start <= m.start() < end]
+    bullets: list[str] = []
+    uncited: list[str] = []
+    line_start = start
+    for raw in text[start:end].splitlines(keepends=True):
+        line_end = line_start + len(raw.rstrip("\r\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"))
+        line = raw.strip()
+        if line.startswith("-"):
+            bullets.append(line)
+            if not any(line_start <= s and e <= line_end for s, e in citations):
+                uncited.append(line)
+        line_start += len(raw)
     findings = [
         {
             "source": "export_citation_integrity",
@@ -254,9 +285,31 @@ def run_quality_gates(
             "litigation_pass": bool,
             "litigation_score": int,
             "failures": list[dict],
-            "gate_report": {...}  # detailed gate results
+            "gate_report": {...}  # detailed gate results, incl. per-rule timings under "rule_engine"
         }
     """
+    with rule_timings() as timings:
+        results = _run_quality_gates(
+            report_text,
+            page_text_by_number,
+            projection_entries,
+            gate_rule_hits=_report_rule_hits(report_text),
+            quality_mode=quality_mode,
+            visit_bucket_quality=visit_bucket_quality,
+        )
+    results["gate_report"]["rule_engine"] = {name: t.as_dict() for name, t in sorted(timings.items())}
+    return results
+
+
+def _run_quality_gates(
+    report_text: str,
+    page_text_by_number: dict[int, str],
+    projection_entries: list[Any] | None,
+    *,
+    gate_rule_hits: dict[str, list[re.Match[str]]],
+    quality_mode: str,
+    visit_bucket_quality: dict[str, Any] | None,
+) -> dict[str, Any]:
     from apps.worker.lib.attorney_readiness import build_attorney_readiness_report
     from apps.worker.lib.luqa import build_luqa_report
     
@@ -311,7 +364,7 @@ def run_quality_gates(
     
     # Note: Litigation checklist requires source PDF and more context
     # For now, we'll skip it in the quick wrapper but could be added
-    placeholder_findings = _placeholder_leak_findings(report_text)
+    placeholder_findings = _placeholder_leak_findings(report_text, gate_rule_hits)
     if placeholder_findings:
         results["failures"].extend(placeholder_findings)
         results["gate_report"]["placeholder_scan"] = {
@@ -321,7 +374,7 @@ def run_quality_gates(
     else:
         results["gate_report"]["placeholder_scan"] = {"pass": True, "failures": []}
 
-    pt_findings, pt_telemetry = _pt_count_consistency_findings(report_text)
+    pt_findings, pt_telemetry = _pt_count_consistency_findings(report_text, gate_rule_hits)
     if pt_findings:
         results["failures"].extend(pt_findings)
         results["gate_report"]["pt_count_consistency"] = {
@@ -337,7 +390,7 @@ def run_quality_gates(
         }
 
     projection_cite_findings, projection_cite_telemetry = _projection_citation_integrity_findings(projection_entries)
-    top10_cite_findings, top10_cite_telemetry = _top10_citation_integrity_findings(report_text)
+    top10_cite_findings, top10_cite_telemetry = _top10_citation_integrity_findings(report_text, gate_rule_hits)
     export_citation_findings = projection_cite_findings + top10_cite_findings
     if export_citation_findings:
         results["failures"].extend(export_citation_findings)
@@ -455,6 +508,7 @@ def write_fail_cover_pdf(
     from reportlab.lib.pagesizes import letter
     from reportlab.pdfgen import canvas
     from pypdf import PdfReader, PdfWriter
+    from packages.shared.storage import replace_artifact_file
     
     hard_failures = list(gate_results.get("hard_failures") or [])
     soft_failures = list(gate_results.get("soft_failures") or [])
@@ -509,8 +563,10 @@ def write_fail_cover_pdf(
         writer = PdfWriter()
         writer.append(PdfReader(cover_buf))
         writer.append(PdfReader(str(out_pdf_path)))
-        with open(out_pdf_path, "wb") as f:
-            writer.write(f)
+        out_buf = io.BytesIO()
+        writer.write(out_buf)
+        # Replace, never rewrite in place: the PDF may share a blob with its export aliases.
+        replace_artifact_file(out_pdf_path, out_buf.getvalue())
         logger.info(f"Written fail cover page to {out_pdf_path}")
         return True
     except Exception as e:
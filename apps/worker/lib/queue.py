@@ -19,6 +19,7 @@ from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 
 from packages.db.models import Artifact, Run, utcnow
+from packages.db.run_dispatch import notify_run_enqueued, record_claim
 
 logger = logging.getLogger(__name__)
 
@@ -137,6 +138,7 @@ def enqueue_run(
             existing.worker_id = None
             existing.error_message = None
             db.flush()
+            notify_run_enqueued(db, existing.id)
             logger.info(
                 "enqueue_run: re-queued failed run run_id=%s attempt=%d",
                 existing.id, existing.attempt,
@@ -150,6 +152,7 @@ def enqueue_run(
             existing.lock_expires_at = None
             existing.worker_id = None
             db.flush()
+            notify_run_enqueued(db, existing.id)
             return existing.id, False
 
     # New run — update the row that was pre-inserted by the caller, or insert here.
@@ -162,6 +165,7 @@ def enqueue_run(
     row.status = STATUS_QUEUED
     row.attempt = 1
     db.flush()
+    notify_run_enqueued(db, run_id)
     logger.info("enqueue_run: new run queued run_id=%s", run_id)
     return run_id, True
 
@@ -211,6 +215,8 @@ def claim_next_run(
     run.started_at = utcnow()
     run.claimed_at = utcnow()
     db.flush()
+    if run.attempt <= 1:
+        record_claim(run.id, run.created_at, run.claimed_at)
     logger.info("claim_next_run: claimed run_id=%s worker=%s", run.id, wid)
     return run
 
@@ -347,4 +353,6 @@ def requeue_expired_leases(
             requeued += 1
             logger.info("requeue_expired_leases: requeued run_id=%s new_attempt=%d", run.id, run.attempt)
     db.flush()
+    if requeued:
+        notify_run_enqueued(db, "requeue")
     return requeued
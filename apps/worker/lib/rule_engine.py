@@ -0,0 +1,175 @@
+"""
+Multi-pattern rule engine for the quality gates (LUQA, attorney readiness, export checks).
+
+Gates declare their regexes up front as ``Rule`` objects grouped in a ``RuleSet``.
+The set compiles them into one scanner: a leading lookahead ``(?=p0|p1|...)``
+lets the regex engine skip straight to positions where some rule can match, and
+one optional lookahead group per rule then reports every rule matching there.
+One walk over the text therefore yields exactly what each rule's own
+``finditer``/``search`` would have found. Overlapping rules ("disc" and
+"disc spaces") never shadow each other the way a plain alternation would.
+
+Scan time, per-rule match counts and handler time are recorded into the
+collector opened by ``rule_timings()``, so gate cost stays visible as rules grow.
+"""
+from __future__ import annotations
+
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+_SCOPED_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+_LEADING_FLAGS_RE = re.compile(r"^\(\?([imsx]+)\)")
+_FLAG_BY_LETTER = {letter: flag for flag, letter in _SCOPED_FLAGS}
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One named pattern. It is embedded in the combined scanner, so it must not use numbered backreferences."""
+
+    name: str
+    pattern: str
+    flags: int = 0
+
+    @classmethod
+    def of(cls, name: str, regex: re.Pattern[str]) -> "Rule":
+        return cls(name, regex.pattern, regex.flags)
+
+
+@dataclass
+class RuleTiming:
+    matches: int = 0
+    handler_seconds: float = 0.0
+
+
+@dataclass
+class RuleSetTiming:
+    scans: int = 0
+    scan_seconds: float = 0.0
+    rules: dict[str, RuleTiming] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "scans": self.scans,
+            "scan_ms": round(self.scan_seconds * 1000, 3),
+            "rules": {
+                name: {"matches": t.matches, "handler_ms": round(t.handler_seconds * 1000, 3)}
+                for name, t in sorted(self.rules.items())
+            },
+        }
+
+
+_timings: ContextVar[dict[str, RuleSetTiming] | None] = ContextVar("rule_engine_timings", default=None)
+
+
+@contextmanager
+def rule_timings() -> Iterator[dict[str, RuleSetTiming]]:
+    """Collect timings of every RuleSet scan in this context, keyed by rule set name."""
+    collected: dict[str, RuleSetTiming] = {}
+    token = _timings.set(collected)
+    try:
+        yield collected
+    finally:
+        _timings.reset(token)
+
+
+def _scoped(pattern: str, flags: int) -> str:
+    m = _LEADING_FLAGS_RE.match(pattern)
+    if m:
+        # Global inline flags are only legal at the very start; lift them into the group.
+        flags |= sum(_FLAG_BY_LETTER[c] for c in set(m.group(1)))
+        pattern = pattern[m.end():]
+    letters = "".join(letter for flag, letter in _SCOPED_FLAGS if flags & flag)
+    return f"(?{letters}:{pattern})" if letters else f"(?:{pattern})"
+
+
+class RuleSet:
+    def __init__(self, name: str, rules: Iterable[Rule]) -> None:
+        self.name = name
+        self.rules = tuple(rules)
+        self.names = tuple(r.name for r in self.rules)
+        if len(set(self.names)) != len(self.names):
+            raise ValueError(f"duplicate rule names in {name}")
+        self._regexes = tuple(re.compile(r.pattern, r.flags) for r in self.rules)
+        for rule, regex in zip(self.rules, self._regexes, strict=True):
+            if regex.fullmatch(""):
+                raise ValueError(f"rule {rule.name} matches the empty string")
+        scoped = [_scoped(r.pattern, r.flags) for r in self.rules]
+        probes = "".join(f"(?:(?=(?P<_r{i}>{p})))?" for i, p in enumerate(scoped))
+        self._scanner = re.compile(f"(?=(?:{'|'.join(scoped)})){probes}")
+        self._groups = tuple(self._scanner.groupindex[f"_r{i}"] for i in range(len(self.rules)))
+
+    def _timing(self) -> RuleSetTiming | None:
+        collected = _timings.get()
+        if collected is None:
+            return None
+        timing = collected.get(self.name)
+        if timing is None:
+            timing = collected[self.name] = RuleSetTiming(rules={n: RuleTiming() for n in self.names})
+        return timing
+
+    def matched(self, text: str) -> set[str]:
+        """Names of the rules that ``search`` would find in *text*; stops once every rule has matched."""
+        timing = self._timing()
+        t0 = time.perf_counter()
+        found: set[str] = set()
+        total = len(self.names)
+        for m in self._scanner.finditer(text or ""):
+            regs = m.regs
+            for name, group in zip(self.names, self._groups, strict=True):
+                if regs[group][0] >= 0:
+                    found.add(name)
+            if len(found) == total:
+                break
+        if timing is not None:
+            timing.scans += 1
+            timing.scan_seconds += time.perf_counter() - t0
+            for name in found:
+                timing.rules[name].matches += 1
+        return found
+
+    def finditer(self, text: str) -> Iterator[tuple[str, re.Match[str]]]:
+        """Every rule's own ``finditer`` matches over *text*, merged in position order."""
+        timing = self._timing()
+        text = text or ""
+        resume = [0] * len(self.rules)
+        elapsed = 0.0
+        t0 = time.perf_counter()
+        try:
+            for m in self._scanner.finditer(text):
+                pos = m.start()
+                regs = m.regs
+                for i, group in enumerate(self._groups):
+                    if regs[group][0] < 0 or pos < resume[i]:
+                        continue
+                    match = self._regexes[i].match(text, pos)
+                    resume[i] = match.end()
+                    if timing is not None:
+                        timing.rules[self.names[i]].matches += 1
+                    elapsed += time.perf_counter() - t0
+                    yield self.names[i], match
+                    t0 = time.perf_counter()
+        finally:
+            if timing is not None:
+                timing.scans += 1
+                timing.scan_seconds += elapsed + time.perf_counter() - t0
+
+    def collect(self, text: str) -> dict[str, list[re.Match[str]]]:
+        out: dict[str, list[re.Match[str]]] = {name: [] for name in self.names}
+        self.dispatch(text, {name: out[name].append for name in self.names})
+        return out
+
+    def dispatch(self, text: str, handlers: Mapping[str, Callable[[re.Match[str]], Any]]) -> None:
+        """Walk *text* once and call ``handlers[rule]`` for each match of a rule that has one."""
+        timing = self._timing()
+        for name, match in self.finditer(text):
+            handler = handlers.get(name)
+            if handler is None:
+                continue
+            t0 = time.perf_counter()
+            handler(match)
+            if timing is not None:
+                timing.rules[name].handler_seconds += time.perf_counter() - t0
@@ -5,7 +5,7 @@ Centralises all clinical signal extraction so that DAM v2, CSI v1, and the Settl
 Report can consume a single pre-extracted dict without duplicating keyword logic.
 
 Public API:
-    build_settlement_feature_pack(evidence_graph_payload, renderer_manifest) -> dict
+    build_settlement_feature_pack(evidence_graph_payload, renderer_manifest, analysis_context=None) -> dict
 
 Returns a SettlementFeaturePack.v1 dict. Never raises.
 """
@@ -15,6 +15,8 @@ import logging
 from datetime import date as _date
 from typing import Any
 
+from apps.worker.lib.analysis_context import AnalysisContext
+
 logger = logging.getLogger(__name__)
 
 # ── Keyword sets (clinical logic lives here, not in renderer) ─────────────────
@@ -64,28 +66,6 @@ def _parse_date(s: str | None) -> _date | None:
     return None
 
 
-def _event_type_str(event: dict) -> str:
-    raw = event.get("event_type")
-    if isinstance(raw, dict):
-        return str(raw.get("value") or "").lower()
-    return str(raw or "").lower()
-
-
-def _event_all_text(event: dict) -> str:
-    parts: list[str] = []
-    for k in ("reason_for_visit", "chief_complaint", "author_name", "author_role"):
-        v = event.get(k)
-        if v:
-            parts.append(str(v))
-    for k in ("facts", "diagnoses", "procedures", "exam_findings", "treatment_plan"):
-        for f in (event.get(k) or []):
-            if isinstance(f, dict):
-                parts.append(str(f.get("text") or ""))
-            else:
-                parts.append(str(f))
-    return " ".join(parts).lower()
-
-
 def _kw_in(text: str, kws: frozenset) -> bool:
     return any(kw in text for kw in kws)
 
@@ -130,11 +110,11 @@ def _empty_pack() -> dict[str, Any]:
 
 # ── Main extractor ────────────────────────────────────────────────────────────
 
-def _build(eg: dict | None, rm: dict | None) -> dict[str, Any]:
+def _build(eg: dict | None, rm: dict | None, ctx: AnalysisContext | None = None) -> dict[str, Any]:
     eg = eg if isinstance(eg, dict) else {}
     rm = rm if isinstance(rm, dict) else {}
+    ctx = AnalysisContext.ensure(ctx, eg)
 
-    events: list[dict] = [e for e in (eg.get("events") or []) if isinstance(e, dict)]
     gaps: list[dict] = [g for g in (eg.get("gaps") or []) if isinstance(g, dict)]
     promoted_findings: list[dict] = [
         pf for pf in (rm.get("promoted_findings") or []) if isinstance(pf, dict)
@@ -142,25 +122,17 @@ def _build(eg: dict | None, rm: dict | None) -> dict[str, Any]:
     extensions: dict = eg.get("extensions") if isinstance(eg.get("extensions"), dict) else {}
 
     # ── Procedure / treatment signals from events ─────────────────────────────
-    has_surgery = False
-    has_injection = False
+    has_surgery = ctx.any_keyword(_SURGERY_KW, event_type="procedure")
+    has_injection = ctx.any_keyword(_INJECTION_KW, event_type="procedure")
+    has_specialist = ctx.any_keyword(_SPECIALIST_KW)
     has_ed_visit = False
     has_imaging = False
     has_pt = False
-    has_specialist = False
     has_prior_similar_injury = False
     has_emg_positive = False
 
-    for ev in events:
-        et = _event_type_str(ev)
-        txt = _event_all_text(ev)
-
-        if et == "procedure":
-            if _kw_in(txt, _SURGERY_KW):
-                has_surgery = True
-            if _kw_in(txt, _INJECTION_KW):
-                has_injection = True
-
+    # Type-level signals: one check per distinct event type.
+    for et in ctx.event_types():
         if "ed" in et or "emergency" in et:
             has_ed_visit = True
 
@@ -173,10 +145,7 @@ def _build(eg: dict | None, rm: dict | None) -> dict[str, Any]:
         if et == "referenced_prior_event":
             has_prior_similar_injury = True
 
-        if _kw_in(txt, _SPECIALIST_KW):
-            has_specialist = True
-
-        if "emg" in et or ("imaging" in et and "emg" in txt):
+        if "emg" in et or ("imaging" in et and ctx.any_keyword(("emg",), event_type=et)):
             has_emg_positive = True
 
     # Check contradiction_matrix in extensions for prior injury
@@ -228,18 +197,16 @@ def _build(eg: dict | None, rm: dict | None) -> dict[str, Any]:
         if any(kw in label for kw in _SURGICAL_INDICATION_KW):
             has_surgical_indication = True
 
-    # Also scan events for radiculopathy / disc / neuro keywords
-    for ev in events:
-        txt = _event_all_text(ev)
-        if _kw_in(txt, _RADICULOPATHY_KW):
-            has_radiculopathy = True
-            has_neuro_deficit_keywords = True
-        if _kw_in(txt, _NEURO_DEFICIT_KW):
-            has_neuro_deficit_keywords = True
-        if _kw_in(txt, _DISC_HERNIATION_KW):
-            has_disc_herniation = True
-        if _kw_in(txt, _SOFT_TISSUE_KW):
-            has_soft_tissue = True
+    # Also check events for radiculopathy / disc / neuro keywords
+    if ctx.any_keyword(_RADICULOPATHY_KW):
+        has_radiculopathy = True
+        has_neuro_deficit_keywords = True
+    if ctx.any_keyword(_NEURO_DEFICIT_KW):
+        has_neuro_deficit_keywords = True
+    if ctx.any_keyword(_DISC_HERNIATION_KW):
+        has_disc_herniation = True
+    if ctx.any_keyword(_SOFT_TISSUE_KW):
+        has_soft_tissue = True
 
     # ── PT summary ────────────────────────────────────────────────────────────
     pt_summary = rm.get("pt_summary") if isinstance(rm.get("pt_summary"), dict) else {}
@@ -290,20 +257,11 @@ def _build(eg: dict | None, rm: dict | None) -> dict[str, Any]:
             or rm["case_metadata"].get("date_of_injury")
         )
 
-    event_dates: list[_date] = []
-    for ev in events:
-        raw_date = ev.get("date") or ev.get("event_date")
-        if isinstance(raw_date, dict):
-            raw_date = raw_date.get("value")
-        d = _parse_date(str(raw_date) if raw_date else None)
-        if d:
-            event_dates.append(d)
-
     first_event_date: str | None = None
     days_to_first_treatment: int | None = None
 
-    if event_dates:
-        first_date = min(event_dates)
+    first_date = ctx.first_event_date()
+    if first_date:
         first_event_date = first_date.isoformat()
         doi_parsed = _parse_date(doi_str)
         if doi_parsed:
@@ -345,6 +303,7 @@ def _build(eg: dict | None, rm: dict | None) -> dict[str, Any]:
 def build_settlement_feature_pack(
     evidence_graph_payload: dict | None,
     renderer_manifest: dict | None,
+    analysis_context: AnalysisContext | None = None,
 ) -> dict[str, Any]:
     """
     Extract all features needed by DAM v2, CSI v1, and the Settlement Model Report.
@@ -355,6 +314,9 @@ def build_settlement_feature_pack(
         JSON-serialised EvidenceGraph dict or None.
     renderer_manifest
         JSON-serialised RendererManifest dict or None.
+    analysis_context
+        Optional shared ``AnalysisContext`` for the same payload. If None, one is
+        built from evidence_graph_payload.
 
     Returns
     -------
@@ -364,7 +326,7 @@ def build_settlement_feature_pack(
     try:
         eg = evidence_graph_payload if isinstance(evidence_graph_payload, dict) else None
         rm = renderer_manifest if isinstance(renderer_manifest, dict) else None
-        return _build(eg, rm)
+        return _build(eg, rm, analysis_context)
     except Exception as exc:
         logger.exception(f"SettlementFeaturePack build failed: {exc}")
         return _empty_pack()
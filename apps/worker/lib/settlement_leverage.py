@@ -2,7 +2,7 @@
 Settlement Leverage Model v1 — deterministic, citation-bound leverage scoring.
 
 Public API:
-    build_settlement_leverage_model(evidence_graph_payload, renderer_manifest) -> dict
+    build_settlement_leverage_model(evidence_graph_payload, renderer_manifest, analysis_context=None) -> dict
 
 All inputs are dict (JSON-serialised EvidenceGraph / RendererManifest).
 If either dict is None or empty all medical signals resolve as UNKNOWN (value=None).
@@ -14,6 +14,7 @@ import logging
 from datetime import date as _date
 from typing import Any
 
+from apps.worker.lib.analysis_context import AnalysisContext
 from packages.shared.models.domain import (
     SettlementLeverageModel,
     SlmProvenance,
@@ -51,28 +52,6 @@ def _kw_in_text(text: str, kws: frozenset | list) -> bool:
     return any(kw in text for kw in kws)
 
 
-def _event_type_str(event: dict) -> str:
-    raw = event.get("event_type")
-    if isinstance(raw, dict):
-        return str(raw.get("value") or "").lower()
-    return str(raw or "").lower()
-
-
-def _event_all_text(event: dict) -> str:
-    parts: list[str] = []
-    for k in ("reason_for_visit", "chief_complaint", "author_name", "author_role"):
-        v = event.get(k)
-        if v:
-            parts.append(str(v))
-    for k in ("facts", "diagnoses", "procedures", "exam_findings", "treatment_plan"):
-        for f in (event.get(k) or []):
-            if isinstance(f, dict):
-                parts.append(str(f.get("text") or ""))
-            else:
-                parts.append(str(f))
-    return " ".join(parts).lower()
-
-
 def _parse_date(s: str | None) -> _date | None:
     if not s:
         return None
@@ -115,17 +94,14 @@ def _extract_mri_positive(rm: dict, rm_absent: bool) -> SlmSignalAudit:
     )
 
 
-def _extract_emg_positive(eg: dict, rm: dict, data_absent: bool) -> SlmSignalAudit:
+def _extract_emg_positive(ctx: AnalysisContext, rm: dict, data_absent: bool) -> SlmSignalAudit:
     if data_absent:
         return _not_det()
-    for ev in (eg.get("events") or []):
-        if not isinstance(ev, dict):
-            continue
-        if _event_type_str(ev) == "imaging_study" and "emg" in _event_all_text(ev):
-            return SlmSignalAudit(
-                value=True,
-                provenance=SlmProvenance(source_type="event", confidence="MED"),
-            )
+    if ctx.any_keyword(("emg",), event_type="imaging_study"):
+        return SlmSignalAudit(
+            value=True,
+            provenance=SlmProvenance(source_type="event", confidence="MED"),
+        )
     for pf in (rm.get("promoted_findings") or []):
         if not isinstance(pf, dict):
             continue
@@ -140,7 +116,7 @@ def _extract_emg_positive(eg: dict, rm: dict, data_absent: bool) -> SlmSignalAud
     )
 
 
-def _extract_fracture(eg: dict, rm: dict, data_absent: bool) -> SlmSignalAudit:
+def _extract_fracture(ctx: AnalysisContext, rm: dict, data_absent: bool) -> SlmSignalAudit:
     if data_absent:
         return _not_det()
     for pf in (rm.get("promoted_findings") or []):
@@ -153,48 +129,39 @@ def _extract_fracture(eg: dict, rm: dict, data_absent: bool) -> SlmSignalAudit:
                 value=True,
                 provenance=SlmProvenance(source_type="promoted_finding", confidence=conf),  # type: ignore[arg-type]
             )
-    for ev in (eg.get("events") or []):
-        if not isinstance(ev, dict):
-            continue
-        if "fracture" in _event_all_text(ev):
-            return SlmSignalAudit(
-                value=True,
-                provenance=SlmProvenance(source_type="event", confidence="MED"),
-            )
+    if ctx.any_keyword(("fracture",)):
+        return SlmSignalAudit(
+            value=True,
+            provenance=SlmProvenance(source_type="event", confidence="MED"),
+        )
     return SlmSignalAudit(
         value=False,
         provenance=SlmProvenance(source_type="promoted_finding", confidence="MED"),
     )
 
 
-def _extract_surgery_performed(eg: dict, eg_absent: bool) -> SlmSignalAudit:
+def _extract_surgery_performed(ctx: AnalysisContext, eg_absent: bool) -> SlmSignalAudit:
     if eg_absent:
         return _not_det()
-    for ev in (eg.get("events") or []):
-        if not isinstance(ev, dict):
-            continue
-        if _event_type_str(ev) == "procedure" and _kw_in_text(_event_all_text(ev), _SURGERY_KW):
-            return SlmSignalAudit(
-                value=True,
-                provenance=SlmProvenance(source_type="event", confidence="HIGH"),
-            )
+    if ctx.any_keyword(_SURGERY_KW, event_type="procedure"):
+        return SlmSignalAudit(
+            value=True,
+            provenance=SlmProvenance(source_type="event", confidence="HIGH"),
+        )
     return SlmSignalAudit(
         value=False,
         provenance=SlmProvenance(source_type="event", confidence="HIGH"),
     )
 
 
-def _extract_injection_performed(eg: dict, rm: dict, data_absent: bool) -> SlmSignalAudit:
+def _extract_injection_performed(ctx: AnalysisContext, rm: dict, data_absent: bool) -> SlmSignalAudit:
     if data_absent:
         return _not_det()
-    for ev in (eg.get("events") or []):
-        if not isinstance(ev, dict):
-            continue
-        if _event_type_str(ev) == "procedure" and _kw_in_text(_event_all_text(ev), _INJECTION_KW):
-            return SlmSignalAudit(
-                value=True,
-                provenance=SlmProvenance(source_type="event", confidence="HIGH"),
-            )
+    if ctx.any_keyword(_INJECTION_KW, event_type="procedure"):
+        return SlmSignalAudit(
+            value=True,
+            provenance=SlmProvenance(source_type="event", confidence="HIGH"),
+        )
     for pf in (rm.get("promoted_findings") or []):
         if not isinstance(pf, dict):
             continue
@@ -209,17 +176,14 @@ def _extract_injection_performed(eg: dict, rm: dict, data_absent: bool) -> SlmSi
     )
 
 
-def _extract_hardware_implanted(eg: dict, eg_absent: bool) -> SlmSignalAudit:
+def _extract_hardware_implanted(ctx: AnalysisContext, eg_absent: bool) -> SlmSignalAudit:
     if eg_absent:
         return _not_det("MED")
-    for ev in (eg.get("events") or []):
-        if not isinstance(ev, dict):
-            continue
-        if _event_type_str(ev) == "procedure" and _kw_in_text(_event_all_text(ev), _HARDWARE_KW):
-            return SlmSignalAudit(
-                value=True,
-                provenance=SlmProvenance(source_type="event", confidence="MED"),
-            )
+    if ctx.any_keyword(_HARDWARE_KW, event_type="procedure"):
+        return SlmSignalAudit(
+            value=True,
+            provenance=SlmProvenance(source_type="event", confidence="MED"),
+        )
     return SlmSignalAudit(
         value=False,
         provenance=SlmProvenance(source_type="event", confidence="MED"),
@@ -305,17 +269,14 @@ def _extract_compliance_rate(eg: dict, eg_absent: bool) -> SlmSignalAudit:
     )
 
 
-def _extract_similar_body_part_prior(eg: dict, eg_absent: bool) -> SlmSignalAudit:
+def _extract_similar_body_part_prior(ctx: AnalysisContext, eg: dict, eg_absent: bool) -> SlmSignalAudit:
     if eg_absent:
         return _not_det()
-    for ev in (eg.get("events") or []):
-        if not isinstance(ev, dict):
-            continue
-        if _event_type_str(ev) == "referenced_prior_event":
-            return SlmSignalAudit(
-                value=True,
-                provenance=SlmProvenance(source_type="event", confidence="MED"),
-            )
+    if ctx.of_type("referenced_prior_event"):
+        return SlmSignalAudit(
+            value=True,
+            provenance=SlmProvenance(source_type="event", confidence="MED"),
+        )
     # Also check contradiction_matrix in extensions
     exts = eg.get("extensions") if isinstance(eg.get("extensions"), dict) else {}
     for entry in (exts.get("contradiction_matrix") or []):
@@ -371,7 +332,7 @@ def _extract_documentation_overlap_score(eg: dict, eg_absent: bool) -> SlmSignal
         )
 
 
-def _extract_future_surgery_recommended(eg: dict, rm: dict, data_absent: bool) -> SlmSignalAudit:
+def _extract_future_surgery_recommended(ctx: AnalysisContext, rm: dict, data_absent: bool) -> SlmSignalAudit:
     if data_absent:
         return _not_det()
     for pf in (rm.get("promoted_findings") or []):
@@ -382,38 +343,32 @@ def _extract_future_surgery_recommended(eg: dict, rm: dict, data_absent: bool) -
                 value=True,
                 provenance=SlmProvenance(source_type="promoted_finding", confidence="MED"),
             )
-    for ev in (eg.get("events") or []):
-        if not isinstance(ev, dict):
-            continue
-        if _kw_in_text(_event_all_text(ev), _FUTURE_SURGERY_KW):
-            return SlmSignalAudit(
-                value=True,
-                provenance=SlmProvenance(source_type="event", confidence="MED"),
-            )
+    if ctx.any_keyword(_FUTURE_SURGERY_KW):
+        return SlmSignalAudit(
+            value=True,
+            provenance=SlmProvenance(source_type="event", confidence="MED"),
+        )
     return SlmSignalAudit(
         value=False,
         provenance=SlmProvenance(source_type="promoted_finding", confidence="MED"),
     )
 
 
-def _extract_impairment_rating_present(eg: dict, eg_absent: bool) -> SlmSignalAudit:
+def _extract_impairment_rating_present(ctx: AnalysisContext, eg_absent: bool) -> SlmSignalAudit:
     if eg_absent:
         return _not_det()
-    for ev in (eg.get("events") or []):
-        if not isinstance(ev, dict):
-            continue
-        if _kw_in_text(_event_all_text(ev), _IMPAIRMENT_KW):
-            return SlmSignalAudit(
-                value=True,
-                provenance=SlmProvenance(source_type="event", confidence="MED"),
-            )
+    if ctx.any_keyword(_IMPAIRMENT_KW):
+        return SlmSignalAudit(
+            value=True,
+            provenance=SlmProvenance(source_type="event", confidence="MED"),
+        )
     return SlmSignalAudit(
         value=False,
         provenance=SlmProvenance(source_type="event", confidence="MED"),
     )
 
 
-def _extract_documented_wage_loss(eg: dict, eg_absent: bool) -> SlmSignalAudit:
+def _extract_documented_wage_loss(ctx: AnalysisContext, eg: dict, eg_absent: bool) -> SlmSignalAudit:
     if eg_absent:
         return _not_det()
     exts = eg.get("extensions") if isinstance(eg.get("extensions"), dict) else {}
@@ -423,13 +378,9 @@ def _extract_documented_wage_loss(eg: dict, eg_absent: bool) -> SlmSignalAudit:
             value=True,
             provenance=SlmProvenance(source_type="extension", confidence="MED"),
         )
-    for ev in (eg.get("events") or []):
-        if not isinstance(ev, dict):
-            continue
-        et = _event_type_str(ev)
-        if "work" in et or "employment" in et:
-            txt = _event_all_text(ev)
-            if any(kw in txt for kw in ("$", "wage", "income", "salary")):
+    for rec in ctx.events:
+        if "work" in rec.event_type or "employment" in rec.event_type:
+            if any(kw in rec.text for kw in ("$", "wage", "income", "salary")):
                 return SlmSignalAudit(
                     value=True,
                     provenance=SlmProvenance(source_type="event", confidence="MED"),
@@ -440,19 +391,15 @@ def _extract_documented_wage_loss(eg: dict, eg_absent: bool) -> SlmSignalAudit:
     )
 
 
-def _extract_lost_work_days(eg: dict, eg_absent: bool) -> SlmSignalAudit:
+def _extract_lost_work_days(ctx: AnalysisContext, eg_absent: bool) -> SlmSignalAudit:
     if eg_absent:
         return _not_det("LOW")
-    for ev in (eg.get("events") or []):
-        if not isinstance(ev, dict):
-            continue
-        if "work" in _event_type_str(ev):
-            txt = _event_all_text(ev)
-            if any(kw in txt for kw in ("restricted", "unable to work", "off work", "out of work", "work restriction")):
-                return SlmSignalAudit(
-                    value=True,
-                    provenance=SlmProvenance(source_type="event", confidence="LOW"),
-                )
+    for rec in ctx.of_type_containing("work"):
+        if any(kw in rec.text for kw in ("restricted", "unable to work", "off work", "out of work", "work restriction")):
+            return SlmSignalAudit(
+                value=True,
+                provenance=SlmProvenance(source_type="event", confidence="LOW"),
+            )
     return SlmSignalAudit(
         value=False,
         provenance=SlmProvenance(source_type="event", confidence="LOW"),
@@ -461,13 +408,18 @@ def _extract_lost_work_days(eg: dict, eg_absent: bool) -> SlmSignalAudit:
 
 # ── Signal assembly ───────────────────────────────────────────────────────────
 
-def _extract_all_signals(eg: dict | None, rm: dict | None) -> dict[str, SlmSignalAudit]:
+def _extract_all_signals(
+    eg: dict | None,
+    rm: dict | None,
+    ctx: AnalysisContext | None = None,
+) -> dict[str, SlmSignalAudit]:
     eg_absent = _is_empty(eg)
     rm_absent = _is_empty(rm)
     data_absent = eg_absent and rm_absent
 
     eg = eg or {}
     rm = rm or {}
+    ctx = AnalysisContext.ensure(ctx, eg)
 
     # Liability signals — never determinable from medical records
     _nd = _not_det()
@@ -478,21 +430,21 @@ def _extract_all_signals(eg: dict | None, rm: dict | None) -> dict[str, SlmSigna
     }
 
     signals["mri_positive"] = _extract_mri_positive(rm, rm_absent)
-    signals["emg_positive"] = _extract_emg_positive(eg, rm, data_absent)
-    signals["fracture"] = _extract_fracture(eg, rm, data_absent)
-    signals["surgery_performed"] = _extract_surgery_performed(eg, eg_absent)
-    signals["injection_performed"] = _extract_injection_performed(eg, rm, data_absent)
-    signals["hardware_implanted"] = _extract_hardware_implanted(eg, eg_absent)
+    signals["emg_positive"] = _extract_emg_positive(ctx, rm, data_absent)
+    signals["fracture"] = _extract_fracture(ctx, rm, data_absent)
+    signals["surgery_performed"] = _extract_surgery_performed(ctx, eg_absent)
+    signals["injection_performed"] = _extract_injection_performed(ctx, rm, data_absent)
+    signals["hardware_implanted"] = _extract_hardware_implanted(ctx, eg_absent)
     signals["total_visits"] = _extract_total_visits(rm, rm_absent)
     signals["treatment_duration_days"] = _extract_treatment_duration_days(rm, rm_absent)
     signals["gap_over_30_days"] = _extract_gap_over_30_days(eg, eg_absent)
     signals["compliance_rate"] = _extract_compliance_rate(eg, eg_absent)
-    signals["similar_body_part_prior"] = _extract_similar_body_part_prior(eg, eg_absent)
+    signals["similar_body_part_prior"] = _extract_similar_body_part_prior(ctx, eg, eg_absent)
     signals["documentation_overlap_score"] = _extract_documentation_overlap_score(eg, eg_absent)
-    signals["future_surgery_recommended"] = _extract_future_surgery_recommended(eg, rm, data_absent)
-    signals["impairment_rating_present"] = _extract_impairment_rating_present(eg, eg_absent)
-    signals["documented_wage_loss"] = _extract_documented_wage_loss(eg, eg_absent)
-    signals["lost_work_days"] = _extract_lost_work_days(eg, eg_absent)
+    signals["future_surgery_recommended"] = _extract_future_surgery_recommended(ctx, rm, data_absent)
+    signals["impairment_rating_present"] = _extract_impairment_rating_present(ctx, eg_absent)
+    signals["documented_wage_loss"] = _extract_documented_wage_loss(ctx, eg, eg_absent)
+    signals["lost_work_days"] = _extract_lost_work_days(ctx, eg_absent)
 
     return signals
 
@@ -623,6 +575,7 @@ def _compute_confidence_score(signals: dict[str, SlmSignalAudit]) -> float:
 def build_settlement_leverage_model(
     evidence_graph_payload: dict | None,
     renderer_manifest: dict | None,
+    analysis_context: AnalysisContext | None = None,
 ) -> dict[str, Any]:
     """
     Compute Settlement Leverage Model v1.
@@ -635,6 +588,9 @@ def build_settlement_leverage_model(
     renderer_manifest
         JSON-serialised RendererManifest (from ``renderer_manifest.model_dump(mode="json")``)
         or None / empty dict when not available.
+    analysis_context
+        Optional shared ``AnalysisContext`` for the same payload. If None, one is
+        built from evidence_graph_payload.
 
     Returns
     -------
@@ -646,7 +602,7 @@ def build_settlement_leverage_model(
         eg = evidence_graph_payload if isinstance(evidence_graph_payload, dict) else None
         rm = renderer_manifest if isinstance(renderer_manifest, dict) else None
 
-        signals = _extract_all_signals(eg, rm)
+        signals = _extract_all_signals(eg, rm, analysis_context)
         scores = _score_domains(signals)
         posture = _map_posture(scores["sli"])
         confidence = _compute_confidence_score(signals)
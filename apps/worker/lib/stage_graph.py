@@ -0,0 +1,186 @@
+"""
+Declarative stage graph for pipeline steps that only depend on each other's outputs.
+
+Each ``Stage`` names the state keys it reads and writes. Declaration order is the
+reference sequential order; from it ``StageGraph`` derives dependencies:
+
+  - read-after-write: a stage runs after the last earlier stage writing a key it reads
+  - write-after-read / write-after-write: a stage writing a key runs after earlier
+    readers and writers of that key
+
+``run()`` executes the graph in waves. Stages in one wave have no dependencies
+on each other and run concurrently on a thread pool; their outputs are applied to
+the state only when the whole wave has finished, in declaration order, so a stage
+never observes a sibling's writes and results do not depend on thread timing.
+
+A read key ending in ``*`` (e.g. ``ext.*``) declares a read of every key with
+that prefix, for stages handed a whole object those keys live in. It orders the
+stage after every earlier writer of such a key and before every later one, so
+what it sees matches the sequential order whatever the wave layout. These are
+ordering edges only: they neither pull lazy stages in nor fail on skipped ones.
+
+Stages may be restricted to export modes (``modes``). Skipped stages write
+nothing; a running stage that reads a key only a skipped stage produces is a
+configuration error.
+
+Stages may also be ``lazy``: a lazy stage only runs when the caller asks for
+one of its outputs (``want``) or a stage that runs reads from it. Eager stages
+always run; ``want=None`` runs every stage. Per-stage wall time is recorded in ``StageRun.timings_ms`` and,
+when given, in the run's ``_StageTimings``.
+"""
+from __future__ import annotations
+
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Mapping
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: Callable[[Mapping[str, Any]], Mapping[str, Any] | None]
+    reads: tuple[str, ...] = ()
+    writes: tuple[str, ...] = ()
+    modes: frozenset[str] | None = None  # None: every export mode
+    lazy: bool = False  # only run when a wanted key or a running stage needs an output
+
+    def runs_in(self, mode: str | None) -> bool:
+        return self.modes is None or mode is None or mode in self.modes
+
+
+@dataclass
+class StageRun:
+    waves: list[list[str]] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    timings_ms: dict[str, int] = field(default_factory=dict)
+
+
+class StageGraph:
+    def __init__(self, stages: Iterable[Stage]) -> None:
+        self.stages: list[Stage] = list(stages)
+        names = [s.name for s in self.stages]
+        if len(set(names)) != len(names):
+            raise ValueError("stage names must be unique")
+        # stage name -> {dependency name: keys read from it (RAW) or empty for ordering-only edges}
+        self.deps: dict[str, dict[str, set[str]]] = {}
+        last_writer: dict[str, str] = {}
+        readers: dict[str, list[str]] = {}
+        prefix_readers: dict[str, list[str]] = {}  # "ext." -> stages reading "ext.*"
+        for stage in self.stages:
+            deps: dict[str, set[str]] = {}
+            for key in stage.reads:
+                if key.endswith("*"):
+                    for written, writer in last_writer.items():
+                        if written.startswith(key[:-1]):
+                            deps.setdefault(writer, set())
+                elif key in last_writer:
+                    deps.setdefault(last_writer[key], set()).add(key)
+            for key in stage.writes:
+                if key in last_writer:
+                    deps.setdefault(last_writer[key], set())
+                for reader in readers.get(key, []):
+                    if reader != stage.name:
+                        deps.setdefault(reader, set())
+                for prefix, names in prefix_readers.items():
+                    if key.startswith(prefix):
+                        deps.update((n, deps.get(n, set())) for n in names if n != stage.name)
+            self.deps[stage.name] = deps
+            for key in stage.reads:
+                if key.endswith("*"):
+                    prefix_readers.setdefault(key[:-1], []).append(stage.name)
+                else:
+                    readers.setdefault(key, []).append(stage.name)
+            for key in stage.writes:
+                last_writer[key] = stage.name
+                readers[key] = []
+
+    def plan(
+        self, mode: str | None = None, want: Iterable[str] | None = None,
+    ) -> tuple[list[list[Stage]], list[str]]:
+        """Waves of runnable stages for ``mode`` plus the names of skipped stages.
+
+        With ``want``, lazy stages run only if they write a wanted key or a running
+        stage reads from them; unneeded lazy stages are reported as skipped.
+        """
+        active = {s.name for s in self.stages if s.runs_in(mode)}
+        if want is not None:
+            wanted = set(want)
+            needed = {
+                s.name for s in self.stages
+                if s.name in active and (not s.lazy or wanted.intersection(s.writes))
+            }
+            # Dependencies point backwards, so one reverse pass closes over read-after-write edges.
+            for stage in reversed(self.stages):
+                if stage.name in needed:
+                    needed.update(dep for dep, keys in self.deps[stage.name].items() if keys and dep in active)
+            active &= needed
+        skipped = [s.name for s in self.stages if s.name not in active]
+        level: dict[str, int] = {}
+        waves: list[list[Stage]] = []
+        for stage in self.stages:
+            if stage.name not in active:
+                continue
+            lvl = 0
+            for dep, keys in self.deps[stage.name].items():
+                if dep in active:
+                    lvl = max(lvl, level[dep] + 1)
+                elif keys:
+                    raise ValueError(
+                        f"stage {stage.name!r} reads {sorted(keys)} from stage {dep!r}, which is skipped in mode {mode!r}"
+                    )
+            level[stage.name] = lvl
+            while len(waves) <= lvl:
+                waves.append([])
+            waves[lvl].append(stage)
+        return waves, skipped
+
+    def run(
+        self,
+        state: dict[str, Any],
+        *,
+        mode: str | None = None,
+        want: Iterable[str] | None = None,
+        max_workers: int = 1,
+        timings: Any = None,
+        run_id: str = "",
+        on_write: Callable[[str, Any], None] | None = None,
+    ) -> StageRun:
+        """Run the stages planned for ``mode`` / ``want``, writing their outputs into ``state``."""
+        waves, skipped = self.plan(mode, want)
+        report = StageRun(waves=[[s.name for s in wave] for wave in waves], skipped=skipped)
+
+        def _call(stage: Stage) -> Mapping[str, Any]:
+            t0 = time.perf_counter()
+            if timings is not None:
+                with timings.timer(stage.name, run_id):
+                    out = stage.fn(state)
+            else:
+                out = stage.fn(state)
+            report.timings_ms[stage.name] = int((time.perf_counter() - t0) * 1000)
+            return out or {}
+
+        pool = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+        try:
+            for wave in waves:
+                if pool is not None and len(wave) > 1:
+                    # Stages run in the caller's context (e.g. its DB engine profile).
+                    futures = [pool.submit(contextvars.copy_context().run, _call, stage) for stage in wave]
+                    outputs = [f.result() for f in futures]
+                else:
+                    outputs = [_call(stage) for stage in wave]
+                for stage, out in zip(wave, outputs, strict=True):
+                    produced = set(out)
+                    if produced != set(stage.writes):
+                        raise ValueError(
+                            f"stage {stage.name!r} declared writes {sorted(stage.writes)} but produced {sorted(produced)}"
+                        )
+                    for key in stage.writes:
+                        state[key] = out[key]
+                        if on_write is not None:
+                            on_write(key, out[key])
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+        return report
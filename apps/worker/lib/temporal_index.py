@@ -0,0 +1,259 @@
+"""
+Shared temporal index over event date ranges.
+
+Gap, coverage and missing-record analysis all need the same questions answered
+about an event set: which events fall on a day or start inside a window, which
+overlap a window, what are the gaps between consecutive visit dates, what span
+does a provider cover. ``TemporalIndex`` is built once and answers them from
+per-scope / per-provider interval trees plus a day bucket map, so the analyzers
+no longer rescan the full event list for every date pair. Subsets (e.g. care
+events only) are filtered at query time through ``include`` instead of
+re-indexing.
+
+Conventions match the existing analyzers:
+  - an event's interval is ``[sort_date(), DateRange.end or sort_date()]``
+  - placeholder dates (year <= 1900, i.e. relative/partial/undated) are not indexed
+  - scope comes from the caller's ``scope_of`` (missing-records passes its
+    ``_patient_scope_id``); without one every event is in the ``ANY`` scope
+  - events in a bucket keep ``EventDate.sort_key()`` order (stable)
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+from itertools import pairwise
+from typing import Any, Callable, Generic, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+ANY = "*"
+
+
+def event_interval(event: Any) -> Optional[tuple[date, date]]:
+    """Return ``(start, end)`` for an event, or None for undated/placeholder dates."""
+    edate = getattr(event, "date", None)
+    if not edate:
+        return None
+    try:
+        start = edate.sort_date()
+    except Exception:
+        return None
+    if not isinstance(start, date) or start.year <= 1900:
+        return None
+    end = getattr(getattr(edate, "value", None), "end", None)
+    if not isinstance(end, date) or end < start:
+        end = start
+    return start, end
+
+
+def event_day(event: Any) -> Optional[date]:
+    """Return the indexed start date of an event, or None for undated/placeholder dates."""
+    span = event_interval(event)
+    return span[0] if span else None
+
+
+class IntervalTree(Generic[T]):
+    """
+    Static augmented interval tree.
+
+    Intervals are stored sorted by start in an implicit balanced BST (midpoint of
+    each index range is the node); ``_max_end`` holds the max end of each subtree so
+    overlap queries prune whole ranges. Build is O(n log n), queries are
+    O(log n + k). Results come back in start order (ties keep insertion order).
+    """
+
+    __slots__ = ("_starts", "_ends", "_items", "_max_end")
+
+    def __init__(self, intervals: Iterable[tuple[date, date, T]]) -> None:
+        rows = sorted(enumerate(intervals), key=lambda r: (r[1][0], r[0]))
+        self._starts: list[date] = [r[1][0] for r in rows]
+        self._ends: list[date] = [r[1][1] for r in rows]
+        self._items: list[T] = [r[1][2] for r in rows]
+        self._max_end: list[Optional[date]] = [None] * len(rows)
+        if rows:
+            self._build(0, len(rows))
+
+    def _build(self, lo: int, hi: int) -> date:
+        mid = (lo + hi) // 2
+        best = self._ends[mid]
+        if lo < mid:
+            best = max(best, self._build(lo, mid))
+        if mid + 1 < hi:
+            best = max(best, self._build(mid + 1, hi))
+        self._max_end[mid] = best
+        return best
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def span(self) -> Optional[tuple[date, date]]:
+        if not self._items:
+            return None
+        return self._starts[0], self._max_end[len(self._items) // 2]
+
+    def overlapping(self, start: date, end: date) -> list[T]:
+        """Items whose interval intersects the closed window ``[start, end]``."""
+        out: list[tuple[int, T]] = []
+        # Only nodes with start <= end can overlap; restrict to that prefix.
+        hi = bisect_right(self._starts, end)
+        if hi:
+            self._collect(0, len(self._items), hi, start, out)
+        out.sort(key=lambda r: r[0])
+        return [item for _, item in out]
+
+    def _collect(self, lo: int, hi: int, limit: int, start: date, out: list) -> None:
+        if lo >= hi or lo >= limit:
+            return
+        mid = (lo + hi) // 2
+        max_end = self._max_end[mid]
+        if max_end is None or max_end < start:
+            return
+        self._collect(lo, mid, limit, start, out)
+        if mid < limit and self._ends[mid] >= start:
+            out.append((mid, self._items[mid]))
+        self._collect(mid + 1, hi, limit, start, out)
+
+    def at(self, day: date) -> list[T]:
+        return self.overlapping(day, day)
+
+
+class TemporalIndex:
+    """Per-scope and per-provider temporal lookups over a fixed event set."""
+
+    def __init__(self, events: Iterable[Any], *, scope_of: Callable[[Any], str] | None = None) -> None:
+        ordered = sorted(
+            events,
+            key=lambda e: e.date.sort_key() if getattr(e, "date", None) else (99, "UNKNOWN"),
+        )
+        self._events: list[Any] = ordered
+        self._days: dict[tuple[str, str], dict[date, list[Any]]] = {}
+        rows: dict[tuple[str, str], list[tuple[date, date, Any]]] = {}
+        for event in ordered:
+            span = event_interval(event)
+            if span is None:
+                continue
+            scope = scope_of(event) if scope_of is not None else ANY
+            pid = getattr(event, "provider_id", None) or ANY
+            keys = {(ANY, ANY), (scope, ANY)}
+            if pid != ANY:
+                keys.add((ANY, pid))
+                keys.add((scope, pid))
+            for key in keys:
+                self._days.setdefault(key, {}).setdefault(span[0], []).append(event)
+                rows.setdefault(key, []).append((span[0], span[1], event))
+        self._trees: dict[tuple[str, str], IntervalTree] = {k: IntervalTree(v) for k, v in rows.items()}
+        self._sorted_days: dict[tuple[str, str], list[date]] = {k: sorted(v) for k, v in self._days.items()}
+
+    @staticmethod
+    def _key(scope: str | None, provider_id: str | None) -> tuple[str, str]:
+        return (scope or ANY, provider_id or ANY)
+
+    @property
+    def events(self) -> list[Any]:
+        """Indexed events in ``sort_key`` order (includes undated ones)."""
+        return self._events
+
+    def scopes(self) -> list[str]:
+        return sorted({s for s, p in self._days if s != ANY and p == ANY})
+
+    def provider_keys(self, scope: str | None = None) -> list[tuple[str, str]]:
+        """``(scope, provider_id)`` pairs with at least one dated event."""
+        return sorted(
+            (s, p) for s, p in self._days
+            if s != ANY and p != ANY and (scope is None or s == scope)
+        )
+
+    def dates(
+        self,
+        *,
+        scope: str | None = None,
+        provider_id: str | None = None,
+        include: Callable[[Any], bool] | None = None,
+    ) -> list[date]:
+        """Distinct start dates, ascending; with ``include``, only days holding a matching event."""
+        key = self._key(scope, provider_id)
+        days = self._sorted_days.get(key, [])
+        if include is None:
+            return list(days)
+        buckets = self._days.get(key, {})
+        return [d for d in days if any(include(e) for e in buckets[d])]
+
+    def events_on(
+        self,
+        day: date,
+        *,
+        scope: str | None = None,
+        provider_id: str | None = None,
+        include: Callable[[Any], bool] | None = None,
+    ) -> list[Any]:
+        """Events whose start date is ``day``, in ``sort_key`` order, optionally filtered by ``include``."""
+        bucket = self._days.get(self._key(scope, provider_id), {}).get(day, [])
+        return [e for e in bucket if include(e)] if include is not None else list(bucket)
+
+    def starting_between(
+        self,
+        start: date | None,
+        end: date | None,
+        *,
+        scope: str | None = None,
+        provider_id: str | None = None,
+        include: Callable[[Any], bool] | None = None,
+    ) -> list[Any]:
+        """Events whose start date lies in the closed window ``[start, end]`` (open side when None)."""
+        key = self._key(scope, provider_id)
+        days = self._sorted_days.get(key, [])
+        lo = bisect_left(days, start) if start is not None else 0
+        hi = bisect_right(days, end) if end is not None else len(days)
+        buckets = self._days.get(key, {})
+        return [e for d in days[lo:hi] for e in buckets[d] if include is None or include(e)]
+
+    def overlapping(
+        self,
+        start: date,
+        end: date,
+        *,
+        scope: str | None = None,
+        provider_id: str | None = None,
+        include: Callable[[Any], bool] | None = None,
+    ) -> list[Any]:
+        """Events whose date range intersects ``[start, end]``, in start order."""
+        tree = self._trees.get(self._key(scope, provider_id))
+        if tree is None:
+            return []
+        hits = tree.overlapping(start, end)
+        return [e for e in hits if include(e)] if include is not None else hits
+
+    def coverage(self, *, scope: str | None = None, provider_id: str | None = None) -> Optional[tuple[date, date]]:
+        """First start date and last end date covered by the selected events."""
+        days = self._sorted_days.get(self._key(scope, provider_id))
+        if not days:
+            return None
+        span = self._trees[self._key(scope, provider_id)].span()
+        return days[0], span[1] if span else days[-1]
+
+    def gaps(
+        self,
+        min_days: int,
+        *,
+        scope: str | None = None,
+        provider_id: str | None = None,
+        include: Callable[[Any], bool] | None = None,
+    ) -> list[tuple[date, date, int]]:
+        """Consecutive distinct-date pairs at least ``min_days`` apart."""
+        days = self.dates(scope=scope, provider_id=provider_id, include=include)
+        out: list[tuple[date, date, int]] = []
+        for d1, d2 in pairwise(days):
+            delta = (d2 - d1).days
+            if delta >= min_days:
+                out.append((d1, d2, delta))
+        return out
+
+    def max_gap_days(
+        self,
+        *,
+        scope: str | None = None,
+        provider_id: str | None = None,
+        include: Callable[[Any], bool] | None = None,
+    ) -> int:
+        days = self.dates(scope=scope, provider_id=provider_id, include=include)
+        return max(((d2 - d1).days for d1, d2 in pairwise(days)), default=0)
@@ -20,10 +20,8 @@ from packages.db.models import (
 )
 from packages.shared.models import (
     CaseInfo,
-    ClaimEdge,
     ChronologyResult,
     EvidenceGraph,
-    LitigationExtensions,
     PipelineInputs,
     PipelineOutputs,
     RunConfig,
@@ -32,8 +30,8 @@ from packages.shared.models import (
     ArtifactRef,
     PageType,
 )
-from packages.shared.schema_validator import validate_output
-from packages.shared.storage import get_upload_path, UPLOADS_DIR, ensure_dirs, save_artifact
+from packages.shared.schema_validator import ValidationSession
+from packages.shared.storage import get_upload_path, UPLOADS_DIR, ensure_dirs, flush_artifact_uploads, save_artifact
 
 # Step Imports
 from apps.worker.steps.step00_validate import validate_inputs
@@ -42,79 +40,46 @@ from apps.worker.steps.step02_text_acquire import acquire_text
 from apps.worker.steps.step03_classify import classify_pages
 from apps.worker.steps.step03a_demographics import extract_demographics
 from apps.worker.steps.step03b_patient_partitions import (
-    assign_patient_scope_to_events,
     build_patient_partitions,
     enforce_event_patient_scope,
-    render_patient_partitions,
     validate_patient_scope_invariants,
 )
 from apps.worker.steps.step04_segment import segment_documents
 from apps.worker.steps.step05_provider import detect_providers
 from apps.worker.steps.step06_dates import extract_dates_for_pages
-from apps.worker.steps.step07_events import (
-    extract_billing_events, extract_clinical_events, extract_imaging_events,
-    extract_pt_events, extract_lab_events, extract_discharge_events, extract_operative_events,
-)
+from apps.worker.steps.step07_events import stream_events
 from apps.worker.steps.step08_citations import post_process_citations
+from apps.worker.steps.events.citation_store import collecting_citations
 from apps.worker.steps.step09_dedup import deduplicate_events
-from apps.worker.steps.step10_confidence import apply_confidence_scoring, filter_for_export
+from apps.worker.steps.step10_confidence import ConfidenceMatrix, apply_confidence_scoring, filter_for_export
 from apps.worker.steps.step11_gaps import detect_gaps
 from apps.worker.steps.events.event_weighting import annotate_event_weights
 from apps.worker.steps.events.legal_usability import improve_legal_usability
 from apps.worker.steps.step12a_narrative_synthesis import synthesize_narrative
 from apps.worker.steps.step12_export import render_exports, render_patient_chronology_reports
-from apps.worker.project.chronology import build_chronology_projection, compute_provider_resolution_quality
 from apps.worker.steps.step12b_litigation_review import run_litigation_review
 from apps.worker.steps.step13_receipt import create_run_record
-from apps.worker.lib.provider_normalize import normalize_provider_entities, compute_coverage_spans
+from apps.worker.lib.temporal_index import TemporalIndex
+from apps.worker.steps.step15_missing_records import _patient_scope_id
+from apps.worker.lib.event_overlay import fork_events
+from apps.worker.lib.graph_snapshot import ModelSnapshot
 from apps.worker.lib.quality_gates import run_quality_gates, write_fail_cover_pdf
-from apps.worker.lib.claim_ledger_lite import build_claim_edges, select_top_claim_rows
-from apps.worker.lib.causation_ladder import build_causation_ladders
-from apps.worker.steps.case_collapse import (
-    build_case_collapse_candidates, build_defense_attack_paths,
-    build_objection_profiles, build_upgrade_recommendations, quote_lock,
-)
-from apps.worker.steps.litigation import (
-    build_comparative_pattern_snapshot, build_contradiction_matrix, build_narrative_duality,
-)
-from apps.worker.steps.step14_provider_directory import render_provider_directory
-from apps.worker.steps.step15_missing_records import detect_missing_records, render_missing_records
-from apps.worker.steps.step15a_missing_record_requests import (
-    generate_missing_record_requests, render_missing_record_requests,
-)
-from apps.worker.steps.step16_billing_lines import extract_billing_lines, render_billing_lines
-from apps.worker.steps.step17_specials_summary import compute_specials_summary, render_specials_summary
-from apps.worker.steps.step_renderer_manifest import build_renderer_manifest, annotate_renderer_manifest_claim_context_alignment
-from apps.worker.steps.step_visit_abstraction_registry import build_competitive_registries
-from apps.worker.steps.step18_paralegal_chronology import (
-    build_paralegal_chronology_payload, generate_extraction_notes_md, render_paralegal_chronology_artifacts,
-)
-from apps.worker.pipeline_artifacts import build_artifact_ref_entries, build_page_map
+from apps.worker.pipeline_artifacts import build_artifact_ref_entries
 from apps.worker.pipeline_persistence import persist_pipeline_state
+from apps.worker.pipeline_stages import _build_litigation_extensions, run_analyzer_stages
 from apps.worker.steps.step19_llm_reasoning import run_llm_reasoning
 from apps.worker.steps.step20_chronology_narrative import run_chronology_narrative
 from apps.worker.lib.litigation_integrity import run_litigation_integrity_pass
 from apps.worker.lib.pipeline_parity import build_pipeline_parity_report
-from apps.worker.quality.text_quality import clean_text, is_garbage
 from apps.worker.lib.pt_enumeration import build_pt_evidence_extensions
-from apps.worker.lib.provider_resolution_v1 import augment_provider_resolution_quality
-from apps.worker.lib.claim_context_alignment import run_claim_context_alignment
-from apps.worker.lib.litigation_safe_v1 import build_litigation_safe_v1_snapshot, validate_litigation_safe_v1
-from apps.worker.lib.settlement_leverage import build_settlement_leverage_model
-from apps.worker.lib.settlement_features import build_settlement_feature_pack
-from apps.worker.lib.defense_attack_map import build_defense_attack_map
-from apps.worker.lib.case_severity_index import build_case_severity_index
-from apps.worker.lib.severity_profile import build_severity_profile
-from apps.worker.lib.settlement_model import build_settlement_model_report
-from apps.worker.lib.internal_demand_copilot import build_internal_demand_package
-from apps.worker.lib.artifacts_writer import build_export_evidence_graph
-from apps.worker.lib.citation_fidelity import assess_claim_row_fidelity
+from apps.worker.lib.artifacts_writer import save_evidence_graph_artifact
 from apps.worker.lib.observability import write_run_observability, make_stage_timings
 
 logger = logging.getLogger(__name__)
 RUN_TIMEOUT_SECONDS = int(os.getenv("RUN_TIMEOUT_SECONDS", "1800"))
 API_BASE_URL = os.getenv("API_BASE_URL", "https://linecite-api.onrender.com")
 ERROR_MESSAGE_MAX_LEN = int(os.getenv("ERROR_MESSAGE_MAX_LEN", "2000"))
+_ANALYZER_STAGE_WORKERS = int(os.getenv("ANALYZER_STAGE_WORKERS", "4"))
 
 
 def _require_export_mode_config(config_dict: dict[str, Any]) -> str:
@@ -142,24 +107,6 @@ def _check_deadline(start_time: float, run_id: str, label: str) -> None:
     if elapsed > RUN_TIMEOUT_SECONDS:
         raise TimeoutError(f"Run {run_id} exceeded timeout at {label} ({int(elapsed)}s)")
 
-def _build_litigation_extensions(claim_rows: list[dict] | list[ClaimEdge], citations: list | None, config: RunConfig) -> dict:
-    all_rows = list(claim_rows); anchored_rows = [r for r in all_rows if (r.get("citations") or [])]
-    citation_fidelity = assess_claim_row_fidelity(all_rows, list(citations or []))
-    collapse_candidates = build_case_collapse_candidates(anchored_rows)
-    attack_paths = build_defense_attack_paths(collapse_candidates, limit=config.litigation_defense_paths_limit)
-    objection_profiles = build_objection_profiles(all_rows, limit=config.litigation_objection_profiles_limit)
-    upgrade_recs = build_upgrade_recommendations(collapse_candidates, limit=config.litigation_upgrade_recommendations_limit)
-    locked_quotes: list[dict] = []
-    for row in select_top_claim_rows(anchored_rows, limit=config.litigation_quote_lock_limit):
-        q = quote_lock(str(row.get("assertion") or ""))
-        if q: locked_quotes.append({"id": str(row.get("id") or ""), "date": str(row.get("date") or "unknown"), "claim_type": str(row.get("claim_type") or ""), "quote": q, "citation": str(row.get("citation") or ""), "event_id": str(row.get("event_id") or "")})
-    causation_chains = build_causation_ladders(all_rows)
-    contradiction_matrix = build_contradiction_matrix(all_rows, limit=config.litigation_contradiction_limit)
-    narrative_duality = build_narrative_duality(all_rows)
-    comparative_snapshot = build_comparative_pattern_snapshot(all_rows)
-    payload = {"claim_rows": all_rows, "causation_chains": causation_chains, "citation_fidelity": citation_fidelity, "case_collapse_candidates": collapse_candidates, "defense_attack_paths": attack_paths, "objection_profiles": objection_profiles, "evidence_upgrade_recommendations": upgrade_recs, "quote_lock_rows": locked_quotes, "contradiction_matrix": contradiction_matrix, "narrative_duality": narrative_duality, "comparative_pattern_engine": comparative_snapshot}
-    return LitigationExtensions.model_validate(payload).model_dump(mode="json")
-
 def run_pipeline(run_id: str) -> None:
     started_at = datetime.now(timezone.utc); start_time = time.time(); all_warnings = []
     stage_timings = make_stage_timings()
@@ -234,31 +181,16 @@ def run_pipeline(run_id: str) -> None:
 
         dates = extract_dates_for_pages(quality_filtered_pages, page_provider_map=page_provider_map)
 
+        # Extraction streams batch by batch through the fused fact quality gate and
+        # patient-scope assignment. Citations accumulate in a columnar store and are
+        # materialized as pydantic models once, at the boundary below.
         all_events, all_citations, all_skipped = [], [], []
-        # Extraction logic
-        e, c, w, s = extract_clinical_events(quality_filtered_pages, dates, providers, config, page_provider_map); all_events.extend(e); all_citations.extend(c); all_skipped.extend(s)
-        e, c, w, s = extract_imaging_events(quality_filtered_pages, dates, providers, config, page_provider_map, page_text_by_number={p.page_number: (p.text or "") for p in quality_filtered_pages}); all_events.extend(e); all_citations.extend(c); all_skipped.extend(s)
-        e, c, w, s = extract_pt_events(quality_filtered_pages, dates, providers, config, page_provider_map); all_events.extend(e); all_citations.extend(c); all_skipped.extend(s)
-        e, c, w, s = extract_billing_events(quality_filtered_pages, dates, providers, config, page_provider_map); all_events.extend(e); all_citations.extend(c); all_skipped.extend(s)
-        e, c, w, s = extract_lab_events(quality_filtered_pages, dates, providers, config, page_provider_map); all_events.extend(e); all_citations.extend(c); all_skipped.extend(s)
-        e, c, w, s = extract_discharge_events(quality_filtered_pages, dates, providers, config, page_provider_map); all_events.extend(e); all_citations.extend(c); all_skipped.extend(s)
-        e, c, w, s = extract_operative_events(quality_filtered_pages, dates, providers, config, page_provider_map); all_events.extend(e); all_citations.extend(c); all_skipped.extend(s)
-
-        # Quality Gate
         quality_stats = {"num_snippets_filtered": 0, "num_snippets_cleaned": 0}
-        clean_events = []
-        for evt in all_events:
-            cleaned_facts = []
-            for fact in evt.facts or []:
-                text = str(getattr(fact, "text", "") or "")
-                cleaned = clean_text(text)
-                if cleaned and cleaned != text: quality_stats["num_snippets_cleaned"] += 1
-                if is_garbage(cleaned): quality_stats["num_snippets_filtered"] += 1; continue
-                fact.text = cleaned; cleaned_facts.append(fact)
-            if cleaned_facts: evt.facts = cleaned_facts; clean_events.append(evt)
-        all_events = clean_events
-
-        assign_patient_scope_to_events(all_events, page_to_patient_scope)
+        with collecting_citations() as citation_store:
+            for batch in stream_events(quality_filtered_pages, dates, providers, config, page_provider_map, page_to_patient_scope, quality_stats):
+                all_events.extend(batch.events); all_citations.extend(batch.citations); all_skipped.extend(batch.skipped)
+        all_citations = citation_store.materialize(all_citations)
+
         enforce_event_patient_scope(all_events, all_citations, page_to_patient_scope)
         all_citations, _ = post_process_citations(all_citations)
         pt_evidence_ext = build_pt_evidence_extensions(
@@ -269,11 +201,13 @@ def run_pipeline(run_id: str) -> None:
             citations=all_citations,
         )
         all_events, _ = deduplicate_events(all_events)
-        all_events, _ = apply_confidence_scoring(all_events, config)
+        confidence_matrix = ConfidenceMatrix(all_events)
+        all_events, _ = apply_confidence_scoring(all_events, config, matrix=confidence_matrix)
         weight_summary = annotate_event_weights(all_events)
+        temporal_index = TemporalIndex(all_events, scope_of=_patient_scope_id)
 
-        chronology_events = improve_legal_usability([e.model_copy(deep=True) for e in all_events])
-        export_events = filter_for_export([e.model_copy(deep=True) for e in all_events], config)
+        chronology_events = improve_legal_usability(fork_events(all_events))
+        export_events = filter_for_export(fork_events(all_events), config)
         export_events, gaps, _ = detect_gaps(export_events, config)
         export_events = improve_legal_usability(export_events)
 
@@ -307,170 +241,25 @@ def run_pipeline(run_id: str) -> None:
         for p in all_pages: pt = str(p.page_type or "other"); page_type_counts[pt] = page_type_counts.get(pt, 0) + 1
         event_type_counts = {}
         for e in all_events: et = str(e.event_type); event_type_counts[et] = event_type_counts.get(et, 0) + 1
-        evidence_graph.extensions["extraction_metrics"] = {"pages_total": len(all_pages), "pages_classified": page_type_counts, "providers_detected": len(providers), "events_total": len(all_events), "events_by_type": event_type_counts, "events_exported": len(chronology_events), "facts_total": sum(len(e.facts) for e in all_events), "citations_total": len(all_citations)}
+        evidence_graph.extensions["extraction_metrics"] = {"pages_total": len(all_pages), "pages_classified": page_type_counts, "providers_detected": len(providers), "events_total": len(all_events), "events_by_type": event_type_counts, "events_exported": len(chronology_events), "facts_total": sum(len(e.facts) for e in all_events), "citations_total": len(all_citations), "confidence_contributions": confidence_matrix.summary(config.confidence_scoring)}
         evidence_graph.extensions["quality_gate"] = quality_stats
         evidence_graph.extensions["event_weighting"] = weight_summary
 
-        # Ã¢â€â‚¬Ã¢â€â‚¬ Step 14-17: Artifacts Ã¢â€â‚¬Ã¢â€â‚¬
-        claim_edges = build_claim_edges([], raw_events=chronology_events, all_citations=all_citations)
-        evidence_graph.extensions.update(_build_litigation_extensions(claim_edges, all_citations, config))
-
-        providers_normalized = normalize_provider_entities(evidence_graph)
-        evidence_graph.extensions["providers_normalized"] = providers_normalized
-        evidence_graph.extensions["coverage_spans"] = compute_coverage_spans(providers_normalized)
-        prov_csv_ref, prov_json_ref = render_provider_directory(run_id, providers_normalized)
-        patient_partitions_json_ref = render_patient_partitions(run_id, patient_partitions_payload)
-
-        missing_records_payload = detect_missing_records(evidence_graph, providers_normalized)
-        evidence_graph.extensions["missing_records"] = missing_records_payload
-        mr_csv_ref, mr_json_ref = render_missing_records(run_id, missing_records_payload)
-
-        missing_record_requests_payload = generate_missing_record_requests(evidence_graph)
-        mrr_csv_ref, mrr_json_ref, mrr_md_ref = render_missing_record_requests(run_id, missing_record_requests_payload)
-
-        billing_lines_payload = extract_billing_lines(evidence_graph, providers_normalized)
-        bl_csv_ref, bl_json_ref = render_billing_lines(run_id, billing_lines_payload)
-
-        specials_payload = compute_specials_summary(billing_lines_payload, providers_normalized)
-        evidence_graph.extensions["specials_summary"] = specials_payload
-        ss_csv_ref, ss_json_ref, ss_pdf_ref = render_specials_summary(run_id, specials_payload, matter_title)
-
-        renderer_manifest = build_renderer_manifest(
-            events=chronology_events,
-            evidence_graph_extensions=evidence_graph.extensions,
-            specials_summary=specials_payload,
-            citations=all_citations,
-        )
-        evidence_graph.extensions["renderer_manifest"] = renderer_manifest.model_dump(mode="json")
-        registry_payload = build_competitive_registries(
-            events=chronology_events,
-            providers=providers,
-            citations=all_citations,
-            mechanism=str(getattr(renderer_manifest.mechanism, "value", "") or ""),
-        )
-        evidence_graph.extensions.update(registry_payload)
-        rm_with_registry = renderer_manifest.model_dump(mode="json")
-        for key in (
-            "visit_abstraction_registry",
-            "provider_role_registry",
-            "diagnosis_registry",
-            "injury_clusters",
-            "injury_cluster_severity",
-            "treatment_escalation_path",
-            "causation_timeline_registry",
-            "visit_bucket_quality",
-            "registry_contract_version",
-        ):
-            rm_with_registry[key] = registry_payload.get(key)
-        evidence_graph.extensions["renderer_manifest"] = rm_with_registry
-
-        # Ã¢â€â‚¬Ã¢â€â‚¬ Step 18: Paralegal artifacts Ã¢â€â‚¬Ã¢â€â‚¬
-        page_map = build_page_map(all_pages, source_documents)
-        projection_for_metrics = build_chronology_projection(
-            events=chronology_events,
-            providers=providers,
-            page_map=page_map,
-            page_provider_map=page_provider_map,
-            page_text_by_number={p.page_number: (p.text or "") for p in all_pages},
-            config=config,
-        )
-        evidence_graph.extensions["provider_resolution_quality"] = compute_provider_resolution_quality(
-            projection_for_metrics.entries
-        )
-        evidence_graph.extensions["provider_resolution_quality"] = augment_provider_resolution_quality(
-            evidence_graph.extensions.get("provider_resolution_quality"),
-            pt_encounters=list(evidence_graph.extensions.get("pt_encounters") or []),
-        )
-        evidence_graph.extensions["claim_context_alignment"] = run_claim_context_alignment(
-            evidence_graph_payload=evidence_graph.model_dump(mode="json"),
-            renderer_manifest=renderer_manifest.model_dump(mode="json"),
-        )
-        annotated_manifest = annotate_renderer_manifest_claim_context_alignment(
-            renderer_manifest,
-            evidence_graph.extensions,
-        )
-        if isinstance(annotated_manifest, type(renderer_manifest)):
-            renderer_manifest = annotated_manifest
-            rm_with_registry = renderer_manifest.model_dump(mode="json")
-            for key in (
-                "visit_abstraction_registry",
-                "provider_role_registry",
-                "diagnosis_registry",
-                "injury_clusters",
-                "injury_cluster_severity",
-                "treatment_escalation_path",
-                "causation_timeline_registry",
-                "visit_bucket_quality",
-                "registry_contract_version",
-            ):
-                rm_with_registry[key] = evidence_graph.extensions.get(key)
-            evidence_graph.extensions["renderer_manifest"] = rm_with_registry
-        billing_status_upper = str(renderer_manifest.billing_completeness or "none").strip().upper()
-        pt_recon = (
-            evidence_graph.extensions.get("pt_reconciliation")
-            if isinstance(evidence_graph.extensions.get("pt_reconciliation"), dict)
-            else {}
-        )
-        reported_pt_counts = list(pt_recon.get("reported_pt_counts") or []) if isinstance(pt_recon, dict) else []
-        numeric_pt_counts = [renderer_manifest.pt_summary.total_encounters]
-        numeric_pt_counts.extend(reported_pt_counts)
-        evidence_graph.extensions["litigation_safe_v1"] = validate_litigation_safe_v1(
-            build_litigation_safe_v1_snapshot(renderer_manifest.model_dump(mode="json")),
-            chronology_events,
-            {
-                "billingStatus": billing_status_upper or "NONE",
-                "gaps": gaps,
-                "missing_records": evidence_graph.extensions.get("missing_records") or {},
-                "renderer_manifest": renderer_manifest.model_dump(mode="json"),
-                "billingPresentation": {
-                    "visibleIncompleteDisclosure": True,
-                    "noGlobalTotalSpecials": True,
-                    "partialTotalsLabeled": True,
-                },
-                "ptEvidence": pt_recon or {},
-                "claimContextAlignment": evidence_graph.extensions.get("claim_context_alignment") or {},
-                "numericAggregates": {
-                    "pt_total_encounters": numeric_pt_counts,
-                },
-            },
-        )
-        evidence_graph.extensions["settlement_leverage_model"] = build_settlement_leverage_model(
-            evidence_graph_payload=evidence_graph.model_dump(mode="json"),
-            renderer_manifest=renderer_manifest.model_dump(mode="json"),
-        )
-        _sfp = build_settlement_feature_pack(
-            evidence_graph_payload=evidence_graph.model_dump(mode="json"),
-            renderer_manifest=renderer_manifest.model_dump(mode="json"),
-        )
-        evidence_graph.extensions["settlement_feature_pack"] = _sfp
-        _dam = build_defense_attack_map(
-            evidence_graph_payload=evidence_graph.model_dump(mode="json"),
-            renderer_manifest=renderer_manifest.model_dump(mode="json"),
-            feature_pack=_sfp,
-        )
-        evidence_graph.extensions["defense_attack_map"] = _dam
-        _csi = build_case_severity_index(
-            evidence_graph_payload=evidence_graph.model_dump(mode="json"),
-            renderer_manifest=renderer_manifest.model_dump(mode="json"),
-            feature_pack=_sfp,
-        )
-        evidence_graph.extensions["case_severity_index"] = _csi
-        evidence_graph.extensions["severity_profile"] = build_severity_profile(_csi)
-        evidence_graph.extensions["settlement_model_report"] = build_settlement_model_report(
-            feature_pack=_sfp,
-            dam=_dam,
-            csi=_csi,
-            settlement_leverage_model=evidence_graph.extensions.get("settlement_leverage_model"),
-        )
-        evidence_graph.extensions["internal_demand_package"] = build_internal_demand_package(
-            evidence_graph=evidence_graph.model_dump(mode="json"),
-            csi_internal=_csi,
-            damages_structured=specials_payload,
-        )
-        paralegal_payload = build_paralegal_chronology_payload(evidence_graph, chronology_events, providers, page_map)
-        evidence_graph.extensions["paralegal_chronology"] = paralegal_payload
-        extraction_notes_md = generate_extraction_notes_md(evidence_graph, chronology_events, page_map)
-        paralegal_chronology_md_ref, extraction_notes_md_ref = render_paralegal_chronology_artifacts(run_id, paralegal_payload, extraction_notes_md)
+        # Ã¢â€â‚¬Ã¢â€â‚¬ Step 14-18: Analyzers & artifacts (stage graph, see pipeline_stages) Ã¢â€â‚¬Ã¢â€â‚¬
+        # Analyzers read JSON payloads; serialize each field once and share read-only views.
+        graph_snapshot = ModelSnapshot(evidence_graph)
+        # Schema-check the graph sections now so failures surface here; the final check reuses the validated sub-trees.
+        schema_check = ValidationSession()
+        schema_errors = schema_check.validate_section("EvidenceGraph", graph_snapshot.view(), path=("outputs", "evidence_graph"))
+        if schema_errors: logger.warning("[%s] evidence graph fails schema validation before analyzers (%d errors): %s", run_id, len(schema_errors), schema_errors[:5])
+        stage_state = {"run_id": run_id, "config": config, "matter_title": matter_title, "evidence_graph": evidence_graph, "graph_snapshot": graph_snapshot, "chronology_events": chronology_events, "all_citations": all_citations, "providers": providers, "all_pages": all_pages, "source_documents": source_documents, "page_provider_map": page_provider_map, "gaps": gaps, "temporal_index": temporal_index, "patient_partitions_payload": patient_partitions_payload}
+        run_analyzer_stages(stage_state, export_mode=export_mode, max_workers=_ANALYZER_STAGE_WORKERS, timings=stage_timings)
+        manifest_snapshot, page_map, projection_for_metrics = stage_state["manifest_snapshot"], stage_state["page_map"], stage_state["projection_for_metrics"]
+        specials_payload = stage_state["ext.specials_summary"]
+        prov_csv_ref, prov_json_ref, patient_partitions_json_ref = stage_state["prov_csv_ref"], stage_state["prov_json_ref"], stage_state["patient_partitions_json_ref"]
+        mr_csv_ref, mr_json_ref, mrr_csv_ref, mrr_json_ref, mrr_md_ref = stage_state["mr_csv_ref"], stage_state["mr_json_ref"], stage_state["mrr_csv_ref"], stage_state["mrr_json_ref"], stage_state["mrr_md_ref"]
+        bl_csv_ref, bl_json_ref, ss_csv_ref, ss_json_ref, ss_pdf_ref = stage_state["bl_csv_ref"], stage_state["bl_json_ref"], stage_state["ss_csv_ref"], stage_state["ss_json_ref"], stage_state["ss_pdf_ref"]
+        paralegal_chronology_md_ref, extraction_notes_md_ref = stage_state["paralegal_chronology_md_ref"], stage_state["extraction_notes_md_ref"]
 
         # Ã¢â€â‚¬Ã¢â€â‚¬ Step 19/20: LLM Ã¢â€â‚¬Ã¢â€â‚¬
         if config.enable_llm_reasoning:
@@ -500,13 +289,13 @@ def run_pipeline(run_id: str) -> None:
             all_citations=all_citations,
             narrative_synthesis=narrative_synthesis,
             page_text_by_number={p.page_number: (p.text or "") for p in all_pages},
-            evidence_graph_payload=evidence_graph.model_dump(mode="json"),
+            evidence_graph_payload=graph_snapshot.mutable_copy("extensions"),
             specials_summary=specials_payload,
             config=config,
             renderer_manifest=(
                 evidence_graph.extensions.get("renderer_manifest")
                 if isinstance(evidence_graph.extensions.get("renderer_manifest"), dict)
-                else renderer_manifest.model_dump(mode="json")
+                else manifest_snapshot.view()
             ),
         )
         patient_chronologies_json_ref = render_patient_chronology_reports(
@@ -524,24 +313,25 @@ def run_pipeline(run_id: str) -> None:
             run_id,
             chronology_events,
             {p.page_number: (p.text or "") for p in all_pages},
-            extensions=evidence_graph.extensions,
+            extensions=graph_snapshot.view()["extensions"],
         )
         all_warnings.extend(review_warnings)
 
         run_record = create_run_record(run_id, started_at, source_documents, evidence_graph, chronology, all_warnings, processing_seconds)
         full_result = ChronologyResult(schema_version="0.1.0", generated_at=datetime.now(timezone.utc), case=case_info, inputs=PipelineInputs(source_documents=source_documents, run_config=config), outputs=PipelineOutputs(run=run_record, evidence_graph=evidence_graph, chronology=chronology))
 
-        full_output_dict = full_result.model_dump(mode="json")
-        eg_dict = build_export_evidence_graph(evidence_graph.model_dump(mode="json"), export_mode)
-        json_bytes = json.dumps(eg_dict, indent=2, default=str).encode()
-        json_path = save_artifact(run_id, "evidence_graph.json", json_bytes)
-        json_sha = hashlib.sha256(json_bytes).hexdigest()
+        full_output_dict = full_result.model_dump(mode="json", exclude={"outputs": {"evidence_graph"}})
+        # Post-analyzer steps only reassign graph fields / extension keys (LLM output, narrative) and
+        # exports get copies, so the snapshot re-dumps just those and the schema check skips the rest.
+        final_graph_view = graph_snapshot.view()
+        full_output_dict["outputs"]["evidence_graph"] = final_graph_view
+        eg_written = save_evidence_graph_artifact(run_id, final_graph_view, export_mode, default=str, allow_gzip=True)
         if not chronology.exports.json_export:
-            chronology.exports.json_export = ArtifactRef(uri=str(json_path), sha256=json_sha, bytes=len(json_bytes))
+            chronology.exports.json_export = ArtifactRef(uri=str(eg_written.path), sha256=eg_written.sha256, bytes=eg_written.bytes)
         else:
-            chronology.exports.json_export.uri, chronology.exports.json_export.sha256, chronology.exports.json_export.bytes = str(json_path), json_sha, len(json_bytes)
+            chronology.exports.json_export.uri, chronology.exports.json_export.sha256, chronology.exports.json_export.bytes = str(eg_written.path), eg_written.sha256, eg_written.bytes
 
-        is_valid, errors = validate_output(full_output_dict)
+        is_valid, errors = schema_check.validate_output(full_output_dict)
         status = "success" if is_valid else "partial"
 
         # Run quality gates before finalizing
@@ -622,6 +412,9 @@ def run_pipeline(run_id: str) -> None:
         # Compute total packet bytes for observability
         total_packet_bytes = sum(getattr(d, "bytes", 0) or 0 for d in source_documents)
 
+        # Barrier: artifact rows are committed only once their remote uploads have finished.
+        upload_failures = flush_artifact_uploads(run_id)
+        if upload_failures: all_warnings.append(Warning(code="ARTIFACT_UPLOAD_FAILED", message=f"{len(upload_failures)} artifact upload(s) failed: {', '.join(upload_failures[:5])}"))
         persist_pipeline_state(
             run_id, status, processing_seconds, run_record, all_warnings,
             evidence_graph, artifact_entries, gate_results,
@@ -649,11 +442,12 @@ def _run_production_quality_gates(
     """
     Run quality gates on the production pipeline output.
     
-    Extracts text from the rendered PDF and runs attorney readiness
-    and LUQA checks to ensure quality before export.
+    Reads the text the renderer recorded for the PDF (its chronology_text.json
+    sidecar) and runs attorney readiness and LUQA checks to ensure quality
+    before export. The PDF is only re-parsed when no sidecar was written.
     """
     from apps.worker.lib.quality_gates import run_quality_gates
-    import fitz
+    from apps.worker.steps.export_render.rendered_text import TEXT_SIDECAR_NAME, RenderedText
     
     try:
         # Get PDF path from chronology exports
@@ -670,11 +464,16 @@ def _run_production_quality_gates(
         # Convert Path to string if needed
         pdf_path_str = str(pdf_path)
         
-        # Extract text from PDF
+        # Text as rendered, falling back to extracting it from the PDF
         try:
-            doc = fitz.open(pdf_path_str)
-            report_text = "\n".join((doc[i].get_text("text") or "") for i in range(doc.page_count))
-            doc.close()
+            sidecar_path = Path(pdf_path_str).with_name(TEXT_SIDECAR_NAME)
+            if sidecar_path.exists():
+                report_text = RenderedText.from_dict(json.loads(sidecar_path.read_text(encoding="utf-8"))).text
+            else:
+                import fitz
+                doc = fitz.open(pdf_path_str)
+                report_text = "\n".join((doc[i].get_text("text") or "") for i in range(doc.page_count))
+                doc.close()
         except Exception as e:
             logger.warning(f"Failed to extract text from PDF for quality gates: {e}")
             return {"overall_pass": True, "skipped": True}
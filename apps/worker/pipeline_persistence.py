@@ -5,10 +5,13 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Iterator, Optional
 
+from packages.db.bulk import bulk_insert, diff_rows
 from packages.db.database import get_session
+from packages.db.page_text import page_blob_refs, store_page_blobs
 from packages.db.models import (
     Artifact as ArtifactORM,
     Citation as CitationORM,
@@ -26,6 +29,12 @@ from apps.worker.lib.observability import write_run_observability
 
 logger = logging.getLogger(__name__)
 
+# "diff": re-persisting a run writes only new, changed and removed rows.
+# "replace": delete every row of the run, then re-insert the whole graph.
+PERSIST_MODE = os.getenv("PERSIST_MODE", "diff").strip().lower()
+# Artifact ids are generated on insert, so artifact rows are matched on their content.
+_ARTIFACT_DIFF_KEY = ("artifact_type", "storage_uri", "sha256", "bytes")
+
 
 def persist_pipeline_state(
     run_id: str,
@@ -41,6 +50,7 @@ def persist_pipeline_state(
     packet_bytes: int | None = None,
     invariant_results: list[dict] | None = None,
     stage_timings: dict[str, float] | None = None,
+    persist_mode: str | None = None,
 ) -> None:
     try:
         with get_session() as session:
@@ -77,105 +87,24 @@ def persist_pipeline_state(
                 stage_timings=stage_timings,
             )
 
-            # Idempotency: clear prior rows for this run.
-            session.query(PageORM).filter_by(run_id=run_id).delete()
-            session.query(DocumentSegmentORM).filter_by(run_id=run_id).delete()
-            session.query(ProviderORM).filter_by(run_id=run_id).delete()
-            session.query(EventORM).filter_by(run_id=run_id).delete()
-            session.query(CitationORM).filter_by(run_id=run_id).delete()
-            session.query(GapORM).filter_by(run_id=run_id).delete()
-            session.query(ArtifactORM).filter_by(run_id=run_id).delete()
-            # Note: InvariantResult and RunMetric are NOT cleared — they are append-only audit logs
-            session.flush()
-
-            for page in evidence_graph.pages:
-                session.add(PageORM(
-                    id=page.page_id,
-                    run_id=run_id,
-                    source_document_id=page.source_document_id,
-                    page_number=page.page_number,
-                    text=page.text,
-                    text_source=page.text_source,
-                    page_type=page.page_type.value if page.page_type else None,
-                    layout_json=page.layout.model_dump(mode="json") if page.layout else None,
-                ))
-
-            for doc in evidence_graph.documents:
-                session.add(DocumentSegmentORM(
-                id=doc.document_id,
-                run_id=run_id,
-                source_document_id=doc.source_document_id,
-                page_start=doc.page_start,
-                page_end=doc.page_end,
-                page_types_json=[pt.model_dump(mode="json") for pt in doc.page_types],
-                declared_document_type=doc.declared_document_type.value if doc.declared_document_type else None,
-                confidence=doc.confidence,
-                ))
-
-            for prov in evidence_graph.providers:
-                session.add(ProviderORM(
-                id=prov.provider_id,
-                run_id=run_id,
-                detected_name_raw=prov.detected_name_raw,
-                normalized_name=prov.normalized_name,
-                provider_type=prov.provider_type.value,
-                confidence=prov.confidence,
-                evidence_json=[e.model_dump(mode="json") for e in prov.evidence],
-                ))
-
-            for cit in evidence_graph.citations:
-                session.add(CitationORM(
-                id=cit.citation_id,
-                run_id=run_id,
-                source_document_id=cit.source_document_id,
-                page_number=cit.page_number,
-                snippet=cit.snippet,
-                bbox_json=cit.bbox.model_dump(mode="json"),
-                text_hash=cit.text_hash,
-                ))
-
-            for evt in evidence_graph.events:
-                pid_fk = evt.provider_id if evt.provider_id and evt.provider_id != "unknown" else None
-                session.add(EventORM(
-                id=evt.event_id,
-                run_id=run_id,
-                provider_id=pid_fk,
-                event_type=evt.event_type.value,
-                date_json=evt.date.model_dump(mode="json") if evt.date else None,
-                encounter_type_raw=evt.encounter_type_raw,
-                facts_json=[f.model_dump(mode="json") for f in evt.facts],
-                diagnoses_json=[d.model_dump(mode="json") for d in evt.diagnoses],
-                procedures_json=[p.model_dump(mode="json") for p in evt.procedures],
-                imaging_json=evt.imaging.model_dump(mode="json") if evt.imaging else None,
-                billing_json=evt.billing.model_dump(mode="json") if evt.billing else None,
-                confidence=evt.confidence,
-                flags_json=evt.flags,
-                citation_ids_json=evt.citation_ids,
-                source_page_numbers_json=evt.source_page_numbers,
-                extensions_json=evt.extensions,
-                ))
-
-            for gap in evidence_graph.gaps:
-                session.add(GapORM(
-                id=gap.gap_id,
-                run_id=run_id,
-                start_date=gap.start_date.isoformat(),
-                end_date=gap.end_date.isoformat(),
-                duration_days=gap.duration_days,
-                threshold_days=gap.threshold_days,
-                confidence=gap.confidence,
-                related_event_ids_json=gap.related_event_ids,
-            ))
-
-            for atype, aref in artifact_entries:
-                if aref:
-                    session.add(ArtifactORM(
-                        run_id=run_id,
-                        artifact_type=atype,
-                        storage_uri=aref.uri,
-                        sha256=aref.sha256,
-                        bytes=aref.bytes,
-                    ))
+            blob_refs = store_page_blobs(session, evidence_graph.pages)
+            tables = graph_table_rows(run_id, evidence_graph, artifact_entries, blob_refs=blob_refs)
+            if (persist_mode or PERSIST_MODE) == "replace":
+                # Idempotency: clear prior rows for this run.
+                session.query(PageORM).filter_by(run_id=run_id).delete()
+                session.query(DocumentSegmentORM).filter_by(run_id=run_id).delete()
+                session.query(ProviderORM).filter_by(run_id=run_id).delete()
+                session.query(EventORM).filter_by(run_id=run_id).delete()
+                session.query(CitationORM).filter_by(run_id=run_id).delete()
+                session.query(GapORM).filter_by(run_id=run_id).delete()
+                session.query(ArtifactORM).filter_by(run_id=run_id).delete()
+                # Note: InvariantResult and RunMetric are NOT cleared — they are append-only audit logs
+                session.flush()
+
+                for model, rows in tables:
+                    bulk_insert(session, model, rows)
+            else:
+                _persist_diff(session, run_id, tables)
     except Exception as exc:
         # CRITICAL: If any row fails (constraint violation, data overflow),
         # the transaction rolls back. We MUST catch this and mark the run
@@ -184,6 +113,133 @@ def persist_pipeline_state(
         _fail_run_persisted(run_id, f"Persist failed: {exc}")
 
 
+def _persist_diff(session, run_id: str, tables: Iterator[tuple[type, Iterator[dict[str, Any]]]]) -> None:
+    """Idempotency by difference: only rows that are new, changed or gone for this run are written."""
+    diffs = [
+        diff_rows(session, model, rows, scope={"run_id": run_id}, key=_ARTIFACT_DIFF_KEY if model is ArtifactORM else None)
+        for model, rows in tables
+    ]
+    # Children are deleted before their parents and parents written before their children.
+    for diff in reversed(diffs):
+        diff.delete(session)
+    for diff in diffs:
+        diff.write(session)
+    logger.info(f"[{run_id}] Persisted by diff: " + ", ".join(f"{d.table.name}={d.stats.as_dict()}" for d in diffs))
+
+
+def graph_table_rows(
+    run_id: str,
+    evidence_graph: EvidenceGraph,
+    artifact_entries: list[tuple[str, Optional[ArtifactRef]]],
+    blob_refs: dict[str, tuple[Optional[str], Optional[str]]] | None = None,
+) -> Iterator[tuple[type, Iterator[dict[str, Any]]]]:
+    """
+    (ORM model, row dicts) per run-scoped table, parents before children.
+
+    Page rows reference their text and layout blobs (``blob_refs`` from
+    ``store_page_blobs``); the blobs themselves must already be stored.
+    """
+    if blob_refs is None:
+        blob_refs = page_blob_refs(evidence_graph.pages)
+    yield PageORM, (
+        {
+            "id": page.page_id,
+            "run_id": run_id,
+            "source_document_id": page.source_document_id,
+            "page_number": page.page_number,
+            "text": None,
+            "text_source": page.text_source,
+            "page_type": page.page_type.value if page.page_type else None,
+            "layout_json": None,
+            "text_sha256": blob_refs[page.page_id][0],
+            "layout_sha256": blob_refs[page.page_id][1],
+        }
+        for page in evidence_graph.pages
+    )
+    yield DocumentSegmentORM, (
+        {
+            "id": doc.document_id,
+            "run_id": run_id,
+            "source_document_id": doc.source_document_id,
+            "page_start": doc.page_start,
+            "page_end": doc.page_end,
+            "page_types_json": [pt.model_dump(mode="json") for pt in doc.page_types],
+            "declared_document_type": doc.declared_document_type.value if doc.declared_document_type else None,
+            "confidence": doc.confidence,
+        }
+        for doc in evidence_graph.documents
+    )
+    yield ProviderORM, (
+        {
+            "id": prov.provider_id,
+            "run_id": run_id,
+            "detected_name_raw": prov.detected_name_raw,
+            "normalized_name": prov.normalized_name,
+            "provider_type": prov.provider_type.value,
+            "confidence": prov.confidence,
+            "evidence_json": [e.model_dump(mode="json") for e in prov.evidence],
+        }
+        for prov in evidence_graph.providers
+    )
+    yield CitationORM, (
+        {
+            "id": cit.citation_id,
+            "run_id": run_id,
+            "source_document_id": cit.source_document_id,
+            "page_number": cit.page_number,
+            "snippet": cit.snippet,
+            "bbox_json": cit.bbox.model_dump(mode="json"),
+            "text_hash": cit.text_hash,
+        }
+        for cit in evidence_graph.citations
+    )
+    yield EventORM, (
+        {
+            "id": evt.event_id,
+            "run_id": run_id,
+            "provider_id": evt.provider_id if evt.provider_id and evt.provider_id != "unknown" else None,
+            "event_type": evt.event_type.value,
+            "date_json": evt.date.model_dump(mode="json") if evt.date else None,
+            "encounter_type_raw": evt.encounter_type_raw,
+            "facts_json": [f.model_dump(mode="json") for f in evt.facts],
+            "diagnoses_json": [d.model_dump(mode="json") for d in evt.diagnoses],
+            "procedures_json": [p.model_dump(mode="json") for p in evt.procedures],
+            "imaging_json": evt.imaging.model_dump(mode="json") if evt.imaging else None,
+            "billing_json": evt.billing.model_dump(mode="json") if evt.billing else None,
+            "confidence": evt.confidence,
+            "flags_json": evt.flags,
+            "citation_ids_json": evt.citation_ids,
+            "source_page_numbers_json": evt.source_page_numbers,
+            "extensions_json": evt.extensions,
+        }
+        for evt in evidence_graph.events
+    )
+    yield GapORM, (
+        {
+            "id": gap.gap_id,
+            "run_id": run_id,
+            "start_date": gap.start_date.isoformat(),
+            "end_date": gap.end_date.isoformat(),
+            "duration_days": gap.duration_days,
+            "threshold_days": gap.threshold_days,
+            "confidence": gap.confidence,
+            "related_event_ids_json": gap.related_event_ids,
+        }
+        for gap in evidence_graph.gaps
+    )
+    yield ArtifactORM, (
+        {
+            "run_id": run_id,
+            "artifact_type": atype,
+            "storage_uri": aref.uri,
+            "sha256": aref.sha256,
+            "bytes": aref.bytes,
+        }
+        for atype, aref in artifact_entries
+        if aref
+    )
+
+
 def _fail_run_persisted(run_id: str, error: str) -> None:
     """Mark a run as failed in a separate transaction (for persist failures)."""
     try:
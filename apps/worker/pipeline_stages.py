@@ -0,0 +1,505 @@
+"""
+Post-extraction analyzer stages for ``run_pipeline``, declared as a stage graph.
+
+Every stage reads and writes named state keys. Keys prefixed ``ext.`` are
+evidence-graph extensions: ``run_analyzer_stages`` mirrors them into
+``evidence_graph.extensions`` as they are produced and restores the historical
+key order at the end. Plain keys (``renderer_manifest``, ``page_map``, artifact
+refs, ...) are pipeline locals handed back to the caller.
+
+Stages only read extensions they declare. A stage handed the whole evidence
+graph (``evidence_graph``, its ``extensions`` or ``graph_snapshot.view()``)
+declares ``ext.*``, which orders it after every earlier extension writer.
+Valuation stages are lazy: they run
+only when the export mode keeps one of their outputs (``exported_extension_keys``)
+or a running stage reads from them. MEDIATION strips the valuation outputs, so
+only the feature pack and severity index run there, for the exported
+``severity_profile``. ``compute_valuation_extensions`` runs the same stages on
+demand over a stored ``evidence_graph.json`` payload.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Iterable
+
+from packages.shared.models import ClaimEdge, LitigationExtensions, RunConfig
+
+from apps.worker.lib.causation_ladder import build_causation_ladders
+from apps.worker.lib.citation_fidelity import assess_claim_row_fidelity
+from apps.worker.lib.claim_context_alignment import run_claim_context_alignment
+from apps.worker.lib.claim_ledger_lite import build_claim_edges, select_top_claim_rows
+from apps.worker.lib.analysis_context import AnalysisContext
+from apps.worker.lib.artifacts_writer import exported_extension_keys
+from apps.worker.lib.case_severity_index import build_case_severity_index
+from apps.worker.lib.defense_attack_map import build_defense_attack_map
+from apps.worker.lib.graph_snapshot import ModelSnapshot, freeze
+from apps.worker.lib.internal_demand_copilot import build_internal_demand_package
+from apps.worker.lib.litigation_safe_v1 import build_litigation_safe_v1_snapshot, validate_litigation_safe_v1
+from apps.worker.lib.provider_normalize import normalize_provider_entities, compute_coverage_spans
+from apps.worker.lib.provider_resolution_v1 import augment_provider_resolution_quality
+from apps.worker.lib.settlement_features import build_settlement_feature_pack
+from apps.worker.lib.settlement_leverage import build_settlement_leverage_model
+from apps.worker.lib.settlement_model import build_settlement_model_report
+from apps.worker.lib.severity_profile import build_severity_profile
+from apps.worker.lib.stage_graph import Stage, StageGraph, StageRun
+from apps.worker.lib.temporal_index import TemporalIndex
+from apps.worker.pipeline_artifacts import build_page_map
+from apps.worker.project.chronology import build_chronology_projection, compute_provider_resolution_quality
+from apps.worker.steps.case_collapse import (
+    build_case_collapse_candidates, build_defense_attack_paths,
+    build_objection_profiles, build_upgrade_recommendations, quote_lock,
+)
+from apps.worker.steps.litigation import (
+    build_comparative_pattern_snapshot, build_contradiction_matrix, build_narrative_duality,
+)
+from apps.worker.steps.step03b_patient_partitions import render_patient_partitions
+from apps.worker.steps.step14_provider_directory import render_provider_directory
+from apps.worker.steps.step15_missing_records import detect_missing_records, render_missing_records
+from apps.worker.steps.step15a_missing_record_requests import (
+    generate_missing_record_requests, render_missing_record_requests,
+)
+from apps.worker.steps.step16_billing_lines import extract_billing_lines, render_billing_lines
+from apps.worker.steps.step17_specials_summary import compute_specials_summary, render_specials_summary
+from apps.worker.steps.step18_paralegal_chronology import (
+    build_paralegal_chronology_payload, generate_extraction_notes_md, render_paralegal_chronology_artifacts,
+)
+from apps.worker.steps.step_renderer_manifest import build_renderer_manifest, annotate_renderer_manifest_claim_context_alignment
+from apps.worker.steps.step_visit_abstraction_registry import build_competitive_registries
+
+logger = logging.getLogger(__name__)
+
+EXT_PREFIX = "ext."
+
+_LITIGATION_KEYS = tuple(LitigationExtensions.model_fields)
+_REGISTRY_KEYS = (
+    "registry_contract_version",
+    "visit_abstraction_registry",
+    "provider_role_registry",
+    "diagnosis_registry",
+    "injury_clusters",
+    "injury_cluster_severity",
+    "treatment_escalation_path",
+    "causation_timeline_registry",
+    "visit_bucket_quality",
+)
+# Order the renderer manifest copies registry keys in (differs from the registry payload order).
+_MANIFEST_REGISTRY_KEYS = _REGISTRY_KEYS[1:] + _REGISTRY_KEYS[:1]
+
+
+EXT_ALL = EXT_PREFIX + "*"  # reads the whole evidence graph, every extension included
+
+
+def _ext(*names: str) -> tuple[str, ...]:
+    return tuple(EXT_PREFIX + n for n in names)
+
+
+def _build_litigation_extensions(claim_rows: list[dict] | list[ClaimEdge], citations: list | None, config: RunConfig) -> dict:
+    all_rows = list(claim_rows); anchored_rows = [r for r in all_rows if (r.get("citations") or [])]
+    citation_fidelity = assess_claim_row_fidelity(all_rows, list(citations or []))
+    collapse_candidates = build_case_collapse_candidates(anchored_rows)
+    attack_paths = build_defense_attack_paths(collapse_candidates, limit=config.litigation_defense_paths_limit)
+    objection_profiles = build_objection_profiles(all_rows, limit=config.litigation_objection_profiles_limit)
+    upgrade_recs = build_upgrade_recommendations(collapse_candidates, limit=config.litigation_upgrade_recommendations_limit)
+    locked_quotes: list[dict] = []
+    for row in select_top_claim_rows(anchored_rows, limit=config.litigation_quote_lock_limit):
+        q = quote_lock(str(row.get("assertion") or ""))
+        if q: locked_quotes.append({"id": str(row.get("id") or ""), "date": str(row.get("date") or "unknown"), "claim_type": str(row.get("claim_type") or ""), "quote": q, "citation": str(row.get("citation") or ""), "event_id": str(row.get("event_id") or "")})
+    causation_chains = build_causation_ladders(all_rows)
+    contradiction_matrix = build_contradiction_matrix(all_rows, limit=config.litigation_contradiction_limit)
+    narrative_duality = build_narrative_duality(all_rows)
+    comparative_snapshot = build_comparative_pattern_snapshot(all_rows)
+    payload = {"claim_rows": all_rows, "causation_chains": causation_chains, "citation_fidelity": citation_fidelity, "case_collapse_candidates": collapse_candidates, "defense_attack_paths": attack_paths, "objection_profiles": objection_profiles, "evidence_upgrade_recommendations": upgrade_recs, "quote_lock_rows": locked_quotes, "contradiction_matrix": contradiction_matrix, "narrative_duality": narrative_duality, "comparative_pattern_engine": comparative_snapshot}
+    return LitigationExtensions.model_validate(payload).model_dump(mode="json")
+
+
+# ── Claims & litigation ──────────────────────────────────────────────────────
+
+def _claim_edges(s: dict) -> dict:
+    return {"claim_edges": build_claim_edges([], raw_events=s["chronology_events"], all_citations=s["all_citations"])}
+
+
+def _litigation(s: dict) -> dict:
+    ext = _build_litigation_extensions(s["claim_edges"], s["all_citations"], s["config"])
+    return {EXT_PREFIX + k: ext.get(k) for k in _LITIGATION_KEYS}
+
+
+# ── Providers, records, billing ──────────────────────────────────────────────
+
+def _providers(s: dict) -> dict:
+    providers_normalized = normalize_provider_entities(s["evidence_graph"])
+    return {"ext.providers_normalized": providers_normalized, "ext.coverage_spans": compute_coverage_spans(providers_normalized, s["temporal_index"])}
+
+
+def _provider_directory(s: dict) -> dict:
+    prov_csv_ref, prov_json_ref = render_provider_directory(s["run_id"], s["ext.providers_normalized"])
+    return {"prov_csv_ref": prov_csv_ref, "prov_json_ref": prov_json_ref}
+
+
+def _patient_partitions(s: dict) -> dict:
+    return {"patient_partitions_json_ref": render_patient_partitions(s["run_id"], s["patient_partitions_payload"])}
+
+
+def _missing_records(s: dict) -> dict:
+    payload = detect_missing_records(s["evidence_graph"], s["ext.providers_normalized"], temporal_index=s["temporal_index"])
+    mr_csv_ref, mr_json_ref = render_missing_records(s["run_id"], payload)
+    return {"ext.missing_records": payload, "mr_csv_ref": mr_csv_ref, "mr_json_ref": mr_json_ref}
+
+
+def _missing_record_requests(s: dict) -> dict:
+    payload = generate_missing_record_requests(s["evidence_graph"])
+    mrr_csv_ref, mrr_json_ref, mrr_md_ref = render_missing_record_requests(s["run_id"], payload)
+    return {"mrr_csv_ref": mrr_csv_ref, "mrr_json_ref": mrr_json_ref, "mrr_md_ref": mrr_md_ref}
+
+
+def _billing_lines(s: dict) -> dict:
+    payload = extract_billing_lines(s["evidence_graph"], s["ext.providers_normalized"])
+    bl_csv_ref, bl_json_ref = render_billing_lines(s["run_id"], payload)
+    return {"billing_lines_payload": payload, "bl_csv_ref": bl_csv_ref, "bl_json_ref": bl_json_ref}
+
+
+def _specials(s: dict) -> dict:
+    payload = compute_specials_summary(s["billing_lines_payload"], s["ext.providers_normalized"])
+    ss_csv_ref, ss_json_ref, ss_pdf_ref = render_specials_summary(s["run_id"], payload, s["matter_title"])
+    return {"ext.specials_summary": payload, "ss_csv_ref": ss_csv_ref, "ss_json_ref": ss_json_ref, "ss_pdf_ref": ss_pdf_ref}
+
+
+# ── Renderer manifest & registries ───────────────────────────────────────────
+
+def _renderer_manifest(s: dict) -> dict:
+    # build_renderer_manifest records its mechanism audit into the extensions it is given;
+    # hand it a copy so the audit comes back as a declared output.
+    ext = dict(s["evidence_graph"].extensions)
+    manifest = build_renderer_manifest(
+        events=s["chronology_events"],
+        evidence_graph_extensions=ext,
+        specials_summary=s["ext.specials_summary"],
+        citations=s["all_citations"],
+    )
+    return {
+        "ext.mechanism_selection_audit": ext.get("mechanism_selection_audit"),
+        "renderer_manifest": manifest,
+        "ext.renderer_manifest": manifest.model_dump(mode="json"),
+    }
+
+
+def _registries(s: dict) -> dict:
+    manifest = s["renderer_manifest"]
+    registry_payload = build_competitive_registries(
+        events=s["chronology_events"],
+        providers=s["providers"],
+        citations=s["all_citations"],
+        mechanism=str(getattr(manifest.mechanism, "value", "") or ""),
+    )
+    rm_with_registry = manifest.model_dump(mode="json")
+    for key in _MANIFEST_REGISTRY_KEYS:
+        rm_with_registry[key] = registry_payload.get(key)
+    out = {EXT_PREFIX + k: registry_payload.get(k) for k in _REGISTRY_KEYS}
+    out["ext.renderer_manifest"] = rm_with_registry
+    return out
+
+
+def _projection(s: dict) -> dict:
+    page_map = build_page_map(s["all_pages"], s["source_documents"])
+    projection = build_chronology_projection(
+        events=s["chronology_events"],
+        providers=s["providers"],
+        page_map=page_map,
+        page_provider_map=s["page_provider_map"],
+        page_text_by_number={p.page_number: (p.text or "") for p in s["all_pages"]},
+        config=s["config"],
+    )
+    quality = augment_provider_resolution_quality(
+        compute_provider_resolution_quality(projection.entries),
+        pt_encounters=list(s["evidence_graph"].extensions.get("pt_encounters") or []),
+    )
+    return {"page_map": page_map, "projection_for_metrics": projection, "ext.provider_resolution_quality": quality}
+
+
+# ── Claim alignment & litigation-safe checks ─────────────────────────────────
+
+def _claim_context_alignment(s: dict) -> dict:
+    manifest_snapshot = ModelSnapshot(s["renderer_manifest"])
+    return {
+        "ext.claim_context_alignment": run_claim_context_alignment(
+            evidence_graph_payload=s["graph_snapshot"].view(),
+            renderer_manifest=manifest_snapshot.view(),
+        ),
+        "manifest_snapshot": manifest_snapshot,
+    }
+
+
+def _annotate_manifest(s: dict) -> dict:
+    manifest, manifest_snapshot = s["renderer_manifest"], s["manifest_snapshot"]
+    rm_with_registry = s["ext.renderer_manifest"]
+    annotated = annotate_renderer_manifest_claim_context_alignment(
+        manifest,
+        {"claim_context_alignment": s["ext.claim_context_alignment"]},
+    )
+    if isinstance(annotated, type(manifest)):
+        manifest = annotated
+        manifest_snapshot = ModelSnapshot(manifest)
+        rm_with_registry = manifest_snapshot.thaw()
+        for key in _MANIFEST_REGISTRY_KEYS:
+            rm_with_registry[key] = s[EXT_PREFIX + key]
+    return {"renderer_manifest": manifest, "manifest_snapshot": manifest_snapshot, "ext.renderer_manifest": rm_with_registry}
+
+
+def _litigation_safe(s: dict) -> dict:
+    manifest, manifest_snapshot = s["renderer_manifest"], s["manifest_snapshot"]
+    ext = s["evidence_graph"].extensions
+    billing_status_upper = str(manifest.billing_completeness or "none").strip().upper()
+    pt_recon = ext.get("pt_reconciliation") if isinstance(ext.get("pt_reconciliation"), dict) else {}
+    reported_pt_counts = list(pt_recon.get("reported_pt_counts") or []) if isinstance(pt_recon, dict) else []
+    numeric_pt_counts = [manifest.pt_summary.total_encounters]
+    numeric_pt_counts.extend(reported_pt_counts)
+    result = validate_litigation_safe_v1(
+        build_litigation_safe_v1_snapshot(manifest_snapshot.view()),
+        s["chronology_events"],
+        {
+            "billingStatus": billing_status_upper or "NONE",
+            "gaps": s["gaps"],
+            "missing_records": s["ext.missing_records"] or {},
+            "renderer_manifest": manifest_snapshot.view(),
+            "billingPresentation": {
+                "visibleIncompleteDisclosure": True,
+                "noGlobalTotalSpecials": True,
+                "partialTotalsLabeled": True,
+            },
+            "ptEvidence": pt_recon or {},
+            "claimContextAlignment": s["ext.claim_context_alignment"] or {},
+            "numericAggregates": {
+                "pt_total_encounters": numeric_pt_counts,
+            },
+        },
+        temporal_index=TemporalIndex(s["chronology_events"]),
+    )
+    return {"ext.litigation_safe_v1": result}
+
+
+# ── Valuation ────────────────────────────────────────────────────────────────
+
+def _analysis_context(s: dict) -> dict:
+    return {"analysis_context": AnalysisContext(s["graph_snapshot"].view())}
+
+
+def _settlement_leverage(s: dict) -> dict:
+    return {"ext.settlement_leverage_model": build_settlement_leverage_model(
+        evidence_graph_payload=s["graph_snapshot"].view(),
+        renderer_manifest=s["manifest_snapshot"].view(),
+        analysis_context=s["analysis_context"],
+    )}
+
+
+def _feature_pack(s: dict) -> dict:
+    return {"ext.settlement_feature_pack": build_settlement_feature_pack(
+        evidence_graph_payload=s["graph_snapshot"].view(),
+        renderer_manifest=s["manifest_snapshot"].view(),
+        analysis_context=s["analysis_context"],
+    )}
+
+
+def _defense_attack_map(s: dict) -> dict:
+    return {"ext.defense_attack_map": build_defense_attack_map(
+        evidence_graph_payload=s["graph_snapshot"].view(),
+        renderer_manifest=s["manifest_snapshot"].view(),
+        feature_pack=s["ext.settlement_feature_pack"],
+    )}
+
+
+def _case_severity_index(s: dict) -> dict:
+    return {"ext.case_severity_index": build_case_severity_index(
+        evidence_graph_payload=s["graph_snapshot"].view(),
+        renderer_manifest=s["manifest_snapshot"].view(),
+        feature_pack=s["ext.settlement_feature_pack"],
+        analysis_context=s["analysis_context"],
+    )}
+
+
+def _severity_profile(s: dict) -> dict:
+    return {"ext.severity_profile": build_severity_profile(s["ext.case_severity_index"])}
+
+
+def _settlement_model(s: dict) -> dict:
+    return {"ext.settlement_model_report": build_settlement_model_report(
+        feature_pack=s["ext.settlement_feature_pack"],
+        dam=s["ext.defense_attack_map"],
+        csi=s["ext.case_severity_index"],
+        settlement_leverage_model=s["ext.settlement_leverage_model"],
+    )}
+
+
+def _internal_demand(s: dict) -> dict:
+    return {"ext.internal_demand_package": build_internal_demand_package(
+        evidence_graph=s["graph_snapshot"].view(),
+        csi_internal=s["ext.case_severity_index"],
+        damages_structured=s["ext.specials_summary"],
+    )}
+
+
+# ── Paralegal artifacts ──────────────────────────────────────────────────────
+
+def _paralegal(s: dict) -> dict:
+    payload = build_paralegal_chronology_payload(s["evidence_graph"], s["chronology_events"], s["providers"], s["page_map"])
+    notes_md = generate_extraction_notes_md(s["evidence_graph"], s["chronology_events"], s["page_map"])
+    md_ref, notes_ref = render_paralegal_chronology_artifacts(s["run_id"], payload, notes_md)
+    return {"ext.paralegal_chronology": payload, "paralegal_chronology_md_ref": md_ref, "extraction_notes_md_ref": notes_ref}
+
+
+ANALYZER_STAGES = StageGraph([
+    Stage("claim_edges", _claim_edges, writes=("claim_edges",)),
+    Stage("litigation_extensions", _litigation, reads=("claim_edges",), writes=_ext(*_LITIGATION_KEYS)),
+    Stage("providers_normalized", _providers, writes=_ext("providers_normalized", "coverage_spans")),
+    Stage("provider_directory", _provider_directory, reads=_ext("providers_normalized"), writes=("prov_csv_ref", "prov_json_ref")),
+    Stage("patient_partitions", _patient_partitions, writes=("patient_partitions_json_ref",)),
+    Stage("missing_records", _missing_records, reads=_ext("providers_normalized"), writes=("ext.missing_records", "mr_csv_ref", "mr_json_ref")),
+    Stage("missing_record_requests", _missing_record_requests, reads=_ext("missing_records"), writes=("mrr_csv_ref", "mrr_json_ref", "mrr_md_ref")),
+    Stage("billing_lines", _billing_lines, reads=_ext("providers_normalized"), writes=("billing_lines_payload", "bl_csv_ref", "bl_json_ref")),
+    Stage("specials_summary", _specials, reads=("billing_lines_payload", "ext.providers_normalized"), writes=("ext.specials_summary", "ss_csv_ref", "ss_json_ref", "ss_pdf_ref")),
+    Stage(
+        "renderer_manifest", _renderer_manifest,
+        reads=(EXT_ALL,) + _ext("specials_summary", "claim_rows"),
+        writes=("ext.mechanism_selection_audit", "renderer_manifest", "ext.renderer_manifest"),
+    ),
+    Stage("registries", _registries, reads=("renderer_manifest",), writes=_ext(*_REGISTRY_KEYS, "renderer_manifest")),
+    Stage("projection", _projection, reads=(EXT_ALL, "ext.pt_encounters"), writes=("page_map", "projection_for_metrics", "ext.provider_resolution_quality")),
+    Stage("claim_context_alignment", _claim_context_alignment, reads=(EXT_ALL, "renderer_manifest"), writes=("ext.claim_context_alignment", "manifest_snapshot")),
+    Stage(
+        "annotate_manifest", _annotate_manifest,
+        reads=("renderer_manifest", "manifest_snapshot", "ext.renderer_manifest", "ext.claim_context_alignment") + _ext(*_REGISTRY_KEYS),
+        writes=("renderer_manifest", "manifest_snapshot", "ext.renderer_manifest"),
+    ),
+    Stage(
+        "litigation_safe_v1", _litigation_safe,
+        reads=(EXT_ALL, "renderer_manifest", "manifest_snapshot", "ext.missing_records", "ext.claim_context_alignment", "ext.pt_reconciliation"),
+        writes=("ext.litigation_safe_v1",),
+    ),
+    # Indexes events and citations only, which no analyzer stage changes.
+    Stage("analysis_context", _analysis_context, writes=("analysis_context",), lazy=True),
+    Stage(
+        "settlement_leverage_model", _settlement_leverage,
+        reads=(EXT_ALL, "analysis_context", "manifest_snapshot", "ext.claim_context_alignment"),
+        writes=("ext.settlement_leverage_model",), lazy=True,
+    ),
+    Stage("settlement_feature_pack", _feature_pack, reads=(EXT_ALL, "analysis_context", "manifest_snapshot"), writes=("ext.settlement_feature_pack",), lazy=True),
+    Stage(
+        "defense_attack_map", _defense_attack_map,
+        reads=(EXT_ALL, "manifest_snapshot", "ext.settlement_feature_pack"),
+        writes=("ext.defense_attack_map",), lazy=True,
+    ),
+    Stage(
+        "case_severity_index", _case_severity_index,
+        reads=(EXT_ALL, "analysis_context", "manifest_snapshot", "ext.settlement_feature_pack", "ext.litigation_safe_v1", "ext.defense_attack_paths"),
+        writes=("ext.case_severity_index",), lazy=True,
+    ),
+    Stage("severity_profile", _severity_profile, reads=_ext("case_severity_index"), writes=("ext.severity_profile",), lazy=True),
+    Stage(
+        "settlement_model_report", _settlement_model,
+        reads=_ext("settlement_feature_pack", "defense_attack_map", "case_severity_index", "settlement_leverage_model"),
+        writes=("ext.settlement_model_report",), lazy=True,
+    ),
+    Stage(
+        "internal_demand_package", _internal_demand,
+        reads=(EXT_ALL,) + _ext("case_severity_index", "specials_summary", "settlement_feature_pack", "litigation_safe_v1"),
+        writes=("ext.internal_demand_package",), lazy=True,
+    ),
+    Stage("paralegal_chronology", _paralegal, reads=("page_map",), writes=("ext.paralegal_chronology", "paralegal_chronology_md_ref", "extraction_notes_md_ref")),
+])
+
+
+def run_analyzer_stages(
+    state: dict[str, Any],
+    *,
+    export_mode: str,
+    max_workers: int = 1,
+    timings: Any = None,
+) -> StageRun:
+    """Run ``ANALYZER_STAGES`` over ``state``, mirroring ``ext.*`` outputs into the evidence graph.
+
+    Lazy stages run only for extensions ``export_mode`` exports.
+    """
+    extensions = state["evidence_graph"].extensions
+    exported = exported_extension_keys(export_mode)
+    want = None if exported is None else set(_ext(*exported))
+    preexisting = list(extensions)
+
+    def _publish(key: str, value: Any) -> None:
+        if key.startswith(EXT_PREFIX):
+            extensions[key[len(EXT_PREFIX):]] = value
+
+    report = ANALYZER_STAGES.run(
+        state, mode=export_mode, want=want, max_workers=max_workers, timings=timings,
+        run_id=str(state.get("run_id") or ""), on_write=_publish,
+    )
+
+    # Waves publish out of declaration order; restore the sequential insertion order.
+    order = {k: i for i, k in enumerate(preexisting)}
+    for stage in ANALYZER_STAGES.stages:
+        for key in stage.writes:
+            if key.startswith(EXT_PREFIX):
+                order.setdefault(key[len(EXT_PREFIX):], len(order))
+    ordered = sorted(extensions.items(), key=lambda kv: order.get(kv[0], len(order)))
+    extensions.clear()
+    extensions.update(ordered)
+
+    logger.info(
+        "[%s] analyzer stages: %d waves, skipped=%s, timings_ms=%s",
+        state.get("run_id"), len(report.waves), report.skipped, report.timings_ms,
+    )
+    return report
+
+
+# ── On-demand valuation ──────────────────────────────────────────────────────
+
+_VALUATION_STAGES = StageGraph([s for s in ANALYZER_STAGES.stages if s.lazy])
+VALUATION_EXTENSION_KEYS = tuple(
+    k[len(EXT_PREFIX):] for s in _VALUATION_STAGES.stages for k in s.writes if k.startswith(EXT_PREFIX)
+)
+
+
+class _StoredSnapshot:
+    """``ModelSnapshot`` stand-in over an already-serialized payload."""
+
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self._view = freeze(payload)
+
+    def view(self) -> Any:
+        return self._view
+
+
+def compute_valuation_extensions(
+    evidence_graph_payload: dict[str, Any],
+    *,
+    keys: Iterable[str] | None = None,
+    recompute: bool = False,
+) -> tuple[dict[str, Any], list[str], list[str]]:
+    """Valuation extensions for a stored ``evidence_graph.json`` payload.
+
+    Returns ``(extensions, computed, dependencies)``: the requested ``keys`` (default:
+    all), taken from the payload where present; the requested keys that had to be
+    computed; and the unrequested valuation extensions computed along the way as their
+    inputs. Missing keys (or every requested key with ``recompute``) are produced by
+    running the lazy valuation stages over the payload.
+    """
+    requested = list(keys) if keys is not None else list(VALUATION_EXTENSION_KEYS)
+    unknown = sorted(set(requested) - set(VALUATION_EXTENSION_KEYS))
+    if unknown:
+        raise ValueError(f"not valuation extensions: {unknown}")
+    ext = evidence_graph_payload.get("extensions") or {}
+    missing = [k for k in requested if recompute or ext.get(k) is None]
+    computed: dict[str, Any] = {}
+    if missing:
+        state: dict[str, Any] = {EXT_PREFIX + k: v for k, v in ext.items()}
+        state["graph_snapshot"] = _StoredSnapshot(evidence_graph_payload)
+        state["manifest_snapshot"] = _StoredSnapshot(ext.get("renderer_manifest") or {})
+
+        def _collect(key: str, value: Any) -> None:
+            if key.startswith(EXT_PREFIX):
+                computed[key[len(EXT_PREFIX):]] = value
+
+        _VALUATION_STAGES.run(state, want=set(_ext(*missing)), on_write=_collect)
+    out = {k: computed[k] if k in computed else ext.get(k) for k in requested}
+    return (
+        out,
+        [k for k in VALUATION_EXTENSION_KEYS if k in computed and k in requested],
+        [k for k in VALUATION_EXTENSION_KEYS if k in computed and k not in requested],
+    )
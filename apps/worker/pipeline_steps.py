@@ -43,6 +43,7 @@ from apps.worker.steps.step13_receipt import create_run_record
 from apps.worker.lib.provider_normalize import normalize_provider_entities, compute_coverage_spans
 from apps.worker.lib.claim_ledger_lite import build_claim_edges, select_top_claim_rows
 from apps.worker.lib.causation_ladder import build_causation_ladders
+from apps.worker.lib.event_overlay import fork_events
 from apps.worker.steps.case_collapse import (
     build_case_collapse_candidates, build_defense_attack_paths,
     build_objection_profiles, build_upgrade_recommendations, quote_lock
@@ -185,7 +186,7 @@ class PipelineSteps:
     @staticmethod
     def step11_gaps(all_events, config):
         logger.info("Step 11: Gap detection")
-        export_events = filter_for_export([e.model_copy(deep=True) for e in all_events], config)
+        export_events = filter_for_export(fork_events(all_events), config)
         evts, gaps, _ = detect_gaps(export_events, config)
         return evts, gaps
 
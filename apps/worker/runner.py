@@ -1,6 +1,9 @@
 """
 Worker runner script.
-Polls the database for pending runs and executes the pipeline.
+Claims pending runs and executes the pipeline. While idle it waits on the run
+dispatch wakeup (LISTEN/NOTIFY, or a wakeup file on SQLite) and re-checks the
+database every ``wakeup.poll_seconds`` as a fallback (RUN_DISPATCH_POLL_SECONDS,
+or RUN_DISPATCH_UNNOTIFIED_POLL_SECONDS where no notification can arrive).
 """
 import logging
 import time
@@ -16,8 +19,9 @@ from sqlalchemy import text
 # Add project root to path if needed (though usually handled by python -m)
 sys.path.append(os.getcwd())
 
-from packages.db.database import get_session
+from packages.db.database import get_session, use_engine_profile
 from packages.db.models import Run
+from packages.db.run_dispatch import open_run_wakeup, record_claim
 from apps.worker.pipeline import run_pipeline
 
 logger = logging.getLogger(__name__)
@@ -108,6 +112,8 @@ def claim_run() -> str | None:
         session.commit()
         
         if rows_updated == 1:
+            if not stale_run:
+                record_claim(run_id, target_run.created_at)
             return run_id
         else:
             # Race condition: someone else claimed it
@@ -128,7 +134,7 @@ class HeartbeatThread(threading.Thread):
         self.stop_event.wait(jitter)
         while not self.stop_event.is_set():
             try:
-                with get_session() as session:
+                with get_session("worker") as session:
                     session.query(Run).filter_by(id=self.run_id).update({
                         "heartbeat_at": get_utc_now()
                     })
@@ -143,6 +149,11 @@ class HeartbeatThread(threading.Thread):
         self.stop_event.set()
 
 def main():
+    # Own pool, so pipeline sessions never starve API requests served by the same process.
+    with use_engine_profile("worker"):
+        _main()
+
+def _main():
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
@@ -153,7 +164,15 @@ def main():
     # Ensure DB is initialized
     from packages.db.database import init_db
     init_db()
-    
+    wakeup = open_run_wakeup()
+    logger.info(f"Waiting for runs via {wakeup.kind} wakeup (fallback poll {wakeup.poll_seconds}s)")
+
+    try:
+        _work_loop(wakeup)
+    finally:
+        wakeup.close()
+
+def _work_loop(wakeup):
     while True:
         try:
             run_id = claim_run()
@@ -176,7 +195,7 @@ def main():
                     
                 logger.info(f"Run {run_id} processing complete.")
             else:
-                time.sleep(2)
+                wakeup.wait(wakeup.poll_seconds)
         
         except KeyboardInterrupt:
             logger.info("Worker stopping by user request.")
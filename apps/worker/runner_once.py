@@ -1,26 +1,40 @@
 """
 One-shot worker runner for Cron jobs.
 Claims one pending run, processes it, and exits.
+
+With RUNNER_ONCE_WAIT_SECONDS > 0 and nothing pending, it waits that long on
+the run dispatch wakeup for a run to be enqueued instead of exiting at once,
+so a run submitted between cron ticks starts right away.
 """
 import logging
 import sys
 import os
+import time
 
 # Add project root to path
 sys.path.append(os.getcwd())
 
-from packages.db.database import init_db
+from packages.db.database import init_db, use_engine_profile
 from apps.worker.runner import claim_run
+from packages.db.run_dispatch import open_run_wakeup
 from apps.worker.pipeline import run_pipeline
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
 logger = logging.getLogger("linecite.worker.once")
 
+WAIT_SECONDS = float(os.getenv("RUNNER_ONCE_WAIT_SECONDS", "0"))
+
 def main():
+    with use_engine_profile("cron"):
+        _main()
+
+def _main():
     logger.info("One-shot worker starting...")
     init_db()
     
     run_id = claim_run()
+    if not run_id and WAIT_SECONDS > 0:
+        run_id = _wait_for_run(WAIT_SECONDS)
     if run_id:
         logger.info(f"Processing claimed run: {run_id}")
         try:
@@ -32,5 +46,19 @@ def main():
     else:
         logger.info("No pending runs found.")
 
+def _wait_for_run(seconds: float) -> str | None:
+    wakeup = open_run_wakeup()
+    deadline = time.monotonic() + seconds
+    try:
+        # Claim again after subscribing, so a run enqueued in between is not missed.
+        while not (run_id := claim_run()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            wakeup.wait(min(remaining, wakeup.poll_seconds))
+        return run_id
+    finally:
+        wakeup.close()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,211 @@
+"""
+Columnar citation store for event extraction.
+
+Extractors emit one citation per retained snippet line, which on large packets
+means hundreds of thousands of citations. Building a validated pydantic
+``Citation`` (plus nested ``BBox`` and an eager SHA-256) for each of them is the
+dominant allocation cost of step 7.
+
+``CitationStore`` keeps citations as parallel arrays instead:
+  - snippet text and document ids are interned, so repeated lines share storage
+  - ``text_hash`` is deferred and computed once per distinct snippet in batch
+  - ``CitationRef`` is a ``__slots__`` view exposing the ``Citation`` attributes
+    extractors actually read (``citation_id``, ``page_number``, ``snippet``...)
+
+Pydantic models are only materialized at the schema boundary via
+``materialize()``. When no store is bound, ``_make_citation`` keeps returning
+plain ``Citation`` models, so direct extractor callers (evals, tests) are
+unaffected.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import sys
+import uuid
+from array import array
+from contextvars import ContextVar
+from typing import Iterable, Iterator
+
+from packages.shared.models import BBox, Citation
+
+SNIPPET_MAX_CHARS = 500
+
+_ACTIVE_STORE: ContextVar["CitationStore | None"] = ContextVar("citeline_citation_store", default=None)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class CitationRef:
+    """Lightweight read-only view of one row in a ``CitationStore``."""
+
+    __slots__ = ("_store", "_idx")
+
+    def __init__(self, store: "CitationStore", idx: int) -> None:
+        self._store = store
+        self._idx = idx
+
+    @property
+    def citation_id(self) -> str:
+        return self._store._ids[self._idx]
+
+    @property
+    def source_document_id(self) -> str:
+        return self._store._doc_ids[self._idx]
+
+    @property
+    def page_number(self) -> int:
+        return self._store._pages[self._idx]
+
+    @property
+    def snippet(self) -> str:
+        return self._store._snippets[self._idx]
+
+    @property
+    def bbox(self) -> BBox:
+        # Extractors only ever emit the whole-page fallback bbox.
+        return BBox(x=0, y=0, w=0, h=0)
+
+    @property
+    def text_hash(self) -> str:
+        return self._store.text_hash(self._idx)
+
+    def to_model(self) -> Citation:
+        return self._store.materialize_one(self._idx)
+
+    def __repr__(self) -> str:
+        return f"CitationRef({self.citation_id!r}, page={self.page_number})"
+
+
+class CitationStore:
+    """Struct-of-arrays citation container that extractors append to."""
+
+    __slots__ = ("_ids", "_doc_ids", "_pages", "_snippets", "_hashes", "_hash_sources", "_index", "_hash_cache")
+
+    def __init__(self) -> None:
+        self._ids: list[str] = []
+        self._doc_ids: list[str] = []
+        self._pages = array("i")
+        self._snippets: list[str] = []
+        self._hashes: list[str | None] = []
+        # Original (untruncated) snippet for the rare rows clipped to SNIPPET_MAX_CHARS;
+        # text_hash has always been computed over the full snippet.
+        self._hash_sources: dict[int, str] = {}
+        self._index: dict[str, int] = {}
+        self._hash_cache: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[CitationRef]:
+        return (CitationRef(self, i) for i in range(len(self._ids)))
+
+    def __contains__(self, citation_id: object) -> bool:
+        return citation_id in self._index
+
+    def append(
+        self,
+        source_document_id: str,
+        page_number: int,
+        snippet: str,
+        citation_id: str | None = None,
+    ) -> CitationRef:
+        """Record a citation row and return a view onto it."""
+        if not snippet:
+            raise ValueError("citation snippet must be non-empty")
+        if int(page_number) < 1:
+            raise ValueError(f"citation page_number must be >= 1, got {page_number}")
+        cid = citation_id or uuid.uuid4().hex[:16]
+        idx = len(self._ids)
+        clipped = snippet[:SNIPPET_MAX_CHARS]
+        if len(clipped) != len(snippet):
+            self._hash_sources[idx] = snippet
+        self._ids.append(cid)
+        self._doc_ids.append(sys.intern(str(source_document_id)))
+        self._pages.append(int(page_number))
+        self._snippets.append(sys.intern(clipped))
+        self._hashes.append(None)
+        self._index[cid] = idx
+        return CitationRef(self, idx)
+
+    def get(self, citation_id: str) -> CitationRef | None:
+        idx = self._index.get(citation_id)
+        return CitationRef(self, idx) if idx is not None else None
+
+    def text_hash(self, idx: int) -> str:
+        value = self._hashes[idx]
+        if value is None:
+            source = self._hash_sources.get(idx, self._snippets[idx])
+            value = self._hash_cache.get(source)
+            if value is None:
+                value = _sha256(source)
+                self._hash_cache[source] = value
+            self._hashes[idx] = value
+        return value
+
+    def hash_pending(self) -> int:
+        """Compute every deferred ``text_hash`` once per distinct snippet. Returns rows hashed."""
+        hashed = 0
+        for idx, value in enumerate(self._hashes):
+            if value is None:
+                self.text_hash(idx)
+                hashed += 1
+        return hashed
+
+    def materialize_one(self, idx: int) -> Citation:
+        # Validated like ``_make_citation`` so the bbox serializes as 0.0, not 0.
+        return Citation(
+            citation_id=self._ids[idx],
+            source_document_id=self._doc_ids[idx],
+            page_number=self._pages[idx],
+            snippet=self._snippets[idx],
+            bbox=BBox(x=0, y=0, w=0, h=0),
+            text_hash=self.text_hash(idx),
+        )
+
+    def materialize(self, items: Iterable[object] | None = None) -> list[Citation]:
+        """
+        Build ``Citation`` models for the schema/persistence boundary.
+
+        With ``items`` given, preserves its order and passes through anything that
+        is already a ``Citation``; refs owned by this store are materialized.
+        Without ``items``, materializes every row in append order.
+        """
+        self.hash_pending()
+        if items is None:
+            return [self.materialize_one(i) for i in range(len(self._ids))]
+        out: list[Citation] = []
+        for item in items:
+            if isinstance(item, CitationRef) and item._store is self:
+                out.append(self.materialize_one(item._idx))
+            elif isinstance(item, CitationRef):
+                out.append(item.to_model())
+            else:
+                out.append(item)  # type: ignore[arg-type]
+        return out
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "rows": len(self._ids),
+            "distinct_snippets": len({id(s) for s in self._snippets}),
+            "distinct_documents": len(set(self._doc_ids)),
+            "clipped_snippets": len(self._hash_sources),
+        }
+
+
+def active_citation_store() -> CitationStore | None:
+    """Return the store bound for the current extraction pass, if any."""
+    return _ACTIVE_STORE.get()
+
+
+@contextlib.contextmanager
+def collecting_citations(store: CitationStore | None = None) -> Iterator[CitationStore]:
+    """Bind a ``CitationStore`` so ``_make_citation`` appends to it instead of building models."""
+    store = store if store is not None else CitationStore()
+    token = _ACTIVE_STORE.set(store)
+    try:
+        yield store
+    finally:
+        _ACTIVE_STORE.reset(token)
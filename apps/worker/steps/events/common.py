@@ -9,9 +9,17 @@ from packages.shared.models import (
     FactKind,
     Page,
 )
+from apps.worker.steps.events.citation_store import CitationRef, active_citation_store
 
-def _make_citation(page: Page, snippet: str) -> Citation:
-    """Create a citation for a fact extracted from a page."""
+def _make_citation(page: Page, snippet: str) -> Citation | CitationRef:
+    """Create a citation for a fact extracted from a page.
+
+    When a ``CitationStore`` is bound (see ``collecting_citations``) the row is
+    appended to it and a ``CitationRef`` view is returned instead of a model.
+    """
+    store = active_citation_store()
+    if store is not None:
+        return store.append(page.source_document_id, page.page_number, snippet)
     text_hash = hashlib.sha256(snippet.encode()).hexdigest()
     return Citation(
         citation_id=uuid.uuid4().hex[:16],
@@ -13,7 +13,7 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
 from packages.shared.models import ArtifactRef, ChronologyExports, ChronologyOutput
-from packages.shared.storage import save_artifact
+from packages.shared.storage import save_artifact, save_artifact_aliased
 from apps.worker.project.chronology import build_chronology_projection, compute_provider_resolution_quality
 from packages.shared.utils.render_utils import infer_page_patient_labels
 from apps.worker.project.models import ChronologyProjection
@@ -25,6 +25,7 @@ from apps.worker.steps.export_render.projection_pipeline import (
     prepare_projection_bundle,
 )
 from apps.worker.steps.export_render.timeline_pdf import generate_pdf_from_projection, generate_executive_summary
+from apps.worker.steps.export_render.rendered_text import TEXT_SIDECAR_NAME, RenderedText
 from apps.worker.steps.export_render.csv_render import generate_csv_from_projection
 from apps.worker.steps.export_render.docx_render import generate_docx
 from apps.worker.steps.export_render.markdown_render import build_markdown_bytes
@@ -54,7 +55,7 @@ from apps.worker.steps.export_render.projection_enrichment import (
 )
 from packages.shared.utils.scoring_utils import bucket_for_required_coverage as _bucket_for_required_coverage
 from apps.worker.steps.export_render.settlement_posture_pdf import render_settlement_posture_page
-from apps.worker.lib.artifacts_writer import build_export_evidence_graph
+from apps.worker.lib.artifacts_writer import build_export_evidence_graph, save_evidence_graph_artifact
 
 if TYPE_CHECKING:
     from packages.shared.models import CaseInfo, Citation, Event, Gap, Provider
@@ -296,10 +297,7 @@ def render_exports(
         
     mode_dir = f"exports/{export_mode.lower()}"
     if evidence_graph_payload is not None:
-        bundle_payload = build_export_evidence_graph(evidence_graph_payload, export_mode)
-        bundle_bytes = json.dumps(bundle_payload, indent=2).encode("utf-8")
-        save_artifact(run_id, "evidence_graph.json", bundle_bytes)
-        save_artifact(run_id, f"{mode_dir}/evidence_graph.json", bundle_bytes)
+        save_evidence_graph_artifact(run_id, evidence_graph_payload, export_mode, copies=(f"{mode_dir}/evidence_graph.json",))
     save_artifact(
         run_id,
         "export_mode.json",
@@ -329,6 +327,7 @@ def render_exports(
                 raise RuntimeError(f"MEDIATION_RENDER_INPUT_BLOCKED: forbidden settlement/valuation keys present: {', '.join(leaked)}")
 
     # PDF
+    rendered_text = RenderedText()
     pdf_bytes = generate_pdf_from_projection(
         matter_title=matter_title,
         projection=projection,
@@ -346,23 +345,23 @@ def render_exports(
         run_id=run_id,
         include_internal_review_sections=False,
         export_mode=export_mode,
+        text_sidecar=rendered_text,
     )
     # Persist post-render extension updates (timeline audit / invariants) written during PDF generation.
     if evidence_graph_payload is not None:
-        bundle_payload = build_export_evidence_graph(evidence_graph_payload, export_mode)
-        bundle_bytes = json.dumps(bundle_payload, indent=2).encode("utf-8")
-        save_artifact(run_id, "evidence_graph.json", bundle_bytes)
-        save_artifact(run_id, f"{mode_dir}/evidence_graph.json", bundle_bytes)
+        save_evidence_graph_artifact(run_id, evidence_graph_payload, export_mode, copies=(f"{mode_dir}/evidence_graph.json",))
 
     # Append settlement posture page to the PDF
     try:
         ext = (evidence_graph_payload or {}).get("extensions") if isinstance(evidence_graph_payload, dict) else {}
         if isinstance(ext, dict) and export_mode == "INTERNAL":
+            _posture_text = RenderedText()
             _posture_bytes = render_settlement_posture_page(
                 run_id=run_id,
                 settlement_model_report=ext.get("settlement_model_report"),
                 defense_attack_map=ext.get("defense_attack_map"),
                 case_severity_index=ext.get("case_severity_index"),
+                text_sidecar=_posture_text,
             )
             if _posture_bytes:
                 import io as _io
@@ -374,19 +373,28 @@ def render_exports(
                 _merged = _io.BytesIO()
                 _writer.write(_merged)
                 pdf_bytes = _merged.getvalue()
+                rendered_text.extend(_posture_text)
     except Exception as _exc:
         import logging as _logging
         _logging.getLogger(__name__).warning(f"Settlement posture page append failed: {_exc}")
 
-    pdf_path = save_artifact(run_id, "chronology.pdf", pdf_bytes)
-    save_artifact(run_id, "export.pdf", pdf_bytes)
-    save_artifact(run_id, f"{mode_dir}/chronology.pdf", pdf_bytes)
-    save_artifact(run_id, f"{mode_dir}/export.pdf", pdf_bytes)
-    save_artifact(run_id, f"chronology_{export_mode}.pdf", pdf_bytes)
-    save_artifact(run_id, f"export_{export_mode}.pdf", pdf_bytes)
+    pdf_path = save_artifact_aliased(
+        run_id,
+        [
+            "chronology.pdf",
+            "export.pdf",
+            f"{mode_dir}/chronology.pdf",
+            f"{mode_dir}/export.pdf",
+            f"chronology_{export_mode}.pdf",
+            f"export_{export_mode}.pdf",
+        ],
+        pdf_bytes,
+    )
     pdf_sha = hashlib.sha256(pdf_bytes).hexdigest() if hasattr(pdf_bytes, "__len__") else None
     if not pdf_sha:
         pdf_sha = hashlib.sha256(pdf_bytes).hexdigest()
+    # Text sidecar for the quality gates, so they need not re-parse the PDF.
+    save_artifact(run_id, TEXT_SIDECAR_NAME, json.dumps(rendered_text.to_dict()).encode("utf-8"))
 
     # CSV
     csv_bytes = generate_csv_from_projection(projection)
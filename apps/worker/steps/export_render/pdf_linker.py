@@ -1,93 +1,74 @@
 """
-Post-process PDF to insert internal link annotations using render_manifest.json.
+Insert internal link annotations from render_manifest.json while the PDF is drawn.
+
+Paragraph ``<a name="..."/>`` anchors reach the canvas as ``bookmarkHorizontal``
+calls. ``anchor_canvas`` returns a canvas class that records every anchor's page
+and position in an ``AnchorRegistry`` and, when the anchor is a chronology row
+with forward links, adds the link to its first cited appendix anchor on the
+spot. Destinations may be defined later in the document, so the finished PDF
+never has to be re-parsed to place links.
 """
 from __future__ import annotations
 
-import io
-import json
-import re
+from dataclasses import dataclass, field
 from typing import Any
 
-from pypdf import PdfReader, PdfWriter
-
-from apps.worker.steps.export_render.render_manifest import parse_appendix_anchor, parse_chron_anchor
-
-
-def _find_label_rect(page, label: str) -> tuple[float, float, float, float] | None:
-    """
-    Find the first rectangle for a text label on the page.
-    Uses text extraction visitor for a best-effort bounding box.
-    """
-    label_norm = re.sub(r"\s+", " ", label.strip())
-    found: tuple[float, float, float, float] | None = None
-
-    def visitor_text(text, cm, tm, fontDict, fontSize):
-        nonlocal found
-        if found is not None:
-            return
-        if not text or not text.strip():
-            return
-        key = re.sub(r"\s+", " ", text.strip())
-        if key != label_norm:
-            return
-        x, y = tm[4], tm[5]
-        w = fontDict.get("Widths", [])[0] if fontDict else 40
-        h = fontSize
-        found = (x, y, x + w + 140, y + h + 8)
-
-    page.extract_text(visitor_text=visitor_text)
-    return found
-
-
-def add_internal_links(pdf_bytes: bytes, manifest: dict[str, Any]) -> bytes:
-    """
-    Insert internal link annotations for citations using the manifest mapping.
-    This is a best-effort pass; if a target cannot be located, the link is skipped.
-    """
-    reader = PdfReader(io.BytesIO(pdf_bytes))
-    writer = PdfWriter()
-
-    for page in reader.pages:
-        writer.add_page(page)
-
-    # Build anchor destinations based on simple text search.
-    # We expect anchors in text like "Page 12" and a fixed structure.
-    anchor_page_map: dict[str, int] = {}
-    for i, page in enumerate(reader.pages):
-        text = page.extract_text() or ""
-        for anchor in manifest.get("appendix_anchors", []):
-            parsed = parse_appendix_anchor(anchor)
-            if not parsed:
-                continue
-            _doc_id, page_no = parsed
-            if f"Page {page_no}" in text:
-                anchor_page_map[anchor] = i
-        for anchor in manifest.get("chron_anchors", []):
-            parsed = parse_chron_anchor(anchor)
-            if not parsed:
-                continue
-            if parsed in text:
-                anchor_page_map[anchor] = i
-
-    # Add link annotations by scanning pages for citation labels.
-    for i, page in enumerate(reader.pages):
-        label_rect = _find_label_rect(page, "Citation(s):")
-        if not label_rect:
-            continue
-        x0, y0, x1, y1 = label_rect
-        for _from_anchor, to_anchors in (manifest.get("forward_links") or {}).items():
-            if not to_anchors:
-                continue
-            target_page = anchor_page_map.get(to_anchors[0])
-            if target_page is None:
-                continue
-            writer.add_link(
-                pagenum=i,
-                pagedest=target_page,
-                rect=(x0, y0, x1, y1),
-                border=[0, 0, 0],
-            )
-
-    output = io.BytesIO()
-    writer.write(output)
-    return output.getvalue()
+from reportlab.pdfgen.canvas import Canvas
+
+from apps.worker.steps.export_render.render_manifest import RenderManifest
+
+_LINK_HEIGHT = 12.0
+
+
+@dataclass
+class AnchorRegistry:
+    """Source anchor -> destination anchor, plus anchor positions recorded during rendering."""
+
+    targets: dict[str, str]
+    positions: dict[str, tuple[int, float, float]] = field(default_factory=dict)
+    linked: dict[str, tuple[Any, float]] = field(default_factory=dict)
+
+    @classmethod
+    def from_manifest(cls, manifest: RenderManifest) -> "AnchorRegistry":
+        # Only link to anchors the render declared; undefined destinations fail the PDF save.
+        declared = set(manifest.chron_anchors) | set(manifest.appendix_anchors)
+        targets: dict[str, str] = {}
+        for from_anchor, to_anchors in (manifest.forward_links or {}).items():
+            target = next((a for a in to_anchors if a in declared), None)
+            if target is not None:
+                targets[from_anchor] = target
+        return cls(targets=targets)
+
+    def anchor_pages(self) -> dict[str, int]:
+        """1-based page number of every anchor drawn."""
+        return {name: pos[0] for name, pos in self.positions.items()}
+
+    def unresolved(self) -> dict[str, tuple[Any, float]]:
+        return {t: src for t, src in self.linked.items() if t not in self.positions}
+
+
+def anchor_canvas(registry: AnchorRegistry) -> type[Canvas]:
+    """Canvas class for ``doc.build(..., canvasmaker=...)`` that fills *registry* and emits links."""
+
+    class AnchorCanvas(Canvas):
+        def bookmarkHorizontal(self, key, relativeX, relativeY, **kw):
+            super().bookmarkHorizontal(key, relativeX, relativeY, **kw)
+            left, top = self.absolutePosition(relativeX, relativeY)
+            registry.positions.setdefault(key, (self.getPageNumber(), left, top))
+            target = registry.targets.get(key)
+            if target is None:
+                return
+            right = max(self._pagesize[0] - left, left + 72.0)
+            self.linkAbsolute("", target, (left, top - _LINK_HEIGHT, right, top), thickness=0)
+            registry.linked.setdefault(target, (self._doc.thisPageRef(), top))
+
+        def save(self):
+            # A declared anchor that was never drawn would leave a dangling destination;
+            # bind it to the linking row instead so the document still builds.
+            for target, (page_ref, top) in registry.unresolved().items():
+                dest = self._bookmarkReference(target)
+                dest.xyz("null", top, 0)
+                dest.setPage(page_ref)
+            super().save()
+
+    return AnchorCanvas
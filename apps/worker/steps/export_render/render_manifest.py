@@ -49,6 +49,7 @@ class RenderManifest:
     appendix_anchors: List[str] = field(default_factory=list)
     forward_links: Dict[str, List[str]] = field(default_factory=dict)
     back_links: Dict[str, List[str]] = field(default_factory=dict)
+    anchor_pages: Dict[str, int] = field(default_factory=dict)
 
     def add_chron_anchor(self, anchor: str) -> None:
         if anchor not in self.chron_anchors:
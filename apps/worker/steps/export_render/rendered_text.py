@@ -0,0 +1,173 @@
+"""
+Structured text sidecar captured while a PDF is laid out.
+
+Every string reportlab draws passes through ``PDFTextObject._formatText``;
+``text_canvas`` returns a canvas class whose text objects record those strings
+line by line, tagged with the page number and the enclosing Heading1 section.
+Quality gates read the sidecar (``chronology_text.json``) instead of re-parsing
+the finished PDF.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.pdfgen.textobject import PDFTextObject
+from reportlab.platypus import Paragraph
+
+TEXT_SIDECAR_NAME = "chronology_text.json"
+
+_CITED_PAGE_RE = re.compile(r"\bp\.\s*(\d+)")
+
+
+@dataclass
+class RenderedLine:
+    page: int
+    section: str
+    text: str
+
+    @property
+    def is_bullet(self) -> bool:
+        return self.text.lstrip().startswith(("- ", "•"))
+
+    @property
+    def cited_pages(self) -> list[int]:
+        return [int(p) for p in _CITED_PAGE_RE.findall(self.text)]
+
+
+@dataclass
+class RenderedText:
+    lines: list[RenderedLine] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Text in draw order, one line per drawn line and a blank line between pages (as PDF text extraction gives)."""
+        pages: dict[int, list[str]] = {}
+        for line in self.lines:
+            pages.setdefault(line.page, []).append(line.text + "\n")
+        return "\n".join("".join(chunks) for _page, chunks in sorted(pages.items()))
+
+    @property
+    def page_count(self) -> int:
+        return max((line.page for line in self.lines), default=0)
+
+    def sections(self) -> list[str]:
+        out: list[str] = []
+        for line in self.lines:
+            if line.section and (not out or out[-1] != line.section):
+                out.append(line.section)
+        return out
+
+    def section_text(self, title: str) -> str:
+        """Text of every section whose heading starts with *title* (case-insensitive)."""
+        key = title.strip().lower()
+        return "\n".join(line.text for line in self.lines if line.section.lower().startswith(key))
+
+    def pages_text(self, first_page: int = 1) -> str:
+        return "\n".join(line.text for line in self.lines if line.page >= first_page)
+
+    def extend(self, other: "RenderedText") -> None:
+        """Append *other* as pages following this document (e.g. an appended PDF)."""
+        offset = self.page_count
+        self.lines.extend(RenderedLine(line.page + offset, line.section, line.text) for line in other.lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "page_count": self.page_count,
+            "sections": self.sections(),
+            "lines": [
+                {
+                    "page": line.page,
+                    "section": line.section,
+                    "text": line.text,
+                    "bullet": line.is_bullet,
+                    "cited_pages": line.cited_pages,
+                }
+                for line in self.lines
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "RenderedText":
+        return cls([
+            RenderedLine(int(row.get("page") or 0), str(row.get("section") or ""), str(row.get("text") or ""))
+            for row in (payload or {}).get("lines") or []
+        ])
+
+
+def _heading_level(flowable: Any) -> int | None:
+    style = getattr(flowable, "style", None) if isinstance(flowable, Paragraph) else None
+    while style is not None:
+        m = re.fullmatch(r"Heading(\d)", str(getattr(style, "name", "")))
+        if m:
+            return int(m.group(1))
+        style = getattr(style, "parent", None)
+    return None
+
+
+class _RecordingTextObject(PDFTextObject):
+    def _formatText(self, text):
+        self._canvas._rendered_piece(text)
+        return super()._formatText(text)
+
+    def _textOut(self, text, TStar=0):
+        super()._textOut(text, TStar)
+        if TStar:
+            self._canvas._rendered_break()
+
+    def textLine(self, text=""):
+        super().textLine(text)
+        self._canvas._rendered_break()
+
+
+def text_canvas(sidecar: RenderedText, base: type[Canvas] = Canvas) -> type[Canvas]:
+    """Canvas class for ``doc.build(..., canvasmaker=...)`` that records drawn text into *sidecar*."""
+
+    class TextCanvas(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._pending: list[str] = []
+            self._section = ""
+            self._flowable_start = len(sidecar.lines)
+
+        def beginText(self, x=0, y=0, direction=None):
+            return _RecordingTextObject(self, x, y, direction=direction)
+
+        def drawText(self, aTextObject):
+            super().drawText(aTextObject)
+            self._rendered_break()
+
+        def _rendered_piece(self, text):
+            self._pending.append(text)
+
+        def _rendered_break(self):
+            text = "".join(self._pending)
+            self._pending = []
+            if text.strip():
+                sidecar.lines.append(RenderedLine(self.getPageNumber(), self._section, text))
+
+        def _after_flowable(self, flowable):
+            if _heading_level(flowable) == 1:
+                self._section = re.sub(r"\s+", " ", flowable.getPlainText()).strip()
+                # The heading's own lines were drawn before the callback fired.
+                for line in sidecar.lines[self._flowable_start:]:
+                    line.section = self._section
+            self._flowable_start = len(sidecar.lines)
+
+    return TextCanvas
+
+
+def capture_text(doc: Any, sidecar: RenderedText, base: type[Canvas] = Canvas) -> type[Canvas]:
+    """Hook *doc* so Heading1 flowables open sidecar sections; returns the canvasmaker to build with."""
+    previous = doc.afterFlowable
+
+    def after_flowable(flowable):
+        previous(flowable)
+        canv = getattr(doc, "canv", None)
+        if canv is not None and hasattr(canv, "_after_flowable"):
+            canv._after_flowable(flowable)
+
+    doc.afterFlowable = after_flowable
+    return text_canvas(sidecar, base)
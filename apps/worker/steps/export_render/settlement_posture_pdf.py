@@ -6,7 +6,8 @@ all medical signal extraction happened upstream in apps/worker/lib/.
 
 Public API:
     render_settlement_posture_page(
-        run_id, settlement_model_report, defense_attack_map, case_severity_index
+        run_id, settlement_model_report, defense_attack_map, case_severity_index,
+        text_sidecar=None
     ) -> bytes | None
 
 Returns PDF bytes for the settlement intelligence page, or None on failure.
@@ -33,6 +34,8 @@ from reportlab.platypus import (
     TableStyle,
 )
 
+from apps.worker.steps.export_render.rendered_text import RenderedText, capture_text
+
 logger = logging.getLogger(__name__)
 
 # ── Layout constants ──────────────────────────────────────────────────────────
@@ -357,6 +360,7 @@ def render_settlement_posture_page(
     settlement_model_report: dict | None,
     defense_attack_map: dict | None,
     case_severity_index: dict | None,
+    text_sidecar: RenderedText | None = None,
 ) -> bytes | None:
     """
     Render the Settlement Intelligence PDF page.
@@ -373,6 +377,8 @@ def render_settlement_posture_page(
         DefenseAttackMap.v2 dict or None.
     case_severity_index
         CSI.v1 dict or None.
+    text_sidecar
+        Optional RenderedText that receives the page's drawn text.
 
     Returns
     -------
@@ -435,7 +441,10 @@ def render_settlement_posture_page(
         )
         template = PageTemplate(id="settlement_page", frames=[frame], onPage=_on_page)
         doc.addPageTemplates([template])
-        doc.build(story)
+        if text_sidecar is not None:
+            doc.build(story, canvasmaker=capture_text(doc, text_sidecar))
+        else:
+            doc.build(story)
 
         return buf.getvalue()
 
@@ -46,6 +46,7 @@ from apps.worker.steps.export_render.appendices_pdf import (
     build_projection_appendix_sections,
 )
 from apps.worker.steps.export_render.gap_utils import build_gap_anchor_metadata_rows
+from apps.worker.steps.export_render.rendered_text import RenderedText, capture_text
 from apps.worker.steps.export_render.render_manifest import (
     RenderManifest,
     chron_anchor,
@@ -1778,6 +1779,7 @@ def generate_pdf_from_projection(
     run_id: str | None = None,
     include_internal_review_sections: bool = False,
     export_mode: str = "INTERNAL",
+    text_sidecar: RenderedText | None = None,
 ) -> bytes:
     buffer = BytesIO()
     doc = BaseDocTemplate(buffer, pagesize=letter, leftMargin=0.75 * inch, rightMargin=0.75 * inch, topMargin=0.75 * inch, bottomMargin=0.75 * inch)
@@ -3170,7 +3172,13 @@ def generate_pdf_from_projection(
     frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id="normal")
     template = PageTemplate(id="test", frames=[frame], onPage=footer)
     doc.addPageTemplates([template])
-    doc.build(flowables)
+    from apps.worker.steps.export_render.pdf_linker import AnchorRegistry, anchor_canvas
+    anchors = AnchorRegistry.from_manifest(manifest)
+    canvasmaker = anchor_canvas(anchors)
+    if text_sidecar is not None:
+        canvasmaker = capture_text(doc, text_sidecar, canvasmaker)
+    doc.build(flowables, canvasmaker=canvasmaker)
+    manifest.anchor_pages = anchors.anchor_pages()
     manifest_bytes: bytes | None = None
     if run_id or manifest.forward_links:
         from dataclasses import asdict
@@ -3201,13 +3209,6 @@ def generate_pdf_from_projection(
         include_internal_review_sections=include_internal_review_sections,
         export_mode=export_mode_norm,
     )
-    try:
-        from apps.worker.steps.export_render.pdf_linker import add_internal_links
-        if manifest.forward_links and manifest_bytes:
-            import json
-            pdf_bytes = add_internal_links(pdf_bytes, json.loads(manifest_bytes.decode("utf-8")))
-    except Exception as exc:
-        logger.warning(f"PDF link post-process failed: {exc}")
     return pdf_bytes
 
 
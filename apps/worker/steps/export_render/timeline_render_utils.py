@@ -328,7 +328,7 @@ def _render_entry(
             label = link.get("label") or ""
             if not anchor or not label:
                 continue
-            link_bits.append(f"[{escape(label)}]")  # link annotations are added post-render
+            link_bits.append(f"[{escape(label)}]")  # the row anchor carries the link, see pdf_linker
             if manifest and chron_anchor:
                 manifest.add_link(chron_anchor, anchor)
         if link_bits:
@@ -136,7 +136,58 @@ def _is_contradiction(kind: str, a_val: str, b_val: str) -> bool:
     return False
 
 
+def _window_pairs(group: list[int], mentions: list[dict], window_days: int):
+    """Yield ``(i, j)`` with ``i < j`` for same-kind mentions at most ``window_days`` apart.
+
+    Dated mentions are swept in date order and the inner scan stops at the first
+    mention past the window; undated mentions pair with every other mention.
+    """
+    dated = sorted((mentions[idx]["date_obj"], idx) for idx in group if mentions[idx].get("date_obj"))
+    undated = [idx for idx in group if not mentions[idx].get("date_obj")]
+    for p, (day, i) in enumerate(dated):
+        for q in range(p + 1, len(dated)):
+            other_day, j = dated[q]
+            if (other_day - day).days > window_days:
+                break
+            yield (i, j) if i < j else (j, i)
+    undated_set = set(undated)
+    for u in undated:
+        for idx in group:
+            if idx == u or (idx in undated_set and idx < u):
+                continue
+            yield (u, idx) if u < idx else (idx, u)
+
+
+def _matrix_entry(a: dict, b: dict) -> dict:
+    return {
+        "category": str(a["kind"]),
+        "supporting": {
+            "date": a["date"],
+            "value": str(a["value"]),
+            "support_score": int(a.get("support_score") or 0),
+            "support_strength": _support_strength_bucket(int(a.get("support_score") or 0)),
+            "citations": list(a.get("citations") or []),
+        },
+        "contradicting": {
+            "date": b["date"],
+            "value": str(b["value"]),
+            "support_score": int(b.get("support_score") or 0),
+            "support_strength": _support_strength_bucket(int(b.get("support_score") or 0)),
+            "citations": list(b.get("citations") or []),
+        },
+        "strength_delta": abs(int(a.get("support_score") or 0) - int(b.get("support_score") or 0)),
+        "window_days": _days_apart(a.get("date_obj"), b.get("date_obj")),
+    }
+
+
 def build_contradiction_matrix(claim_rows: list[ClaimRowLike], *, window_days: int = 45, limit: int = 24) -> list[dict]:
+    """Contradicting same-kind mentions within ``window_days``, strongest ``limit`` first.
+
+    Rows are ordered by (-strength_delta, category, supporting date) with ties kept
+    in mention-pair order; each (kind, values, earliest date) key keeps its first
+    pair. Mentions are bucketed by kind and swept by date, and kinds whose best
+    possible strength_delta cannot reach the current top ``limit`` are skipped.
+    """
     mentions: list[dict] = []
     for row in claim_rows:
         citations = [str(c).strip() for c in (row.get("citations") or []) if str(c).strip()]
@@ -147,56 +198,33 @@ def build_contradiction_matrix(claim_rows: list[ClaimRowLike], *, window_days: i
             m["citations"] = citations[:3]
             mentions.append(m)
 
-    matrix: list[dict] = []
-    seen_keys: set[tuple[str, str, str, str]] = set()
-    for i in range(len(mentions)):
-        for j in range(i + 1, len(mentions)):
+    by_kind: dict[str, list[int]] = {}
+    for idx, m in enumerate(mentions):
+        by_kind.setdefault(str(m["kind"]), []).append(idx)
+
+    def _best_delta(group: list[int]) -> int:
+        scores = [int(mentions[idx]["support_score"]) for idx in group]
+        return max(scores) - min(scores)
+
+    ranked_kinds = sorted(by_kind, key=lambda k: (-_best_delta(by_kind[k]), k))
+    ranked: list[tuple[tuple, dict]] = []
+    for kind in ranked_kinds:
+        group = by_kind[kind]
+        if limit > 0 and len(ranked) >= limit and (-_best_delta(group), kind) > ranked[limit - 1][0][:2]:
+            break  # every later kind ranks below the current top ``limit`` too
+        first_pair: dict[tuple[str, str, str, str], tuple[int, int]] = {}
+        for i, j in _window_pairs(group, mentions, window_days):
             a = mentions[i]
             b = mentions[j]
-            if a["kind"] != b["kind"]:
-                continue
-            apart = _days_apart(a.get("date_obj"), b.get("date_obj"))
-            if apart is not None and apart > window_days:
-                continue
-            if not _is_contradiction(str(a["kind"]), str(a["value"]), str(b["value"])):
-                continue
-            key = (
-                str(a["kind"]),
-                str(a["value"]),
-                str(b["value"]),
-                str(min(a["date"], b["date"])),
-            )
-            if key in seen_keys:
+            if not _is_contradiction(kind, str(a["value"]), str(b["value"])):
                 continue
-            seen_keys.add(key)
-            delta = abs(int(a.get("support_score") or 0) - int(b.get("support_score") or 0))
-            matrix.append(
-                {
-                    "category": str(a["kind"]),
-                    "supporting": {
-                        "date": a["date"],
-                        "value": str(a["value"]),
-                        "support_score": int(a.get("support_score") or 0),
-                        "support_strength": _support_strength_bucket(int(a.get("support_score") or 0)),
-                        "citations": list(a.get("citations") or []),
-                    },
-                    "contradicting": {
-                        "date": b["date"],
-                        "value": str(b["value"]),
-                        "support_score": int(b.get("support_score") or 0),
-                        "support_strength": _support_strength_bucket(int(b.get("support_score") or 0)),
-                        "citations": list(b.get("citations") or []),
-                    },
-                    "strength_delta": delta,
-                    "window_days": apart,
-                }
-            )
-
-    matrix.sort(
-        key=lambda r: (
-            -int(r.get("strength_delta") or 0),
-            str(r.get("category") or ""),
-            str(((r.get("supporting") or {}).get("date") or "")),
-        )
-    )
-    return matrix[:limit]
+            key = (kind, str(a["value"]), str(b["value"]), str(min(a["date"], b["date"])))
+            seen = first_pair.get(key)
+            if seen is None or (i, j) < seen:
+                first_pair[key] = (i, j)
+        for i, j in first_pair.values():
+            entry = _matrix_entry(mentions[i], mentions[j])
+            ranked.append(((-int(entry["strength_delta"]), kind, str(entry["supporting"]["date"] or ""), i, j), entry))
+        ranked.sort(key=lambda r: r[0])
+
+    return [entry for _, entry in ranked][:limit]
@@ -17,6 +17,7 @@ import fitz  # PyMuPDF
 from packages.shared.models import Page, Warning
 from packages.db.database import get_session
 from packages.db.models import SourceDocument, Run, OCRCache
+from packages.db.page_text import store_blobs
 from apps.worker.quality.text_quality import is_structured_medical_signal
 
 logger = logging.getLogger(__name__)
@@ -378,7 +379,7 @@ def acquire_text(
                     .one_or_none()
                 )
                 if row and row.document_sha256 == doc_meta.get("sha256") and row.dpi == _OCR_DPI:
-                    return str(row.text or "")
+                    return str(row.cached_text or "")
         except Exception as exc:
             logger.warning(f"OCR cache lookup failed for page {page.page_number}: {exc}")
         return None
@@ -390,11 +391,12 @@ def acquire_text(
             return
         try:
             with get_session() as session:
+                store_blobs(session, [text])
                 row = OCRCache(
                     source_document_id=str(page.source_document_id),
                     document_sha256=doc_meta.get("sha256") or "",
                     page_number=int(page.page_number),
-                    text=text,
+                    text=None,  # stored once in page_text_blobs under text_hash
                     text_hash=_text_hash(text),
                     ocr_engine="tesseract",
                     dpi=_OCR_DPI,
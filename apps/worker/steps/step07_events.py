@@ -4,7 +4,23 @@ Step 7 — Event extraction by page type (deterministic rules).
 7B: Imaging events
 7C: PT events (aggregate default)
 7D: Billing events (always stored; export optional)
+
+``stream_events`` is the pipeline entry point: extractors run in the fixed
+order below and yield ``ExtractionBatch`` objects through the fused fact
+quality gate and patient-scope assignment, so rejected snippets are dropped
+per batch instead of after the whole packet has been extracted.
+
+Batch granularity is the extractor's own unit of context:
+  - billing / lab / discharge / operative are page-local → one batch per page
+  - clinical (page blocks), imaging (consecutive report pages) and PT
+    (provider/date windows) group across pages → one batch per extractor
 """
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from packages.shared.models import Event, EventDate, Page, PageType, Provider, RunConfig, SkippedEvent, Warning
 from apps.worker.steps.events.clinical import extract_clinical_events
 from apps.worker.steps.events.imaging import extract_imaging_events
 from apps.worker.steps.events.pt import extract_pt_events
@@ -12,8 +28,12 @@ from apps.worker.steps.events.billing import extract_billing_events
 from apps.worker.steps.events.lab import extract_lab_events
 from apps.worker.steps.events.discharge import extract_discharge_events
 from apps.worker.steps.events.operative import extract_operative_events
+from apps.worker.steps.step03b_patient_partitions import assign_patient_scope_to_events
+from apps.worker.quality.text_quality import clean_text, is_garbage
 
 __all__ = [
+    "ExtractionBatch",
+    "apply_fact_quality_gate",
     "extract_clinical_events",
     "extract_imaging_events",
     "extract_pt_events",
@@ -21,4 +41,89 @@ __all__ = [
     "extract_lab_events",
     "extract_discharge_events",
     "extract_operative_events",
+    "iter_extraction_batches",
+    "stream_events",
 ]
+
+# Extractors whose output for a page depends only on that page.
+_PAGE_LOCAL_EXTRACTORS = (
+    ("billing", extract_billing_events, PageType.BILLING),
+    ("lab", extract_lab_events, PageType.LAB_REPORT),
+    ("discharge", extract_discharge_events, PageType.DISCHARGE_SUMMARY),
+    ("operative", extract_operative_events, PageType.OPERATIVE_REPORT),
+)
+
+
+@dataclass
+class ExtractionBatch:
+    source: str
+    events: list[Event] = field(default_factory=list)
+    citations: list[Any] = field(default_factory=list)
+    warnings: list[Warning] = field(default_factory=list)
+    skipped: list[SkippedEvent] = field(default_factory=list)
+
+
+def iter_extraction_batches(
+    pages: list[Page],
+    dates: dict[int, list[EventDate]],
+    providers: list[Provider],
+    config: RunConfig,
+    page_provider_map: dict[int, str],
+    page_text_by_number: dict[int, str] | None = None,
+) -> Iterator[ExtractionBatch]:
+    """Run all extractors in pipeline order, yielding raw (unfiltered) batches."""
+    e, c, w, s = extract_clinical_events(pages, dates, providers, config, page_provider_map)
+    yield ExtractionBatch("clinical", e, c, w, s)
+    if page_text_by_number is None:
+        page_text_by_number = {p.page_number: (p.text or "") for p in pages}
+    e, c, w, s = extract_imaging_events(pages, dates, providers, config, page_provider_map, page_text_by_number=page_text_by_number)
+    yield ExtractionBatch("imaging", e, c, w, s)
+    e, c, w, s = extract_pt_events(pages, dates, providers, config, page_provider_map)
+    yield ExtractionBatch("pt", e, c, w, s)
+    for source, extractor, page_type in _PAGE_LOCAL_EXTRACTORS:
+        for page in pages:
+            if page.page_type != page_type:
+                continue
+            e, c, w, s = extractor([page], dates, providers, config, page_provider_map)
+            yield ExtractionBatch(source, e, c, w, s)
+
+
+def apply_fact_quality_gate(event: Event, quality_stats: dict[str, int]) -> bool:
+    """Clean fact text in place and drop garbage facts. Returns False when no facts survive."""
+    cleaned_facts = []
+    for fact in event.facts or []:
+        text = str(getattr(fact, "text", "") or "")
+        cleaned = clean_text(text)
+        if cleaned and cleaned != text:
+            quality_stats["num_snippets_cleaned"] += 1
+        if is_garbage(cleaned):
+            quality_stats["num_snippets_filtered"] += 1
+            continue
+        fact.text = cleaned
+        cleaned_facts.append(fact)
+    if not cleaned_facts:
+        return False
+    event.facts = cleaned_facts
+    return True
+
+
+def stream_events(
+    pages: list[Page],
+    dates: dict[int, list[EventDate]],
+    providers: list[Provider],
+    config: RunConfig,
+    page_provider_map: dict[int, str],
+    page_to_patient_scope: dict[int, str],
+    quality_stats: dict[str, int],
+    page_text_by_number: dict[int, str] | None = None,
+) -> Iterator[ExtractionBatch]:
+    """
+    Yield quality-gated, patient-scoped extraction batches.
+
+    ``quality_stats`` must carry ``num_snippets_filtered`` / ``num_snippets_cleaned``
+    counters; they are updated as batches are consumed.
+    """
+    for batch in iter_extraction_batches(pages, dates, providers, config, page_provider_map, page_text_by_number):
+        batch.events = [evt for evt in batch.events if apply_fact_quality_gate(evt, quality_stats)]
+        assign_patient_scope_to_events(batch.events, page_to_patient_scope)
+        yield batch
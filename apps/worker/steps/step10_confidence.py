@@ -1,9 +1,15 @@
 """
 Step 10 — Confidence scoring + flags.
 Compute Event.confidence (0–100) based on date tier, provider, encounter cues, content anchors.
+
+Scoring is a batch pass: ``ConfidenceMatrix`` extracts feature columns for all
+events once and applies the ``RunConfig.confidence_scoring`` weights column-wise.
 """
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_left
+
 from packages.shared.models import (
     DateSource,
     Event,
@@ -16,66 +22,129 @@ from packages.shared.models import (
 from apps.worker.quality.text_quality import should_quarantine_fact
 
 
+_STRONG_TYPES = frozenset({
+    EventType.ER_VISIT, EventType.HOSPITAL_ADMISSION,
+    EventType.HOSPITAL_DISCHARGE, EventType.PROCEDURE,
+    EventType.INPATIENT_DAILY_NOTE,
+})
+_ANCHOR_KINDS = frozenset({FactKind.CHIEF_COMPLAINT, FactKind.ASSESSMENT, FactKind.PLAN, FactKind.IMPRESSION})
+_CLINICAL_KINDS = frozenset({FactKind.DIAGNOSIS, FactKind.PROCEDURE, FactKind.MEDICATION})
+# Date status -> (weight key, default). Column value is the index, -1 = no date / other status.
+_DATE_STATUS_WEIGHTS = (
+    (DateStatus.EXPLICIT, "date_explicit", 35),
+    (DateStatus.RANGE, "date_range", 25),
+    (DateStatus.PROPAGATED, "date_propagated", 15),
+    (DateStatus.AMBIGUOUS, "date_ambiguous", 10),
+    (DateStatus.UNDATED, "date_undated", -50),  # Heavy penalty for undated status
+)
+_DATE_STATUS_CODE = {status: i for i, (status, _, _) in enumerate(_DATE_STATUS_WEIGHTS)}
+
+CONFIDENCE_FEATURES = (
+    "date_status",
+    "provider",
+    "strong_type",
+    "anchors",
+    "clinical",
+    "fact_richness",
+    "citations",
+    "multi_page",
+    "time",
+)
+
+
+class ConfidenceMatrix:
+    """
+    Column-oriented confidence features for a batch of events.
+
+    Raw features are extracted from the events once; ``contributions`` then turns
+    a weight dict (``RunConfig.confidence_scoring``) into one integer column per
+    feature, and ``scores`` sums and clamps them. Re-scoring under different
+    weights or sweeping export thresholds never touches the events again, and the
+    contribution columns explain every score feature by feature.
+    """
+
+    def __init__(self, events: list[Event]) -> None:
+        self.event_ids: list[str] = [e.event_id for e in events]
+        self.date_status = array("b")
+        self.has_provider = array("b")
+        self.strong_type = array("b")
+        self.anchor_count = array("i")
+        self.clinical_count = array("i")
+        self.fact_count = array("i")
+        self.citation_count = array("i")
+        self.page_count = array("i")
+        self.has_time = array("b")
+        for event in events:
+            status = event.date.status if event.date else None
+            self.date_status.append(_DATE_STATUS_CODE.get(status, -1))
+            self.has_provider.append(bool(event.provider_id and event.provider_id != "unknown"))
+            self.strong_type.append(event.event_type in _STRONG_TYPES)
+            anchors = clinical = 0
+            for fact in event.facts:
+                if fact.kind in _ANCHOR_KINDS:
+                    anchors += 1
+                elif fact.kind in _CLINICAL_KINDS:
+                    clinical += 1
+            self.anchor_count.append(anchors)
+            self.clinical_count.append(clinical)
+            self.fact_count.append(len(event.facts))
+            self.citation_count.append(len(event.citation_ids))
+            self.page_count.append(len(event.source_page_numbers))
+            self.has_time.append(bool(event.date and event.date.extensions and event.date.extensions.get("time")))
+
+    def __len__(self) -> int:
+        return len(self.event_ids)
+
+    def contributions(self, weights: dict[str, int] | None) -> dict[str, list[int]]:
+        """Per-feature score contribution columns under ``weights``."""
+        w = weights or {}
+        date_lookup = [w.get(key, default) for _, key, default in _DATE_STATUS_WEIGHTS] + [0]
+        provider = w.get("provider_bonus", 20)
+        strong = w.get("strong_type_bonus", 15)
+        anchor_per, anchor_max = w.get("anchor_per", 7), w.get("anchor_max", 21)
+        clinical_per, clinical_max = w.get("clinical_per", 4), w.get("clinical_max", 12)
+        richness_min, richness = w.get("fact_richness_min", 3), w.get("fact_richness_bonus", 8)
+        # >= 4 citations is already covered by the >= 2 branch; citation_bonus_4 never applies.
+        citation = w.get("citation_bonus_2", 10)
+        multi_page = w.get("multi_page_bonus", 5)
+        time_bonus = w.get("time_bonus", 25)
+        return {
+            "date_status": [date_lookup[c] for c in self.date_status],
+            "provider": [provider if v else 0 for v in self.has_provider],
+            "strong_type": [strong if v else 0 for v in self.strong_type],
+            "anchors": [min(n * anchor_per, anchor_max) for n in self.anchor_count],
+            "clinical": [min(n * clinical_per, clinical_max) for n in self.clinical_count],
+            "fact_richness": [richness if n >= richness_min else 0 for n in self.fact_count],
+            "citations": [citation if n >= 2 else 0 for n in self.citation_count],
+            "multi_page": [multi_page if n > 1 else 0 for n in self.page_count],
+            "time": [time_bonus if v else 0 for v in self.has_time],
+        }
+
+    def scores(self, weights: dict[str, int] | None, contributions: dict[str, list[int]] | None = None) -> list[int]:
+        cols = contributions if contributions is not None else self.contributions(weights)
+        return [max(0, min(sum(row), 100)) for row in zip(*(cols[f] for f in CONFIDENCE_FEATURES))]
+
+    def export_counts(self, thresholds: list[int], weights: dict[str, int] | None) -> dict[int, int]:
+        """Number of events at or above each export threshold (one scoring pass for the whole sweep)."""
+        ordered = sorted(self.scores(weights))
+        return {t: len(ordered) - bisect_left(ordered, t) for t in thresholds}
+
+    def explain(self, event_id: str, weights: dict[str, int] | None) -> dict[str, int]:
+        i = self.event_ids.index(event_id)
+        return {f: col[i] for f, col in self.contributions(weights).items()}
+
+    def summary(self, weights: dict[str, int] | None) -> dict[str, dict[str, float]]:
+        """Mean contribution and hit count per feature (audit block for run metrics)."""
+        n = len(self) or 1
+        return {
+            f: {"mean": round(sum(col) / n, 2), "events": sum(1 for v in col if v)}
+            for f, col in self.contributions(weights).items()
+        }
+
+
 def score_event(event: Event, config: RunConfig) -> int:
     """Compute confidence score for an event (0–100)."""
-    score = 0
-    w = config.confidence_scoring or {}
-
-    # Date status contribution
-    if event.date:
-        if event.date.status == DateStatus.EXPLICIT:
-            score += w.get("date_explicit", 35)
-        elif event.date.status == DateStatus.RANGE:
-            score += w.get("date_range", 25)
-        elif event.date.status == DateStatus.PROPAGATED:
-            score += w.get("date_propagated", 15)
-        elif event.date.status == DateStatus.AMBIGUOUS:
-            score += w.get("date_ambiguous", 10)
-        elif event.date.status == DateStatus.UNDATED:
-            score += w.get("date_undated", -50)  # Heavy penalty for undated status
-
-    # Provider confidence
-    if event.provider_id and event.provider_id != "unknown":
-        score += w.get("provider_bonus", 20)
-
-    # Encounter type strong cue
-    strong_types = {
-        EventType.ER_VISIT, EventType.HOSPITAL_ADMISSION,
-        EventType.HOSPITAL_DISCHARGE, EventType.PROCEDURE,
-        EventType.INPATIENT_DAILY_NOTE,
-    }
-    if event.event_type in strong_types:
-        score += w.get("strong_type_bonus", 15)
-
-    # Content anchors — +7 each, max 21 (increased from 5/15)
-    anchor_kinds = {FactKind.CHIEF_COMPLAINT, FactKind.ASSESSMENT, FactKind.PLAN, FactKind.IMPRESSION}
-    anchor_count = sum(1 for f in event.facts if f.kind in anchor_kinds)
-    score += min(anchor_count * w.get("anchor_per", 7), w.get("anchor_max", 21))
-
-    # Clinical content density — bonus for diagnosis, procedure, medication facts
-    clinical_kinds = {FactKind.DIAGNOSIS, FactKind.PROCEDURE, FactKind.MEDICATION}
-    clinical_count = sum(1 for f in event.facts if f.kind in clinical_kinds)
-    score += min(clinical_count * w.get("clinical_per", 4), w.get("clinical_max", 12))  # Up to +12 for clinical density
-
-    # Fact richness — reward events with ≥3 facts (increased from 5 to 8)
-    if len(event.facts) >= w.get("fact_richness_min", 3):
-        score += w.get("fact_richness_bonus", 8)
-
-    # Citation coverage — reward events with multiple citations (increased from 5 to 10)
-    if len(event.citation_ids) >= 2:
-        score += w.get("citation_bonus_2", 10)
-    elif len(event.citation_ids) >= 4:
-        score += w.get("citation_bonus_4", 5)  # Extra bonus for heavily cited events
-
-    # multi-page events are stronger
-    if len(event.source_page_numbers) > 1:
-        score += w.get("multi_page_bonus", 5)
-
-    # NEW: Granular timestamp boost (Crucial for flowsheet data)
-    if event.date and event.date.extensions and event.date.extensions.get("time"):
-        score += w.get("time_bonus", 25)
-
-    return max(0, min(score, 100))
+    return ConfidenceMatrix([event]).scores(config.confidence_scoring)[0]
 
 
 def apply_ocr_quarantine(events: list[Event]) -> int:
@@ -98,18 +167,27 @@ def apply_ocr_quarantine(events: list[Event]) -> int:
 def apply_confidence_scoring(
     events: list[Event],
     config: RunConfig,
+    matrix: ConfidenceMatrix | None = None,
 ) -> tuple[list[Event], list[Warning]]:
     """
     Score all events and apply flags.
+    Pass a prebuilt ``matrix`` to keep the per-feature contributions for auditing;
+    its rows must be ``events`` in the same order (checked by ``event_id``).
     Returns (events_with_scores, warnings).
     """
     warnings: list[Warning] = []
+    if matrix is not None and matrix.event_ids != [e.event_id for e in events]:
+        raise ValueError(
+            f"confidence matrix rows ({len(matrix)}) do not match the events being scored ({len(events)})"
+        )
 
     # Clause VI: mark OCR noise facts before scoring so noisy events score lower
     apply_ocr_quarantine(events)
 
-    for event in events:
-        event.confidence = score_event(event, config)
+    if matrix is None:
+        matrix = ConfidenceMatrix(events)
+    for event, score in zip(events, matrix.scores(config.confidence_scoring)):
+        event.confidence = score
 
         # Apply flags
         if event.confidence < config.event_confidence_min_export:
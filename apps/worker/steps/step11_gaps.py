@@ -8,6 +8,7 @@ import uuid
 from datetime import date
 
 from packages.shared.models import Event, EventType, Gap, RunConfig, Warning
+from apps.worker.lib.temporal_index import TemporalIndex
 from apps.worker.steps.events.report_quality import date_sanity
 
 
@@ -39,46 +40,26 @@ def detect_gaps(
             return isinstance(start, date)
         return False
 
-    # Sort events by date using the robust sort_key
-    sorted_events = sorted(events, key=lambda e: e.date.sort_key() if e.date else (99, "UNKNOWN"))
-
-    # Filter to non-billing for gap detection AND only events with actual resolved dates (no partials)
-    # ALSO exclude historical references
-    dated_events = [
-        e for e in sorted_events 
-        if e.event_type not in (EventType.BILLING_EVENT, EventType.REFERENCED_PRIOR_EVENT) 
-        and "is_reference" not in (e.flags or [])
-        and has_full_date(e)
-    ]
+    def gap_eligible(e: Event) -> bool:
+        # Non-billing events with actual resolved dates (no partials), excluding historical references
+        return (
+            e.event_type not in (EventType.BILLING_EVENT, EventType.REFERENCED_PRIOR_EVENT)
+            and "is_reference" not in (e.flags or [])
+            and has_full_date(e)
+        )
 
-    # If not enough real dates, do not emit gaps
-    if len(dated_events) < 2:
-        return sorted_events, [], warnings
+    # The index orders events by the robust sort_key and buckets them by start date
+    index = TemporalIndex(events)
+    sorted_events = index.events
 
     gaps: list[Gap] = []
     base_threshold = config.gap_threshold_days
     short_gap_anchor_types = {EventType.HOSPITAL_ADMISSION, EventType.PROCEDURE}
 
-    for i in range(1, len(dated_events)):
-        prev_date = dated_events[i - 1].date.value
-        curr_date = dated_events[i].date.value
-        
-        # Guard against DateRange (take start)
-        if hasattr(prev_date, "start"): prev_date = prev_date.start
-        if hasattr(curr_date, "start"): curr_date = curr_date.start
-
-        if not isinstance(prev_date, date) or not isinstance(curr_date, date):
-            continue
-            
-        delta_days = (curr_date - prev_date).days
-
-        # FIXED: Special handling for inpatient daily notes - 
-        # Treat them as same-day if within the same admission context (simulated by <1 day delta)
-        if delta_days == 0:
-            continue
-
-        prev_evt = dated_events[i - 1]
-        next_evt = dated_events[i]
+    # Adjacent eligible events on different days; same-day pairs (e.g. inpatient daily notes) never gap.
+    for prev_date, curr_date, delta_days in index.gaps(min(base_threshold, 90), include=gap_eligible):
+        prev_evt = index.events_on(prev_date, include=gap_eligible)[-1]
+        next_evt = index.events_on(curr_date, include=gap_eligible)[0]
         prev_blob = " ".join((f.text or "") for f in prev_evt.facts).lower()
         next_blob = " ".join((f.text or "") for f in next_evt.facts).lower()
         post_acute = (
@@ -96,10 +77,7 @@ def detect_gaps(
                 duration_days=delta_days,
                 threshold_days=pair_threshold,
                 confidence=80,
-                related_event_ids=[
-                    dated_events[i - 1].event_id,
-                    dated_events[i].event_id,
-                ],
+                related_event_ids=[prev_evt.event_id, next_evt.event_id],
             ))
 
     return sorted_events, gaps, warnings
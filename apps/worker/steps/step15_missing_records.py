@@ -15,6 +15,7 @@ import re
 from packages.shared.models import ArtifactRef, EvidenceGraph, MissingRecordsExtension
 from packages.shared.storage import save_artifact
 from apps.worker.lib.noise_filter import is_noise_span
+from apps.worker.lib.temporal_index import TemporalIndex, event_day
 
 
 CARE_EVENT_TYPES = {
@@ -143,9 +144,13 @@ def _is_acute_event(event) -> bool:
 def detect_missing_records(
     evidence_graph: EvidenceGraph,
     providers_normalized: list[dict], # Provided for context, but we prioritize graph data
+    temporal_index: TemporalIndex | None = None,
 ) -> dict:
     """
     Run missing-record detection based strictly on EvidenceGraph events.
+
+    ``temporal_index`` is the run's shared index over the deduplicated events;
+    one is built from the graph when not supplied.
     """
     # STEP 1 — Build deterministic visit date maps from EVENTS
     provider_visit_dates: dict[tuple[str, str], Set[date]] = {}
@@ -157,22 +162,24 @@ def detect_missing_records(
         p.provider_id: p.detected_name_raw for p in evidence_graph.providers
     }
 
-    # Authoritative source of visit timing
-    for event in evidence_graph.events:
-        if not _is_care_event(event):
-            continue
-        if not event.date:
-            continue
-        
-        visit_date = event.date.sort_date()
-        # Skip unknown/placeholder dates (sort_date returns 1900-01-01 for unknown)
-        if visit_date.year <= 1900:
-            continue
-        if care_start and visit_date < care_start:
-            continue
-        if care_end and visit_date > care_end:
-            continue
+    # _is_care_event runs regexes over the facts; evaluate it once per event object.
+    care_flags: dict[int, bool] = {}
+
+    def is_care(event) -> bool:
+        flag = care_flags.get(id(event))
+        if flag is None:
+            flag = care_flags[id(event)] = _is_care_event(event)
+        return flag
+
+    # Events bucketed by (scope, provider, day) in sort_key order for "latest/earliest" logic;
+    # care events are picked out of the shared buckets at lookup time.
+    if temporal_index is None:
+        temporal_index = TemporalIndex(evidence_graph.events, scope_of=_patient_scope_id)
 
+    # Authoritative source of visit timing: dated care events starting inside the care window
+    # (the index skips unknown/placeholder dates, which sort_date returns as 1900-01-01)
+    for event in temporal_index.starting_between(care_start, care_end, include=is_care):
+        visit_date = event_day(event)
         patient_scope_id = _patient_scope_id(event)
         if patient_scope_id == "ps_unknown":
             continue
@@ -187,12 +194,6 @@ def detect_missing_records(
                 provider_visit_dates[key] = set()
             provider_visit_dates[key].add(visit_date)
 
-    # Pre-sort events by sort_key for "latest/earliest" logic
-    sorted_events_for_evidence = sorted(
-        evidence_graph.events, 
-        key=lambda e: e.date.sort_key() if e.date else (99, "UNKNOWN")
-    )
-
     # Sort dates ascending
     sorted_global_dates_by_scope: dict[str, list[date]] = {
         scope: sorted(list(dates)) for scope, dates in global_visit_dates.items()
@@ -218,14 +219,8 @@ def detect_missing_records(
             gap_days = (d2 - d1).days
             # Find boundary events for evidence
             # We need all events on these dates for this provider to get citations
-            events_on_d1 = [e for e in sorted_events_for_evidence 
-                            if _is_care_event(e)
-                            and _patient_scope_id(e) == patient_scope_id
-                            and e.provider_id == pid and e.date and e.date.sort_date() == d1]
-            events_on_d2 = [e for e in sorted_events_for_evidence 
-                            if _is_care_event(e)
-                            and _patient_scope_id(e) == patient_scope_id
-                            and e.provider_id == pid and e.date and e.date.sort_date() == d2]
+            events_on_d1 = temporal_index.events_on(d1, scope=patient_scope_id, provider_id=pid, include=is_care)
+            events_on_d2 = temporal_index.events_on(d2, scope=patient_scope_id, provider_id=pid, include=is_care)
             boundary_acute = bool((events_on_d1 and _is_acute_event(events_on_d1[-1])) or (events_on_d2 and _is_acute_event(events_on_d2[0])))
             min_days = 30
             if gap_days >= min_days:
@@ -278,14 +273,8 @@ def detect_missing_records(
             d2 = sorted_global_dates[i+1]
             gap_days = (d2 - d1).days
             # Find nearest events globally
-            events_on_d1 = [e for e in sorted_events_for_evidence 
-                            if _is_care_event(e)
-                            and _patient_scope_id(e) == patient_scope_id
-                            and e.date and e.date.sort_date() == d1]
-            events_on_d2 = [e for e in sorted_events_for_evidence 
-                            if _is_care_event(e)
-                            and _patient_scope_id(e) == patient_scope_id
-                            and e.date and e.date.sort_date() == d2]
+            events_on_d1 = temporal_index.events_on(d1, scope=patient_scope_id, include=is_care)
+            events_on_d2 = temporal_index.events_on(d2, scope=patient_scope_id, include=is_care)
             boundary_acute = bool((events_on_d1 and _is_acute_event(events_on_d1[-1])) or (events_on_d2 and _is_acute_event(events_on_d2[0])))
             min_days = 45
             if gap_days < min_days:
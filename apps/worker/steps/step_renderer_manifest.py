@@ -8,11 +8,11 @@ from __future__ import annotations
 
 import hashlib
 import re
-from difflib import SequenceMatcher
 from datetime import datetime
 from datetime import date
 from typing import Any
 
+from apps.worker.lib.fuzzy_match import get_similarity_engine
 from packages.shared.models import Citation, Event, RendererManifest, RendererDoiField, RendererCitationValue, RendererPtSummary, PromotedFinding, BucketEvidence, RendererCaseSkeleton, RendererCaseSkeletonItem
 from packages.shared.utils.scoring_utils import is_ed_event
 from packages.shared.utils.noise_utils import is_fax_header_noise
@@ -421,7 +421,7 @@ def _labels_similar_within_family(a: PromotedFinding, b: PromotedFinding) -> boo
         jacc = len(ta & tb) / max(1, len(ta | tb))
         if jacc >= 0.78:
             return True
-    return SequenceMatcher(None, na, nb).ratio() >= 0.88
+    return get_similarity_engine().ratio_at_least(na, nb, 0.88)
 
 
 def _promoted_finding_pick_rank(f: PromotedFinding) -> tuple:
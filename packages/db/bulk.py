@@ -0,0 +1,276 @@
+"""
+Bulk row inserts for run-scoped tables.
+
+``bulk_insert`` writes plain row dicts on the session's own connection, so the
+rows commit (or roll back) with the rest of the session's transaction:
+
+- Postgres: ``COPY <table> FROM STDIN`` through the raw psycopg2/psycopg connection,
+  one round trip per table instead of one INSERT per ORM object.
+- Everything else (SQLite, drivers without COPY): Core ``insert()`` executed with
+  a list of parameter sets per batch (``executemany``; SQLAlchemy folds these into
+  multi-row VALUES where the dialect supports it).
+
+``upsert_diff`` re-persists a run's rows by difference instead: rows are matched
+to what the run already has by key and content hash, and only new, changed and
+removed rows are written (``ON CONFLICT DO UPDATE`` on Postgres, ``INSERT OR
+REPLACE`` on SQLite).
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import JSON, Table, select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger("linecite.db")
+
+BATCH_SIZE = 1000
+# Below this many rows a plain executemany is as fast as COPY.
+COPY_MIN_ROWS = 200
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+def _table(target: Any) -> Table:
+    return getattr(target, "__table__", target)
+
+
+def _batched(rows: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    it = iter(rows)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _with_defaults(table: Table, rows: list[dict[str, Any]]) -> tuple[list[str], list[dict[str, Any]]]:
+    """Fill Python-side column defaults (ids, timestamps) that executemany would have applied."""
+    present = set().union(*(row.keys() for row in rows))
+    columns = [
+        c for c in table.columns
+        if c.name in present or (c.default is not None and (c.default.is_callable or c.default.is_scalar))
+    ]
+    for col in columns:
+        default = col.default
+        for row in rows:
+            if col.name in row:
+                continue
+            if default is None:
+                row[col.name] = None
+            elif default.is_callable:
+                row[col.name] = default.arg(None)
+            else:
+                row[col.name] = default.arg
+    return [c.name for c in columns], rows
+
+
+def _copy_value(value: Any, is_json: bool) -> str:
+    if is_json:
+        # Like the JSON bind processor: Python None is stored as JSON null, not SQL NULL.
+        text = json.dumps(value)
+    elif value is None:
+        return "\\N"
+    elif isinstance(value, bool):
+        text = "t" if value else "f"
+    elif isinstance(value, (datetime, date)):
+        text = value.isoformat()
+    else:
+        text = str(value)
+    return text.translate(_COPY_ESCAPES)
+
+
+def copy_text(table: Table, columns: list[str], rows: list[dict[str, Any]]) -> str:
+    """Rows in Postgres COPY text format (tab-separated, ``\\N`` for NULL)."""
+    json_cols = [isinstance(table.c[name].type, JSON) for name in columns]
+    out = io.StringIO()
+    for row in rows:
+        out.write("\t".join(_copy_value(row[name], is_json) for name, is_json in zip(columns, json_cols, strict=True)))
+        out.write("\n")
+    return out.getvalue()
+
+
+def _copy_rows(session: Session, table: Table, rows: list[dict[str, Any]]) -> bool:
+    dbapi_conn = session.connection().connection.dbapi_connection
+    columns, rows = _with_defaults(table, rows)
+    sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+    payload = copy_text(table, columns, rows)
+    cursor = dbapi_conn.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(sql, io.StringIO(payload))
+        elif hasattr(cursor, "copy"):  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(payload)
+        else:
+            return False
+    finally:
+        cursor.close()
+    return True
+
+
+def bulk_insert(session: Session, target: Any, rows: Iterable[dict[str, Any]], *, batch_size: int = BATCH_SIZE) -> int:
+    """Insert *rows* (column name -> value) into *target* (ORM class or Table); returns the row count."""
+    table = _table(target)
+    rows = list(rows)
+    if not rows:
+        return 0
+    if session.get_bind().dialect.name == "postgresql" and len(rows) >= COPY_MIN_ROWS:
+        try:
+            if _copy_rows(session, table, rows):
+                return len(rows)
+        except AttributeError:
+            logger.debug("COPY unavailable for %s; falling back to executemany", table.name)
+    conn = session.connection()
+    for batch in _batched(rows, batch_size):
+        conn.execute(table.insert(), batch)
+    return len(rows)
+
+
+@dataclass
+class DiffStats:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {"inserted": self.inserted, "updated": self.updated, "deleted": self.deleted, "unchanged": self.unchanged}
+
+
+def row_digest(row: dict[str, Any], columns: Iterable[str]) -> str:
+    """Content hash of *row* over *columns*; JSON values hash the same whether built in Python or read back."""
+    canonical = json.dumps([row.get(c) for c in columns], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def _pk_column(table: Table) -> str:
+    (column,) = table.primary_key.columns
+    return column.name
+
+
+def _upsert(session: Session, table: Table, rows: list[dict[str, Any]], batch_size: int) -> None:
+    dialect = session.get_bind().dialect.name
+    pk = _pk_column(table)
+    conn = session.connection()
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            # An upsert, not INSERT OR REPLACE: that deletes and re-inserts the row,
+            # firing delete triggers and resetting columns missing from *rows*.
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[pk],
+            set_={name: stmt.excluded[name] for name in rows[0] if name != pk},
+        )
+    else:
+        _delete_ids(session, table, [row[pk] for row in rows], batch_size)
+        stmt = table.insert()
+    for batch in _batched(rows, batch_size):
+        conn.execute(stmt, batch)
+
+
+def _delete_ids(session: Session, table: Table, ids: list[Any], batch_size: int) -> None:
+    conn = session.connection()
+    pk = table.c[_pk_column(table)]
+    for batch in _batched(ids, batch_size):
+        conn.execute(table.delete().where(pk.in_(batch)))
+
+
+@dataclass
+class RowDiff:
+    """Rows to delete and to write to bring one table's scoped rows up to date."""
+
+    table: Table
+    by_pk: bool
+    fresh: list[dict[str, Any]]
+    changed: list[dict[str, Any]]
+    stale_ids: list[Any]
+    stats: DiffStats
+
+    def delete(self, session: Session, *, batch_size: int = BATCH_SIZE) -> None:
+        if self.stale_ids:
+            _delete_ids(session, self.table, self.stale_ids, batch_size)
+
+    def write(self, session: Session, *, batch_size: int = BATCH_SIZE) -> None:
+        if self.by_pk:
+            if self.changed:
+                _upsert(session, self.table, self.changed, batch_size)
+            bulk_insert(session, self.table, self.fresh, batch_size=batch_size)
+        else:
+            bulk_insert(session, self.table, self.changed + self.fresh, batch_size=batch_size)
+
+
+def diff_rows(
+    session: Session,
+    target: Any,
+    rows: Iterable[dict[str, Any]],
+    *,
+    scope: dict[str, Any],
+    key: tuple[str, ...] | None = None,
+) -> RowDiff:
+    """
+    Compare *rows* with the rows of *target* matching *scope* (e.g. ``{"run_id": ...}``) by key and content hash.
+
+    Rows are matched on *key* (default: the primary key). With the primary key as key,
+    changed rows are upserted in place; with another key (e.g. the content columns of a
+    table whose ids are generated on insert) changed rows are deleted and re-inserted.
+    """
+    table = _table(target)
+    pk = _pk_column(table)
+    key = tuple(key or (pk,))
+    by_pk = key == (pk,)
+    rows = list(rows)
+    columns = sorted(set().union(*(row.keys() for row in rows)) - ({pk} - set(key))) if rows else []
+
+    stats = DiffStats()
+    stale: list[Any] = []
+    existing: dict[tuple, dict[str, Any]] = {}
+    query = select(table).where(*(table.c[c] == v for c, v in scope.items()))
+    for found in session.connection().execute(query).mappings():
+        found_key = tuple(found[k] for k in key)
+        if found_key in existing:  # duplicate under a non-unique key: keep one
+            stale.append(found[pk])
+            stats.deleted += 1
+        else:
+            existing[found_key] = dict(found)
+
+    fresh: list[dict[str, Any]] = []
+    changed: list[dict[str, Any]] = []
+    for row in rows:
+        old = existing.pop(tuple(row.get(k) for k in key), None)
+        if old is None:
+            fresh.append(row)
+        elif row_digest(old, columns) == row_digest(row, columns):
+            stats.unchanged += 1
+        else:
+            changed.append(row)
+            if not by_pk:
+                stale.append(old[pk])
+    stale.extend(old[pk] for old in existing.values())
+    stats.inserted, stats.updated = len(fresh), len(changed)
+    stats.deleted += len(existing)
+    return RowDiff(table, by_pk, fresh, changed, stale, stats)
+
+
+def upsert_diff(
+    session: Session,
+    target: Any,
+    rows: Iterable[dict[str, Any]],
+    *,
+    scope: dict[str, Any],
+    key: tuple[str, ...] | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> DiffStats:
+    """Make the rows of *target* matching *scope* equal *rows*, writing only the difference (see ``diff_rows``)."""
+    diff = diff_rows(session, target, rows, scope=scope, key=key)
+    diff.delete(session, batch_size=batch_size)
+    diff.write(session, batch_size=batch_size)
+    return diff.stats
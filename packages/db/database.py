@@ -6,11 +6,17 @@ from __future__ import annotations
 import os
 import logging
 import re
+import threading
+import time
 from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from typing import Generator
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 from dotenv import load_dotenv
 
 logger = logging.getLogger("linecite.db")
@@ -60,24 +66,213 @@ def get_database_url() -> str:
             
     return url
 
-_engine = None
-_SessionLocal = None
-
-def get_engine():
-    global _engine
-    if _engine is None:
-        url = get_database_url()
-        connect_args = {}
-        if "sqlite" in url:
-            connect_args = {"check_same_thread": False}
-        _engine = create_engine(url, echo=False, connect_args=connect_args)
-    return _engine
-
-def get_session_factory():
-    global _SessionLocal
-    if _SessionLocal is None:
-        _SessionLocal = sessionmaker(bind=get_engine(), autoflush=False, autocommit=False)
-    return _SessionLocal
+# Engine profiles: every process role gets its own pool, so API requests never queue
+# behind worker threads or the in-process sweeper. Each setting can be overridden
+# with DB_<PROFILE>_<SETTING>, e.g. DB_API_POOL_SIZE=10 or DB_WORKER_STATEMENT_TIMEOUT_MS=0.
+@dataclass(frozen=True)
+class EngineProfile:
+    name: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float         # seconds to wait for a free connection before erroring
+    pool_recycle: int           # seconds; drop connections before the pooler/LB kills them
+    statement_timeout_ms: int   # 0 disables
+    null_pool: bool = False     # open per checkout; nothing held between uses
+
+_PROFILES = {
+    "api": EngineProfile("api", pool_size=5, max_overflow=10, pool_timeout=10, pool_recycle=1800, statement_timeout_ms=30_000),
+    "worker": EngineProfile("worker", pool_size=3, max_overflow=2, pool_timeout=30, pool_recycle=1800, statement_timeout_ms=600_000),
+    # Cron runner and periodic sweepers: short-lived or idle most of the time, so hold nothing.
+    "cron": EngineProfile("cron", pool_size=0, max_overflow=0, pool_timeout=30, pool_recycle=0, statement_timeout_ms=600_000, null_pool=True),
+}
+ENGINE_PROFILE_NAMES = tuple(_PROFILES)
+DEFAULT_ENGINE_PROFILE = os.getenv("DB_ENGINE_PROFILE", "api").strip().lower()
+# "transaction" for a transaction-mode pooler (Supabase port 6543, PgBouncer pool_mode=transaction);
+# auto-detected from the port when unset.
+DB_POOLER_MODE = os.getenv("DB_POOLER_MODE", "").strip().lower()
+
+_profile_override: ContextVar[str | None] = ContextVar("db_engine_profile", default=None)
+
+
+def engine_profile(name: str | None = None) -> EngineProfile:
+    name = (name or _profile_override.get() or DEFAULT_ENGINE_PROFILE).lower()
+    if name not in _PROFILES:
+        raise ValueError(f"Unknown DB engine profile {name!r}; expected one of {sorted(_PROFILES)}")
+    base = _PROFILES[name]
+    prefix = f"DB_{name.upper()}_"
+
+    def _env(field: str, cast, default):
+        raw = os.getenv(prefix + field.upper())
+        if raw is None or not raw.strip():
+            return default
+        if cast is bool:
+            return raw.strip().lower() in {"1", "true", "yes", "on"}
+        return cast(raw)
+
+    return EngineProfile(
+        name=name,
+        pool_size=_env("pool_size", int, base.pool_size),
+        max_overflow=_env("max_overflow", int, base.max_overflow),
+        pool_timeout=_env("pool_timeout", float, base.pool_timeout),
+        pool_recycle=_env("pool_recycle", int, base.pool_recycle),
+        statement_timeout_ms=_env("statement_timeout_ms", int, base.statement_timeout_ms),
+        null_pool=_env("null_pool", bool, base.null_pool),
+    )
+
+
+@contextmanager
+def use_engine_profile(name: str) -> Generator[None, None, None]:
+    """Route get_engine()/get_session() in this context (thread or task) to the *name* profile."""
+    engine_profile(name)  # validate
+    token = _profile_override.set(name)
+    try:
+        yield
+    finally:
+        _profile_override.reset(token)
+
+
+def _transaction_pooler(url: str) -> bool:
+    if DB_POOLER_MODE:
+        return DB_POOLER_MODE == "transaction"
+    return ":6543/" in url
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    waits: int = 0              # checkouts that found no idle connection
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    timeouts: int = 0
+
+
+class _TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        idle = self.checkedin() > 0  # otherwise the checkout connects or blocks
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - t0
+            self.stats.checkouts += 1
+            if not idle:
+                self.stats.waits += 1
+                self.stats.wait_seconds += waited
+                self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, waited)
+
+
+def _create_engine(url: str, profile: EngineProfile):
+    if "sqlite" in url:
+        return create_engine(url, echo=False, connect_args={"check_same_thread": False})
+
+    pooler = _transaction_pooler(url)
+    connect_args: dict = {}
+    if url.startswith("postgresql+psycopg:") or url.startswith("postgresql+psycopg_async:"):
+        # Server-side prepared statements break when the pooler hands the next
+        # transaction to a different backend; psycopg 3 prepares after 5 executions by default.
+        if pooler:
+            connect_args["prepare_threshold"] = None
+    if profile.statement_timeout_ms and not pooler:
+        # Session-level setting, applied once per physical connection.
+        connect_args["options"] = f"-c statement_timeout={profile.statement_timeout_ms}"
+    kwargs: dict = {"echo": False, "connect_args": connect_args, "pool_pre_ping": True}
+    if profile.null_pool or pooler:
+        # The transaction pooler already pools; a client-side pool would only pin server slots.
+        kwargs["poolclass"] = NullPool
+    else:
+        kwargs.update(
+            poolclass=_TimedQueuePool,
+            pool_size=profile.pool_size,
+            max_overflow=profile.max_overflow,
+            pool_timeout=profile.pool_timeout,
+            pool_recycle=profile.pool_recycle if profile.pool_recycle > 0 else -1,
+        )
+    engine = create_engine(url, **kwargs)
+    if profile.statement_timeout_ms and pooler:
+        timeout_ms = int(profile.statement_timeout_ms)
+
+        @event.listens_for(engine, "begin")
+        def _set_local_timeout(conn):
+            # SET LOCAL lasts for this transaction only, so it never leaks to
+            # another client sharing the pooler's backend.
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+    logger.info(
+        "DB engine profile=%s pool=%s pooler=%s statement_timeout_ms=%s",
+        profile.name, type(engine.pool).__name__, "transaction" if pooler else "session", profile.statement_timeout_ms,
+    )
+    return engine
+
+
+_engines: dict[str, object] = {}
+_session_factories: dict[str, sessionmaker] = {}
+_engines_lock = threading.Lock()
+
+
+_engine_url: str | None = None
+
+
+def _engine_key(profile: str | None) -> tuple[str, str]:
+    global _engine_url
+    if _engine_url is None:
+        _engine_url = get_database_url()
+    # SQLite has nothing to tune and an in-memory database must stay on one engine.
+    if "sqlite" in _engine_url:
+        return "sqlite", _engine_url
+    return engine_profile(profile).name, _engine_url
+
+
+def get_engine(profile: str | None = None):
+    key, url = _engine_key(profile)
+    engine = _engines.get(key)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(key)
+            if engine is None:
+                engine = _engines[key] = _create_engine(url, engine_profile(profile))
+    return engine
+
+def get_session_factory(profile: str | None = None):
+    key, _ = _engine_key(profile)
+    factory = _session_factories.get(key)
+    if factory is None:
+        factory = _session_factories[key] = sessionmaker(bind=get_engine(profile), autoflush=False, autocommit=False)
+    return factory
+
+
+def pool_metrics() -> dict[str, dict]:
+    """Per-profile pool state for engines created in this process."""
+    out = {}
+    for key, engine in list(_engines.items()):
+        pool = engine.pool
+        entry: dict = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update(size=pool.size(), checked_out=pool.checkedout(), checked_in=pool.checkedin(), overflow=max(0, pool.overflow()))
+        stats = getattr(pool, "stats", None)
+        if stats is not None:
+            entry.update(
+                checkouts=stats.checkouts,
+                waits=stats.waits,
+                wait_ms_total=round(stats.wait_seconds * 1000, 3),
+                wait_ms_max=round(stats.max_wait_seconds * 1000, 3),
+                timeouts=stats.timeouts,
+            )
+        out[key] = entry
+    return out
 
 def init_db() -> None:
     """Create all tables (idempotent)."""
@@ -85,6 +280,18 @@ def init_db() -> None:
     Base.metadata.create_all(bind=get_engine())
     _apply_schema_migrations()
 
+def _index_ddl(concurrently: bool = False) -> list[str]:
+    """CREATE INDEX IF NOT EXISTS for every non-unique index declared on the models (create_all skips existing tables)."""
+    from packages.db.models import Base
+
+    keyword = "CREATE INDEX CONCURRENTLY IF NOT EXISTS" if concurrently else "CREATE INDEX IF NOT EXISTS"
+    return [
+        f"{keyword} {index.name} ON {table.name} ({', '.join(c.name for c in index.columns)})"
+        for table in Base.metadata.sorted_tables
+        for index in sorted(table.indexes, key=lambda i: i.name)
+        if not index.unique
+    ]
+
 def _apply_schema_migrations() -> None:
     """Apply lightweight schema fixes."""
     url = get_database_url()
@@ -101,6 +308,13 @@ def _apply_schema_migrations() -> None:
             if "retry_count" not in cols:
                 conn.execute(text("ALTER TABLE runs ADD COLUMN retry_count INTEGER DEFAULT 0"))
                 conn.commit()
+            if "export_mode" not in cols:
+                conn.execute(text("ALTER TABLE runs ADD COLUMN export_mode VARCHAR(20)"))
+                conn.execute(text(
+                    "UPDATE runs SET export_mode = NULLIF(UPPER(TRIM(json_extract(config_json, '$.export_mode'))), '') "
+                    "WHERE export_mode IS NULL AND json_valid(config_json)"
+                ))
+                conn.commit()
             
             # Table: firms
             res = conn.execute(text("PRAGMA table_info(firms)")).fetchall()
@@ -118,6 +332,18 @@ def _apply_schema_migrations() -> None:
             if "firm_id" not in cols:
                 conn.execute(text("ALTER TABLE sales_events ADD COLUMN firm_id VARCHAR(120)"))
                 conn.commit()
+
+            # Table: pages (text/layout moved to page_text_blobs)
+            res = conn.execute(text("PRAGMA table_info(pages)")).fetchall()
+            cols = [r[1] for r in res]
+            for col in ("text_sha256", "layout_sha256"):
+                if col not in cols:
+                    conn.execute(text(f"ALTER TABLE pages ADD COLUMN {col} VARCHAR(64) REFERENCES page_text_blobs(sha256)"))
+                    conn.commit()
+
+            for ddl in _index_ddl():
+                conn.execute(text(ddl))
+            conn.commit()
         return
     
     try:
@@ -126,15 +352,37 @@ def _apply_schema_migrations() -> None:
             # Type-alter DDL can request ACCESS EXCLUSIVE locks and stall health checks.
             conn.execute(text("ALTER TABLE runs ADD COLUMN IF NOT EXISTS retry_count INTEGER DEFAULT 0"))
             conn.execute(text("ALTER TABLE runs ADD COLUMN IF NOT EXISTS invariant_attestation_json JSONB"))
+            conn.execute(text("ALTER TABLE runs ADD COLUMN IF NOT EXISTS export_mode VARCHAR(20)"))
             conn.execute(text("ALTER TABLE firms ADD COLUMN IF NOT EXISTS status VARCHAR(50) DEFAULT 'trial'"))
             conn.execute(text("ALTER TABLE firms ADD COLUMN IF NOT EXISTS tier VARCHAR(50) DEFAULT 'starter'"))
             conn.execute(text("ALTER TABLE sales_events ADD COLUMN IF NOT EXISTS firm_id VARCHAR(120)"))
+            conn.execute(text("ALTER TABLE pages ADD COLUMN IF NOT EXISTS text_sha256 VARCHAR(64) REFERENCES page_text_blobs(sha256)"))
+            conn.execute(text("ALTER TABLE pages ADD COLUMN IF NOT EXISTS layout_sha256 VARCHAR(64) REFERENCES page_text_blobs(sha256)"))
+    except Exception:
+        pass
+    try:
+        with engine.begin() as conn:
+            # Backfill the denormalized export mode; a no-op once every run has one (or no config).
+            conn.execute(text(
+                "UPDATE runs SET export_mode = NULLIF(UPPER(TRIM(config_json::json->>'export_mode')), '') "
+                "WHERE export_mode IS NULL AND config_json IS NOT NULL AND config_json::json->>'export_mode' IS NOT NULL"
+            ))
+    except Exception:
+        logger.warning("runs.export_mode backfill failed", exc_info=True)
+    try:
+        # CONCURRENTLY builds without blocking writes to the table; it cannot run inside a transaction.
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for ddl in _index_ddl(concurrently=True):
+                try:
+                    conn.execute(text(ddl))
+                except Exception:
+                    logger.warning("Index migration failed: %s", ddl, exc_info=True)
     except Exception:
         pass
 
 @contextmanager
-def get_session() -> Generator[Session, None, None]:
-    factory = get_session_factory()
+def get_session(profile: str | None = None) -> Generator[Session, None, None]:
+    factory = get_session_factory(profile)
     session = factory()
     try:
         yield session
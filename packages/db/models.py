@@ -3,11 +3,13 @@ SQLAlchemy ORM models for CiteLine persistence.
 """
 from __future__ import annotations
 
+import json
 import uuid
+import zlib
 from datetime import datetime, timezone as dt_timezone
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text, JSON
-from sqlalchemy.orm import DeclarativeBase, relationship
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String, Text, JSON
+from sqlalchemy.orm import DeclarativeBase, relationship, validates
 
 def _uuid():
     return uuid.uuid4().hex
@@ -34,6 +36,7 @@ class Firm(Base):
 
 class Matter(Base):
     __tablename__ = "matters"
+    __table_args__ = (Index("ix_matters_firm_id", "firm_id"),)
     id = Column(String(120), primary_key=True, default=_uuid)
     firm_id = Column(String(120), ForeignKey("firms.id"), nullable=False)
     title = Column(String(200), nullable=False)
@@ -49,6 +52,7 @@ class Matter(Base):
 
 class SourceDocument(Base):
     __tablename__ = "source_documents"
+    __table_args__ = (Index("ix_source_documents_matter_id_sha256", "matter_id", "sha256"),)
 
     id = Column(String(120), primary_key=True, default=_uuid)
     matter_id = Column(String(120), ForeignKey("matters.id"), nullable=False)
@@ -65,12 +69,22 @@ class SourceDocument(Base):
 
 class Run(Base):
     __tablename__ = "runs"
+    # Hot paths: claim (status + created_at), stale/lease recovery (status + heartbeat/lease),
+    # per-matter run lists and latest-export lookup (matter_id + export mode + time).
+    __table_args__ = (
+        Index("ix_runs_status_created_at", "status", "created_at"),
+        Index("ix_runs_status_heartbeat_at", "status", "heartbeat_at"),
+        Index("ix_runs_status_lock_expires_at", "status", "lock_expires_at"),
+        Index("ix_runs_matter_id_created_at", "matter_id", "created_at"),
+        Index("ix_runs_matter_id_export_mode_finished_at", "matter_id", "export_mode", "finished_at"),
+    )
 
     id = Column(String(120), primary_key=True, default=_uuid)
     matter_id = Column(String(120), ForeignKey("matters.id"), nullable=False)
     status = Column(String(20), default="pending")  # pending | running | success | partial | failed | needs_review
     created_at = Column(DateTime, default=utcnow)
     config_json = Column(JSON, nullable=True)
+    export_mode = Column(String(20), nullable=True)  # INTERNAL | MEDIATION; copy of config_json["export_mode"] for SQL filters
     metrics_json = Column(JSON, nullable=True)
     warnings_json = Column(JSON, nullable=True)
     error_message = Column(Text, nullable=True)
@@ -110,6 +124,12 @@ class Run(Base):
     invariant_results = relationship("InvariantResult", back_populates="run", cascade="all, delete-orphan")
     run_metrics = relationship("RunMetric", back_populates="run", cascade="all, delete-orphan")
 
+    @validates("config_json")
+    def _sync_export_mode(self, key, value):
+        mode = str(value.get("export_mode") or "").strip().upper() if isinstance(value, dict) else ""
+        self.export_mode = mode or None
+        return value
+
 
 class InvariantResult(Base):
     """Pass 042: Persisted record of every invariant check result for a production run."""
@@ -143,6 +163,7 @@ class RunMetric(Base):
 
 class Artifact(Base):
     __tablename__ = "artifacts"
+    __table_args__ = (Index("ix_artifacts_run_id_artifact_type", "run_id", "artifact_type"),)
 
     id = Column(String(120), primary_key=True, default=_uuid)
     run_id = Column(String(120), ForeignKey("runs.id"), nullable=False)
@@ -158,6 +179,7 @@ class Artifact(Base):
 
 class Page(Base):
     __tablename__ = "pages"
+    __table_args__ = (Index("ix_pages_run_id_source_document_id_page_number", "run_id", "source_document_id", "page_number"),)
 
     id = Column(String(120), primary_key=True, default=_uuid)
     run_id = Column(String(120), ForeignKey("runs.id"), nullable=False)
@@ -167,13 +189,48 @@ class Page(Base):
     text_source = Column(String(50), nullable=True)  # embedded_pdf_text | ocr
     page_type = Column(String(50), nullable=True)
     layout_json = Column(JSON, nullable=True)
-    
+    # Text and layout live in page_text_blobs; the inline columns only hold rows written before that.
+    text_sha256 = Column(String(64), ForeignKey("page_text_blobs.sha256"), nullable=True, index=True)
+    layout_sha256 = Column(String(64), ForeignKey("page_text_blobs.sha256"), nullable=True, index=True)
+
     run = relationship("Run", back_populates="pages")
     source_document = relationship("SourceDocument")
+    text_blob = relationship("PageTextBlob", foreign_keys=[text_sha256], viewonly=True)
+    layout_blob = relationship("PageTextBlob", foreign_keys=[layout_sha256], viewonly=True)
+
+    @property
+    def page_text(self) -> str | None:
+        """Page text; the blob is loaded (and decompressed) on first access."""
+        if self.text is not None or self.text_blob is None:
+            return self.text
+        return self.text_blob.text
+
+    @property
+    def layout(self) -> dict | None:
+        if self.layout_blob is None:
+            return self.layout_json
+        return json.loads(self.layout_blob.text)
+
+
+class PageTextBlob(Base):
+    """Content-addressed page text or layout JSON, shared by every run (and the OCR cache) that saw it."""
+    __tablename__ = "page_text_blobs"
+
+    sha256 = Column(String(64), primary_key=True)  # of the uncompressed UTF-8 payload
+    codec = Column(String(10), nullable=False, default="zlib")  # zlib | raw
+    data = Column(LargeBinary, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=utcnow)
+
+    @property
+    def text(self) -> str:
+        raw = zlib.decompress(self.data) if self.codec == "zlib" else self.data
+        return raw.decode("utf-8")
 
 
 class DocumentSegment(Base):
     __tablename__ = "document_segments"
+    __table_args__ = (Index("ix_document_segments_run_id", "run_id"),)
 
     id = Column(String(120), primary_key=True, default=_uuid)
     run_id = Column(String(120), ForeignKey("runs.id"), nullable=False)
@@ -190,6 +247,7 @@ class DocumentSegment(Base):
 
 class Provider(Base):
     __tablename__ = "providers"
+    __table_args__ = (Index("ix_providers_run_id", "run_id"),)
 
     id = Column(String(120), primary_key=True, default=_uuid)
     run_id = Column(String(120), ForeignKey("runs.id"), nullable=False)
@@ -205,6 +263,7 @@ class Provider(Base):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (Index("ix_events_run_id", "run_id"),)
 
     id = Column(String(120), primary_key=True, default=_uuid)
     run_id = Column(String(120), ForeignKey("runs.id"), nullable=False)
@@ -229,6 +288,7 @@ class Event(Base):
 
 class Citation(Base):
     __tablename__ = "citations"
+    __table_args__ = (Index("ix_citations_run_id_page_number", "run_id", "page_number"),)
 
     id = Column(String(120), primary_key=True, default=_uuid)
     run_id = Column(String(120), ForeignKey("runs.id"), nullable=False)
@@ -244,22 +304,35 @@ class Citation(Base):
 
 class OCRCache(Base):
     __tablename__ = "ocr_cache"
+    __table_args__ = (Index("ix_ocr_cache_source_document_id_page_number", "source_document_id", "page_number"),)
 
     id = Column(String(120), primary_key=True, default=_uuid)
     source_document_id = Column(String(120), ForeignKey("source_documents.id"), nullable=False)
     document_sha256 = Column(String(64), nullable=False)
     page_number = Column(Integer, nullable=False)
     text = Column(Text, nullable=True)
-    text_hash = Column(String(64), nullable=True)
+    text_hash = Column(String(64), nullable=True)  # sha256 of the text; also its page_text_blobs key
     ocr_engine = Column(String(50), nullable=True)
     dpi = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=utcnow)
 
     source_document = relationship("SourceDocument")
+    text_blob = relationship(
+        "PageTextBlob",
+        primaryjoin="foreign(OCRCache.text_hash) == PageTextBlob.sha256",
+        viewonly=True,
+    )
+
+    @property
+    def cached_text(self) -> str | None:
+        if self.text is not None or self.text_blob is None:
+            return self.text
+        return self.text_blob.text
 
 
 class Gap(Base):
     __tablename__ = "gaps"
+    __table_args__ = (Index("ix_gaps_run_id", "run_id"),)
 
     id = Column(String(120), primary_key=True, default=_uuid)
     run_id = Column(String(120), ForeignKey("runs.id"), nullable=False)
@@ -0,0 +1,210 @@
+"""
+Content-addressed storage for page text and layout (``page_text_blobs``).
+
+Re-running a matter re-extracts the same text for every page, so pages and the
+OCR cache store a sha256 reference instead of the payload itself. Each distinct
+text (or canonical layout JSON) is kept once, zlib-compressed, however many
+runs point at it.
+
+- ``store_blobs`` writes the payloads that are not stored yet. Existing ones are
+  found by key and neither compressed nor sent again.
+- ``Page.page_text`` / ``Page.layout`` and ``OCRCache.cached_text`` load a blob
+  lazily on first access; ``selectinload(Page.text_blob)`` batches it for lists.
+- ``compact_page_text`` moves rows written before blob storage into blobs and
+  deletes blobs nothing references any more.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import zlib
+from typing import Any, Iterable
+
+from sqlalchemy import bindparam, exists, select, update
+from sqlalchemy.orm import Session
+
+from packages.db.bulk import BATCH_SIZE, _batched
+from packages.db.models import OCRCache, Page, PageTextBlob
+
+logger = logging.getLogger("linecite.db")
+
+_ZLIB_LEVEL = 6
+
+
+def blob_key(payload: str) -> str:
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def layout_payload(layout: Any) -> str | None:
+    """Canonical JSON for a page layout, so equal layouts share one blob."""
+    if layout is None:
+        return None
+    return json.dumps(layout, sort_keys=True, separators=(",", ":"))
+
+
+def _blob_row(key: str, payload: str) -> dict[str, Any]:
+    raw = payload.encode("utf-8")
+    packed = zlib.compress(raw, _ZLIB_LEVEL)
+    if len(packed) < len(raw):
+        return {"sha256": key, "codec": "zlib", "data": packed, "size_bytes": len(raw)}
+    return {"sha256": key, "codec": "raw", "data": raw, "size_bytes": len(raw)}
+
+
+def _insert_blobs(session: Session, rows: list[dict[str, Any]]) -> None:
+    table = PageTextBlob.__table__
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        # A concurrent run may store the same blob first; keep whichever landed.
+        stmt = pg_insert(table).on_conflict_do_nothing(index_elements=["sha256"])
+    elif dialect == "sqlite":
+        stmt = table.insert().prefix_with("OR IGNORE")
+    else:
+        stmt = table.insert()
+    conn = session.connection()
+    for batch in _batched(rows, BATCH_SIZE):
+        conn.execute(stmt, batch)
+
+
+def store_blobs(session: Session, payloads: Iterable[str | None]) -> dict[str, int]:
+    """Store each distinct non-empty payload once; returns ``{"stored", "reused", "bytes_stored"}``."""
+    by_key: dict[str, str] = {}
+    for payload in payloads:
+        if payload is not None:
+            by_key.setdefault(blob_key(payload), payload)
+    existing: set[str] = set()
+    conn = session.connection()
+    for keys in _batched(by_key, BATCH_SIZE):
+        query = select(PageTextBlob.sha256).where(PageTextBlob.sha256.in_(keys))
+        if session.get_bind().dialect.name == "postgresql":
+            # Hold the reused blobs until the referencing rows commit, so compaction cannot drop them in between.
+            query = query.with_for_update(read=True, key_share=True)
+        existing.update(conn.execute(query).scalars())
+    rows = [_blob_row(key, payload) for key, payload in by_key.items() if key not in existing]
+    if rows:
+        _insert_blobs(session, rows)
+    return {"stored": len(rows), "reused": len(existing), "bytes_stored": sum(len(r["data"]) for r in rows)}
+
+
+def _page_payloads(page: Any) -> tuple[str | None, str | None]:
+    return page.text, layout_payload(page.layout.model_dump(mode="json")) if page.layout else None
+
+
+def _keys(payloads: tuple[str | None, str | None]) -> tuple[str | None, str | None]:
+    text, layout = payloads
+    return (blob_key(text) if text is not None else None, blob_key(layout) if layout is not None else None)
+
+
+def page_blob_refs(pages: Iterable[Any]) -> dict[str, tuple[str | None, str | None]]:
+    """``page_id -> (text_sha256, layout_sha256)`` for shared-model pages."""
+    return {page.page_id: _keys(_page_payloads(page)) for page in pages}
+
+
+def store_page_blobs(session: Session, pages: Iterable[Any]) -> dict[str, tuple[str | None, str | None]]:
+    """Store the text and layout blobs of shared-model *pages*; returns their ``page_blob_refs``."""
+    payloads = {page.page_id: _page_payloads(page) for page in pages}
+    stats = store_blobs(session, (p for pair in payloads.values() for p in pair))
+    logger.debug("Page blobs: %s", stats)
+    return {page_id: _keys(pair) for page_id, pair in payloads.items()}
+
+
+def _move_inline_pages(session: Session, batch_size: int) -> int:
+    conn = session.connection()
+    pages = Page.__table__
+    stmt = (
+        update(pages)
+        .where(pages.c.id == bindparam("page_id"))
+        .values(text=None, layout_json=None, text_sha256=bindparam("t_sha"), layout_sha256=bindparam("l_sha"))
+    )
+    moved = 0
+    last_id = ""
+    while True:
+        batch = conn.execute(
+            select(pages.c.id, pages.c.text, pages.c.layout_json)
+            .where(pages.c.text_sha256.is_(None), pages.c.layout_sha256.is_(None), pages.c.id > last_id)
+            .order_by(pages.c.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            return moved
+        last_id = batch[-1].id
+        params = []
+        payloads: list[str | None] = []
+        for row in batch:
+            layout = layout_payload(row.layout_json)
+            if row.text is None and layout is None:
+                continue
+            t_sha, l_sha = _keys((row.text, layout))
+            params.append({"page_id": row.id, "t_sha": t_sha, "l_sha": l_sha})
+            payloads += (row.text, layout)
+        if params:
+            store_blobs(session, payloads)
+            conn.execute(stmt, params)
+            moved += len(params)
+
+
+def _move_inline_ocr_cache(session: Session, batch_size: int) -> int:
+    conn = session.connection()
+    cache = OCRCache.__table__
+    stmt = update(cache).where(cache.c.id == bindparam("row_id")).values(text=None, text_hash=bindparam("sha"))
+    moved = 0
+    last_id = ""
+    while True:
+        batch = conn.execute(
+            select(cache.c.id, cache.c.text)
+            .where(cache.c.text.is_not(None), cache.c.id > last_id)
+            .order_by(cache.c.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            return moved
+        last_id = batch[-1].id
+        store_blobs(session, (row.text for row in batch))
+        conn.execute(stmt, [{"row_id": row.id, "sha": blob_key(row.text)} for row in batch])
+        moved += len(batch)
+
+
+def _unreferenced(blobs: Any) -> tuple[Any, ...]:
+    return (
+        ~exists().where(Page.text_sha256 == blobs.c.sha256),
+        ~exists().where(Page.layout_sha256 == blobs.c.sha256),
+        ~exists().where(OCRCache.text_hash == blobs.c.sha256),
+    )
+
+
+def _delete_orphaned_blobs(session: Session, batch_size: int) -> int:
+    conn = session.connection()
+    blobs = PageTextBlob.__table__
+    if session.get_bind().dialect.name != "postgresql":
+        # SQLite serializes writers: nothing can reference a blob between the check and the delete.
+        return conn.execute(blobs.delete().where(*_unreferenced(blobs))).rowcount
+    # ocr_cache.text_hash has no foreign key (legacy rows hash text that was never stored as a
+    # blob), so nothing makes the delete fail for an OCR reference committed after its snapshot.
+    # Lock the orphans first, skipping blobs a run in flight share-locked in ``store_blobs``;
+    # then re-check in new statements, whose snapshots see every reference committed before
+    # the lock. Writers arriving later wait on the lock and store the blob again.
+    candidates = conn.execute(
+        select(blobs.c.sha256).where(*_unreferenced(blobs)).with_for_update(skip_locked=True)
+    ).scalars().all()
+    deleted = 0
+    for keys in _batched(candidates, batch_size):
+        deleted += conn.execute(blobs.delete().where(blobs.c.sha256.in_(keys), *_unreferenced(blobs))).rowcount
+    return deleted
+
+
+def compact_page_text(session: Session, *, batch_size: int = 500) -> dict[str, int]:
+    """
+    Move inline page text, layouts and OCR cache text into blobs, then delete unreferenced blobs.
+
+    Safe to run alongside the worker: on Postgres the orphan delete skips blobs a run in
+    flight has share-locked (see ``store_blobs``) and re-checks page and OCR cache
+    references after locking the rest; a skipped blob is picked up by the next compaction.
+    """
+    pages_moved = _move_inline_pages(session, batch_size)
+    ocr_moved = _move_inline_ocr_cache(session, batch_size)
+    deleted = _delete_orphaned_blobs(session, batch_size)
+    stats = {"pages_moved": pages_moved, "ocr_rows_moved": ocr_moved, "blobs_deleted": deleted}
+    logger.info("Page text compaction: %s", stats)
+    return stats
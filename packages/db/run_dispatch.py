@@ -0,0 +1,277 @@
+"""
+Run dispatch wakeups: idle workers are told about new runs instead of polling.
+
+Whatever makes a run claimable (API create, ``enqueue_run``, lease requeue)
+calls ``notify_run_enqueued(session, run_id)`` in the same transaction:
+
+- Postgres: ``pg_notify('citeline_runs', run_id)``. The server delivers it only
+  if the transaction commits; workers hold a dedicated ``LISTEN`` connection.
+  Behind a transaction-mode pooler a session cannot ``LISTEN``, so workers
+  there poll every ``RUN_DISPATCH_UNNOTIFIED_POLL_SECONDS`` (default 2), as
+  they did before notifications; so do workers whose LISTEN connection is down.
+- SQLite: after commit, a wakeup file next to the database file is rewritten.
+  Idle workers check it every 25 ms; that is a small file read, not a query.
+  A rolled-back transaction drops its pending wakeups.
+
+Workers that can be notified still poll every ``RUN_DISPATCH_POLL_SECONDS``
+(default 30) so a lost notification or a stale run is picked up anyway. ``dispatch_metrics`` reports
+enqueue-to-claim latency for the runs claimed in this process.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import select
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from packages.db.database import _transaction_pooler, get_engine
+
+logger = logging.getLogger("linecite.db")
+
+CHANNEL = "citeline_runs"
+FALLBACK_POLL_SECONDS = float(os.getenv("RUN_DISPATCH_POLL_SECONDS", "30"))
+
+# Polling used where no notification can arrive; the interval workers had before.
+UNNOTIFIED_POLL_SECONDS = float(os.getenv("RUN_DISPATCH_UNNOTIFIED_POLL_SECONDS", "2"))
+
+_WAKE_FILE_CHECK_SECONDS = 0.025
+_PENDING_WAKEUPS = "citeline_run_wakeups"
+_LATENCY_WINDOW = 500
+
+
+# ── Notify ────────────────────────────────────────────────────────────────────
+
+def wakeup_path(engine: Any) -> Path:
+    """Wakeup file shared by every process using the SQLite database of *engine*."""
+    database = engine.url.database
+    if not database or database == ":memory:":
+        # Only this process can see an in-memory database.
+        return Path(tempfile.gettempdir()) / f"citeline-runs-{os.getpid()}.wake"
+    db_path = Path(database)
+    return db_path.with_name(db_path.name + ".wake")
+
+
+def _touch_wakeup(path: Path, run_id: str) -> None:
+    try:
+        path.write_text(f"{run_id} {time.time_ns()}", encoding="utf-8")
+    except OSError as exc:
+        # Workers still find the run on their fallback poll.
+        logger.warning("Run dispatch: could not write wakeup file %s: %s", path, exc)
+
+
+def _touch_pending_wakeups(session: Session) -> None:
+    pending = session.info[_PENDING_WAKEUPS]
+    latest = dict(pending)  # one touch per wakeup file is enough
+    pending.clear()
+    for path, run_id in latest.items():
+        _touch_wakeup(path, run_id)
+
+
+def _discard_pending_wakeups(session: Session, previous_transaction: Any) -> None:
+    # A savepoint rollback keeps them: a spurious wakeup only costs a claim query.
+    if not previous_transaction.nested:
+        session.info[_PENDING_WAKEUPS].clear()
+
+
+def notify_run_enqueued(session: Session, run_id: str) -> None:
+    """Wake idle workers once the current transaction of *session* commits."""
+    bind = session.get_bind()
+    if bind.dialect.name == "postgresql":
+        session.execute(text("SELECT pg_notify(:channel, :run_id)"), {"channel": CHANNEL, "run_id": run_id})
+    else:
+        pending = session.info.get(_PENDING_WAKEUPS)
+        if pending is None:
+            # Registered once per session: listeners cannot be removed while they dispatch.
+            pending = session.info[_PENDING_WAKEUPS] = []
+            event.listen(session, "after_commit", _touch_pending_wakeups)
+            event.listen(session, "after_soft_rollback", _discard_pending_wakeups)
+        pending.append((wakeup_path(bind), run_id))
+    _stats.note_notify()
+
+
+# ── Wait ──────────────────────────────────────────────────────────────────────
+
+class RunWakeup:
+    """Blocks an idle worker until a run may be claimable. The base class just polls."""
+
+    kind = "poll"
+
+    @property
+    def poll_seconds(self) -> float:
+        """How long an idle worker should wait before re-checking the database."""
+        return UNNOTIFIED_POLL_SECONDS
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to *timeout* seconds; True if woken by a notification."""
+        time.sleep(timeout)
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+class _FileWakeup(RunWakeup):
+    kind = "file"
+    poll_seconds = FALLBACK_POLL_SECONDS
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._seen = self._read()
+
+    def _read(self) -> str | None:
+        try:
+            return self.path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._read()
+            if current != self._seen:
+                self._seen = current
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(_WAKE_FILE_CHECK_SECONDS, remaining))
+
+
+class _ListenWakeup(RunWakeup):
+    kind = "listen"
+
+    def __init__(self, engine: Any):
+        self.engine = engine
+        self._conn = None
+        self._listen()
+
+    @property
+    def poll_seconds(self) -> float:
+        # While the LISTEN connection is down nothing can wake the worker.
+        return FALLBACK_POLL_SECONDS if self._conn is not None else UNNOTIFIED_POLL_SECONDS
+
+    def _listen(self) -> None:
+        conn = self.engine.raw_connection()
+        conn.detach()  # held for the worker's lifetime, never handed back to the pool
+        dbapi_conn = conn.driver_connection
+        dbapi_conn.autocommit = True
+        cur = dbapi_conn.cursor()
+        cur.execute(f"LISTEN {CHANNEL}")
+        cur.close()
+        self._conn = conn
+
+    def _drain(self, timeout: float) -> bool:
+        dbapi_conn = self._conn.driver_connection
+        if hasattr(dbapi_conn, "poll"):  # psycopg2
+            if not dbapi_conn.notifies:
+                if select.select([dbapi_conn], [], [], timeout) == ([], [], []):
+                    return False
+                dbapi_conn.poll()
+            woke = bool(dbapi_conn.notifies)
+            del dbapi_conn.notifies[:]
+            return woke
+        # psycopg 3
+        return any(True for _ in dbapi_conn.notifies(timeout=timeout, stop_after=1))
+
+    def wait(self, timeout: float) -> bool:
+        started = time.monotonic()
+        try:
+            if self._conn is None:
+                self._listen()
+            return self._drain(timeout)
+        except Exception as exc:
+            logger.warning("Run dispatch: LISTEN connection lost (%s); polling until it reconnects", exc)
+            self.close()
+            time.sleep(max(0.0, min(timeout, UNNOTIFIED_POLL_SECONDS) - (time.monotonic() - started)))
+            return False
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+
+def open_run_wakeup(engine: Any = None) -> RunWakeup:
+    """The wakeup a worker should idle on for the database behind *engine*."""
+    engine = engine if engine is not None else get_engine()
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        return _FileWakeup(wakeup_path(engine))
+    if dialect == "postgresql":
+        if _transaction_pooler(engine.url.render_as_string(hide_password=True)):
+            logger.info("Run dispatch: no LISTEN through a transaction pooler; polling every %ss", UNNOTIFIED_POLL_SECONDS)
+            return RunWakeup()
+        try:
+            return _ListenWakeup(engine)
+        except Exception as exc:
+            logger.warning("Run dispatch: LISTEN %s failed (%s); polling instead", CHANNEL, exc)
+    return RunWakeup()
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+class _DispatchStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.notifies = 0
+        self.claims = 0
+        self.latency_seconds_total = 0.0
+        self.latency_seconds_max = 0.0
+        self.recent: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def note_notify(self) -> None:
+        with self._lock:
+            self.notifies += 1
+
+    def note_claim(self, latency: float) -> None:
+        with self._lock:
+            self.claims += 1
+            self.latency_seconds_total += latency
+            self.latency_seconds_max = max(self.latency_seconds_max, latency)
+            self.recent.append(latency)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            recent = sorted(self.recent)
+            claims = self.claims
+            out: dict[str, Any] = {"notifies": self.notifies, "claims": claims}
+            if claims:
+                out.update(
+                    enqueue_to_claim_ms_avg=round(self.latency_seconds_total / claims * 1000, 3),
+                    enqueue_to_claim_ms_max=round(self.latency_seconds_max * 1000, 3),
+                    enqueue_to_claim_ms_p50=round(recent[len(recent) // 2] * 1000, 3),
+                    enqueue_to_claim_ms_p95=round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 3),
+                )
+            return out
+
+
+_stats = _DispatchStats()
+
+
+def record_claim(run_id: str, enqueued_at: datetime | None, claimed_at: datetime | None = None) -> float | None:
+    """Record the enqueue-to-claim latency of a freshly claimed run; returns it in seconds."""
+    if enqueued_at is None:
+        return None
+    if enqueued_at.tzinfo is None:  # SQLite drops the offset; stored values are UTC
+        enqueued_at = enqueued_at.replace(tzinfo=timezone.utc)
+    latency = max(0.0, ((claimed_at or datetime.now(timezone.utc)) - enqueued_at).total_seconds())
+    _stats.note_claim(latency)
+    logger.info("Run dispatch: claimed run %s %.1f ms after enqueue", run_id, latency * 1000)
+    return latency
+
+
+def dispatch_metrics() -> dict[str, Any]:
+    """Notifications sent and enqueue-to-claim latency in this process (percentiles over recent claims)."""
+    return _stats.snapshot()
@@ -0,0 +1,164 @@
+"""
+Background uploader for artifacts mirrored to Supabase Object Storage.
+
+One pooled ``requests.Session`` (keep-alive connections, one per worker) serves
+a bounded thread pool. ``submit`` returns immediately unless ``max_pending``
+uploads are already queued, in which case it blocks until one finishes, so a
+run cannot buffer unbounded artifact bytes. Uploads are retried with exponential
+backoff on connection errors, 429 and 5xx responses; other 4xx responses fail
+immediately. Uploads to the same remote path run in submission order, and a
+queued or retrying upload is dropped once a newer one for that path is
+submitted, so stale bytes never land last. ``flush`` is the barrier the pipeline waits on before it commits
+artifact rows: it blocks until every upload under a path prefix has finished and
+reports the ones that failed.
+"""
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("linecite.storage")
+
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class UploadStats:
+    uploaded: int = 0
+    failed: int = 0
+    retries: int = 0
+    superseded: int = 0
+    bytes: int = 0
+
+
+class ArtifactUploader:
+    def __init__(
+        self,
+        base_url: str,
+        service_key: str,
+        *,
+        max_workers: int = 4,
+        max_pending: int = 32,
+        retries: int = 3,
+        backoff_seconds: float = 0.5,
+        timeout: float = 30,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout = timeout
+        self.stats = UploadStats()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update({
+            "apikey": service_key,
+            "Authorization": f"Bearer {service_key}",
+            "x-upsert": "true",
+        })
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact-upload")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending: dict[Future, str] = {}
+        self._seq = itertools.count()
+        self._latest: dict[tuple[str, str], tuple[int, Future]] = {}  # newest upload per (bucket, path)
+
+    def submit(self, bucket: str, path: str, source: bytes | Path, content_type: str) -> Future:
+        """Queue an upload of *source* (bytes, or a file read at upload time) to ``bucket/path``."""
+        self._slots.acquire()
+        key = (bucket, path)
+        try:
+            with self._lock:
+                seq = next(self._seq)
+                previous = self._latest[key][1] if key in self._latest else None
+                future = self._pool.submit(self._upload, bucket, path, source, content_type, seq, previous)
+                self._latest[key] = (seq, future)
+                self._pending[future] = path
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._done(key, seq))
+        return future
+
+    def _done(self, key: tuple[str, str], seq: int) -> None:
+        with self._lock:
+            if self._latest.get(key, (None,))[0] == seq:
+                del self._latest[key]
+        self._slots.release()
+
+    def _superseded(self, key: tuple[str, str], seq: int) -> bool:
+        with self._lock:
+            return self._latest.get(key, (seq,))[0] != seq
+
+    def _upload(
+        self,
+        bucket: str,
+        path: str,
+        source: bytes | Path,
+        content_type: str,
+        seq: int = -1,
+        previous: Future | None = None,
+    ) -> None:
+        if previous is not None:
+            # Tasks start in submission order, so *previous* is already running or done;
+            # waiting keeps its request from landing after this one.
+            wait([previous])
+        url = f"{self.base_url}/storage/v1/object/{bucket}/{path}"
+        attempt = 0
+        while True:
+            if self._superseded((bucket, path), seq):
+                # A newer upload of this path is queued behind us and carries the current bytes.
+                with self._lock:
+                    self.stats.superseded += 1
+                return
+            error: str
+            try:
+                if isinstance(source, Path):
+                    with open(source, "rb") as f:
+                        response = self._session.post(url, data=f, headers={"Content-Type": content_type}, timeout=self.timeout)
+                else:
+                    response = self._session.post(url, data=source, headers={"Content-Type": content_type}, timeout=self.timeout)
+                if response.status_code in (200, 201):
+                    size = source.stat().st_size if isinstance(source, Path) else len(source)
+                    with self._lock:
+                        self.stats.uploaded += 1
+                        self.stats.bytes += size
+                    return
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                retryable = response.status_code in _RETRY_STATUS
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error, retryable = f"{type(exc).__name__}: {exc}", True
+            if not retryable or attempt >= self.retries:
+                with self._lock:
+                    self.stats.failed += 1
+                logger.error(f"Failed to upload {path} to Supabase bucket {bucket}: {error}")
+                raise RuntimeError(f"upload of {path} failed: {error}")
+            with self._lock:
+                self.stats.retries += 1
+            time.sleep(self.backoff_seconds * (2 ** attempt))
+            attempt += 1
+
+    def flush(self, prefix: str = "", timeout: float | None = None) -> list[str]:
+        """Wait for queued uploads whose path starts with *prefix*; return the paths that failed."""
+        with self._lock:
+            futures = {f: p for f, p in self._pending.items() if p.startswith(prefix)}
+        done, not_done = wait(list(futures), timeout=timeout)
+        failed = sorted(futures[f] for f in done if f.exception() is not None)
+        failed.extend(sorted(futures[f] for f in not_done))
+        with self._lock:
+            for f in done:
+                self._pending.pop(f, None)
+        return failed
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        self._session.close()
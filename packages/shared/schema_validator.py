@@ -1,17 +1,34 @@
 """
 Validate pipeline output JSON against the PI Chronology MVP schema.
+
+The schema is loaded and checked once; every call shares one compiled
+``Draft202012Validator``. ``ValidationSession`` validates a run's output in
+sections (``validate_section``) as the pipeline produces them, so schema
+failures surface at the stage that caused them, and remembers which sub-trees
+already passed: a ``$ref`` target (a page, event, citation, ...) that is the
+same read-only object as one validated earlier in the session is not walked
+again. Only read-only containers (``dict`` / ``list`` subclasses such as
+``graph_snapshot`` views) are remembered; plain dicts and lists may be mutated
+in place and are always re-validated.
 """
 from __future__ import annotations
 
 import json
+from contextvars import ContextVar
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import jsonschema
+from jsonschema.validators import extend
 
 _SCHEMA_PATH = Path(__file__).resolve().parent.parent.parent / "schemas" / "pi-chronology-mvp.schema.json"
 _schema_cache: dict | None = None
 
+# Sub-trees validated without errors in the active session: ($ref, id(instance)) -> instance
+_validated: ContextVar[dict[tuple[str, int], Any] | None] = ContextVar("schema_validated", default=None)
+_BASE_REF = jsonschema.Draft202012Validator.VALIDATORS["$ref"]
+
 
 def _load_schema() -> dict:
     global _schema_cache
@@ -21,13 +38,71 @@ def _load_schema() -> dict:
     return _schema_cache
 
 
+def _cached_ref(validator, ref, instance, schema):
+    seen = _validated.get()
+    if seen is None or type(instance) in (dict, list) or not isinstance(instance, (dict, list)):
+        yield from _BASE_REF(validator, ref, instance, schema)
+        return
+    key = (ref, id(instance))
+    if seen.get(key) is instance:
+        return
+    errors = list(_BASE_REF(validator, ref, instance, schema))
+    if not errors:
+        seen[key] = instance  # holding the object keeps its id from being reused
+    yield from errors
+
+
+_SessionValidator = extend(jsonschema.Draft202012Validator, {"$ref": _cached_ref})
+
+
+@lru_cache(maxsize=1)
+def _compiled_validator() -> jsonschema.Draft202012Validator:
+    schema = _load_schema()
+    jsonschema.Draft202012Validator.check_schema(schema)
+    return _SessionValidator(schema)
+
+
+def _format_errors(errors: Iterable[jsonschema.ValidationError], prefix: tuple = ()) -> list[str]:
+    ordered = sorted(errors, key=lambda e: list(e.absolute_path))
+    return [f"{'→'.join(str(p) for p in (*prefix, *e.absolute_path))}: {e.message}" for e in ordered]
+
+
+class ValidationSession:
+    """Per-run incremental validation against the shared compiled schema."""
+
+    def __init__(self) -> None:
+        self._validator = _compiled_validator()
+        self._seen: dict[tuple[str, int], Any] = {}
+
+    def _iter_errors(self, data: Any, schema: dict | None = None) -> list[jsonschema.ValidationError]:
+        token = _validated.set(self._seen)
+        try:
+            if schema is None:
+                return list(self._validator.iter_errors(data))
+            return list(self._validator.descend(data, schema))
+        finally:
+            _validated.reset(token)
+
+    def validate_section(self, definition: str, data: Any, *, path: Iterable[Any] = ()) -> list[str]:
+        """
+        Validate *data* against ``$defs/<definition>``; *path* prefixes error locations
+        (e.g. ``("outputs", "evidence_graph")``) so messages match a full-document check.
+        """
+        if definition not in self._validator.schema.get("$defs", {}):
+            raise KeyError(f"unknown schema definition: {definition}")
+        errors = self._iter_errors(data, {"$ref": f"#/$defs/{definition}"})
+        return _format_errors(errors, tuple(path))
+
+    def validate_output(self, data: dict[str, Any]) -> tuple[bool, list[str]]:
+        """Validate a full ``ChronologyResult`` dump, skipping sub-trees already validated."""
+        messages = _format_errors(self._iter_errors(data))
+        return (len(messages) == 0, messages)
+
+
 def validate_output(data: dict[str, Any]) -> tuple[bool, list[str]]:
     """
     Validate *data* against the PI Chronology MVP JSON schema.
     Returns (is_valid, list_of_error_messages).
     """
-    schema = _load_schema()
-    validator = jsonschema.Draft202012Validator(schema)
-    errors = sorted(validator.iter_errors(data), key=lambda e: list(e.absolute_path))
-    messages = [f"{'→'.join(str(p) for p in e.absolute_path)}: {e.message}" for e in errors]
+    messages = _format_errors(_compiled_validator().iter_errors(data))
     return (len(messages) == 0, messages)
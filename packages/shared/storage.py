@@ -4,12 +4,20 @@ Local disk and remote Supabase Storage helpers for uploads and artifacts.
 from __future__ import annotations
 
 import hashlib
+import json
 import os
 import logging
+import shutil
+import threading
+import zlib
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
 import requests
 from dotenv import load_dotenv
 
+from packages.shared.artifact_uploader import ArtifactUploader
+
 # Load .env file BEFORE reading any environment variables
 load_dotenv()
 
@@ -41,6 +49,8 @@ SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_KEY")
 USE_SUPABASE_STORAGE = bool(SUPABASE_REST_URL and SUPABASE_SERVICE_KEY)
 DOCUMENTS_BUCKET = "documents"
 ARTIFACTS_BUCKET = "artifacts"
+# Artifact uploads go through a pooled background uploader; 0 uploads inline.
+ARTIFACT_UPLOAD_WORKERS = int(os.environ.get("ARTIFACT_UPLOAD_WORKERS", "4"))
 
 def ensure_dirs() -> None:
     """Create data directories if they don't exist."""
@@ -75,10 +85,10 @@ def _normalize_supabase_signed_url(raw_url: str) -> str:
         return f"{SUPABASE_REST_URL}/storage/v1{text}"
     return f"{SUPABASE_REST_URL}/storage/v1/{text}"
 
-def _supabase_upload(bucket: str, path: str, file_bytes: bytes, content_type: str = "application/pdf") -> None:
-    """Upload a file to Supabase Object Storage."""
+def _supabase_upload(bucket: str, path: str, file_bytes: bytes | BinaryIO, content_type: str = "application/pdf") -> bool:
+    """Upload a file (bytes, or an open binary file streamed from disk) to Supabase Object Storage."""
     if not USE_SUPABASE_STORAGE:
-        return
+        return False
     url = f"{SUPABASE_REST_URL}/storage/v1/object/{bucket}/{path}"
     headers = {
         "apikey": SUPABASE_SERVICE_KEY,
@@ -91,10 +101,12 @@ def _supabase_upload(bucket: str, path: str, file_bytes: bytes, content_type: st
         response = requests.post(url, headers=headers, data=file_bytes, timeout=30)
         if response.status_code not in (200, 201):
             logger.error(f"Failed to upload {path} to Supabase bucket {bucket}: {response.text}")
-        else:
-            logger.info(f"Successfully uploaded {path} to Supabase bucket {bucket}")
+            return False
+        logger.info(f"Successfully uploaded {path} to Supabase bucket {bucket}")
+        return True
     except Exception as e:
         logger.error(f"Exception uploading to Supabase: {e}")
+    return False
 
 
 def _supabase_download(bucket: str, path: str, dest: Path) -> bool:
@@ -289,30 +301,299 @@ def delete_local_upload(source_document_id: str) -> bool:
         logger.error(f"Exception deleting local upload {path}: {e}")
     return False
 
+def _artifact_content_type(filename: str) -> str:
+    if filename.endswith(".pdf"):
+        return "application/pdf"
+    if filename.endswith(".csv"):
+        return "text/csv"
+    if filename.endswith(".json"):
+        return "application/json"
+    if filename.endswith(".md"):
+        return "text/markdown"
+    if filename.endswith(".gz"):
+        return "application/gzip"
+    return "application/octet-stream"
+
+
+_artifact_uploader: ArtifactUploader | None = None
+_uploader_lock = threading.Lock()
+
+
+def _get_artifact_uploader() -> ArtifactUploader | None:
+    global _artifact_uploader
+    if not USE_SUPABASE_STORAGE or ARTIFACT_UPLOAD_WORKERS <= 0:
+        return None
+    with _uploader_lock:
+        if _artifact_uploader is None:
+            _artifact_uploader = ArtifactUploader(SUPABASE_REST_URL, SUPABASE_SERVICE_KEY, max_workers=ARTIFACT_UPLOAD_WORKERS)
+        return _artifact_uploader
+
+
+def _upload_artifact(
+    run_id: str,
+    name: str,
+    source: bytes | Path,
+    content_type: str | None = None,
+    on_success: Callable[[], None] | None = None,
+) -> None:
+    """
+    Mirror an artifact to remote storage: queued on the background uploader, or
+    inline when it is disabled. *on_success* runs once the upload has landed.
+    """
+    remote = f"{run_id}/{name}"
+    content_type = content_type or _artifact_content_type(name)
+    uploader = _get_artifact_uploader()
+    if uploader is not None:
+        future = uploader.submit(ARTIFACTS_BUCKET, remote, source, content_type)
+        if on_success is not None:
+            future.add_done_callback(lambda f: f.exception() is None and on_success())
+        return
+    if isinstance(source, Path):
+        with open(source, "rb") as f:
+            ok = _supabase_upload(ARTIFACTS_BUCKET, remote, f, content_type)
+    else:
+        ok = _supabase_upload(ARTIFACTS_BUCKET, remote, source, content_type)
+    if ok and on_success is not None:
+        on_success()
+
+
+def flush_artifact_uploads(run_id: str, timeout: float | None = None) -> list[str]:
+    """Block until the run's queued artifact uploads finish; return the remote paths that failed."""
+    uploader = _artifact_uploader
+    failed = uploader.flush(f"{run_id}/", timeout=timeout) if uploader is not None else []
+    with _alias_lock:
+        _uploaded_blobs.pop(run_id, None)
+    return failed
+
+
+# Content-addressed artifacts: bytes saved under several names are stored once per run as
+# <run_id>/.blobs/<sha256> (uploaded once); each name is recorded in the run's alias manifest
+# and hardlinked locally. get_artifact_path resolves aliases through the manifest.
+ARTIFACT_ALIAS_MANIFEST = "artifact_aliases.json"
+_BLOBS_DIR = ".blobs"
+_alias_lock = threading.Lock()
+_uploaded_blobs: dict[str, set[str]] = {}  # run_id -> blob shas known to be uploaded, until the run is flushed
+
+
+def _replace_file(path: Path, data: bytes) -> None:
+    # Write-then-rename, so a name hardlinked to a blob never has the shared inode rewritten.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(dst.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _read_aliases(run_id: str, *, fetch: bool = False) -> dict[str, str]:
+    path = ARTIFACTS_DIR / run_id / ARTIFACT_ALIAS_MANIFEST
+    if fetch and not path.exists() and USE_SUPABASE_STORAGE:
+        _supabase_download(ARTIFACTS_BUCKET, f"{run_id}/{ARTIFACT_ALIAS_MANIFEST}", path)
+    try:
+        aliases = json.loads(path.read_text(encoding="utf-8")).get("aliases")
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return dict(aliases) if isinstance(aliases, dict) else {}
+
+
+def _write_aliases(run_id: str, aliases: dict[str, str]) -> None:
+    data = json.dumps({"version": 1, "aliases": dict(sorted(aliases.items()))}, indent=2).encode("utf-8")
+    _replace_file(ARTIFACTS_DIR / run_id / ARTIFACT_ALIAS_MANIFEST, data)
+    if USE_SUPABASE_STORAGE:
+        _upload_artifact(run_id, ARTIFACT_ALIAS_MANIFEST, data)
+
+
+def _update_aliases(run_id: str, set_names: dict[str, str] | None = None, drop_name: str | None = None) -> None:
+    manifest = ARTIFACTS_DIR / run_id / ARTIFACT_ALIAS_MANIFEST
+    if set_names is None and not manifest.exists():
+        return
+    with _alias_lock:
+        aliases = _read_aliases(run_id)
+        updated = dict(aliases)
+        if drop_name is not None:
+            updated.pop(drop_name, None)
+        updated.update(set_names or {})
+        if updated != aliases:
+            _write_aliases(run_id, updated)
+
+
+def _publish_blob(run_id: str, blob: Path, sha: str, names: list[str]) -> Path:
+    run_dir = ARTIFACTS_DIR / run_id
+    for name in names:
+        _link_or_copy(blob, run_dir / name)
+    if USE_SUPABASE_STORAGE and sha not in _uploaded_blobs.get(run_id, ()):
+        # Recorded only once the upload lands, so a failed one is retried by the next save.
+        def _uploaded() -> None:
+            with _alias_lock:
+                _uploaded_blobs.setdefault(run_id, set()).add(sha)
+
+        _upload_artifact(run_id, f"{_BLOBS_DIR}/{sha}", blob, _artifact_content_type(names[0]), on_success=_uploaded)
+    _update_aliases(run_id, set_names={name: sha for name in names})
+    return run_dir / names[0]
+
+
 def save_artifact(run_id: str, filename: str, data: bytes) -> Path:
     """Save a generated artifact (PDF/CSV/JSON) to the run's artifact dir."""
     ensure_dirs()
-    run_dir = ARTIFACTS_DIR / run_id
-    run_dir.mkdir(parents=True, exist_ok=True)
-    path = run_dir / filename
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_bytes(data)
-    
+    path = ARTIFACTS_DIR / run_id / filename
+    _replace_file(path, data)
+    _update_aliases(run_id, drop_name=filename)
+
     if USE_SUPABASE_STORAGE:
-        content_type = "application/octet-stream"
-        if filename.endswith(".pdf"):
-            content_type = "application/pdf"
-        elif filename.endswith(".csv"):
-            content_type = "text/csv"
-        elif filename.endswith(".json"):
-            content_type = "application/json"
-        elif filename.endswith(".md"):
-            content_type = "text/markdown"
-
-        _supabase_upload(ARTIFACTS_BUCKET, f"{run_id}/{filename}", data, content_type)
+        _upload_artifact(run_id, filename, data)
 
     return path
 
+
+def replace_artifact_file(path: str | Path, data: bytes) -> Path:
+    """
+    Rewrite an existing artifact file with *data*. Never writes in place: the
+    name may be hardlinked to a blob shared with other aliases. A file inside a
+    run's artifact dir is re-saved with ``save_artifact``, so it stops being an
+    alias and the new bytes are uploaded.
+    """
+    path = Path(path)
+    try:
+        parts = path.resolve().relative_to(ARTIFACTS_DIR.resolve()).parts
+    except ValueError:
+        parts = ()
+    if len(parts) < 2:
+        _replace_file(path, data)
+        return path
+    return save_artifact(parts[0], "/".join(parts[1:]), data)
+
+
+def save_artifact_aliased(run_id: str, names: Iterable[str], data: bytes) -> Path:
+    """
+    Save identical *data* under every name in *names*: one content-addressed blob
+    (written and uploaded once), with the names recorded as aliases of it.
+    Returns the path of the first name.
+    """
+    names = list(names)
+    if not names:
+        raise ValueError("save_artifact_aliased needs at least one name")
+    ensure_dirs()
+    sha = sha256_bytes(data)
+    blob = ARTIFACTS_DIR / run_id / _BLOBS_DIR / sha
+    if not blob.exists():
+        _replace_file(blob, data)
+    return _publish_blob(run_id, blob, sha, names)
+
+
+@dataclass(frozen=True)
+class ArtifactWrite:
+    path: Path
+    sha256: str
+    bytes: int
+
+
+_STREAM_CHUNK_CHARS = 1 << 16
+
+
+def iter_json_bytes(obj: Any, *, compact: bool = False, default: Callable[[Any], Any] | None = None) -> Iterator[bytes]:
+    """
+    Encode *obj* as UTF-8 JSON in ~64KB chunks without building the whole document.
+    Output is byte-identical to ``json.dumps(obj, indent=2)`` (or the compact
+    ``separators=(",", ":")`` form) followed by ``.encode()``.
+    """
+    encoder = json.JSONEncoder(
+        indent=None if compact else 2,
+        separators=(",", ":") if compact else None,
+        default=default,
+    )
+    buf: list[str] = []
+    size = 0
+    for piece in encoder.iterencode(obj):
+        buf.append(piece)
+        size += len(piece)
+        if size >= _STREAM_CHUNK_CHARS:
+            yield "".join(buf).encode("utf-8")
+            buf.clear()
+            size = 0
+    if buf:
+        yield "".join(buf).encode("utf-8")
+
+
+def _gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    # wbits=31: gzip container with a zero mtime, so identical content gives identical bytes.
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def save_artifact_stream(run_id: str, filename: str, chunks: Iterable[bytes], *, copies: Iterable[str] = ()) -> ArtifactWrite:
+    """
+    Stream *chunks* into the run's artifact *filename*, hashing and counting bytes
+    as they are written. The file is written to a temporary name and renamed into
+    place; remote uploads stream from disk. With *copies*, the content is stored
+    once as a blob and *filename* plus *copies* become aliases of it.
+    """
+    ensure_dirs()
+    run_dir = ARTIFACTS_DIR / run_id
+    path = run_dir / filename
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    digest = hashlib.sha256()
+    total = 0
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                digest.update(chunk)
+                total += len(chunk)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    sha = digest.hexdigest()
+
+    copies = list(copies)
+    if copies:
+        blob = run_dir / _BLOBS_DIR / sha
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp, blob)
+        _publish_blob(run_id, blob, sha, [filename, *copies])
+    else:
+        os.replace(tmp, path)
+        _update_aliases(run_id, drop_name=filename)
+        if USE_SUPABASE_STORAGE:
+            _upload_artifact(run_id, filename, path)
+    return ArtifactWrite(path=path, sha256=sha, bytes=total)
+
+
+def save_artifact_json(
+    run_id: str,
+    filename: str,
+    obj: Any,
+    *,
+    copies: Iterable[str] = (),
+    compact: bool = False,
+    gzip: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> ArtifactWrite:
+    """
+    Serialize *obj* straight into a JSON artifact (see ``save_artifact_stream``).
+    ``gzip`` compresses the stream and appends ``.gz`` to *filename* and *copies*;
+    the returned hash and size are those of the stored bytes.
+    """
+    chunks = iter_json_bytes(obj, compact=compact, default=default)
+    if gzip:
+        chunks = _gzip_chunks(chunks)
+        filename = f"{filename}.gz"
+        copies = [f"{c}.gz" for c in copies]
+    return save_artifact_stream(run_id, filename, chunks, copies=copies)
+
 def get_artifact_dir(run_id: str) -> Path:
     """Return the artifact directory for a given run."""
     return ARTIFACTS_DIR / run_id
@@ -323,7 +604,9 @@ def get_artifact_path(run_id: str, filename: str) -> Path | None:
 
     if not path.exists() and USE_SUPABASE_STORAGE:
         logger.info(f"Artifact {run_id}/{filename} not found locally. Fetching from Supabase...")
-        success = _supabase_download(ARTIFACTS_BUCKET, f"{run_id}/{filename}", path)
+        sha = _read_aliases(run_id, fetch=True).get(filename)
+        remote = f"{run_id}/{_BLOBS_DIR}/{sha}" if sha else f"{run_id}/{filename}"
+        success = _supabase_download(ARTIFACTS_BUCKET, remote, path)
         if not success or not path.exists():
             return None
     elif not path.exists():
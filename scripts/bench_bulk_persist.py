@@ -0,0 +1,108 @@
+"""
+Benchmark run finalization: per-object ORM adds vs the bulk persistence path on a synthetic graph.
+Usage: python scripts/bench_bulk_persist.py [--citations 50000] [--pages 3000] [--database-url sqlite:///...]
+Without --database-url a throwaway SQLite file is used; pass a Postgres URL to exercise COPY.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Add project root
+sys.path.append(os.getcwd())
+
+
+def build_graph(n_citations: int, n_pages: int, doc_id: str, prefix: str):
+    from packages.shared.models import (
+        BBox, Citation, DateKind, DateSource, Document, Event, EventDate, EventType, EvidenceGraph,
+        Fact, FactKind, Gap, Page, PageType, PageTypeSpan, Provider, ProviderType,
+    )
+
+    pages = [
+        Page(page_id=f"{prefix}pg{i}", source_document_id=doc_id, page_number=i, text=f"Progress note page {i}\n" * 20, text_source="embedded_pdf_text", page_type=PageType.CLINICAL_NOTE)
+        for i in range(1, n_pages + 1)
+    ]
+    documents = [
+        Document(document_id=f"{prefix}d{i}", source_document_id=doc_id, page_start=i, page_end=min(i + 9, n_pages), page_types=[PageTypeSpan(page_start=i, page_end=min(i + 9, n_pages), page_type=PageType.CLINICAL_NOTE)])
+        for i in range(1, n_pages + 1, 10)
+    ]
+    providers = [Provider(provider_id=f"{prefix}prov{i}", detected_name_raw=f"Dr. Bench {i}", normalized_name=f"Bench {i}, MD", provider_type=ProviderType.PHYSICIAN, confidence=80) for i in range(40)]
+    citations = [
+        Citation(citation_id=f"{prefix}c{i}", source_document_id=doc_id, page_number=i % n_pages + 1, snippet=f"Patient reports neck pain 6/10 after collision (line {i}).", bbox=BBox(x=72, y=100 + i % 600, w=400, h=12), text_hash=f"{i:064x}")
+        for i in range(n_citations)
+    ]
+    start = date(2024, 1, 1)
+    events = []
+    for i in range(0, n_citations, 10):
+        ids = [f"{prefix}c{j}" for j in range(i, min(i + 10, n_citations))]
+        events.append(Event(
+            event_id=f"{prefix}e{i // 10}",
+            provider_id=f"{prefix}prov{i % 40}",
+            event_type=EventType.OFFICE_VISIT,
+            date=EventDate(kind=DateKind.SINGLE, value=start + timedelta(days=(i // 10) % 700), source=DateSource.TIER1),
+            facts=[Fact(text=f"Neck pain 6/10, cervical tenderness (visit {i // 10}).", kind=FactKind.OTHER, verbatim=True, citation_ids=ids[:3])],
+            confidence=80,
+            citation_ids=ids,
+            source_page_numbers=sorted({j % n_pages + 1 for j in range(i, i + len(ids))}),
+        ))
+    gaps = [Gap(gap_id=f"{prefix}g{i}", start_date=start + timedelta(days=i * 30), end_date=start + timedelta(days=i * 30 + 45), duration_days=45, threshold_days=30, confidence=70) for i in range(20)]
+    return EvidenceGraph(documents=documents, pages=pages, providers=providers, events=events, citations=citations, gaps=gaps)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--citations", type=int, default=50000)
+    parser.add_argument("--pages", type=int, default=3000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_persist.db')}"
+
+    from apps.worker.pipeline_persistence import graph_table_rows
+    from packages.db.bulk import bulk_insert
+    from packages.db.database import get_engine, get_session, init_db
+    from packages.db.models import Firm, Matter, Run, SourceDocument
+
+    init_db()
+    with get_session() as session:
+        firm = Firm(name="Bench Firm")
+        session.add(firm)
+        session.flush()
+        matter = Matter(firm_id=firm.id, title="Bench Matter")
+        session.add(matter)
+        session.flush()
+        doc = SourceDocument(matter_id=matter.id, filename="bench.pdf", mime_type="application/pdf", sha256="0" * 64, bytes=1)
+        session.add(doc)
+        session.flush()
+        run_ids = []
+        for _ in range(2):
+            run = Run(matter_id=matter.id, status="running")
+            session.add(run)
+            session.flush()
+            run_ids.append(run.id)
+        doc_id = doc.id
+
+    t0 = time.perf_counter()
+    graphs = [build_graph(args.citations, args.pages, doc_id, prefix) for prefix in ("orm-", "bulk-")]
+    graph = graphs[0]
+    print(f"dialect={get_engine().dialect.name} citations={len(graph.citations)} events={len(graph.events)} pages={len(graph.pages)} (built in {time.perf_counter() - t0:.2f}s)")
+
+    def orm_adds(session, run_id, graph):
+        for model, rows in graph_table_rows(run_id, graph, []):
+            for row in rows:
+                session.add(model(**row))
+
+    def bulk(session, run_id, graph):
+        for model, rows in graph_table_rows(run_id, graph, []):
+            bulk_insert(session, model, rows)
+
+    for label, fn, run_id, graph in zip(("orm session.add", "bulk_insert"), (orm_adds, bulk), run_ids, graphs):
+        t0 = time.perf_counter()
+        with get_session() as session:
+            fn(session, run_id, graph)
+        print(f"{label:<18} {time.perf_counter() - t0:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark eager pydantic citations vs the columnar CitationStore on a synthetic packet.
+Usage: python scripts/bench_citation_store.py [--pages 1000] [--lines 60]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Add project root
+sys.path.append(os.getcwd())
+
+from apps.worker.steps.events.citation_store import collecting_citations
+from apps.worker.steps.events.clinical import extract_clinical_events
+from packages.shared.models import Page, PageType, RunConfig
+
+_LINES = [
+    "Chief complaint: neck pain after motor vehicle collision",
+    "Vital signs: BP 128/84, HR 76, RR 16, SpO2 98%",
+    "Exam: tenderness to palpation over cervical paraspinals",
+    "Range of motion limited in flexion and rotation",
+    "Assessment: cervical strain, lumbar strain",
+    "Plan: continue physical therapy 3x weekly",
+    "Medications: ibuprofen 600 mg PO TID",
+    "Patient denies prior neck injury",
+]
+
+
+def build_pages(n_pages: int, n_lines: int) -> list[Page]:
+    pages = []
+    for i in range(n_pages):
+        body = [f"Progress note {i % 28 + 1:02d}/01/2024"]
+        body.extend(f"{_LINES[j % len(_LINES)]} (visit {i})" if j % 3 == 0 else _LINES[j % len(_LINES)] for j in range(n_lines))
+        pages.append(Page(page_id=f"p{i + 1}", source_document_id="doc-bench", page_number=i + 1, text="\n".join(body), text_source="embedded_text", page_type=PageType.CLINICAL_NOTE))
+    return pages
+
+
+def _measure(label: str, fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:8.2f}s  peak {peak / 1e6:8.1f} MB  citations={len(result)}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=60)
+    args = parser.parse_args()
+    pages = build_pages(args.pages, args.lines)
+    config = RunConfig()
+
+    def eager():
+        _, cits, _, _ = extract_clinical_events(pages, {}, [], config)
+        return cits
+
+    def columnar():
+        with collecting_citations() as store:
+            _, refs, _, _ = extract_clinical_events(pages, {}, [], config)
+        return store.materialize(refs)
+
+    def columnar_unmaterialized():
+        with collecting_citations() as store:
+            extract_clinical_events(pages, {}, [], config)
+        return store
+
+    _measure("eager pydantic", eager)
+    _measure("store + materialize", columnar)
+    _measure("store only", columnar_unmaterialized)
+
+
+if __name__ == "__main__":
+    main()
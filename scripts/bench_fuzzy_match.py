@@ -0,0 +1,89 @@
+"""
+Benchmark claim context alignment across similarity engines on a synthetic matter.
+Usage: python scripts/bench_fuzzy_match.py [--claims 600] [--pages 120] [--cites 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+# Add project root
+sys.path.append(os.getcwd())
+
+from apps.worker.lib import fuzzy_match
+from apps.worker.lib.claim_context_alignment import _tokens, run_claim_context_alignment
+
+_LABELS = {
+    "diagnosis": ["Cervical strain", "Lumbar radiculopathy", "Post-traumatic headache", "Thoracic sprain", "Left shoulder impingement"],
+    "imaging": ["Disc herniation L4-L5", "Disc protrusion C5-C6", "Annular tear L5-S1", "Foraminal stenosis C6-C7"],
+    "procedure": ["Epidural steroid injection L5-S1", "Medial branch block", "Lumbar fusion L4-L5", "Trigger point injection"],
+    "visit_count": ["Physical therapy visits", "Chiropractic treatment course"],
+}
+_PAGE_TYPES = {"diagnosis": "clinical_note", "imaging": "imaging_report", "procedure": "procedure_note", "visit_count": "pt_note"}
+_SENTENCES = [
+    "Patient reports neck pain radiating to the left arm after the collision.",
+    "Examination shows paraspinal tenderness and reduced range of motion.",
+    "MRI demonstrates disc herniation with mild foraminal narrowing.",
+    "Plan: continue physical therapy and follow up in four weeks.",
+    "Assessment: lumbar radiculopathy, cervical strain, post-traumatic headache.",
+    "Epidural steroid injection performed under fluoroscopic guidance without complication.",
+]
+
+
+class _DifflibEngine:
+    """The pre-engine behaviour: a fresh SequenceMatcher per comparison."""
+
+    name = "difflib"
+
+    def ratio(self, a, b):
+        return SequenceMatcher(None, a, b).ratio()
+
+    def ratio_at_least(self, a, b, threshold):
+        return SequenceMatcher(None, a, b).ratio() >= threshold
+
+
+def build_matter(n_claims: int, n_pages: int, n_cites: int, seed: int = 11):
+    rng = random.Random(seed)
+    categories = list(_LABELS)
+    pages, citations, findings = [], [], []
+    for p in range(1, n_pages + 1):
+        cat = categories[p % len(categories)]
+        text = " ".join(rng.choice(_SENTENCES) for _ in range(14))
+        pages.append({"page_number": p, "page_type": _PAGE_TYPES[cat], "text": text})
+        citations.append({"citation_id": f"c{p}", "page_number": p, "snippet": text[:240] if p % 2 else ""})
+    for i in range(n_claims):
+        cat = categories[i % len(categories)]
+        label = f"{rng.choice(_LABELS[cat])} ({i % 37})"
+        cites = [f"c{rng.randint(1, n_pages)}" for _ in range(n_cites)]
+        findings.append({"label": label, "category": cat, "citation_ids": cites, "headline_eligible": True})
+    return {"pages": pages, "citations": citations}, {"promoted_findings": findings}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--claims", type=int, default=600)
+    parser.add_argument("--pages", type=int, default=120)
+    parser.add_argument("--cites", type=int, default=3)
+    args = parser.parse_args()
+    eg, rm = build_matter(args.claims, args.pages, args.cites)
+    fuzzy_match.register_similarity_engine("difflib", _DifflibEngine)
+
+    reference = None
+    for name in ("difflib", "sequence", "qgram"):
+        fuzzy_match.register_similarity_engine(name, fuzzy_match._ENGINE_FACTORIES[name])  # cold caches
+        fuzzy_match._DEFAULT_ENGINE = name
+        _tokens.cache_clear()
+        t0 = time.perf_counter()
+        out = run_claim_context_alignment(eg, rm)
+        elapsed = time.perf_counter() - t0
+        scores = [r.get("best_score") for r in out["claims"]]
+        if reference is None:
+            reference = scores
+        diffs = sum(1 for a, b in zip(reference, scores) if a != b)
+        print(f"{name:<10} {elapsed:8.3f}s  claims={len(out['claims'])}  score_diffs_vs_difflib={diffs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark output schema validation on the largest stored evidence graphs.
+Usage: python scripts/bench_schema_validator.py [--top 3] [--repeat 5] [graph.json ...]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import jsonschema
+
+# Add project root
+sys.path.append(os.getcwd())
+
+from apps.worker.lib.graph_snapshot import freeze
+from packages.shared.schema_validator import ValidationSession, _load_schema
+
+_SEARCH = ("reference/**/evidence_graph*.json", "tuning_output/**/evidence_graph*.json", "tests/**/evidence_graph*.json")
+
+
+def _load_graph(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        graph = json.load(f)
+    return graph.get("evidence_graph", graph) if "pages" not in graph else graph
+
+
+def largest_graphs(top: int) -> list[str]:
+    """Largest stored graphs that carry page payloads (some tuning dumps are summaries only)."""
+    paths = {p for pattern in _SEARCH for p in glob.glob(pattern, recursive=True)}
+    out: list[str] = []
+    for path in sorted(paths, key=os.path.getsize, reverse=True):
+        if len(out) >= top:
+            break
+        if _load_graph(path).get("pages"):
+            out.append(path)
+    return out
+
+
+def _timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench(path: str, repeat: int) -> None:
+    graph = _load_graph(path)
+    schema = _load_schema()
+    section = {"$ref": "#/$defs/EvidenceGraph"}
+
+    def per_call():
+        # Previous behaviour: build a validator on every call.
+        validator = jsonschema.Draft202012Validator(schema)
+        return list(validator.descend(graph, section))
+
+    compiled = jsonschema.Draft202012Validator(schema)
+    session = ValidationSession()
+    view = freeze(graph)
+
+    def incremental():
+        # Analyzer stages only add extensions; page/event/citation sub-trees are shared.
+        nonlocal view
+        view = type(view)({**view, "extensions": {**view.get("extensions", {}), "bench": time.perf_counter()}})
+        return session.validate_section("EvidenceGraph", view)
+
+    errors = session.validate_section("EvidenceGraph", view)  # first pass warms the session
+    t_first = _timed(lambda: ValidationSession().validate_section("EvidenceGraph", freeze(graph)), 1)
+    t_call = _timed(per_call, repeat)
+    t_compiled = _timed(lambda: list(compiled.descend(graph, section)), repeat)
+    t_incr = _timed(incremental, repeat)
+    print(
+        f"{os.path.getsize(path) / 1e6:6.2f}MB pages={len(graph.get('pages') or []):<5} errors={len(errors):<3} "
+        f"per_call={t_call * 1000:8.1f}ms compiled={t_compiled * 1000:8.1f}ms "
+        f"session_first={t_first * 1000:8.1f}ms session_unchanged={t_incr * 1000:8.2f}ms  {path}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("graphs", nargs="*")
+    parser.add_argument("--top", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for path in args.graphs or largest_graphs(args.top):
+        bench(path, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+scripts/compact_page_text.py — Compaction job for page_text_blobs.
+
+Moves page text, layouts and OCR cache text still stored inline (rows written
+before blob storage) into content-addressed blobs, then deletes blobs that no
+page or OCR cache row references any more (e.g. after runs were re-persisted).
+
+Run this on a cron / systemd timer off-peak:
+    python scripts/compact_page_text.py
+    python scripts/compact_page_text.py --dry-run
+
+Exit codes:
+    0 — compaction completed
+    1 — error connecting to DB or compacting
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from packages.db.database import get_session_factory, init_db
+from packages.db.page_text import compact_page_text
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Move inline page text into blobs and drop unreferenced blobs.")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without committing.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows moved per batch (default: 500).")
+    args = parser.parse_args()
+
+    init_db()
+    db = get_session_factory()()
+    try:
+        stats = compact_page_text(db, batch_size=args.batch_size)
+        if args.dry_run:
+            db.rollback()
+            stats["dry_run"] = True
+        else:
+            db.commit()
+        print(json.dumps(stats))
+        return 0
+    except Exception as exc:
+        db.rollback()
+        print(f"ERROR: compaction failed: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -102,7 +102,7 @@ def generate_prompt(run_id: str, limit: int = None, output_path: str = None):
         
         for p in pages:
             content.append(f"### Page {p.page_number}")
-            text = p.text.strip() if p.text else "[NO TEXT]"
+            text = p.page_text.strip() if p.page_text else "[NO TEXT]"
             content.append("```text")
             content.append(text)
             content.append("```\n")
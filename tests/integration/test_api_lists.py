@@ -88,7 +88,7 @@ class TestApiLists:
         # 10. List Runs
         resp = client.get(f"/matters/{m1['id']}/runs")
         assert resp.status_code == 200
-        runs = resp.json()
+        runs = resp.json()["items"]
         assert len(runs) == 2
         # Verify ordering (newest first)
         assert runs[0]["id"] == r2["id"]
@@ -0,0 +1,184 @@
+"""
+Integration tests for keyset-paginated run lists and SQL-side export mode filtering.
+"""
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///C:/CiteLine/data/test_citeline_api_run_pagination.db")
+os.environ.setdefault("DATA_DIR", "C:/CiteLine/data")
+
+from apps.api.main import app
+from packages.db.database import engine, get_session
+from packages.db.models import Artifact, Base, Firm, Matter, Page, Run, SourceDocument
+from packages.db.page_text import blob_key, store_blobs
+
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def _seed_runs() -> None:
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with get_session() as db:
+        db.add(Firm(id="pf1", name="Paging Firm"))
+        db.add(Matter(id="pm1", firm_id="pf1", title="Paging Matter"))
+        db.flush()
+        for i in range(7):
+            mode = "MEDIATION" if i % 2 else "INTERNAL"
+            status = ["success", "failed", "completed", "pending", "success", "partial", "success"][i]
+            db.add(Run(
+                id=f"run_{i}",
+                matter_id="pm1",
+                status=status,
+                created_at=base + timedelta(minutes=i // 2),  # pairs share a created_at; id breaks the tie
+                finished_at=base + timedelta(hours=i) if status != "pending" else None,
+                config_json={"export_mode": mode.lower() if i == 5 else mode},
+            ))
+        db.commit()
+
+
+def test_run_list_pages_follow_cursor_without_gaps_or_repeats(client: TestClient):
+    _seed_runs()
+    seen: list[str] = []
+    cursor = None
+    for _ in range(5):
+        params = {"limit": 3} | ({"cursor": cursor} if cursor else {})
+        resp = client.get("/matters/pm1/runs", params=params)
+        assert resp.status_code == 200
+        page = resp.json()
+        assert page["limit"] == 3
+        seen += [r["id"] for r in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["run_6", "run_5", "run_4", "run_3", "run_2", "run_1", "run_0"]
+
+
+def test_run_list_filters_by_status_and_export_mode(client: TestClient):
+    _seed_runs()
+    resp = client.get("/matters/pm1/runs", params={"status": "success", "export_mode": "INTERNAL"})
+    assert resp.status_code == 200
+    body = resp.json()
+    # "completed" is the legacy spelling of success and is reported as such.
+    assert [r["id"] for r in body["items"]] == ["run_6", "run_4", "run_2", "run_0"]
+    assert body["next_cursor"] is None
+
+    resp = client.get("/matters/pm1/runs", params=[("status", "failed"), ("status", "partial")])
+    assert [r["id"] for r in resp.json()["items"]] == ["run_5", "run_1"]
+
+
+def test_run_list_rejects_bad_cursor_and_limit(client: TestClient):
+    _seed_runs()
+    assert client.get("/matters/pm1/runs", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/matters/pm1/runs", params={"limit": 0}).status_code == 422
+    assert client.get("/matters/pm1/runs", params={"limit": 10_000}).status_code == 422
+
+
+def test_export_mode_column_tracks_config(client: TestClient):
+    _seed_runs()
+    with get_session() as db:
+        assert db.get(Run, "run_5").export_mode == "MEDIATION"
+        run = db.get(Run, "run_0")
+        run.config_json = {"max_pages": 5}
+        db.commit()
+        assert db.get(Run, "run_0").export_mode is None
+
+
+def test_latest_exports_picks_newest_finished_run_of_the_mode(client: TestClient):
+    _seed_runs()
+    with get_session() as db:
+        for run_id in ("run_5", "run_6"):
+            db.add(Artifact(run_id=run_id, artifact_type="pdf", storage_uri=f"/exports/{run_id}.pdf", sha256="0" * 64, bytes=1))
+        db.commit()
+
+    resp = client.get("/matters/pm1/exports/latest", params={"export_mode": "MEDIATION"})
+    assert resp.status_code == 200
+    assert resp.json()["run_id"] == "run_5"
+
+    resp = client.get("/matters/pm1/exports/latest", params={"export_mode": "INTERNAL"})
+    assert resp.status_code == 200
+    assert resp.json()["run_id"] == "run_6"
+
+
+def test_v1_job_list_uses_the_same_envelope(client: TestClient, monkeypatch):
+    monkeypatch.setenv("API_V1_JOBS_ENABLED", "true")
+    _seed_runs()
+    resp = client.get("/v1/jobs", params={"matter_id": "pm1", "limit": 3, "export_mode": "INTERNAL"})
+    assert resp.status_code == 200
+    page = resp.json()
+    assert [j["job_id"] for j in page["items"]] == ["run_6", "run_4", "run_2"]
+    assert page["items"][-1]["status"] == "success"  # completed, normalized
+
+    resp = client.get("/v1/jobs", params={"matter_id": "pm1", "limit": 3, "export_mode": "INTERNAL", "cursor": page["next_cursor"]})
+    assert [j["job_id"] for j in resp.json()["items"]] == ["run_0"]
+    assert resp.json()["next_cursor"] is None
+
+    assert client.get("/v1/jobs", params={"matter_id": "missing"}).status_code == 404
+
+
+def test_runs_without_created_at_are_paged_last(client: TestClient):
+    _seed_runs()
+    with get_session() as db:
+        for run_id in ("run_x", "run_y"):
+            db.add(Run(id=run_id, matter_id="pm1", status="pending", config_json={}))
+        db.flush()
+        db.query(Run).filter(Run.id.in_(["run_x", "run_y"])).update({"created_at": None})
+        db.commit()
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        page = client.get("/matters/pm1/runs", params=params).json()
+        seen += [r["id"] for r in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["run_6", "run_5", "run_4", "run_3", "run_2", "run_1", "run_0", "run_y", "run_x"]
+
+
+def test_run_pages_are_paged_in_document_order_with_their_text(client: TestClient):
+    _seed_runs()
+    texts = {(doc, n): f"{doc} page {n}" for doc, count in (("doc_b", 2), ("doc_a", 3)) for n in range(count, 0, -1)}
+    with get_session() as db:
+        for doc in ("doc_a", "doc_b"):
+            db.add(SourceDocument(
+                id=doc, matter_id="pm1", filename=f"{doc}.pdf", mime_type="application/pdf", sha256="0" * 64, bytes=1,
+            ))
+        store_blobs(db, texts.values())
+        for (doc, n), text in texts.items():
+            db.add(Page(
+                id=f"{doc}_{n}", run_id="run_0", source_document_id=doc, page_number=n, text_sha256=blob_key(text),
+            ))
+        db.commit()
+
+    seen: list[tuple[str, int, str | None]] = []
+    cursor = None
+    for _ in range(5):
+        params = {"limit": 2, "include_text": True} | ({"cursor": cursor} if cursor else {})
+        resp = client.get("/runs/run_0/pages", params=params)
+        assert resp.status_code == 200
+        page = resp.json()
+        assert len(page["items"]) <= 2
+        seen += [(p["source_document_id"], p["page_number"], p["text"]) for p in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [(doc, n, texts[(doc, n)]) for doc, n in sorted(texts)]
+
+    body = client.get("/runs/run_0/pages").json()
+    assert [p["text"] for p in body["items"]] == [None] * 5 and body["next_cursor"] is None
+    assert client.get("/runs/run_0/pages", params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,69 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.api.main import app
+from packages.db.database import get_session, init_db
+from packages.db.models import Firm, Matter, Run
+
+client = TestClient(app)
+
+_FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "invariants" / "case7_cross_contamination" / "evidence_graph.json"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def init_database():
+    init_db()
+
+
+def _make_run(export_mode: str | None) -> str:
+    with get_session() as session:
+        firm = Firm(name="Valuation Firm")
+        session.add(firm)
+        session.flush()
+        matter = Matter(firm_id=firm.id, title="Valuation Matter")
+        session.add(matter)
+        session.flush()
+        run = Run(matter_id=matter.id, status="success", config_json={"export_mode": export_mode} if export_mode else {})
+        session.add(run)
+        session.commit()
+        return run.id
+
+
+@pytest.fixture
+def stored_graph(tmp_path, monkeypatch):
+    path = tmp_path / "evidence_graph.json"
+    shutil.copy(_FIXTURE, path)
+    monkeypatch.setattr("packages.shared.storage.get_artifact_path", lambda run_id, name: str(path))
+    return path
+
+
+def test_valuation_computed_on_demand_for_internal_run(stored_graph):
+    run_id = _make_run("INTERNAL")
+    resp = client.get(f"/runs/{run_id}/valuation", params={"keys": ["settlement_model_report", "severity_profile"]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert set(body["extensions"]) == {"settlement_model_report", "severity_profile"}
+    assert body["extensions"]["settlement_model_report"]["schema_version"] == "smr.v1"
+    # The stored severity profile is returned as-is; only the missing report (and its inputs) is computed.
+    stored = json.loads(stored_graph.read_text(encoding="utf-8"))["extensions"]["severity_profile"]
+    assert body["extensions"]["severity_profile"] == stored
+    # Only requested keys are reported as computed; their inputs are listed apart.
+    assert body["computed"] == ["settlement_model_report"]
+    assert "severity_profile" not in body["computed_dependencies"]
+    assert not set(body["computed_dependencies"]) & set(body["extensions"])
+
+
+def test_valuation_rejects_mediation_runs_and_unknown_keys(stored_graph):
+    resp = client.get(f"/runs/{_make_run('MEDIATION')}/valuation")
+    assert resp.status_code == 403
+    resp = client.get(f"/runs/{_make_run('INTERNAL')}/valuation", params={"keys": ["renderer_manifest"]})
+    assert resp.status_code == 400
+
+
+def test_valuation_refuses_runs_with_unknown_export_mode(stored_graph):
+    resp = client.get(f"/runs/{_make_run(None)}/valuation")
+    assert resp.status_code == 409
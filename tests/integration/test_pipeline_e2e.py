@@ -135,3 +135,47 @@ class TestPipelineE2E:
                 for cid in event["citation_ids"]:
                     assert cid in citation_ids, \
                         f"Event {event['event_id']} references missing citation {cid}"
+
+
+def test_final_graph_reuses_unchanged_snapshot_views(monkeypatch):
+    """Late field reassignments reach evidence_graph.json; untouched sections keep their validated views."""
+    from apps.worker import pipeline
+    from apps.worker.lib.graph_snapshot import ModelSnapshot
+    from packages.shared.storage import get_artifact_path
+
+    pdf_bytes = _generate_fixture_pdf()
+    with get_session() as session:
+        firm = Firm(name="Snapshot Firm")
+        session.add(firm)
+        session.flush()
+        matter = Matter(firm_id=firm.id, title="Snapshot Matter")
+        session.add(matter)
+        session.flush()
+        doc = SourceDocument(matter_id=matter.id, filename="snapshot.pdf", mime_type="application/pdf", sha256=sha256_bytes(pdf_bytes), bytes=len(pdf_bytes))
+        session.add(doc)
+        session.flush()
+        doc.storage_uri = str(save_upload(doc.id, pdf_bytes))
+        run = Run(matter_id=matter.id, status="pending", config_json={"max_pages": 500, "export_mode": "INTERNAL"})
+        session.add(run)
+        session.flush()
+        run_id = run.id
+
+    views = []
+    real_view = ModelSnapshot.view
+
+    def _recording_view(self):
+        out = real_view(self)
+        if "pages" in out:  # evidence graph snapshot, not the renderer manifest
+            views.append(out)
+        return out
+
+    monkeypatch.setattr(ModelSnapshot, "view", _recording_view)
+    pipeline.run_pipeline(run_id)
+
+    first, last = views[0], views[-1]
+    for field in ("pages", "events", "citations"):
+        assert last[field] is first[field]
+    assert "llm_polish_applied" not in first["extensions"]
+    written = json.loads(Path(get_artifact_path(run_id, "evidence_graph.json")).read_text(encoding="utf-8"))
+    graph = written.get("outputs", {}).get("evidence_graph", written)
+    assert graph["extensions"]["llm_polish_applied"] == last["extensions"]["llm_polish_applied"]
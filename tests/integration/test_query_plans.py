@@ -0,0 +1,165 @@
+"""
+Query plan regression suite for the hot queries.
+
+Each test runs the real code path (run claim, lease sweep, latest exports,
+run/page/artifact lists, diff persistence) against a seeded database, captures
+every SELECT it issues and EXPLAINs it. A hot table read with a full table scan
+fails the test, so a dropped index or a rewritten query shows up here first.
+
+SQLite always runs. Set TEST_POSTGRES_URL to also check the Postgres plans
+(with enable_seqscan=off, so any usable index is preferred even on tiny tables).
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from apps.api.routes import exports as exports_route
+from apps.api.routes import jobs_v1 as jobs_route
+from apps.api.routes import runs as runs_route
+from apps.worker import runner
+from apps.worker.lib import queue
+from packages.db.bulk import diff_rows
+from packages.db.models import (
+    Artifact, Base, Citation, DocumentSegment, Event, Firm, Gap, Matter, Page, Provider, Run, SourceDocument,
+)
+
+HOT_TABLES = {"runs", "artifacts", "citations", "events", "pages", "providers", "document_segments", "gaps"}
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?! USING (?:COVERING )?INDEX)")
+
+_BACKENDS = ["sqlite"] + (["postgresql"] if os.getenv("TEST_POSTGRES_URL") else [])
+
+
+@pytest.fixture(params=_BACKENDS)
+def db(request, tmp_path):
+    if request.param == "sqlite":
+        engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    else:
+        engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        _seed(session)
+        session.commit()
+        yield session
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def _seed(session: Session) -> None:
+    now = datetime.now(timezone.utc)
+    session.add(Firm(id="f1", name="Plan Firm", tier="pro"))
+    session.add(Matter(id="m1", firm_id="f1", title="Plan Matter"))
+    session.add(SourceDocument(id="d1", matter_id="m1", filename="a.pdf", mime_type="application/pdf", sha256="0" * 64, bytes=1))
+    session.flush()
+    session.add_all([
+        Run(id="r_pending", matter_id="m1", status="pending", created_at=now),
+        Run(id="r_queued", matter_id="m1", status="queued", created_at=now),
+        Run(id="r_stale", matter_id="m1", status="running", heartbeat_at=now - timedelta(hours=1), lock_expires_at=now - timedelta(hours=1)),
+        Run(id="r_done", matter_id="m1", status="success", finished_at=now, config_json={"export_mode": "INTERNAL"}),
+    ])
+    session.flush()
+    session.add(Artifact(run_id="r_done", artifact_type="pdf", storage_uri="/exports/internal/a.pdf", sha256="0" * 64, bytes=1))
+    session.add(Page(id="p1", run_id="r_done", source_document_id="d1", page_number=1))
+    session.add(Citation(id="c1", run_id="r_done", source_document_id="d1", page_number=1))
+    session.flush()
+
+
+@contextmanager
+def _captured_selects(session: Session):
+    statements: list[tuple[str, object]] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            statements.append((statement, parameters))
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+
+def _full_scans(session: Session, statements: list[tuple[str, object]]) -> list[str]:
+    conn = session.connection()
+    scans = []
+    for statement, params in statements:
+        if conn.dialect.name == "sqlite":
+            for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, params).all():
+                m = _SQLITE_SCAN.match(row[-1])
+                if m and m.group(1) in HOT_TABLES:
+                    scans.append(f"{row[-1]}  <-  {statement}")
+        else:
+            conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            (plan,), = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, params).all()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            stack = [plan[0]["Plan"]]
+            while stack:
+                node = stack.pop()
+                if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in HOT_TABLES:
+                    scans.append(f"Seq Scan on {node['Relation Name']}  <-  {statement}")
+                stack.extend(node.get("Plans", []))
+    return scans
+
+
+def _assert_indexed(session: Session, statements: list[tuple[str, object]]) -> None:
+    assert statements, "no SELECTs captured"
+    scans = _full_scans(session, statements)
+    assert not scans, "hot query regressed to a full scan:\n" + "\n".join(scans)
+
+
+def test_run_claim_and_lease_recovery_use_indexes(db: Session, monkeypatch):
+    @contextmanager
+    def _session():
+        yield db
+
+    monkeypatch.setattr(runner, "get_session", _session)
+    monkeypatch.setattr(db, "commit", db.flush)
+    with _captured_selects(db) as statements:
+        runner.claim_run()  # stale recovery
+        db.get(Run, "r_stale").heartbeat_at = datetime.now(timezone.utc)
+        db.flush()
+        runner.claim_run()  # pending, pro tier first
+        queue.claim_next_run(db, worker_id="w1")
+        queue.requeue_expired_leases(db)
+
+    _assert_indexed(db, statements)
+
+
+def test_api_lists_and_latest_exports_use_indexes(db: Session, monkeypatch):
+    monkeypatch.setenv("API_V1_JOBS_ENABLED", "true")
+    with _captured_selects(db) as statements:
+        assert exports_route.get_latest_exports("m1", "INTERNAL", db=db, identity=None).run_id == "r_done"
+        runs_route.list_runs("m1", status=None, export_mode=None, limit=50, cursor=None, db=db, identity=None)
+        runs_route.list_runs("m1", status=["success"], export_mode="INTERNAL", limit=50, cursor=None, db=db, identity=None)
+        runs_route.list_run_pages(
+            "r_done", include_text=False, include_layout=False, limit=50, cursor=None, db=db, identity=None,
+        )
+        jobs_route.list_jobs("m1", status=None, export_mode=None, limit=50, cursor=None, db=db, identity=None)
+        jobs_route.list_job_artifacts("r_done", db=db, identity=None)
+
+    _assert_indexed(db, statements)
+
+
+def test_run_scoped_table_reads_use_indexes(db: Session):
+    with _captured_selects(db) as statements:
+        for model in (Page, DocumentSegment, Provider, Citation, Event, Gap, Artifact):
+            diff_rows(db, model, [], scope={"run_id": "r_done"})
+
+    _assert_indexed(db, statements)
+
+
+def test_suite_detects_a_missing_index(db: Session):
+    db.connection().exec_driver_sql("DROP INDEX ix_citations_run_id_page_number")
+    with _captured_selects(db) as statements:
+        diff_rows(db, Citation, [], scope={"run_id": "r_done"})
+
+    assert _full_scans(db, statements)
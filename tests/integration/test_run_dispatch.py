@@ -0,0 +1,150 @@
+"""
+Run dispatch: an idle worker is woken by the enqueue instead of its poll.
+
+SQLite always runs (wakeup file). Set TEST_POSTGRES_URL to also check LISTEN/NOTIFY.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from apps.worker import runner
+from packages.db import run_dispatch
+from packages.db.models import Base, Firm, Matter, Run
+from packages.db.run_dispatch import RunWakeup, dispatch_metrics, notify_run_enqueued, open_run_wakeup
+
+_BACKENDS = ["sqlite"] + (["postgresql"] if os.getenv("TEST_POSTGRES_URL") else [])
+
+
+@pytest.fixture(params=_BACKENDS)
+def engine(request, tmp_path):
+    if request.param == "sqlite":
+        eng = create_engine(f"sqlite:///{tmp_path / 'dispatch.db'}", connect_args={"check_same_thread": False})
+    else:
+        eng = create_engine(os.environ["TEST_POSTGRES_URL"])
+    Base.metadata.drop_all(eng)
+    Base.metadata.create_all(eng)
+    with sessionmaker(bind=eng)() as session:
+        session.add(Firm(id="f1", name="Dispatch Firm"))
+        session.add(Matter(id="m1", firm_id="f1", title="Dispatch Matter"))
+        session.commit()
+    yield eng
+    Base.metadata.drop_all(eng)
+    eng.dispose()
+
+
+@pytest.fixture
+def factory(engine, monkeypatch):
+    factory = sessionmaker(bind=engine)
+
+    @contextmanager
+    def _session(profile=None):
+        with factory() as session:
+            yield session
+
+    monkeypatch.setattr(runner, "get_session", _session)
+    return factory
+
+
+def _enqueue(factory, run_id: str, *, commit: bool = True) -> float:
+    with factory() as session:
+        session.add(Run(id=run_id, matter_id="m1", status="pending", config_json={}))
+        session.flush()
+        notify_run_enqueued(session, run_id)
+        if commit:
+            session.commit()
+        else:
+            session.rollback()
+    return time.perf_counter()
+
+
+def test_idle_worker_claims_enqueued_run_within_100ms(engine, factory):
+    wakeup = open_run_wakeup(engine)
+    assert wakeup.kind in {"file", "listen"}
+    claims_before = dispatch_metrics()["claims"]
+    claimed: dict = {}
+    ready = threading.Event()
+
+    def _worker():
+        ready.set()
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            # Fallback poll far beyond the assertion below: only the wakeup can make it.
+            if wakeup.wait(2.0) and (run_id := runner.claim_run()):
+                claimed.update(run_id=run_id, at=time.perf_counter())
+                return
+
+    worker = threading.Thread(target=_worker, daemon=True)
+    worker.start()
+    ready.wait()
+    time.sleep(0.1)  # worker is idle inside wait()
+    committed_at = _enqueue(factory, "r_fast")
+    worker.join(5)
+    wakeup.close()
+
+    assert claimed.get("run_id") == "r_fast"
+    assert claimed["at"] - committed_at < 0.1
+    metrics = dispatch_metrics()
+    assert metrics["claims"] == claims_before + 1
+    assert metrics["enqueue_to_claim_ms_max"] >= 0
+
+
+def test_rolled_back_enqueue_does_not_wake(engine, factory):
+    wakeup = open_run_wakeup(engine)
+    try:
+        _enqueue(factory, "r_rolled_back", commit=False)
+        assert wakeup.wait(0.2) is False
+        _enqueue(factory, "r_committed")
+        assert wakeup.wait(1.0) is True
+    finally:
+        wakeup.close()
+
+
+def test_rollback_drops_pending_wakeup_of_a_reused_session(engine, factory):
+    wakeup = open_run_wakeup(engine)
+    try:
+        with factory() as session:
+            session.add(Run(id="r_undone", matter_id="m1", status="pending", config_json={}))
+            session.flush()
+            notify_run_enqueued(session, "r_undone")
+            session.rollback()
+            session.add(Firm(id="f2", name="Unrelated"))
+            session.commit()
+        assert wakeup.wait(0.2) is False
+    finally:
+        wakeup.close()
+
+
+def test_transaction_pooler_falls_back_to_polling(monkeypatch):
+    monkeypatch.setattr(run_dispatch, "_transaction_pooler", lambda url: True)
+    engine = create_engine("postgresql+psycopg2://u:p@localhost:6543/db")
+    wakeup = open_run_wakeup(engine)
+    assert wakeup.kind == "poll"
+    # Nothing can wake it, so it keeps the pre-notification pickup latency.
+    assert wakeup.poll_seconds == run_dispatch.UNNOTIFIED_POLL_SECONDS == 2
+    assert wakeup.wait(0.01) is False
+
+
+def test_runner_once_wait_rechecks_each_poll_interval(engine, factory, monkeypatch):
+    from apps.worker import runner_once
+
+    # A polling wakeup is never notified: only its poll interval can end the wait early.
+    monkeypatch.setattr(runner_once, "open_run_wakeup", lambda: RunWakeup())
+    monkeypatch.setattr(run_dispatch, "UNNOTIFIED_POLL_SECONDS", 0.05)
+
+    def _enqueue_unnotified():
+        time.sleep(0.2)
+        with factory() as session:
+            session.add(Run(id="run-once-poll", matter_id="m1", status="pending", config_json={}))
+            session.commit()
+
+    threading.Thread(target=_enqueue_unnotified, daemon=True).start()
+    started = time.monotonic()
+    assert runner_once._wait_for_run(30) == "run-once-poll"
+    assert time.monotonic() - started < 5
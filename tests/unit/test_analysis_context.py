@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import date
+
+from apps.worker.lib.analysis_context import AnalysisContext
+from apps.worker.lib.case_severity_index import build_case_severity_index
+from apps.worker.lib.settlement_features import build_settlement_feature_pack
+from apps.worker.lib.settlement_leverage import build_settlement_leverage_model
+
+
+def _eg():
+    return {
+        "events": [
+            {"event_id": "e1", "event_type": "procedure", "provider_id": "p1", "date": {"value": "2024-03-10"},
+             "facts": [{"text": "Lumbar fusion performed with pedicle screw placement"}]},
+            {"event_id": "e2", "event_type": {"value": "imaging_study"}, "provider_id": "p2", "date": {"value": "2024-02-01"},
+             "facts": [{"text": "EMG positive for L5 radiculopathy"}]},
+            {"event_id": "e3", "event_type": "work_status", "date": None,
+             "facts": [{"text": "Patient off work for 6 weeks"}]},
+            "not-an-event",
+        ],
+        "citations": [{"citation_id": "c1", "page_number": 4, "source_document_id": "doc-1"}],
+        "gaps": [{"duration_days": 45}],
+        "extensions": {},
+    }
+
+
+def test_indexes_by_type_provider_date_and_citation():
+    ctx = AnalysisContext(_eg())
+    assert [r.event["event_id"] for r in ctx.of_type("imaging_study")] == ["e2"]
+    assert [r.event["event_id"] for r in ctx.by_provider("p1")] == ["e1"]
+    assert [r.event["event_id"] for r in ctx.on_date(date(2024, 3, 10))] == ["e1"]
+    assert ctx.first_event_date() == date(2024, 2, 1)
+    assert [r.event["event_id"] for r in ctx.of_type_containing("work")] == ["e3"]
+    assert ctx.citation(" c1 ")["page_number"] == 4
+    assert ctx.citation("missing") is None
+
+
+def test_keyword_queries_respect_type_filter_and_event_boundaries():
+    ctx = AnalysisContext(_eg())
+    assert ctx.any_keyword(["screw"], event_type="procedure")
+    assert not ctx.any_keyword(["emg"], event_type="procedure")
+    assert ctx.any_keyword(["emg"])
+    # "placement" ends e1 and "emg" starts e2: no match across the boundary.
+    assert not ctx.any_keyword(["placementemg", "placement emg"])
+    hits = ctx.with_keywords(["radiculopathy", "fusion"])
+    assert [r.event["event_id"] for r in hits] == ["e1", "e2"]
+    assert ctx.with_keywords(["fusion", "radiculopathy"]) is hits
+
+
+def test_builders_give_same_output_with_shared_context():
+    eg = _eg()
+    rm = {
+        "promoted_findings": [{"label": "Disc herniation", "category": "imaging", "finding_polarity": "positive", "citation_ids": ["c1"]}],
+        "pt_summary": {"date_start": "2024-02-01", "date_end": "2024-06-01", "citation_ids": ["c1"]},
+    }
+    ctx = AnalysisContext(eg)
+    assert build_settlement_leverage_model(eg, rm) == build_settlement_leverage_model(eg, rm, analysis_context=ctx)
+    fp = build_settlement_feature_pack(eg, rm)
+    assert fp == build_settlement_feature_pack(eg, rm, analysis_context=ctx)
+    assert fp["has_surgery"] and fp["has_emg_positive"] and fp["first_event_date"] == "2024-02-01"
+    csi = build_case_severity_index(eg, rm, fp, analysis_context=ctx)
+    assert csi == build_case_severity_index(eg, rm, fp)
+    assert csi["support"]["page_refs"] == [{"source_document_id": "doc-1", "page_number": 4}]
+
+
+def test_builders_read_extensions_and_gaps_from_the_payload_they_are_given():
+    ctx = AnalysisContext(_eg())  # built before the extensions below were published
+    later = _eg()
+    later["extensions"] = {
+        "specials_summary": {"wage_loss": {"total": 1200}},
+        "contradiction_matrix": [{"body_region": "lumbar"}],
+    }
+    later["gaps"] = [{"duration_days": 45}, {"duration_days": 120}]
+    assert build_settlement_leverage_model(later, {}, analysis_context=ctx) == build_settlement_leverage_model(later, {})
+    assert build_settlement_feature_pack(later, {}, analysis_context=ctx) == build_settlement_feature_pack(later, {})
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import shutil
+
+import pytest
+
+from packages.shared import storage
+from packages.shared.storage import (
+    ARTIFACT_ALIAS_MANIFEST,
+    get_artifact_path,
+    save_artifact,
+    save_artifact_aliased,
+    save_artifact_json,
+)
+
+
+@pytest.fixture
+def remote(tmp_path, monkeypatch):
+    """Dict-backed stand-in for the artifacts bucket."""
+    objects: dict[str, bytes] = {}
+    uploads: list[str] = []
+
+    def upload(bucket, path, data, content_type="application/pdf"):
+        objects[path] = data if isinstance(data, bytes) else data.read()
+        uploads.append(path)
+        return True
+
+    def download(bucket, path, dest):
+        if path not in objects:
+            return False
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(objects[path])
+        return True
+
+    monkeypatch.setattr(storage, "ARTIFACTS_DIR", tmp_path / "artifacts")
+    monkeypatch.setattr(storage, "UPLOADS_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(storage, "USE_SUPABASE_STORAGE", True)
+    monkeypatch.setattr(storage, "ARTIFACT_UPLOAD_WORKERS", 0)  # upload inline through the stand-in
+    monkeypatch.setattr(storage, "_supabase_upload", upload)
+    monkeypatch.setattr(storage, "_supabase_download", download)
+    monkeypatch.setattr(storage, "_uploaded_blobs", {})
+    return objects, uploads
+
+
+def test_aliased_artifact_is_stored_and_uploaded_once(remote):
+    objects, uploads = remote
+    names = ["chronology.pdf", "export.pdf", "exports/internal/chronology.pdf", "chronology_INTERNAL.pdf"]
+    path = save_artifact_aliased("run1", names, b"%PDF-1.7 body")
+
+    assert path == storage.ARTIFACTS_DIR / "run1" / "chronology.pdf"
+    blobs = [k for k in uploads if "/.blobs/" in k]
+    assert len(blobs) == 1
+    assert not any(k.endswith(".pdf") for k in uploads)
+    aliases = json.loads(objects[f"run1/{ARTIFACT_ALIAS_MANIFEST}"])["aliases"]
+    assert set(aliases) == set(names) and len(set(aliases.values())) == 1
+    for name in names:
+        assert (storage.ARTIFACTS_DIR / "run1" / name).read_bytes() == b"%PDF-1.7 body"
+
+    # Saving the same bytes again does not re-upload the blob.
+    uploads.clear()
+    save_artifact_aliased("run1", names, b"%PDF-1.7 body")
+    assert not [k for k in uploads if "/.blobs/" in k]
+
+
+def test_download_resolves_aliases_through_the_manifest(remote):
+    save_artifact_aliased("run1", ["chronology.pdf", "exports/mediation/export.pdf"], b"pdf-bytes")
+    save_artifact_json("run1", "evidence_graph.json", {"pages": []}, copies=["exports/mediation/evidence_graph.json"])
+    save_artifact("run1", "chronology.csv", b"a,b\n")
+    shutil.rmtree(storage.ARTIFACTS_DIR / "run1")  # e.g. the API host never saw the worker's disk
+
+    assert get_artifact_path("run1", "exports/mediation/export.pdf").read_bytes() == b"pdf-bytes"
+    assert json.loads(get_artifact_path("run1", "exports/mediation/evidence_graph.json").read_bytes()) == {"pages": []}
+    assert get_artifact_path("run1", "chronology.csv").read_bytes() == b"a,b\n"
+    assert get_artifact_path("run1", "missing.pdf") is None
+
+
+def test_direct_save_over_an_alias_leaves_other_aliases_intact(remote):
+    objects, _ = remote
+    save_artifact_aliased("run1", ["chronology.pdf", "export.pdf"], b"v1")
+    save_artifact("run1", "chronology.pdf", b"v2")
+
+    run_dir = storage.ARTIFACTS_DIR / "run1"
+    assert (run_dir / "chronology.pdf").read_bytes() == b"v2"
+    assert (run_dir / "export.pdf").read_bytes() == b"v1"
+    aliases = json.loads(objects[f"run1/{ARTIFACT_ALIAS_MANIFEST}"])["aliases"]
+    assert set(aliases) == {"export.pdf"}
+    assert objects["run1/chronology.pdf"] == b"v2"
+
+
+def test_fail_cover_rewrite_leaves_sibling_aliases_and_blob_intact(remote):
+    import io
+
+    from reportlab.pdfgen import canvas
+
+    from apps.worker.lib.quality_gates import write_fail_cover_pdf
+
+    objects, _ = remote
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    c.drawString(50, 750, "chronology")
+    c.save()
+    original = buf.getvalue()
+    names = ["chronology.pdf", "export.pdf", "exports/internal/export.pdf"]
+    path = save_artifact_aliased("run1", names, original)
+    sha = storage.sha256_bytes(original)
+
+    assert write_fail_cover_pdf(str(path), {"export_status": "BLOCKED", "hard_failures": [{"code": "X", "message": "bad"}]})
+
+    run_dir = storage.ARTIFACTS_DIR / "run1"
+    assert (run_dir / "chronology.pdf").read_bytes() != original
+    for sibling in names[1:]:
+        assert (run_dir / sibling).read_bytes() == original
+    blob = run_dir / ".blobs" / sha
+    assert storage.sha256_bytes(blob.read_bytes()) == sha
+    assert objects[f"run1/.blobs/{sha}"] == original
+    assert objects["run1/chronology.pdf"] == (run_dir / "chronology.pdf").read_bytes()
+    aliases = json.loads(objects[f"run1/{ARTIFACT_ALIAS_MANIFEST}"])["aliases"]
+    assert set(aliases) == set(names[1:])
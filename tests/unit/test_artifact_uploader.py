@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from packages.shared import storage
+from packages.shared.artifact_uploader import ArtifactUploader
+
+
+class _StorageStandIn(BaseHTTPRequestHandler):
+    """Minimal ``POST /storage/v1/object/<bucket>/<path>`` endpoint."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        key = self.path.removeprefix("/storage/v1/object/")
+        with server.lock:
+            server.clients.add(self.client_address)
+            server.attempts[key] = server.attempts.get(key, 0) + 1
+            status = server.script.get(key, [200]).pop(0) if server.script.get(key) else 200
+            if status == 200:
+                server.objects[key] = (body, self.headers.get("Content-Type"), self.headers.get("Authorization"))
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StorageStandIn)
+    server.lock = threading.Lock()
+    server.objects, server.attempts, server.script, server.clients = {}, {}, {}, set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _uploader(server, **kwargs) -> ArtifactUploader:
+    host, port = server.server_address
+    return ArtifactUploader(f"http://{host}:{port}", "service-key", backoff_seconds=0.01, **kwargs)
+
+
+def test_uploads_run_in_background_over_pooled_connections(stand_in, tmp_path):
+    uploader = _uploader(stand_in, max_workers=3, max_pending=4)
+    blob = tmp_path / "blob"
+    blob.write_bytes(b"%PDF blob")
+    for i in range(20):
+        uploader.submit("artifacts", f"run1/file_{i}.json", b'{"i": %d}' % i, "application/json")
+    uploader.submit("artifacts", "run1/.blobs/abc", blob, "application/pdf")
+    uploader.submit("artifacts", "run2/other.csv", b"a,b", "text/csv")
+
+    assert uploader.flush("run1/") == []
+    assert all(f"artifacts/run1/file_{i}.json" in stand_in.objects for i in range(20))
+    assert stand_in.objects["artifacts/run1/.blobs/abc"] == (b"%PDF blob", "application/pdf", "Bearer service-key")
+    assert uploader.flush() == []
+    assert uploader.stats.uploaded == 22
+    assert len(stand_in.clients) <= 3  # 22 uploads reuse the pool's keep-alive connections
+    uploader.close()
+
+
+def test_transient_errors_are_retried_and_client_errors_are_reported(stand_in):
+    stand_in.script["artifacts/run1/flaky.json"] = [503, 502]
+    stand_in.script["artifacts/run1/denied.json"] = [403]
+    stand_in.script["artifacts/run1/down.json"] = [503] * 10
+    uploader = _uploader(stand_in, retries=3)
+    for name in ("flaky", "denied", "down"):
+        uploader.submit("artifacts", f"run1/{name}.json", b"{}", "application/json")
+
+    assert uploader.flush("run1/") == ["run1/denied.json", "run1/down.json"]
+    assert stand_in.attempts == {"artifacts/run1/flaky.json": 3, "artifacts/run1/denied.json": 1, "artifacts/run1/down.json": 4}
+    assert "artifacts/run1/flaky.json" in stand_in.objects
+    assert (uploader.stats.uploaded, uploader.stats.failed, uploader.stats.retries) == (1, 2, 5)
+    uploader.close()
+
+
+def test_uploads_of_one_path_land_in_submission_order(stand_in):
+    stand_in.script["artifacts/run1/artifact_aliases.json"] = [503]
+    uploader = _uploader(stand_in, max_workers=4)
+    uploader.submit("artifacts", "run1/artifact_aliases.json", b"v1", "application/json")
+    uploader.submit("artifacts", "run1/artifact_aliases.json", b"v2", "application/json")
+    uploader.submit("artifacts", "run1/other.json", b"{}", "application/json")
+
+    assert uploader.flush("run1/") == []
+    assert stand_in.objects["artifacts/run1/artifact_aliases.json"][0] == b"v2"
+    assert uploader.stats.superseded == 1  # the retry of v1 was dropped instead of overwriting v2
+    uploader.close()
+
+
+def test_failed_blob_upload_is_retried_by_the_next_save(stand_in, tmp_path, monkeypatch):
+    host, port = stand_in.server_address
+    monkeypatch.setattr(storage, "ARTIFACTS_DIR", tmp_path / "artifacts")
+    monkeypatch.setattr(storage, "UPLOADS_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(storage, "USE_SUPABASE_STORAGE", True)
+    monkeypatch.setattr(storage, "SUPABASE_REST_URL", f"http://{host}:{port}")
+    monkeypatch.setattr(storage, "SUPABASE_SERVICE_KEY", "service-key")
+    monkeypatch.setattr(storage, "_artifact_uploader", None)
+    monkeypatch.setattr(storage, "_uploaded_blobs", {})
+    sha = storage.sha256_bytes(b"%PDF")
+    stand_in.script[f"artifacts/run8/.blobs/{sha}"] = [403]
+
+    storage.save_artifact_aliased("run8", ["chronology.pdf"], b"%PDF")
+    storage._artifact_uploader.flush("run8/")
+    storage.save_artifact_aliased("run8", ["export.pdf"], b"%PDF")
+    assert storage.flush_artifact_uploads("run8") == []
+    assert f"artifacts/run8/.blobs/{sha}" in stand_in.objects
+    assert stand_in.attempts[f"artifacts/run8/.blobs/{sha}"] == 2
+    assert "run8" not in storage._uploaded_blobs  # dropped once the run is flushed
+    storage._artifact_uploader.close()
+
+
+def test_save_artifact_queues_uploads_until_the_run_is_flushed(stand_in, tmp_path, monkeypatch):
+    host, port = stand_in.server_address
+    monkeypatch.setattr(storage, "ARTIFACTS_DIR", tmp_path / "artifacts")
+    monkeypatch.setattr(storage, "UPLOADS_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(storage, "USE_SUPABASE_STORAGE", True)
+    monkeypatch.setattr(storage, "SUPABASE_REST_URL", f"http://{host}:{port}")
+    monkeypatch.setattr(storage, "SUPABASE_SERVICE_KEY", "service-key")
+    monkeypatch.setattr(storage, "_artifact_uploader", None)
+    monkeypatch.setattr(storage, "_uploaded_blobs", {})
+
+    storage.save_artifact("run9", "chronology.csv", b"a,b\n")
+    storage.save_artifact_aliased("run9", ["chronology.pdf", "export.pdf"], b"%PDF")
+    assert storage.flush_artifact_uploads("run9") == []
+    keys = set(stand_in.objects)
+    assert "artifacts/run9/chronology.csv" in keys
+    assert "artifacts/run9/artifact_aliases.json" in keys
+    assert sum(1 for k in keys if k.startswith("artifacts/run9/.blobs/")) == 1
+    storage._artifact_uploader.close()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+import pytest
+
+from apps.worker.steps.events.citation_store import CitationRef, CitationStore, collecting_citations
+from apps.worker.steps.events.clinical import extract_clinical_events
+from apps.worker.steps.events.common import _make_citation
+from packages.shared.models import Citation, Page, PageType, RunConfig
+
+
+def _page(n: int, text: str) -> Page:
+    return Page(page_id=f"p{n}", source_document_id="doc-1", page_number=n, text=text, text_source="embedded_text", page_type=PageType.CLINICAL_NOTE)
+
+
+def test_make_citation_returns_model_when_no_store_bound():
+    cit = _make_citation(_page(1, "x"), "Patient reports neck pain.")
+    assert isinstance(cit, Citation)
+    assert cit.text_hash == hashlib.sha256(b"Patient reports neck pain.").hexdigest()
+
+
+def test_make_citation_appends_to_bound_store_and_defers_hash():
+    with collecting_citations() as store:
+        ref = _make_citation(_page(3, "x"), "Cervical strain.")
+    assert isinstance(ref, CitationRef)
+    assert len(store) == 1
+    assert ref.page_number == 3 and ref.source_document_id == "doc-1"
+    assert store._hashes[0] is None
+    assert store.hash_pending() == 1
+    assert ref.text_hash == hashlib.sha256(b"Cervical strain.").hexdigest()
+
+
+def test_materialize_matches_eager_citation_fields():
+    long_snippet = "A" * 620
+    store = CitationStore()
+    refs = [store.append("doc-1", 2, "BP 120/80"), store.append("doc-1", 4, long_snippet)]
+    models = store.materialize(refs)
+    eager = [_make_citation(_page(2, "x"), "BP 120/80"), _make_citation(_page(4, "x"), long_snippet)]
+    for got, want in zip(models, eager):
+        assert isinstance(got, Citation)
+        dumped = got.model_dump(mode="json")
+        expected = want.model_dump(mode="json")
+        dumped.pop("citation_id"), expected.pop("citation_id")
+        assert dumped == expected
+        # Byte-identical once written, python-mode dumps included: dict equality
+        # would let an unvalidated 0 bbox pass for 0.0.
+        assert json.dumps(got.bbox.model_dump()) == json.dumps(want.bbox.model_dump())
+
+
+def test_snippets_are_interned_and_hashed_once():
+    store = CitationStore()
+    a = store.append("doc-1", 1, "".join(["Vitals", " stable"]))
+    b = store.append("doc-1", 2, "".join(["Vitals ", "stable"]))
+    assert a.snippet is b.snippet
+    assert store.stats()["distinct_snippets"] == 1
+    store.hash_pending()
+    assert len(store._hash_cache) == 1
+
+
+def test_store_rejects_rows_the_model_would_reject():
+    store = CitationStore()
+    with pytest.raises(ValueError):
+        store.append("doc-1", 1, "")
+    with pytest.raises(ValueError):
+        store.append("doc-1", 0, "text")
+
+
+def test_materialize_passes_through_existing_models_in_order():
+    store = CitationStore()
+    existing = _make_citation(_page(1, "x"), "Existing")
+    ref = store.append("doc-1", 2, "New")
+    out = store.materialize([existing, ref])
+    assert out[0] is existing
+    assert out[1].citation_id == ref.citation_id
+
+
+def test_extractor_under_store_yields_same_citations_as_eager_path():
+    pages = [_page(1, "Emergency Department\nChief complaint: neck pain after MVC\nAssessment: cervical strain")]
+    eager_events, eager_cits, _, _ = extract_clinical_events(pages, {}, [], RunConfig())
+    with collecting_citations() as store:
+        events, refs, _, _ = extract_clinical_events(pages, {}, [], RunConfig())
+    cits = store.materialize(refs)
+    assert cits and [c.snippet for c in cits] == [c.snippet for c in eager_cits]
+    assert [c.text_hash for c in cits] == [c.text_hash for c in eager_cits]
+    fact_cids = {cid for e in events for cid in e.citation_ids}
+    assert fact_cids <= {c.citation_id for c in cits}
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from apps.worker.steps.step10_confidence import (
+    CONFIDENCE_FEATURES,
+    ConfidenceMatrix,
+    apply_confidence_scoring,
+    score_event,
+)
+from packages.shared.models import DateKind, DateSource, DateStatus, Event, EventDate, EventType, Fact, FactKind, RunConfig
+
+
+def _evt(eid, status=DateStatus.EXPLICIT, etype=EventType.OFFICE_VISIT, kinds=(FactKind.OTHER,), cites=1, pages=1, time=None, pid="p1"):
+    return Event(
+        event_id=eid,
+        provider_id=pid,
+        event_type=etype,
+        date=EventDate(kind=DateKind.SINGLE, value=date(2024, 3, 15), source=DateSource.TIER1, status=status, extensions={"time": time} if time else {}),
+        facts=[Fact(text=f"fact {i}", kind=k, verbatim=True) for i, k in enumerate(kinds)],
+        confidence=0,
+        citation_ids=[f"c{i}" for i in range(cites)],
+        source_page_numbers=list(range(1, pages + 1)),
+    )
+
+
+def _events():
+    return [
+        _evt("er", etype=EventType.ER_VISIT, kinds=(FactKind.CHIEF_COMPLAINT, FactKind.ASSESSMENT, FactKind.DIAGNOSIS), cites=3, pages=2, time="0815"),
+        _evt("undated", status=DateStatus.UNDATED, pid="unknown"),
+        _evt("anchors", kinds=(FactKind.PLAN,) * 5 + (FactKind.MEDICATION,) * 4, cites=5),
+        _evt("propagated", status=DateStatus.PROPAGATED),
+    ]
+
+
+def test_contribution_columns_sum_to_scores_and_explain_each_event():
+    config = RunConfig()
+    events = _events()
+    matrix = ConfidenceMatrix(events)
+    contributions = matrix.contributions(config.confidence_scoring)
+    assert tuple(contributions) == CONFIDENCE_FEATURES
+    scores = matrix.scores(config.confidence_scoring)
+    assert scores == [score_event(e, config) for e in events]
+    assert matrix.explain("anchors", config.confidence_scoring)["anchors"] == 21
+    assert matrix.explain("anchors", config.confidence_scoring)["clinical"] == 12
+    assert matrix.explain("undated", config.confidence_scoring)["date_status"] == -50
+    assert scores[1] == 0  # clamped
+
+
+def test_rescoring_with_new_weights_does_not_touch_events():
+    events = _events()
+    matrix = ConfidenceMatrix(events)
+    events.clear()
+    boosted = matrix.scores({"date_propagated": 60})
+    assert boosted[3] == 60 + 20
+
+
+def test_export_counts_match_per_threshold_filtering():
+    config = RunConfig()
+    matrix = ConfidenceMatrix(_events())
+    scores = matrix.scores(config.confidence_scoring)
+    thresholds = [0, 30, 60, 90, 101]
+    assert matrix.export_counts(thresholds, config.confidence_scoring) == {
+        t: sum(1 for s in scores if s >= t) for t in thresholds
+    }
+
+
+def test_apply_confidence_scoring_uses_supplied_matrix():
+    config = RunConfig()
+    events = _events()
+    matrix = ConfidenceMatrix(events)
+    scored, _ = apply_confidence_scoring(events, config, matrix=matrix)
+    assert [e.confidence for e in scored] == matrix.scores(config.confidence_scoring)
+    assert ("LOW_CONFIDENCE" in scored[1].flags) is (scored[1].confidence < config.event_confidence_min_export)
+    summary = matrix.summary(config.confidence_scoring)
+    assert summary["time"]["events"] == 1
+
+
+def test_apply_confidence_scoring_rejects_a_matrix_of_other_events():
+    config = RunConfig()
+    events = _events()
+    with pytest.raises(ValueError):
+        apply_confidence_scoring(events, config, matrix=ConfidenceMatrix(events[:-1]))
+    with pytest.raises(ValueError):
+        apply_confidence_scoring(events, config, matrix=ConfidenceMatrix(list(reversed(events))))
+    assert all(e.confidence == 0 for e in events)
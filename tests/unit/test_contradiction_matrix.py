@@ -41,3 +41,55 @@ def test_contradiction_matrix_detects_pain_delta() -> None:
     matrix = build_contradiction_matrix(rows, window_days=30)
     assert any(r.get("category") == "pain_severity" for r in matrix)
 
+
+
+def _pairwise_matrix(rows: list[dict], window_days: int, limit: int) -> list[dict]:
+    """Reference all-pairs scan in mention order (the original algorithm)."""
+    from apps.worker.steps.litigation.contradiction_matrix import _collect_mentions, _is_contradiction, _matrix_entry
+    from packages.shared.utils.claim_utils import parse_iso
+
+    mentions = []
+    for row in rows:
+        for m in _collect_mentions(row):
+            m.update(date_obj=parse_iso(str(row.get("date") or "")), date=str(row.get("date") or "unknown"),
+                     support_score=int(row.get("support_score") or 0), citations=list(row.get("citations") or [])[:3])
+            mentions.append(m)
+    out, seen = [], set()
+    for i, a in enumerate(mentions):
+        for b in mentions[i + 1:]:
+            if a["kind"] != b["kind"]:
+                continue
+            if a["date_obj"] and b["date_obj"] and abs((b["date_obj"] - a["date_obj"]).days) > window_days:
+                continue
+            if not _is_contradiction(a["kind"], a["value"], b["value"]):
+                continue
+            key = (a["kind"], a["value"], b["value"], min(a["date"], b["date"]))
+            if key not in seen:
+                seen.add(key)
+                out.append(_matrix_entry(a, b))
+    out.sort(key=lambda r: (-r["strength_delta"], r["category"], r["supporting"]["date"]))
+    return out[:limit]
+
+
+def test_contradiction_matrix_matches_pairwise_scan_ordering() -> None:
+    import random
+
+    rng = random.Random(3)
+    phrases = [
+        "Pain 8/10 left knee.", "Pain 2/10 right knee.", "Pain 5/10.", "Returned to work full duty.",
+        "Off work per provider.", "Rear-end collision.", "Slip and fall at home.", "Cervical strain.",
+        "Lumbar radiculopathy.", "Symptoms improving with PT.", "Worsening pain, MRI ordered.",
+    ]
+    rows = [
+        _row(
+            rid=f"r{i}",
+            date=rng.choice(["unknown", "2025-01-01", f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"]),
+            claim_type=rng.choice(["SYMPTOM", "INJURY_DX"]),
+            assertion=" ".join(rng.sample(phrases, 2)),
+            support_score=rng.randint(0, 9),
+            citations=[f"packet.pdf p. {i}"],
+        )
+        for i in range(160)
+    ]
+    for window, limit in ((45, 24), (10, 5), (365, 200), (0, 3)):
+        assert build_contradiction_matrix(rows, window_days=window, limit=limit) == _pairwise_matrix(rows, window, limit)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
+
+from packages.db import database
+
+
+def test_profiles_read_env_overrides_and_context(monkeypatch):
+    monkeypatch.setenv("DB_WORKER_POOL_SIZE", "7")
+    monkeypatch.setenv("DB_WORKER_NULL_POOL", "true")
+
+    worker = database.engine_profile("worker")
+    assert worker.pool_size == 7 and worker.null_pool and worker.max_overflow == 2
+    assert database.engine_profile().name == database.DEFAULT_ENGINE_PROFILE
+    with database.use_engine_profile("cron"):
+        assert database.engine_profile().name == "cron"
+    with pytest.raises(ValueError):
+        database.engine_profile("batch")
+
+
+def test_postgres_engines_are_pooler_aware(monkeypatch):
+    created: list[dict] = []
+    real_create_engine = database.create_engine
+    monkeypatch.setattr(database, "create_engine", lambda url, **kw: created.append(kw) or real_create_engine(url, **kw))
+    monkeypatch.setattr(database, "DB_POOLER_MODE", "")
+
+    direct = database._create_engine("postgresql+psycopg://u:p@db.example:5432/app", database.engine_profile("api"))
+    pooled = database._create_engine("postgresql+psycopg://u:p@pooler.example:6543/app", database.engine_profile("api"))
+    cron = database._create_engine("postgresql+psycopg2://u:p@db.example:5432/app", database.engine_profile("cron"))
+
+    assert isinstance(direct.pool, database._TimedQueuePool) and direct.pool.size() == 5
+    assert created[0]["pool_pre_ping"] and created[0]["connect_args"] == {"options": "-c statement_timeout=30000"}
+    # Transaction pooler: no client pool, no prepared statements, timeout scoped to each transaction.
+    assert isinstance(pooled.pool, NullPool)
+    assert created[1]["connect_args"] == {"prepare_threshold": None}
+    assert isinstance(cron.pool, NullPool)
+
+
+def test_timed_pool_records_waits_and_timeouts():
+    pool = database._TimedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05)
+    first = pool.connect()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    first.close()
+    pool.connect().close()
+
+    stats = pool.stats
+    assert stats.checkouts == 3 and stats.timeouts == 1
+    assert stats.waits == 2 and stats.max_wait_seconds >= 0.05
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import date
+
+from apps.worker.lib.event_overlay import fork_event, fork_events, materialize_event, overlay_fields, shares_state
+from apps.worker.steps.events.legal_usability import improve_legal_usability
+from apps.worker.steps.step10_confidence import filter_for_export
+from packages.shared.models import DateKind, DateSource, Event, EventDate, EventType, Fact, FactKind, RunConfig
+
+
+def _evt(eid: str, texts: list[str], etype=EventType.OFFICE_VISIT, d=date(2024, 3, 5)) -> Event:
+    return Event(
+        event_id=eid,
+        provider_id="p1",
+        event_type=etype,
+        date=EventDate(kind=DateKind.SINGLE, value=d, source=DateSource.TIER1),
+        facts=[Fact(text=t, kind=FactKind.OTHER, verbatim=True, citation_id=f"c-{eid}-{i}") for i, t in enumerate(texts)],
+        confidence=80,
+        citation_ids=[f"c-{eid}-{i}" for i in range(len(texts))],
+        source_page_numbers=[1],
+        extensions={"patient_scope_id": "ps_a"},
+    )
+
+
+def _events() -> list[Event]:
+    return [
+        _evt("a", ["Patient reports neck pain 7/10 after MVC.", "History of lumbar strain 2/14 treated with PT."]),
+        _evt("b", ["see nursing notes"]),
+        _evt("c", ["Ambulated to bathroom with assist.", "T. Smyth, RN"], etype=EventType.HOSPITAL_ADMISSION),
+        _evt("d", ["Oxycodone 5 mg administered for pain 8/10.", "Patient stable; discharge planned."]),
+    ]
+
+
+def _dump(events: list[Event]) -> list[dict]:
+    rows = []
+    for e in events:
+        row = e.model_dump(mode="json", exclude={"event_id"})
+        row["extensions"].pop("derived_from_event_id", None)
+        row["citation_ids"] = sorted(row["citation_ids"])
+        rows.append(row)
+    return rows
+
+
+def test_fork_shares_nested_models_but_not_containers():
+    base = _evt("a", ["Follow-up visit."])
+    view = fork_event(base)
+    assert view.date is base.date and view.facts[0] is base.facts[0]
+    assert view.facts is not base.facts and view.flags is not base.flags and view.extensions is not base.extensions
+    view.flags.append("NEEDS_REVIEW")
+    view.extensions["authors"] = []
+    assert base.flags == [] and "authors" not in base.extensions
+    assert set(overlay_fields(base, view)) == {"flags", "extensions"}
+
+
+def test_legal_usability_on_forks_matches_deep_copy_and_leaves_base_intact():
+    base = _events()
+    before = [e.model_dump(mode="json") for e in base]
+
+    deep = improve_legal_usability([e.model_copy(deep=True) for e in base])
+    cow = improve_legal_usability(fork_events(base))
+    assert _dump(cow) == _dump(deep)
+
+    exported = filter_for_export(fork_events(base), RunConfig())
+    improve_legal_usability(exported)
+    assert [e.model_dump(mode="json") for e in base] == before
+
+
+def test_materialize_detaches_view_from_base():
+    base = _evt("a", ["Follow-up visit."])
+    view = fork_event(base)
+    assert shares_state(base, view)
+    materialize_event(view)
+    assert not shares_state(base, view)
+    view.facts[0].text = "edited"
+    view.date.value = date(2020, 1, 1)
+    assert base.facts[0].text == "Follow-up visit." and base.date.value == date(2024, 3, 5)
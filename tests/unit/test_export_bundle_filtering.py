@@ -1,4 +1,21 @@
-from apps.worker.lib.artifacts_writer import build_export_evidence_graph
+import gzip
+import hashlib
+import json
+
+from apps.worker.lib import artifacts_writer
+from apps.worker.lib.artifacts_writer import build_export_evidence_graph, save_evidence_graph_artifact
+from apps.worker.lib.graph_snapshot import freeze
+from packages.shared import storage
+from packages.shared.storage import iter_json_bytes, save_artifact_json
+
+
+def _graph_payload() -> dict:
+    pages = [{"page_number": i, "text": f"Page {i} \u2013 caf\u00e9 note " * 200} for i in range(1, 60)]
+    return {
+        "pages": pages,
+        "events": [{"event_id": f"e{i}", "confidence": i / 7, "flags": [None, True]} for i in range(300)],
+        "extensions": {"settlement_model_report": {"label": "internal"}, "severity_profile": {"v": 1}},
+    }
 
 
 def test_build_export_evidence_graph_strips_valuation_extensions_in_mediation():
@@ -32,3 +49,33 @@ def test_build_export_evidence_graph_keeps_internal_extensions_in_internal_mode(
     out = build_export_evidence_graph(payload, "INTERNAL")
     assert "case_severity_index" in out["extensions"]
     assert "severity_profile" in out["extensions"]
+
+
+def test_streamed_json_is_byte_identical_to_json_dumps():
+    payload = _graph_payload()
+    chunks = list(iter_json_bytes(freeze(payload)))
+    assert len(chunks) > 1
+    assert b"".join(chunks) == json.dumps(payload, indent=2).encode()
+    compact = b"".join(iter_json_bytes(payload, compact=True))
+    assert compact == json.dumps(payload, separators=(",", ":")).encode()
+
+
+def test_evidence_graph_artifact_streams_with_hash_copies_and_gzip(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "ARTIFACTS_DIR", tmp_path / "artifacts")
+    monkeypatch.setattr(storage, "UPLOADS_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(artifacts_writer, "_EVIDENCE_GRAPH_GZIP", True)
+    payload = _graph_payload()
+
+    written = save_evidence_graph_artifact("run1", payload, "MEDIATION", copies=("exports/mediation/evidence_graph.json",), allow_gzip=True)
+    expected = json.dumps(build_export_evidence_graph(payload, "MEDIATION"), indent=2).encode()
+    assert written.path.read_bytes() == expected
+    assert (written.sha256, written.bytes) == (hashlib.sha256(expected).hexdigest(), len(expected))
+    assert (tmp_path / "artifacts" / "run1" / "exports" / "mediation" / "evidence_graph.json").read_bytes() == expected
+    assert "settlement_model_report" not in json.loads(expected)["extensions"]
+    gz = tmp_path / "artifacts" / "run1" / "evidence_graph.json.gz"
+    assert json.loads(gzip.decompress(gz.read_bytes())) == json.loads(expected)
+    assert not list((tmp_path / "artifacts" / "run1").glob("*.tmp"))
+
+    again = save_artifact_json("run1", "graph.json", payload, compact=True, gzip=True)
+    assert again.path.name == "graph.json.gz"
+    assert again.sha256 == hashlib.sha256(again.path.read_bytes()).hexdigest()
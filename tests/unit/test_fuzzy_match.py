@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import random
+from difflib import SequenceMatcher
+from pathlib import Path
+
+from apps.worker.lib.claim_context_alignment import _semantic_score, _tokens
+from apps.worker.lib.fuzzy_match import (
+    QGramEngine,
+    SequenceRatioEngine,
+    get_similarity_engine,
+)
+
+_GOLDEN = Path(__file__).resolve().parents[1] / "golden" / "export_baselines"
+
+
+def _golden_lines(limit: int = 120) -> list[str]:
+    lines: list[str] = []
+    for md in sorted(_GOLDEN.glob("*/chronology.md")):
+        lines.extend(ln.strip().lower() for ln in md.read_text(encoding="utf-8").splitlines() if len(ln.strip()) > 12)
+    return lines[:limit]
+
+
+def test_sequence_engine_matches_sequence_matcher_on_golden_text():
+    lines = _golden_lines()
+    assert lines
+    engine = SequenceRatioEngine()
+    rng = random.Random(7)
+    pairs = [(rng.choice(lines)[:400], " ".join(rng.sample(lines, 3))[:800]) for _ in range(150)]
+    pairs += [(ln[:60], ln) for ln in lines[:30]]
+    for a, b in pairs:
+        expected = SequenceMatcher(None, a, b).ratio()
+        assert engine.ratio(a, b) == expected
+        for t in (0.3, 0.6, 0.88):
+            assert engine.ratio_at_least(a, b, t) is (expected >= t)
+
+
+def test_threshold_rejection_does_not_poison_the_pair_cache():
+    engine = SequenceRatioEngine()
+    a, b = "lumbar disc herniation l4-l5", "cervical strain with spasm"
+    assert not engine.ratio_at_least(a, b, 0.95)
+    assert engine.ratio(a, b) == SequenceMatcher(None, a, b).ratio()
+
+
+def test_qgram_threshold_test_agrees_with_its_ratio():
+    engine = QGramEngine()
+    labels = [
+        "disc herniation l4-l5",
+        "disc herniations l4-l5",
+        "disc herniation at l4-l5",
+        "disc protrusion l5-s1",
+        "cervical radiculopathy",
+        "cervical radiculopathy left",
+        "",
+    ]
+    lines = _golden_lines(40)
+    pairs = [(a, b) for a in labels for b in labels] + [(a[:60], b) for a in lines[:10] for b in lines[:10]]
+    for a, b in pairs:
+        score = engine.ratio(a, b)
+        for t in (0.3, 0.6, 0.88, 1.0):
+            assert engine.ratio_at_least(a, b, t) is (score >= t), (a, b, t)
+    assert engine.ratio_at_least("disc herniation l4-l5", "disc herniations l4-l5", 0.88)
+    assert not engine.ratio_at_least("disc herniation l4-l5", "cervical radiculopathy", 0.88)
+
+
+def test_semantic_score_unchanged_with_default_engine():
+    assert get_similarity_engine().name == "sequence"
+
+    def reference(a: str, b: str) -> float:
+        aa, bb = a.strip().lower(), b.strip().lower()
+        ta, tb = _tokens(aa), _tokens(bb)
+        jaccard = (len(ta & tb) / len(ta | tb)) if ta and tb else 0.0
+        seq = SequenceMatcher(None, aa[:400], bb[:800]).ratio()
+        bonus = 0.2 if aa in bb or any(tok in bb for tok in ta if len(tok) >= 4) else 0.0
+        return max(0.0, min(1.0, 0.55 * jaccard + 0.45 * seq + bonus))
+
+    lines = _golden_lines()
+    page = " ".join(lines[:40])
+    for claim in lines[40:80]:
+        assert _semantic_score(claim, page) == reference(claim, page)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import copy
+import json
+from datetime import date
+
+import pytest
+
+from apps.worker.lib.graph_snapshot import FrozenDict, ModelSnapshot
+from packages.shared.models import DateKind, DateSource, EvidenceGraph, Event, EventDate, EventType, Fact, FactKind, Page
+
+
+def _graph() -> EvidenceGraph:
+    page = Page(page_id="p1", source_document_id="doc-1", page_number=1, text="Follow-up visit. " * 50, text_source="embedded_text")
+    event = Event(
+        event_id="e1",
+        provider_id="prov-1",
+        event_type=EventType.OFFICE_VISIT,
+        date=EventDate(kind=DateKind.SINGLE, value=date(2024, 3, 1), source=DateSource.TIER1),
+        facts=[Fact(text="Follow-up visit.", kind=FactKind.OTHER, verbatim=True, citation_id="c1")],
+        confidence=80,
+        citation_ids=["c1"],
+    )
+    return EvidenceGraph(pages=[page], events=[event], extensions={"gaps_summary": {"count": 0}})
+
+
+def test_view_matches_model_dump_and_is_read_only():
+    graph = _graph()
+    snap = ModelSnapshot(graph)
+    view = snap.view()
+    assert view == graph.model_dump(mode="json")
+    assert isinstance(view, dict) and isinstance(view["events"], list)
+    assert json.loads(json.dumps(view)) == graph.model_dump(mode="json")
+    with pytest.raises(TypeError):
+        view["extensions"]["new"] = 1
+    with pytest.raises(TypeError):
+        view["events"][0]["facts"].append({})
+
+
+def test_repeated_views_reuse_serialized_fields():
+    graph = _graph()
+    snap = ModelSnapshot(graph)
+    first = snap.view()
+    dumps = snap.dumps
+    second = snap.view()
+    assert snap.dumps == dumps
+    assert second["pages"] is first["pages"]
+
+
+def test_extension_reassignment_redumps_only_that_key():
+    graph = _graph()
+    snap = ModelSnapshot(graph)
+    before = snap.view()
+    dumps = snap.dumps
+    graph.extensions["claim_context_alignment"] = {"status": "PASS"}
+    after = snap.view()
+    assert snap.dumps == dumps + 1
+    assert after["extensions"]["claim_context_alignment"] == {"status": "PASS"}
+    assert after["extensions"]["gaps_summary"] is before["extensions"]["gaps_summary"]
+    assert after == graph.model_dump(mode="json")
+
+
+def test_in_place_edits_need_explicit_invalidation():
+    graph = _graph()
+    snap = ModelSnapshot(graph)
+    snap.view()
+    graph.extensions["gaps_summary"]["count"] = 3
+    graph.events[0].confidence = 10
+    assert snap.view()["extensions"]["gaps_summary"]["count"] == 0
+    snap.invalidate("extensions", "gaps_summary")
+    snap.invalidate("events")
+    view = snap.view()
+    assert view["extensions"]["gaps_summary"]["count"] == 3
+    assert view["events"][0]["confidence"] == 10
+
+
+def test_copies_of_a_view_are_plain_and_mutable():
+    snap = ModelSnapshot(_graph())
+    deep = copy.deepcopy(snap.view())
+    assert type(deep) is dict and type(deep["events"][0]["facts"]) is list
+    deep["events"][0]["facts"].append({})
+    shallow = snap.mutable_copy("extensions")
+    shallow["extensions"]["export_mode"] = "INTERNAL"
+    assert "export_mode" not in snap.view()["extensions"]
+    assert type(shallow) is dict and type(shallow["extensions"]) is dict
+    assert isinstance(shallow["extensions"]["gaps_summary"], FrozenDict)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from apps.worker.pipeline_persistence import graph_table_rows
+from packages.db.bulk import bulk_insert
+from packages.db.models import Base, OCRCache, Page, PageTextBlob
+from packages.db.page_text import blob_key, compact_page_text, store_page_blobs
+from packages.shared.models import EvidenceGraph, Page as PageModel, PageLayout
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _pages(prefix: str) -> list[PageModel]:
+    layout = PageLayout(width=612, height=792)
+    return [
+        PageModel(page_id=f"{prefix}p{i}", source_document_id="doc1", page_number=i, text=f"Progress note {i}.\n" * 50, text_source="ocr", layout=layout)
+        for i in range(1, 4)
+    ]
+
+
+def test_reruns_share_one_compressed_blob_per_distinct_text(db: Session):
+    for run_id in ("run1", "run2"):
+        pages = _pages(run_id)
+        refs = store_page_blobs(db, pages)
+        for model, rows in graph_table_rows(run_id, EvidenceGraph(pages=pages), [], blob_refs=refs):
+            bulk_insert(db, model, rows)
+
+    # 3 page texts + 1 shared layout, stored once for both runs.
+    assert db.query(PageTextBlob).count() == 4
+    blob = db.get(PageTextBlob, blob_key(_pages("x")[0].text))
+    assert blob.codec == "zlib" and len(blob.data) < blob.size_bytes
+
+    db.expire_all()
+    page = db.get(Page, "run2p1")
+    assert page.text is None and page.layout_json is None
+    assert page.page_text == _pages("x")[0].text
+    assert page.layout["width"] == 612
+
+
+def test_compaction_moves_inline_rows_and_drops_orphans(db: Session):
+    bulk_insert(db, Page, [{"id": "legacy", "run_id": "run0", "source_document_id": "doc1", "page_number": 1, "text": "Old inline text.", "layout_json": {"width": 612}}])
+    bulk_insert(db, OCRCache, [{"source_document_id": "doc1", "document_sha256": "0" * 64, "page_number": 1, "text": "Old inline text.", "dpi": 300}])
+    bulk_insert(db, PageTextBlob, [{"sha256": "f" * 64, "codec": "raw", "data": b"orphan", "size_bytes": 6}])
+
+    stats = compact_page_text(db, batch_size=1)
+
+    assert stats == {"pages_moved": 1, "ocr_rows_moved": 1, "blobs_deleted": 1}
+    db.expire_all()
+    page = db.get(Page, "legacy")
+    assert page.text is None and page.page_text == "Old inline text." and page.layout == {"width": 612}
+    cached = db.query(OCRCache).one()
+    assert cached.text is None and cached.text_hash == page.text_sha256 and cached.cached_text == "Old inline text."
+    assert db.query(PageTextBlob).count() == 2
+    assert compact_page_text(db) == {"pages_moved": 0, "ocr_rows_moved": 0, "blobs_deleted": 0}
+
+
+
+def test_compaction_keeps_blobs_referenced_only_by_the_ocr_cache(db: Session):
+    bulk_insert(db, PageTextBlob, [{"sha256": "a" * 64, "codec": "raw", "data": b"ocr text", "size_bytes": 8}])
+    bulk_insert(db, OCRCache, [{"source_document_id": "doc1", "document_sha256": "0" * 64, "page_number": 1, "text_hash": "a" * 64, "dpi": 300}])
+
+    assert compact_page_text(db)["blobs_deleted"] == 0
+    assert db.get(PageTextBlob, "a" * 64) is not None
@@ -1,6 +1,12 @@
+import io
 from datetime import datetime, timezone
 
+from pypdf import PdfReader
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate
+
 from apps.worker.project.models import ChronologyProjection, ChronologyProjectionEntry
+from apps.worker.steps.export_render.pdf_linker import AnchorRegistry, anchor_canvas
 from apps.worker.steps.export_render.render_manifest import RenderManifest, chron_anchor, appendix_anchor
 from apps.worker.steps.export_render.timeline_pdf import _build_projection_flowables
 from apps.worker.steps.export_render.timeline_pdf import _manifest_finding_paragraphs
@@ -109,3 +115,56 @@ def test_entry_fact_verbatim_quote_helpers() -> None:
     assert pairs[1] == ("Assessment cervical strain.", False)
     assert _quote_if_verbatim(pairs[0][0], pairs[0][1]).startswith('"Rear-end collision')
     assert _quote_if_verbatim(pairs[1][0], pairs[1][1]) == "Assessment cervical strain."
+
+
+def _render_with_anchors(manifest: RenderManifest, flowables: list) -> tuple[AnchorRegistry, PdfReader]:
+    buffer = io.BytesIO()
+    anchors = AnchorRegistry.from_manifest(manifest)
+    SimpleDocTemplate(buffer, pagesize=letter).build(flowables, canvasmaker=anchor_canvas(anchors))
+    return anchors, PdfReader(io.BytesIO(buffer.getvalue()))
+
+
+def _link_dest_pages(reader: PdfReader, page_index: int) -> list[int]:
+    named = reader.named_destinations
+    out = []
+    for annot in reader.pages[page_index].get("/Annots") or []:
+        dest = annot.get_object().get("/Dest")
+        out.append(reader.get_destination_page_number(named[str(dest)]) if str(dest) in named else reader.get_page_number(dest[0]))
+    return out
+
+
+def test_render_time_links_point_at_appendix_pages() -> None:
+    styles = getSampleStyleSheet()
+    row, target = chron_anchor("evt1"), appendix_anchor("records.pdf", 2)
+    manifest = RenderManifest()
+    manifest.add_chron_anchor(row)
+    manifest.add_appendix_anchor(target)
+    manifest.add_link(row, target)
+
+    anchors, reader = _render_with_anchors(manifest, [
+        Paragraph(f'<a name="{row}"/>2024-01-01 MRI. Citation(s): [p. 2]', styles["Normal"]),
+        PageBreak(),
+        PageBreak(),
+        Paragraph(f'<a name="{target}"/>Page 2', styles["Normal"]),
+    ])
+
+    assert anchors.anchor_pages() == {row: 1, target: 3}
+    assert _link_dest_pages(reader, 0) == [2]
+    assert not reader.pages[2].get("/Annots")
+
+
+def test_render_time_links_survive_anchors_that_were_never_drawn() -> None:
+    styles = getSampleStyleSheet()
+    row, target = chron_anchor("evt1"), appendix_anchor("records.pdf", 9)
+    manifest = RenderManifest()
+    manifest.add_appendix_anchor(target)
+    manifest.add_link(row, target)
+    manifest.add_link(chron_anchor("evt2"), appendix_anchor("records.pdf", 10))  # target not declared: no link
+
+    anchors, reader = _render_with_anchors(manifest, [
+        Paragraph(f'<a name="{row}"/>Row one', styles["Normal"]),
+        Paragraph(f'<a name="{chron_anchor("evt2")}"/>Row two', styles["Normal"]),
+    ])
+
+    assert set(anchors.targets) == {row}
+    assert _link_dest_pages(reader, 0) == [0]
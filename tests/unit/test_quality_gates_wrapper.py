@@ -24,6 +24,10 @@ def test_quality_gates_flags_pt_count_conflict() -> None:
     codes = {f.get("code") for f in (res.get("failures") or [])}
     assert "PT_COUNT_CONFLICT" in codes
     assert res["gate_report"]["pt_count_consistency"]["pass"] is False
+    timings = res["gate_report"]["rule_engine"]
+    assert timings["quality_gates.report"]["scans"] == 1
+    assert timings["quality_gates.report"]["rules"]["PT_REPORTED_COUNT"]["matches"] == 1
+    assert timings["luqa.timeline_text"]["scans"] == 1
 
 
 def test_quality_gates_flags_high_volume_unverified_pt() -> None:
@@ -0,0 +1,58 @@
+import io
+import json
+
+import fitz
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Table
+
+from apps.worker.steps.export_render.rendered_text import RenderedText, capture_text
+
+
+def _render(sidecar: RenderedText) -> bytes:
+    styles = getSampleStyleSheet()
+    h1 = ParagraphStyle("H1Style", parent=styles["Heading1"], fontSize=14)
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    doc.build(
+        [
+            Paragraph("Medical Chronology", styles["Title"]),
+            Paragraph("Top 10 Case-Driving Events", h1),
+            Paragraph("- 2024-01-02 ED visit for neck pain after a rear-end collision. " * 3 + "[p. 4] [p. 7]", styles["Normal"]),
+            Table([["2024-01-05", "MRI cervical spine", "Citation(s): [p. 12]"]]),
+            PageBreak(),
+            Paragraph("Appendix A: Medications", h1),
+            Paragraph("Cyclobenzaprine 10 mg started.", styles["Normal"]),
+        ],
+        canvasmaker=capture_text(doc, sidecar),
+        onFirstPage=lambda canv, d: canv.drawRightString(letter[0] - 72, 40, f"Page {d.page}"),
+    )
+    return buffer.getvalue()
+
+
+def test_sidecar_matches_pdf_text_extraction():
+    sidecar = RenderedText()
+    pdf = fitz.open(stream=_render(sidecar), filetype="pdf")
+    extracted = "\n".join(pdf[i].get_text("text") for i in range(pdf.page_count))
+
+    assert sidecar.text == extracted
+    assert sidecar.page_count == pdf.page_count == 2
+
+
+def test_sidecar_records_sections_pages_and_citations():
+    sidecar = RenderedText()
+    _render(sidecar)
+
+    assert sidecar.sections() == ["Top 10 Case-Driving Events", "Appendix A: Medications"]
+    top10 = [line for line in sidecar.lines if line.section == "Top 10 Case-Driving Events"]
+    assert top10[0].text == "Top 10 Case-Driving Events"
+    assert top10[1].is_bullet and all(line.page == 1 for line in top10)
+    assert [p for line in top10 for p in line.cited_pages] == [4, 7, 12]
+    assert sidecar.section_text("appendix a") == "Appendix A: Medications\nCyclobenzaprine 10 mg started."
+
+    restored = RenderedText.from_dict(json.loads(json.dumps(sidecar.to_dict())))
+    assert restored.text == sidecar.text and restored.sections() == sidecar.sections()
+
+    combined = RenderedText(list(sidecar.lines))
+    combined.extend(restored)
+    assert combined.page_count == 4
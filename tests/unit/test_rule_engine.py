@@ -0,0 +1,62 @@
+import re
+
+import pytest
+
+from apps.worker.lib.rule_engine import Rule, RuleSet, rule_timings
+
+
+def _rules() -> RuleSet:
+    return RuleSet(
+        "test.rules",
+        [
+            Rule("disc", r"\bdisc\b", re.IGNORECASE),
+            Rule("disc_spaces", r"\bdisc spaces\b", re.IGNORECASE),
+            Rule("level", r"\b[CL]\d-\d\b"),
+            Rule("pain", r"(?i)\bpain\s*\d{1,2}\s*/\s*10\b"),
+            Rule("line_end", r"\band\.\s*$", re.IGNORECASE | re.MULTILINE),
+        ],
+    )
+
+
+def test_overlapping_rules_match_like_separate_searches():
+    rules = _rules()
+    text = "MRI: DISC SPACES preserved at c5-6 and C5-6. Pain 7/10 and.\nDisc bulge, pain 4 / 10 and.\nl4-5"
+
+    expected = {
+        r.name: [(m.start(), m.end()) for m in re.finditer(r.pattern, text, r.flags)]
+        for r in rules.rules
+    }
+    got = {name: [(m.start(), m.end()) for m in matches] for name, matches in rules.collect(text).items()}
+
+    assert got == expected
+    assert got["disc"] and got["disc_spaces"] and got["disc"][0][0] == got["disc_spaces"][0][0]
+    assert rules.matched(text) == {name for name, spans in expected.items() if spans}
+    assert rules.matched("nothing relevant") == set()
+
+
+def test_dispatch_calls_handlers_and_records_per_rule_timing():
+    rules = _rules()
+    seen: list[tuple[str, str]] = []
+
+    with rule_timings() as timings:
+        rules.dispatch("disc at C5-6, pain 6/10", {
+            "disc": lambda m: seen.append(("disc", m.group(0))),
+            "pain": lambda m: seen.append(("pain", m.group(0))),
+        })
+        rules.matched("disc spaces")
+    rules.matched("disc")
+
+    assert seen == [("disc", "disc"), ("pain", "pain 6/10")]
+    report = timings["test.rules"].as_dict()
+    assert report["scans"] == 2
+    assert report["rules"]["disc"]["matches"] == 2
+    assert report["rules"]["level"]["matches"] == 1
+    assert report["rules"]["line_end"]["matches"] == 0
+    assert report["scan_ms"] >= 0 and report["rules"]["pain"]["handler_ms"] >= 0
+
+
+def test_rule_set_rejects_empty_matching_and_duplicate_rules():
+    with pytest.raises(ValueError):
+        RuleSet("bad", [Rule("maybe", r"x*")])
+    with pytest.raises(ValueError):
+        RuleSet("bad", [Rule("a", r"a"), Rule("a", r"b")])
@@ -3,9 +3,22 @@ Unit tests for schema validator.
 """
 from __future__ import annotations
 
-from packages.shared.schema_validator import validate_output
+import copy
+import json
+from pathlib import Path
+
+from apps.worker.lib.graph_snapshot import freeze
+from packages.shared import schema_validator
+from packages.shared.schema_validator import ValidationSession, validate_output
 from packages.shared.models import RunConfig
 
+_GRAPH = Path(__file__).resolve().parents[1] / "fixtures" / "invariants" / "case7_cross_contamination" / "evidence_graph.json"
+
+
+def _graph() -> dict:
+    return json.loads(_GRAPH.read_text(encoding="utf-8"))
+
+
 def test_validate_output_valid():
     """Test validation with a minimal valid JSON object."""
     data = {
@@ -164,3 +177,37 @@ def test_validate_output_accepts_current_run_config_shape():
     }
     is_valid, errors = validate_output(data)
     assert is_valid, f"Validation failed: {errors}"
+
+
+def test_section_errors_carry_the_document_path():
+    graph = _graph()
+    graph["pages"][0]["page_number"] = "one"
+    errors = ValidationSession().validate_section("EvidenceGraph", freeze(graph), path=("outputs", "evidence_graph"))
+    assert errors == ["outputs→evidence_graph→pages→0→page_number: 'one' is not of type 'integer'"]
+
+
+def test_session_skips_unchanged_read_only_subtrees(monkeypatch):
+    calls: list[str] = []
+    base = schema_validator._BASE_REF
+
+    def counting_ref(validator, ref, instance, schema):
+        calls.append(ref)
+        yield from base(validator, ref, instance, schema)
+
+    monkeypatch.setattr(schema_validator, "_BASE_REF", counting_ref)
+    graph = _graph()
+    assert graph["pages"]
+    frozen = freeze(graph)
+    session = ValidationSession()
+    assert session.validate_section("EvidenceGraph", frozen) == []
+    assert "#/$defs/Page" in calls
+    calls.clear()
+    # A new top-level view sharing the same page objects only re-walks the top level.
+    assert session.validate_section("EvidenceGraph", type(frozen)({**frozen})) == []
+    assert "#/$defs/Page" not in calls
+
+    # Plain dicts may be edited in place, so they are always re-validated.
+    plain = copy.deepcopy(frozen)
+    assert session.validate_section("EvidenceGraph", plain) == []
+    plain["pages"][0]["page_number"] = "one"
+    assert session.validate_section("EvidenceGraph", plain)
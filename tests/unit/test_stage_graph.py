@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from apps.worker.lib.observability import make_stage_timings
+from apps.worker.lib.stage_graph import Stage, StageGraph
+from apps.worker.lib.artifacts_writer import exported_extension_keys
+from apps.worker.pipeline_stages import ANALYZER_STAGES, EXT_PREFIX
+
+
+def _graph(log: list[str] | None = None) -> StageGraph:
+    def node(name, out):
+        def fn(s):
+            if log is not None:
+                log.append(name)
+            return {k: f"{name}:{k}" for k in out}
+        return fn
+
+    return StageGraph([
+        Stage("a", node("a", ["x"]), writes=("x",)),
+        Stage("b", node("b", ["y"]), writes=("y",)),
+        Stage("c", node("c", ["z"]), reads=("x", "y"), writes=("z",)),
+        Stage("d", node("d", ["w"]), reads=("x",), writes=("w",), modes=frozenset({"INTERNAL"})),
+        Stage("e", node("e", ["x"]), writes=("x",)),  # rewrites x after c and d read it
+    ])
+
+
+def test_plan_groups_independent_stages_into_waves():
+    waves, skipped = _graph().plan("INTERNAL")
+    assert [[s.name for s in w] for w in waves] == [["a", "b"], ["c", "d"], ["e"]]
+    assert skipped == []
+    waves, skipped = _graph().plan("MEDIATION")
+    assert [[s.name for s in w] for w in waves] == [["a", "b"], ["c"], ["e"]]
+    assert skipped == ["d"]
+
+
+def test_run_applies_outputs_after_each_wave_and_records_timings():
+    seen: dict[str, object] = {}
+    barrier = threading.Barrier(2, timeout=5)
+
+    def a(s):
+        barrier.wait()  # both first-wave stages must be running at once
+        return {"x": 1}
+
+    def b(s):
+        barrier.wait()
+        seen["x_during_wave"] = s.get("x")
+        return {"y": 2}
+
+    graph = StageGraph([
+        Stage("a", a, writes=("x",)),
+        Stage("b", b, writes=("y",)),
+        Stage("c", lambda s: {"z": s["x"] + s["y"]}, reads=("x", "y"), writes=("z",)),
+    ])
+    state: dict = {}
+    published: list[str] = []
+    timings = make_stage_timings()
+    report = graph.run(state, max_workers=2, timings=timings, on_write=lambda k, v: published.append(k))
+    assert state["z"] == 3
+    assert seen["x_during_wave"] is None
+    assert published == ["x", "y", "z"]
+    assert set(report.timings_ms) == {"a", "b", "c"}
+    assert set(timings.as_dict()) == {"a", "b", "c"}
+
+
+def test_prefix_read_orders_stage_between_earlier_and_later_prefix_writers():
+    graph = StageGraph([
+        Stage("a", lambda s: {"ext.a": 1}, writes=("ext.a",)),
+        Stage("p", lambda s: {"plain": 1}, writes=("plain",)),
+        Stage("whole", lambda s: {"seen": sorted(k for k in s if k.startswith("ext."))}, reads=("ext.*",), writes=("seen",)),
+        Stage("b", lambda s: {"ext.b": 2}, writes=("ext.b",)),
+        Stage("lazy", lambda s: {"ext.c": 3}, writes=("ext.c",), lazy=True),
+    ])
+    waves, skipped = graph.plan(want=set())
+    assert [[s.name for s in w] for w in waves] == [["a", "p"], ["whole"], ["b"]]
+    assert skipped == ["lazy"]  # an ordering edge does not pull a lazy stage in
+
+    state: dict = {}
+    graph.run(state, want=set(), max_workers=4)
+    assert state["seen"] == ["ext.a"]
+
+
+def test_reading_output_of_skipped_stage_is_an_error():
+    graph = StageGraph([
+        Stage("val", lambda s: {"v": 1}, writes=("v",), modes=frozenset({"INTERNAL"})),
+        Stage("use", lambda s: {"u": s["v"]}, reads=("v",), writes=("u",)),
+    ])
+    with pytest.raises(ValueError, match="skipped"):
+        graph.plan("MEDIATION")
+
+
+def test_stage_must_produce_exactly_its_declared_writes():
+    graph = StageGraph([Stage("bad", lambda s: {"other": 1}, writes=("x",))])
+    with pytest.raises(ValueError, match="declared writes"):
+        graph.run({})
+
+
+def test_lazy_stages_run_only_when_wanted_or_read():
+    def node(out):
+        return lambda s: {out: 1}
+
+    graph = StageGraph([
+        Stage("base", node("x"), writes=("x",)),
+        Stage("feat", node("f"), reads=("x",), writes=("f",), lazy=True),
+        Stage("score", node("s"), reads=("f",), writes=("s",), lazy=True),
+        Stage("report", node("r"), reads=("f", "s"), writes=("r",), lazy=True),
+    ])
+    assert graph.plan(want=set())[1] == ["feat", "score", "report"]
+    waves, skipped = graph.plan(want={"s"})
+    assert [[s.name for s in w] for w in waves] == [["base"], ["feat"], ["score"]]
+    assert skipped == ["report"]
+    assert graph.plan()[1] == []
+    state: dict = {}
+    graph.run(state, want={"f"})
+    assert set(state) == {"x", "f"}
+
+
+def test_analyzer_graph_skips_valuation_outputs_stripped_from_mediation():
+    want = {EXT_PREFIX + k for k in exported_extension_keys("MEDIATION")}
+    _, skipped = ANALYZER_STAGES.plan("MEDIATION", want=want)
+    assert set(skipped) == {"settlement_leverage_model", "defense_attack_map", "settlement_model_report", "internal_demand_package"}
+    waves, skipped = ANALYZER_STAGES.plan("INTERNAL")
+    assert skipped == []
+    assert len(waves) < len(ANALYZER_STAGES.stages)
+
+
+def test_record_and_billing_stages_share_waves_with_claim_analysis():
+    waves, _ = ANALYZER_STAGES.plan("INTERNAL")
+    wave_of = {s.name: i for i, wave in enumerate(waves) for s in wave}
+    assert wave_of["providers_normalized"] == wave_of["claim_edges"] == 0
+    assert wave_of["missing_records"] == wave_of["billing_lines"] == wave_of["litigation_extensions"]
+    assert wave_of["paralegal_chronology"] > wave_of["projection"]
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from datetime import date
+
+from apps.worker.steps.step07_events import (
+    extract_billing_events,
+    extract_clinical_events,
+    extract_lab_events,
+    iter_extraction_batches,
+    stream_events,
+)
+from packages.shared.models import DateKind, DateSource, EventDate, Page, PageType, RunConfig
+
+
+def _page(n: int, text: str, page_type: PageType) -> Page:
+    return Page(page_id=f"p{n}", source_document_id="doc-1", page_number=n, text=text, text_source="embedded_text", page_type=page_type)
+
+
+def _packet():
+    pages = [
+        _page(1, "Emergency Department\nChief complaint: neck pain after MVC\nAssessment: cervical strain", PageType.CLINICAL_NOTE),
+        _page(2, "STATEMENT\nPatient account 1234\nDate of service 03/01/2024\nTotal charges $1,250.00", PageType.BILLING),
+        _page(3, "Follow-up visit\nPain 6/10\nPlan: continue PT", PageType.CLINICAL_NOTE),
+        _page(4, "Invoice\nInsurance claim\nBalance due $300.00", PageType.BILLING),
+        _page(5, "LABORATORY REPORT\nHemoglobin 13.2 g/dL\nWBC 7.1", PageType.LAB_REPORT),
+    ]
+    d = EventDate(kind=DateKind.SINGLE, value=date(2024, 3, 1), source=DateSource.TIER1)
+    dates = {p.page_number: [d] for p in pages}
+    return pages, dates
+
+
+def test_page_local_extractors_yield_one_batch_per_page():
+    pages, dates = _packet()
+    sources = [b.source for b in iter_extraction_batches(pages, dates, [], RunConfig(), {})]
+    assert sources[:3] == ["clinical", "imaging", "pt"]
+    assert sources.count("billing") == 2
+    assert sources.count("lab") == 1
+
+
+def test_stream_matches_whole_packet_extraction():
+    pages, dates = _packet()
+    config = RunConfig()
+    stats = {"num_snippets_filtered": 0, "num_snippets_cleaned": 0}
+    scope = {p.page_number: "ps_a" for p in pages}
+    streamed = [e for b in stream_events(pages, dates, [], config, {}, scope, stats) for e in b.events]
+
+    whole = []
+    for extractor in (extract_clinical_events, extract_billing_events, extract_lab_events):
+        evts, _, _, _ = extractor(pages, dates, [], config, {})
+        whole.extend(evts)
+
+    def shape(events):
+        return [(str(e.event_type), e.source_page_numbers, [f.text for f in e.facts]) for e in events]
+
+    assert streamed
+    assert shape(streamed) == shape([e for e in whole if e.facts])
+    assert all(e.extensions.get("patient_scope_id") == "ps_a" for e in streamed)
+
+
+def test_stream_drops_garbage_facts_and_counts_them():
+    page = _page(1, "Follow-up visit\nPain 6/10", PageType.CLINICAL_NOTE)
+    stats = {"num_snippets_filtered": 0, "num_snippets_cleaned": 0}
+    batches = list(stream_events([page], {}, [], RunConfig(), {}, {}, stats))
+    events = [e for b in batches for e in b.events]
+    for evt in events:
+        assert evt.facts
+        assert evt.extensions.get("patient_scope_id")
+    assert set(stats) == {"num_snippets_filtered", "num_snippets_cleaned"}
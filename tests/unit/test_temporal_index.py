@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+
+from apps.worker.lib.litigation_safe_v1 import _compute_max_gap_days, _is_gap_treatment_event
+from apps.worker.lib.provider_normalize import compute_coverage_spans
+from apps.worker.lib.temporal_index import IntervalTree, TemporalIndex
+from apps.worker.steps.step11_gaps import detect_gaps
+from apps.worker.steps.step15_missing_records import _patient_scope_id, detect_missing_records
+from packages.shared.models import (
+    DateKind,
+    DateRange,
+    DateSource,
+    Event,
+    EventDate,
+    EventType,
+    EvidenceGraph,
+    Fact,
+    FactKind,
+    RunConfig,
+)
+
+
+def _evt(eid, d, pid="p1", scope=None, end=None, time=None, etype=EventType.OFFICE_VISIT):
+    value = DateRange(start=d, end=end) if end else d
+    ext = {"time": time} if time else {}
+    return Event(
+        event_id=eid,
+        provider_id=pid,
+        event_type=etype,
+        date=EventDate(
+            kind=DateKind.RANGE if end else DateKind.SINGLE, value=value, source=DateSource.TIER1, extensions=ext,
+        ),
+        facts=[Fact(text="Follow-up visit", kind=FactKind.OTHER, verbatim=True, citation_id=f"c-{eid}")],
+        confidence=80,
+        citation_ids=[f"c-{eid}"],
+        extensions={"patient_scope_id": scope} if scope else {},
+    )
+
+
+def test_interval_tree_matches_brute_force():
+    rng = random.Random(7)
+    base = date(2023, 1, 1)
+    intervals = []
+    for i in range(400):
+        s = base + timedelta(days=rng.randint(0, 700))
+        intervals.append((s, s + timedelta(days=rng.randint(0, 40)), i))
+    tree = IntervalTree(intervals)
+    for _ in range(200):
+        qs = base + timedelta(days=rng.randint(-10, 720))
+        qe = qs + timedelta(days=rng.randint(0, 30))
+        expected = sorted((s, i) for s, e, i in intervals if s <= qe and e >= qs)
+        assert tree.overlapping(qs, qe) == [i for _, i in expected]
+
+
+def test_events_on_keeps_sort_key_order_and_scopes():
+    d = date(2024, 2, 1)
+    idx = TemporalIndex([
+        _evt("late", d, time="1500"),
+        _evt("early", d, time="0800"),
+        _evt("other-scope", d, scope="ps_2"),
+        _evt("other-provider", d, pid="p2"),
+    ], scope_of=_patient_scope_id)
+    assert [e.event_id for e in idx.events_on(d, scope="ps_default", provider_id="p1")] == ["early", "late"]
+    assert {e.event_id for e in idx.events_on(d)} == {"early", "late", "other-scope", "other-provider"}
+    assert idx.scopes() == ["ps_2", "ps_default"]
+
+
+def _office_only(event):
+    return event.event_type == EventType.OFFICE_VISIT
+
+
+def test_gaps_coverage_overlap_and_filtered_day_lookups():
+    idx = TemporalIndex([
+        _evt("a", date(2024, 1, 1)),
+        _evt("b", date(2024, 1, 10), end=date(2024, 2, 20)),
+        _evt("b-lab", date(2024, 1, 10), etype=EventType.LAB_RESULT),
+        _evt("c", date(2024, 5, 1)),
+        _evt("undated-placeholder", date(1900, 1, 1)),
+    ], scope_of=_patient_scope_id)
+    assert idx.gaps(45) == [(date(2024, 1, 10), date(2024, 5, 1), 112)]
+    assert idx.max_gap_days(provider_id="p1") == 112
+    assert idx.dates() == [date(2024, 1, 1), date(2024, 1, 10), date(2024, 5, 1)]
+    assert [e.event_id for e in idx.events_on(date(2024, 1, 10), include=_office_only)] == ["b"]
+    assert idx.coverage(provider_id="p1") == (date(2024, 1, 1), date(2024, 5, 1))
+    assert [e.event_id for e in idx.overlapping(date(2024, 2, 1), date(2024, 2, 5))] == ["b"]
+    window = idx.starting_between(date(2024, 1, 5), None, include=_office_only)
+    assert [e.event_id for e in window] == ["b", "c"]
+    assert idx.gaps(45, include=lambda e: e.event_id != "b") == [(date(2024, 1, 10), date(2024, 5, 1), 112)]
+    assert idx.max_gap_days(include=lambda e: e.event_id in {"a", "c"}) == 121
+
+
+def test_detect_gaps_pairs_last_and_first_eligible_events_of_each_day():
+    events = [
+        _evt("a-late", date(2024, 1, 1), time="1700"),
+        _evt("a-early", date(2024, 1, 1), time="0900"),
+        _evt("bill", date(2024, 2, 15), etype=EventType.BILLING_EVENT),
+        _evt("b", date(2024, 4, 1)),
+        _evt("surgery", date(2024, 5, 15), etype=EventType.PROCEDURE),
+        _evt("c", date(2024, 9, 1)),
+    ]
+    ordered, gaps, _ = detect_gaps(events, RunConfig(gap_threshold_days=60))
+    assert [e.event_id for e in ordered][:2] == ["a-early", "a-late"]
+    assert [(g.start_date, g.end_date, g.threshold_days, g.related_event_ids) for g in gaps] == [
+        (date(2024, 1, 1), date(2024, 4, 1), 60, ["a-late", "b"]),
+        (date(2024, 5, 15), date(2024, 9, 1), 90, ["surgery", "c"]),
+    ]
+
+
+def test_indexed_treatment_gap_and_coverage_spans_match_scans():
+    rng = random.Random(11)
+    types = [EventType.OFFICE_VISIT, EventType.BILLING_EVENT, EventType.PROCEDURE, EventType.LAB_RESULT]
+    events = [
+        _evt(f"e{i}", date(2023, 1, 1) + timedelta(days=rng.randint(0, 600)), pid=f"p{i % 3}", etype=rng.choice(types))
+        for i in range(80)
+    ]
+    idx = TemporalIndex(events)
+    assert idx.max_gap_days(include=_is_gap_treatment_event) == _compute_max_gap_days(events)
+    entities = [
+        {"normalized_name": "p0 p1", "display_name": "P0", "provider_type": "clinic", "event_count": 0,
+         "source_provider_ids": ["p0", "p1"]},
+        {"normalized_name": "none", "display_name": "None", "provider_type": "clinic", "event_count": 0,
+         "source_provider_ids": ["p9"]},
+    ]
+    spans = compute_coverage_spans(entities, idx)
+    days = sorted(e.date.sort_date() for e in events if e.provider_id in {"p0", "p1"})
+    assert [(s["start_date"], s["end_date"]) for s in spans] == [(days[0].isoformat(), days[-1].isoformat())]
+
+
+def test_missing_records_identical_with_shared_index():
+    rng = random.Random(3)
+    events = []
+    for i in range(120):
+        d = date(2022, 1, 1) + timedelta(days=rng.randint(0, 900))
+        scope = "ps_a" if i % 3 else "ps_b"
+        events.append(_evt(f"e{i}", d, pid=f"p{i % 4}", scope=scope, time=f"{rng.randint(0, 23):02d}00"))
+    graph = EvidenceGraph(events=events)
+    without = detect_missing_records(graph, [])
+    shared = detect_missing_records(graph, [], temporal_index=TemporalIndex(graph.events, scope_of=_patient_scope_id))
+    without.pop("generated_at"), shared.pop("generated_at")
+    assert without == shared
+    assert without["gaps"]